@@ -11,6 +11,10 @@ USER_HOME=$(eval echo ~$CURRENT_USER)
 # Application paths - system-wide installation
 APP_DIR="/usr/share/pomodoro-lock"
 MAIN_SCRIPT="$APP_DIR/pomodoro-ui-crossplatform.py"
+CLI_SCRIPT="$APP_DIR/pomodoro-cli.py"
+DAEMON_SCRIPT="$APP_DIR/pomodoro-daemon.py"
+CLIENT_SCRIPT="$APP_DIR/pomodoro-session-client.py"
+COORDINATOR_SCRIPT="$APP_DIR/pomodoro-coordinator.py"
 
 # Check if application is installed in system directory
 if [ ! -f "$MAIN_SCRIPT" ]; then
@@ -166,6 +170,15 @@ show_help() {
     echo "  service - Start the systemd service"
     echo "  stop    - Stop the systemd service"
     echo "  status  - Show service status"
+    echo "  status --watch - Stream timer state transitions (add --json for JSON lines)"
+    echo "  report  - Summarize focus time, breaks and snoozes (--days N, --weekly, --heatmap)"
+    echo "  export  - Stream session history as CSV or JSON Lines (--since, --until, --format)"
+    echo "  config  - Show the effective settings and where each comes from"
+    echo "  metrics - Show tick lateness, GUI callback and overlay timings of the running timer"
+    echo "  daemon  - Run the multi-session daemon (system service on shared hosts)"
+    echo "  client  - Start the thin session client of the multi-session daemon"
+    echo "  coordinator - Run the team coordinator (shared work and break schedules)"
+    echo "  team    - Show or change a team schedule on the team coordinator"
     echo "  help    - Show this help"
     echo ""
     echo "Installation location: $APP_DIR"
@@ -191,6 +204,28 @@ start_ui() {
     exec python pomodoro-ui-crossplatform.py
 }
 
+# Function to run the control CLI against the running timer
+run_cli() {
+    exec python3 "$CLI_SCRIPT" "$@"
+}
+
+# Function to run the multi-session daemon (started by pomodoro-lock-daemon.service)
+run_daemon() {
+    exec python3 "$DAEMON_SCRIPT" "$@"
+}
+
+# Function to run the team coordinator (started by pomodoro-lock-coordinator.service)
+run_coordinator() {
+    exec python3 "$COORDINATOR_SCRIPT" "$@"
+}
+
+# Function to start the thin client of the multi-session daemon
+start_client() {
+    cd "$APP_DIR"
+    source "$VENV_DIR/bin/activate"
+    exec python "$CLIENT_SCRIPT" "$@"
+}
+
 # Function to manage systemd service
 manage_service() {
     case "$1" in
@@ -239,8 +274,33 @@ case "${1:-ui}" in
         manage_service "stop"
         ;;
     "status")
+        # Options such as --watch talk to the running timer directly
+        if [ -n "$2" ]; then
+            run_cli "$@"
+        fi
         manage_service "status"
         ;;
+    "report"|"export"|"config"|"metrics"|"team")
+        run_cli "$@"
+        ;;
+    "daemon")
+        shift
+        run_daemon "$@"
+        ;;
+    "coordinator")
+        shift
+        run_coordinator "$@"
+        ;;
+    "client")
+        # Auto-setup user environment if needed
+        if ! check_user_setup; then
+            setup_user_environment
+            echo ""
+        fi
+        
+        shift
+        start_client "$@"
+        ;;
     "help"|"-h"|"--help")
         show_help
         ;;
@@ -0,0 +1,19 @@
+# PyInstaller hook for engine module
+
+from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+
+# Collect all submodules
+hiddenimports = collect_submodules('engine')
+
+# Add specific imports that might be missed
+hiddenimports += [
+    'engine.state',
+    'engine.scheduler',
+    'engine.sessions',
+    'engine.table',
+    'engine.team',
+    'engine.__init__',
+]
+
+# Collect data files if any
+datas = collect_data_files('engine')
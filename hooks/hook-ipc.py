@@ -0,0 +1,18 @@
+# PyInstaller hook for ipc module
+
+from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+
+# Collect all submodules
+hiddenimports = collect_submodules('ipc')
+
+# Add specific imports that might be missed
+hiddenimports += [
+    'ipc.status_page',
+    'ipc.control',
+    'ipc.session_daemon',
+    'ipc.coordinator',
+    'ipc.__init__',
+]
+
+# Collect data files if any
+datas = collect_data_files('ipc')
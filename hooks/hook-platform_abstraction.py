@@ -9,6 +9,7 @@ hiddenimports = collect_submodules('platform_abstraction')
 hiddenimports += [
     'platform_abstraction.linux',
     'platform_abstraction.windows',
+    'platform_abstraction.dispatcher',
     'platform_abstraction.__init__',
 ]
 
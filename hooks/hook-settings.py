@@ -0,0 +1,17 @@
+# PyInstaller hook for settings module
+
+from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+
+# Collect all submodules
+hiddenimports = collect_submodules('settings')
+
+# Add specific imports that might be missed
+hiddenimports += [
+    'settings.loader',
+    'settings.watcher',
+    'settings.layers',
+    'settings.__init__',
+]
+
+# Collect data files if any
+datas = collect_data_files('settings')
@@ -0,0 +1,19 @@
+# PyInstaller hook for storage module
+
+from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+
+# Collect all submodules
+hiddenimports = collect_submodules('storage')
+
+# Add specific imports that might be missed
+hiddenimports += [
+    'storage.checkpoint',
+    'storage.history',
+    'storage.history_query',
+    'storage.analytics',
+    'storage.export',
+    'storage.__init__',
+]
+
+# Collect data files if any
+datas = collect_data_files('storage')
@@ -0,0 +1,19 @@
+# PyInstaller hook for telemetry module
+
+from PyInstaller.utils.hooks import collect_data_files, collect_submodules
+
+# Collect all submodules
+hiddenimports = collect_submodules('telemetry')
+
+# Add specific imports that might be missed
+hiddenimports += [
+    'telemetry.logsetup',
+    'telemetry.ratelimit',
+    'telemetry.metrics',
+    'telemetry.prometheus',
+    'telemetry.flight',
+    'telemetry.__init__',
+]
+
+# Collect data files if any
+datas = collect_data_files('telemetry')
@@ -32,6 +32,7 @@ if is_windows:
         'platform_abstraction',
         'platform_abstraction.linux',
         'platform_abstraction.windows',
+        'platform_abstraction.dispatcher',
         'platform_abstraction.__init__',
         
         # GUI modules
@@ -40,6 +41,48 @@ if is_windows:
         'gui.tkinter_ui',
         'gui.__init__',
         
+        # IPC modules
+        'ipc',
+        'ipc.status_page',
+        'ipc.control',
+        'ipc.session_daemon',
+        'ipc.coordinator',
+        'ipc.__init__',
+        
+        # Engine modules
+        'engine',
+        'engine.state',
+        'engine.scheduler',
+        'engine.sessions',
+        'engine.table',
+        'engine.team',
+        'engine.__init__',
+        
+        # Telemetry
+        'telemetry',
+        'telemetry.logsetup',
+        'telemetry.ratelimit',
+        'telemetry.metrics',
+        'telemetry.prometheus',
+        'telemetry.flight',
+        'telemetry.__init__',
+        
+        # Configuration
+        'settings',
+        'settings.loader',
+        'settings.watcher',
+        'settings.layers',
+        'settings.__init__',
+        
+        # Storage modules
+        'storage',
+        'storage.checkpoint',
+        'storage.history',
+        'storage.history_query',
+        'storage.analytics',
+        'storage.export',
+        'storage.__init__',
+        
         # Windows-specific imports
         'win10toast',
         'pystray',
@@ -64,6 +107,7 @@ else:
         'platform_abstraction',
         'platform_abstraction.linux',
         'platform_abstraction.windows',
+        'platform_abstraction.dispatcher',
         'platform_abstraction.__init__',
         
         # GUI modules
@@ -72,6 +116,48 @@ else:
         'gui.tkinter_ui',
         'gui.__init__',
         
+        # IPC modules
+        'ipc',
+        'ipc.status_page',
+        'ipc.control',
+        'ipc.session_daemon',
+        'ipc.coordinator',
+        'ipc.__init__',
+        
+        # Engine modules
+        'engine',
+        'engine.state',
+        'engine.scheduler',
+        'engine.sessions',
+        'engine.table',
+        'engine.team',
+        'engine.__init__',
+        
+        # Telemetry
+        'telemetry',
+        'telemetry.logsetup',
+        'telemetry.ratelimit',
+        'telemetry.metrics',
+        'telemetry.prometheus',
+        'telemetry.flight',
+        'telemetry.__init__',
+        
+        # Configuration
+        'settings',
+        'settings.loader',
+        'settings.watcher',
+        'settings.layers',
+        'settings.__init__',
+        
+        # Storage modules
+        'storage',
+        'storage.checkpoint',
+        'storage.history',
+        'storage.history_query',
+        'storage.analytics',
+        'storage.export',
+        'storage.__init__',
+        
         # Linux-specific imports (these are usually system packages)
         'gi',
         'gi.repository',
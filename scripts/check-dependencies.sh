@@ -94,6 +94,8 @@ fi
 
 if python_module_exists notify2; then
     echo "✓ notify2: Available"
+elif python_module_exists gi; then
+    echo "- notify2: Not found (optional, notifications use Gio)"
 else
     echo "✗ notify2: Not found"
     MISSING_PACKAGES+=("notify2")
@@ -3,39 +3,105 @@
 import json
 import os
 import sys
+import time
+
+# Settings package: next to this script's directory when installed, in src/ in the source tree
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..', 'src'))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..'))
+
+from settings.loader import CONFIG_LIMITS, DEFAULT_CONFIG, default_config_path
+from settings.layers import SettingsLoader
+from storage.checkpoint import atomic_write
+from ipc.control import ControlError, send_command
+
+LOADER = SettingsLoader()
 
 def load_config():
-    """Load the current configuration"""
-    config_path = os.path.expanduser('~/.local/share/pomodoro-lock/config/config.json')
-    if os.path.exists(config_path):
-        with open(config_path, 'r') as f:
-            return json.load(f)
-    else:
-        return {
-            "work_time_minutes": 30,
-            "break_time_minutes": 5,
-            "notification_time_minutes": 2,
-            "inactivity_threshold_minutes": 10
-        }
+    """Load the current effective configuration"""
+    return LOADER.get_or_fallback()
+
+def load_user_config():
+    """Load the user's own config.json, without the policy and environment layers"""
+    try:
+        with open(LOADER.user_path, 'r') as f:
+            config = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        print(f"Warning: ignoring unreadable {LOADER.user_path}: {e}")
+        return {}
+    return config if isinstance(config, dict) else {}
 
 def save_config(config):
-    """Save the configuration to file"""
-    config_path = os.path.expanduser('~/.local/share/pomodoro-lock/config/config.json')
+    """Save the configuration atomically and push it to the running timer"""
+    config_path = default_config_path()
     os.makedirs(os.path.dirname(config_path), exist_ok=True)
-    with open(config_path, 'w') as f:
-        json.dump(config, f, indent=4)
+    atomic_write(config_path, (json.dumps(config, indent=4) + "\n").encode('utf-8'))
     print(f"Configuration saved to: {config_path}")
+    notify_running_instance()
+
+def notify_running_instance(control_path=None):
+    """Ask the running timer to apply the saved settings and report what it applied"""
+    start = time.monotonic()
+    try:
+        reply = send_command('reload-config', path=control_path, timeout=3.0)
+    except ControlError:
+        print("Pomodoro Lock is not running; the settings apply when it starts.")
+        return False
+    elapsed = (time.monotonic() - start) * 1000
+
+    if not reply.get('ok'):
+        print(f"The running timer rejected the settings: {reply.get('error')}")
+        return False
+
+    applied = reply['settings']
+    remaining = int(reply.get('remaining', 0))
+    status = "Applied" if reply.get('changed') else "Already in effect"
+    print(
+        f"{status} in the running timer ({elapsed:.0f} ms): "
+        f"work {applied['work_time_minutes']} min, break {applied['break_time_minutes']} min, "
+        f"notification {applied['notification_time_minutes']} min"
+    )
+    print(f"Current {reply.get('state', 'work')} session: {remaining // 60}:{remaining % 60:02d} left")
+    for key in reply.get('locked', []):
+        print(f"  {key} is locked by policy at {applied[key]}")
+    return True
+
+def display_current_config(config, settings=None):
+    """Display a configuration, marking values locked by the system policy"""
+    settings = settings or load_config()
+
+    def note(key):
+        return "  (locked by policy)" if key in settings.locked else ""
 
-def display_current_config(config):
-    """Display the current configuration"""
     print("\nCurrent Configuration:")
     print("=" * 40)
-    print(f"Work Time:           {config['work_time_minutes']} minutes")
-    print(f"Break Time:          {config['break_time_minutes']} minutes")
-    print(f"Notification Time:   {config['notification_time_minutes']} minutes before break")
-    print(f"Inactivity Threshold: {config['inactivity_threshold_minutes']} minutes")
+    print(f"Work Time:           {config['work_time_minutes']} minutes{note('work_time_minutes')}")
+    print(f"Break Time:          {config['break_time_minutes']} minutes{note('break_time_minutes')}")
+    print(f"Notification Time:   {config['notification_time_minutes']} minutes before break{note('notification_time_minutes')}")
+    print(f"Inactivity Threshold: {config['inactivity_threshold_minutes']} minutes{note('inactivity_threshold_minutes')}")
+    print(f"Snooze Time:         {config.get('snooze_time_minutes', DEFAULT_CONFIG['snooze_time_minutes'])} minutes{note('snooze_time_minutes')}")
+    print(f"Snooze Limit:        {config.get('max_snooze_minutes', DEFAULT_CONFIG['max_snooze_minutes'])} minutes per session{note('max_snooze_minutes')}")
     print("=" * 40)
 
+def apply_changes(changes, settings):
+    """The user's config.json with the changed keys applied, skipping keys locked by policy"""
+    config = load_user_config()
+    for key, value in changes.items():
+        if key in settings.locked:
+            if value != getattr(settings, key):
+                print(f"Note: {key} is locked by policy at {getattr(settings, key)}")
+            continue
+        config[key] = value
+    return config
+
+def preview(settings, changes):
+    """The effective configuration once the changes are saved"""
+    config = settings.as_config()
+    config.update((key, value) for key, value in changes.items() if key not in settings.locked)
+    return config
+
 def get_user_input(prompt, current_value, min_value=1, max_value=120):
     """Get user input with validation"""
     while True:
@@ -54,40 +120,36 @@ def get_user_input(prompt, current_value, min_value=1, max_value=120):
 
 def configure_interactive():
     """Interactive configuration"""
-    config = load_config()
+    settings = load_config()
+    current = settings.as_config()
     
     print("Pomodoro Lock Configuration")
     print("=" * 40)
-    display_current_config(config)
+    display_current_config(current, settings)
     
     print("\nEnter new values (press Enter to keep current value):")
     
-    config['work_time_minutes'] = get_user_input(
-        "Work time (minutes)", 
-        config['work_time_minutes'], 
-        1, 120
-    )
-    
-    config['break_time_minutes'] = get_user_input(
-        "Break time (minutes)", 
-        config['break_time_minutes'], 
-        1, 60
-    )
-    
-    config['notification_time_minutes'] = get_user_input(
-        "Notification time (minutes before break)", 
-        config['notification_time_minutes'], 
-        1, 10
-    )
-    
-    config['inactivity_threshold_minutes'] = get_user_input(
-        "Inactivity threshold (minutes)", 
-        config['inactivity_threshold_minutes'], 
-        1, 60
-    )
+    prompts = [
+        ('work_time_minutes', "Work time (minutes)"),
+        ('break_time_minutes', "Break time (minutes)"),
+        ('notification_time_minutes', "Notification time (minutes before break)"),
+        ('inactivity_threshold_minutes', "Inactivity threshold (minutes)"),
+        ('snooze_time_minutes', "Snooze time (minutes)"),
+        ('max_snooze_minutes', "Snooze limit per session (minutes, 0 disables snoozing)"),
+    ]
+    # Only the values the user changes are written, so policy and environment values stay out of config.json
+    changes = {}
+    for key, prompt in prompts:
+        if key in settings.locked:
+            print(f"{prompt}: {current[key]} (locked by policy)")
+            continue
+        value = get_user_input(prompt, current[key], *CONFIG_LIMITS[key])
+        if value != current[key]:
+            changes[key] = value
+    config = apply_changes(changes, settings)
     
     print("\nNew Configuration:")
-    display_current_config(config)
+    display_current_config(preview(settings, changes), settings)
     
     save = input("\nSave this configuration? (y/n): ").lower().strip()
     if save in ['y', 'yes']:
@@ -130,9 +192,10 @@ def configure_preset(preset_name):
         print("Available presets: standard, long, short, custom")
         return
     
-    config = presets[preset_name]
+    settings = load_config()
+    config = apply_changes(presets[preset_name], settings)
     print(f"\nApplying {preset_name} preset:")
-    display_current_config(config)
+    display_current_config(preview(settings, presets[preset_name]), settings)
     
     save = input("\nSave this configuration? (y/n): ").lower().strip()
     if save in ['y', 'yes']:
@@ -146,10 +209,12 @@ def main():
         command = sys.argv[1].lower()
         
         if command == 'show':
-            config = load_config()
-            display_current_config(config)
+            settings = load_config()
+            display_current_config(settings.as_config(), settings)
         elif command in ['standard', 'long', 'short', 'custom']:
             configure_preset(command)
+        elif command == 'reload':
+            notify_running_instance()
         elif command == 'help':
             print("Pomodoro Lock Configuration Tool")
             print("=" * 40)
@@ -160,6 +225,7 @@ def main():
             print("  python3 configure-pomodoro.py long     # Apply long preset (45/15)")
             print("  python3 configure-pomodoro.py short    # Apply short preset (15/3)")
             print("  python3 configure-pomodoro.py custom   # Apply custom preset (30/5)")
+            print("  python3 configure-pomodoro.py reload   # Re-apply the saved settings to the running timer")
             print("  python3 configure-pomodoro.py help     # Show this help")
             print("\nPresets:")
             print("  standard: 25 min work, 5 min break")
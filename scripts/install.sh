@@ -89,11 +89,22 @@ mkdir -p "$INSTALL_DIR/tests"
 # Copy source files
 echo -e "${BLUE}📋 Copying application files...${NC}"
 cp src/pomodoro-ui-crossplatform.py "$INSTALL_DIR/"
+cp src/pomodoro-cli.py "$INSTALL_DIR/"
+cp src/pomodoro-daemon.py "$INSTALL_DIR/"
+cp src/pomodoro-session-client.py "$INSTALL_DIR/"
+cp src/pomodoro-coordinator.py "$INSTALL_DIR/"
 cp -r src/platform_abstraction/ "$INSTALL_DIR/"
 cp -r src/gui/ "$INSTALL_DIR/"
+cp -r src/ipc/ "$INSTALL_DIR/"
+cp -r src/storage/ "$INSTALL_DIR/"
+cp -r src/settings/ "$INSTALL_DIR/"
+cp -r src/telemetry/ "$INSTALL_DIR/"
+cp -r src/engine/ "$INSTALL_DIR/"
 cp scripts/configure-pomodoro.py "$INSTALL_DIR/scripts/"
 cp config/config.json "$INSTALL_DIR/config/"
 cp config/pomodoro-lock.service "$INSTALL_DIR/systemd/"
+cp config/pomodoro-lock-daemon.service "$INSTALL_DIR/systemd/"
+cp config/pomodoro-lock-coordinator.service "$INSTALL_DIR/systemd/"
 cp pomodoro-lock.svg "$INSTALL_DIR/"
 cp README.md "$INSTALL_DIR/docs/"
 cp LICENSE "$INSTALL_DIR/docs/"
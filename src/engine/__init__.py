@@ -0,0 +1,37 @@
+"""
+Timer engine for Pomodoro Lock
+GUI-independent timer state shared safely between threads, the deadlines that drive it,
+the session table of the multi-session daemon and team schedules
+"""
+
+from .state import (
+    TimerState,
+    StateCell
+)
+from .scheduler import (
+    DeadlineScheduler,
+    Deadline
+)
+from .sessions import (
+    SessionManager,
+    Session,
+    SessionError
+)
+from .table import SessionTable
+from .team import (
+    TeamSchedule,
+    ScheduleError
+)
+
+__all__ = [
+    'TimerState',
+    'StateCell',
+    'DeadlineScheduler',
+    'Deadline',
+    'SessionManager',
+    'Session',
+    'SessionError',
+    'SessionTable',
+    'TeamSchedule',
+    'ScheduleError'
+]
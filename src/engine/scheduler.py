@@ -0,0 +1,213 @@
+"""
+Deadline scheduler for Pomodoro Lock
+
+Every timed event of the timer (the break warning, the end of a session,
+the end of a snooze) is a named deadline on the monotonic clock. The
+deadlines live in a binary heap that also records each entry's position,
+so scheduling, rescheduling and cancelling by name are all O(log n) and
+the next deadline is O(1). One thread sleeps until the earliest deadline
+(or until an earlier one is scheduled) and runs the callbacks that are
+due, so arming a snooze or a session does not start a thread or a
+platform timer.
+"""
+
+import time
+import logging
+import threading
+
+# Deadlines of the desktop timer
+DEADLINE_WARNING = 'warning'
+DEADLINE_SESSION_END = 'session-end'
+DEADLINE_SNOOZE_END = 'snooze-end'
+
+
+class Deadline:
+    """One scheduled callback; index is its position in the heap"""
+
+    __slots__ = ('when', 'seq', 'key', 'name', 'callback', 'index')
+
+    def __init__(self, when, seq, name, callback):
+        self.when = when
+        self.seq = seq
+        # Heap order, compared as a tuple so sifting calls no Python code
+        self.key = (when, seq)
+        self.name = name
+        self.callback = callback
+        self.index = -1
+
+    def __lt__(self, other):
+        return self.key < other.key
+
+
+class DeadlineScheduler:
+    """Named deadlines in an indexed binary heap, run by a single waiting thread"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        # Called as observer(name, lateness_seconds) before each callback runs
+        self.observer = None
+        self.fired = 0
+        self._heap = []
+        self._by_name = {}
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def schedule(self, name, when, callback):
+        """Run callback at monotonic time when, replacing any deadline of that name"""
+        with self._cond:
+            self._seq += 1
+            entry = self._by_name.get(name)
+            if entry is None:
+                entry = Deadline(when, self._seq, name, callback)
+                entry.index = len(self._heap)
+                self._heap.append(entry)
+                self._by_name[name] = entry
+                self._sift_up(entry.index)
+            else:
+                earlier = when < entry.when
+                entry.when, entry.seq, entry.callback = when, self._seq, callback
+                entry.key = (when, self._seq)
+                if earlier:
+                    self._sift_up(entry.index)
+                else:
+                    self._sift_down(entry.index)
+            if self._heap[0] is entry:
+                self._cond.notify_all()
+        return when
+
+    def schedule_in(self, name, delay, callback):
+        """Run callback delay seconds from now; returns the deadline"""
+        return self.schedule(name, self.clock() + delay, callback)
+
+    def cancel(self, name):
+        """Remove a deadline; returns False if none was scheduled"""
+        with self._cond:
+            entry = self._by_name.pop(name, None)
+            if entry is None:
+                return False
+            self._remove_at(entry.index)
+            return True
+
+    def clear(self):
+        """Remove every deadline"""
+        with self._cond:
+            self._heap.clear()
+            self._by_name.clear()
+            self._cond.notify_all()
+
+    def deadline(self, name):
+        """When the named deadline is due, or None"""
+        entry = self._by_name.get(name)
+        return entry.when if entry is not None else None
+
+    def next_deadline(self):
+        """The earliest deadline, or None when nothing is scheduled"""
+        with self._cond:
+            return self._heap[0].when if self._heap else None
+
+    def pop_due(self, now=None):
+        """Remove and return the deadlines due at now, earliest first"""
+        if now is None:
+            now = self.clock()
+        due = []
+        with self._cond:
+            while self._heap and self._heap[0].when <= now:
+                entry = self._heap[0]
+                del self._by_name[entry.name]
+                self._remove_at(0)
+                due.append(entry)
+        return due
+
+    def run_due(self, now=None):
+        """Run the callbacks that are due; returns how many ran"""
+        if now is None:
+            now = self.clock()
+        due = self.pop_due(now)
+        for entry in due:
+            self._fire(entry, now)
+        return len(due)
+
+    def wake(self):
+        """Make run() re-check its stop event and deadlines now"""
+        with self._cond:
+            self._cond.notify_all()
+
+    def run(self, stop_event, max_wait=None):
+        """Sleep until deadlines are due and run them, until stop_event is set"""
+        while not stop_event.is_set():
+            with self._cond:
+                while not stop_event.is_set():
+                    now = self.clock()
+                    if self._heap and self._heap[0].when <= now:
+                        break
+                    timeout = self._heap[0].when - now if self._heap else max_wait
+                    if max_wait is not None and timeout is not None:
+                        timeout = min(timeout, max_wait)
+                    self._cond.wait(timeout)
+            if not stop_event.is_set():
+                self.run_due()
+
+    def _fire(self, entry, now):
+        self.fired += 1
+        if self.observer is not None:
+            try:
+                self.observer(entry.name, max(0.0, now - entry.when))
+            except Exception as e:
+                logging.error(f"Scheduler observer failed: {e}")
+        try:
+            entry.callback()
+        except Exception as e:
+            logging.error(f"Error running scheduled {entry.name}: {e}")
+
+    def _remove_at(self, index):
+        heap = self._heap
+        last = heap.pop()
+        last_index = len(heap)
+        if index == last_index:
+            return
+        removed = heap[index]
+        heap[index] = last
+        last.index = index
+        if last.key < removed.key:
+            self._sift_up(index)
+        else:
+            self._sift_down(index)
+
+    def _sift_up(self, index):
+        heap = self._heap
+        entry = heap[index]
+        key = entry.key
+        while index > 0:
+            parent = (index - 1) >> 1
+            if not key < heap[parent].key:
+                break
+            heap[index] = heap[parent]
+            heap[index].index = index
+            index = parent
+        heap[index] = entry
+        entry.index = index
+
+    def _sift_down(self, index):
+        heap = self._heap
+        size = len(heap)
+        entry = heap[index]
+        key = entry.key
+        while True:
+            child = 2 * index + 1
+            if child >= size:
+                break
+            if child + 1 < size and heap[child + 1].key < heap[child].key:
+                child += 1
+            if not heap[child].key < key:
+                break
+            heap[index] = heap[child]
+            heap[index].index = index
+            index = child
+        heap[index] = entry
+        entry.index = index
@@ -0,0 +1,304 @@
+"""
+Shared session table for Pomodoro Lock
+
+On a terminal server or VDI host every desktop session used to run its own
+timer process. The session daemon instead keeps one Session record per user
+session in a SessionManager and drives all of them from a single
+DeadlineScheduler: a session has at most a warning, a session end and a
+snooze end in the shared heap, so nothing runs between transitions however
+many sessions there are. The session semantics are those of PomodoroTimer
+(_run_session, _arm_deadlines, _pause, _resume and apply_config).
+
+Deadlines are named (key, kind). Transitions are reported through
+on_event(key, message) while the table lock is held, so events of one
+session are delivered in order; on_event must only queue the message.
+"""
+
+import time
+import logging
+import threading
+from functools import partial
+
+from settings.loader import validate_config
+from .state import TimerState
+from .scheduler import DEADLINE_WARNING, DEADLINE_SESSION_END, DEADLINE_SNOOZE_END
+
+# A session nobody is attached to is forgotten after this many seconds
+DEADLINE_EXPIRE = 'expire'
+DEFAULT_EXPIRE_AFTER = 15 * 60
+
+
+class SessionError(LookupError):
+    """Raised for requests about a session that is not in the table"""
+
+
+class Session:
+    """One user session: its timer state, lengths in seconds and attached clients"""
+
+    __slots__ = ('key', 'state', 'config', 'work_time', 'break_time', 'notification_time',
+                 'snooze_time', 'max_snooze', 'clients')
+
+    def __init__(self, key, config):
+        self.key = key
+        self.state = TimerState(0)
+        self.clients = 0
+        self.configure(config)
+
+    def configure(self, config):
+        """Take the lengths from a validated config dict"""
+        self.config = config
+        self.work_time = config["work_time_minutes"] * 60
+        self.break_time = config["break_time_minutes"] * 60
+        self.notification_time = config["notification_time_minutes"] * 60
+        self.snooze_time = config["snooze_time_minutes"] * 60
+        self.max_snooze = config["max_snooze_minutes"] * 60
+
+    def length(self, is_work_session):
+        """Full length of a work session or break"""
+        return self.work_time if is_work_session else self.break_time
+
+
+class SessionManager:
+    """Timer state of many sessions, driven by one shared DeadlineScheduler"""
+
+    def __init__(self, scheduler, on_event=None, expire_after=DEFAULT_EXPIRE_AFTER):
+        self.scheduler = scheduler
+        self.clock = scheduler.clock
+        self.on_event = on_event
+        self.expire_after = expire_after
+        self.sessions = {}
+        self.transitions = 0
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.sessions)
+
+    def __contains__(self, key):
+        return key in self.sessions
+
+    def keys(self):
+        """Keys of the sessions in the table"""
+        with self._lock:
+            return list(self.sessions)
+
+    def get(self, key):
+        """The Session for key; raises SessionError if there is none"""
+        session = self.sessions.get(key)
+        if session is None:
+            raise SessionError(f"no such session: {key}")
+        return session
+
+    def attach(self, key, config=None):
+        """
+        Register a client of key and return the Session.
+
+        A new key starts a work session. An existing one keeps running and
+        takes the client's config if it differs.
+        """
+        config = validate_config(config or {})
+        with self._lock:
+            session = self.sessions.get(key)
+            if session is None:
+                session = self.sessions[key] = Session(key, config)
+                self._run(session, True, session.work_time)
+                self._emit(session, "work_start")
+            elif config != session.config:
+                self._reconfigure(session, config)
+            session.clients += 1
+            self.scheduler.cancel((key, DEADLINE_EXPIRE))
+            return session
+
+    def detach(self, key):
+        """A client of key went away; the last one leaves the session to expire"""
+        with self._lock:
+            session = self.sessions.get(key)
+            if session is None:
+                return
+            session.clients = max(0, session.clients - 1)
+            if session.clients == 0:
+                self.scheduler.schedule_in(
+                    (key, DEADLINE_EXPIRE), self.expire_after, partial(self._on_deadline, key, DEADLINE_EXPIRE)
+                )
+
+    def remove(self, key):
+        """Forget a session and its deadlines; False if there was none"""
+        with self._lock:
+            session = self.sessions.pop(key, None)
+            if session is None:
+                return False
+            for kind in (DEADLINE_WARNING, DEADLINE_SESSION_END, DEADLINE_SNOOZE_END, DEADLINE_EXPIRE):
+                self.scheduler.cancel((key, kind))
+            return True
+
+    def pause(self, key, snooze_seconds=None):
+        """Pause within the session's snooze limit; returns the seconds granted (0 if refused)"""
+        with self._lock:
+            session = self.get(key)
+            requested = session.snooze_time if snooze_seconds is None else snooze_seconds
+            if session.state.is_paused:
+                return 0
+            granted = self._pause(session, requested)
+            if granted:
+                self._emit(session, "pause", snooze_seconds=granted, limited=granted < requested)
+            else:
+                self._emit(session, "snooze_denied")
+            return granted
+
+    def resume(self, key):
+        """Resume a paused session; False if it was not paused"""
+        with self._lock:
+            session = self.get(key)
+            if not self._resume(session):
+                return False
+            self._emit(session, "resume")
+            return True
+
+    def snapshot(self, key):
+        """Describe a session the way PomodoroTimer._state_snapshot does"""
+        with self._lock:
+            return self._snapshot(self.get(key))
+
+    def stats(self):
+        """Counts for the daemon's status and metrics"""
+        with self._lock:
+            return {
+                'sessions': len(self.sessions),
+                'clients': sum(session.clients for session in self.sessions.values()),
+                'deadlines': len(self.scheduler),
+                'transitions': self.transitions
+            }
+
+    def _run(self, session, is_work_session, remaining, snooze_used=0):
+        """Start counting down a work or break session of remaining seconds"""
+        session.state = session.state.replace(
+            is_work_session=is_work_session,
+            remaining=remaining,
+            deadline=self.clock() + remaining,
+            is_paused=False,
+            paused_time=None,
+            snooze_deadline=None,
+            snooze_used=snooze_used
+        )
+        self._arm(session)
+
+    def _arm(self, session):
+        """Schedule the warning and session end, or cancel them while paused"""
+        state, key = session.state, session.key
+        if state.is_paused or state.deadline is None:
+            self.scheduler.cancel((key, DEADLINE_WARNING))
+            self.scheduler.cancel((key, DEADLINE_SESSION_END))
+            return
+        self.scheduler.schedule(
+            (key, DEADLINE_SESSION_END), state.deadline, partial(self._on_deadline, key, DEADLINE_SESSION_END)
+        )
+        if state.is_work_session and 0 < session.notification_time < state.left(self.clock()):
+            self.scheduler.schedule(
+                (key, DEADLINE_WARNING), state.deadline - session.notification_time,
+                partial(self._on_deadline, key, DEADLINE_WARNING)
+            )
+        else:
+            self.scheduler.cancel((key, DEADLINE_WARNING))
+
+    def _pause(self, session, snooze_seconds):
+        now = self.clock()
+        paused = session.state.paused(now, snooze_seconds, session.max_snooze)
+        if paused is None:
+            return 0
+        session.state = paused
+        self._arm(session)
+        self.scheduler.schedule(
+            (session.key, DEADLINE_SNOOZE_END), paused.snooze_deadline,
+            partial(self._on_deadline, session.key, DEADLINE_SNOOZE_END)
+        )
+        return int(round(paused.snooze_deadline - now))
+
+    def _resume(self, session):
+        resumed = session.state.resumed(self.clock())
+        if resumed is None:
+            return False
+        session.state = resumed
+        self.scheduler.cancel((session.key, DEADLINE_SNOOZE_END))
+        self._arm(session)
+        return True
+
+    def _reconfigure(self, session, config):
+        """Apply new lengths to a running session, keeping elapsed time"""
+        now = self.clock()
+        state = session.state
+        old_length = session.length(state.is_work_session)
+        session.configure(config)
+        # A session already longer than its new length ends a second from now
+        remaining = max(session.length(state.is_work_session) - (old_length - state.left(now)), 1)
+        if state.is_paused:
+            session.state = state.replace(remaining=remaining, paused_time=remaining)
+        else:
+            session.state = state.replace(remaining=remaining, deadline=now + remaining)
+        self._arm(session)
+        self._emit(
+            session, "config",
+            work_time=session.work_time,
+            break_time=session.break_time,
+            notification_time=session.notification_time
+        )
+
+    def _on_deadline(self, key, kind):
+        """Scheduler callback for every deadline of every session"""
+        with self._lock:
+            session = self.sessions.get(key)
+            if session is None:
+                return
+            state = session.state
+            if kind == DEADLINE_WARNING:
+                if state.is_work_session and not state.is_paused:
+                    self._emit(session, "warning")
+            elif kind == DEADLINE_SESSION_END:
+                # A pause or config change since the deadline was taken re-arms it
+                if state.is_paused or state.left(self.clock()) > 0:
+                    return
+                if state.is_work_session:
+                    self._run(session, False, session.break_time)
+                    self._emit(session, "break_start")
+                else:
+                    self._run(session, True, session.work_time)
+                    self._emit(session, "break_end")
+                    self._emit(session, "work_start")
+            elif kind == DEADLINE_SNOOZE_END:
+                # A manual resume may have got there first
+                if self._resume(session):
+                    self._emit(session, "resume", auto=True)
+            elif kind == DEADLINE_EXPIRE:
+                if session.clients == 0:
+                    self.remove(key)
+                    logging.info(f"Session {key} expired with no client attached")
+
+    def _snapshot(self, session):
+        state = session.state
+        now = time.time()
+        monotonic_now = self.clock()
+        left = state.left(monotonic_now)
+        snapshot = {
+            'state': state.session,
+            'paused': state.is_paused,
+            'remaining': left,
+            'deadline': now + left,
+            'session_length': session.length(state.is_work_session),
+            'snooze_left': int(state.snooze_left(session.max_snooze)),
+            'snooze_time': session.snooze_time,
+            'notification_time': session.notification_time,
+            'time': now
+        }
+        if state.is_paused:
+            snapshot['snooze_until'] = now + (state.snooze_deadline - monotonic_now)
+        return snapshot
+
+    def _emit(self, session, event, **details):
+        self.transitions += 1
+        if self.on_event is None:
+            return
+        message = self._snapshot(session)
+        message['event'] = event
+        message.update(details)
+        try:
+            self.on_event(session.key, message)
+        except Exception as e:
+            logging.error(f"Session event handler failed for {session.key}: {e}")
@@ -0,0 +1,216 @@
+"""
+Simulated load for the Pomodoro Lock engine
+
+Runs thousands of timer sessions through days of work sessions, breaks and
+snoozes on a virtual clock, as fast as the engine allows. The sessions are
+SessionManager entries driven by one DeadlineScheduler, exactly as in the
+session daemon (or rows of a SessionTable with table=True), with
+staggered start times, a mix of session lengths and simulated users who
+snooze some warnings and breaks and resume some snoozes early. Each user's
+choices depend only on their own session, so both representations must
+produce the same events. The clock jumps from one deadline to the next, so a week of
+simulated time costs only the work done at the transitions.
+
+simulate() returns a report with transitions per second, memory per
+session and the share of time spent in the scheduler itself. Every event
+is also checked against the session cycle, so a benchmark run doubles as a
+consistency check.
+"""
+
+import time
+import zlib
+import random
+import tracemalloc
+from functools import partial
+
+from .scheduler import DeadlineScheduler
+from .sessions import SessionManager
+from .table import SessionTable
+
+DAY = 24 * 60 * 60
+
+# Session lengths the simulated users pick from (minutes)
+PROFILES = (
+    {"work_time_minutes": 25, "break_time_minutes": 5, "notification_time_minutes": 2},
+    {"work_time_minutes": 50, "break_time_minutes": 10, "notification_time_minutes": 5},
+    {"work_time_minutes": 45, "break_time_minutes": 15, "notification_time_minutes": 2},
+    {"work_time_minutes": 90, "break_time_minutes": 20, "notification_time_minutes": 10},
+)
+
+# Events that may follow each event of a session
+NEXT_EVENTS = {
+    None: {"work_start"},
+    "work_start": {"warning", "break_start", "pause", "snooze_denied", "config"},
+    "warning": {"break_start", "pause", "snooze_denied"},
+    "break_start": {"break_end", "pause", "snooze_denied"},
+    "break_end": {"work_start"},
+    "pause": {"resume"},
+    "resume": {"warning", "break_start", "break_end", "pause", "snooze_denied"},
+    "snooze_denied": {"warning", "break_start", "break_end", "pause", "snooze_denied"},
+}
+
+
+class VirtualClock:
+    """Monotonic clock that only moves when told to"""
+
+    def __init__(self, start=0.0):
+        self.now = start
+
+    def __call__(self):
+        return self.now
+
+
+class Simulation:
+    """Sessions, simulated users and the measurements of one run"""
+
+    def __init__(self, instances, days=1, snooze_rate=0.2, early_resume_rate=0.3, seed=1, table=False):
+        self.instances = instances
+        self.days = days
+        self.snooze_rate = snooze_rate
+        self.early_resume_rate = early_resume_rate
+        self.seed = seed
+        self.random = random.Random(seed)
+        self.clock = VirtualClock()
+        self.scheduler = DeadlineScheduler(self.clock)
+        manager = SessionTable if table else SessionManager
+        self.manager = manager(self.scheduler, self._on_event, expire_after=2 * days * DAY)
+        self.counts = {}
+        self.last_event = {}
+        self.event_counts = {}
+        # Per-session event logs, kept when record is set
+        self.record = False
+        self.log = {}
+        self.violations = []
+        self.pending = []
+        self.scheduler_seconds = 0.0
+        self.callback_seconds = 0.0
+
+    def profiles(self):
+        """(key, config, start offset) of every simulated session"""
+        for i in range(self.instances):
+            config = dict(self.random.choice(PROFILES))
+            config["snooze_time_minutes"] = self.random.choice((1, 5, 10))
+            config["max_snooze_minutes"] = self.random.choice((0, 10, 20))
+            start = self.random.uniform(0, config["work_time_minutes"] * 60)
+            yield f"{1000 + i // 4}:s{i}", config, start
+
+    def populate(self):
+        """Attach every session at its staggered start time"""
+        for key, config, start in self.profiles():
+            self.scheduler.schedule((key, 'attach'), start, partial(self.manager.attach, key, config))
+
+    def run(self):
+        """Drive the sessions to the end of the simulated days; returns the wall time taken"""
+        end = self.days * DAY
+        scheduler, clock = self.scheduler, self.clock
+        perf_counter = time.perf_counter
+        started = perf_counter()
+        while True:
+            tick = perf_counter()
+            when = scheduler.next_deadline()
+            if when is None or when > end:
+                self.scheduler_seconds += perf_counter() - tick
+                break
+            clock.now = when
+            due = scheduler.pop_due(when)
+            called = perf_counter()
+            self.scheduler_seconds += called - tick
+            scheduler.fired += len(due)
+            for entry in due:
+                entry.callback()
+            # The simulated users react once the transitions have been delivered
+            while self.pending:
+                action, key = self.pending.pop()
+                if action == 'pause':
+                    self._snooze(key)
+                elif key in self.manager:
+                    self.manager.resume(key)
+            self.callback_seconds += perf_counter() - called
+        return perf_counter() - started
+
+    def _on_event(self, key, message):
+        event = message['event']
+        self.counts[event] = self.counts.get(event, 0) + 1
+        previous = self.last_event.get(key)
+        if event not in NEXT_EVENTS.get(previous, ()) and len(self.violations) < 10:
+            self.violations.append((key, previous, event))
+        self.last_event[key] = event
+        if self.record:
+            self.log.setdefault(key, []).append((self.clock.now, event, message['remaining']))
+        count = self.event_counts[key] = self.event_counts.get(key, 0) + 1
+        if event in ("warning", "break_start") and self._chance(key, count, 'pause') < self.snooze_rate:
+            self.pending.append(('pause', key))
+
+    def _chance(self, key, count, salt):
+        """A number in [0, 1) that depends only on the session, its event count and salt"""
+        return zlib.crc32(f"{self.seed}:{key}:{count}:{salt}".encode()) / 2**32
+
+    def _snooze(self, key):
+        granted = self.manager.pause(key)
+        count = self.event_counts.get(key, 0)
+        if granted and self._chance(key, count, 'resume') < self.early_resume_rate:
+            delay = 1 + (granted - 1) * self._chance(key, count, 'delay')
+            self.scheduler.schedule_in((key, 'user-resume'), delay, partial(self.pending.append, ('resume', key)))
+
+
+def measure_memory(instances, seed=1, table=False):
+    """Bytes allocated per attached session (key, table entry, state and deadlines)"""
+    simulation = Simulation(instances, seed=seed, table=table)
+    simulation.manager.on_event = None
+    sessions = [(key.encode(), config) for key, config, _ in simulation.profiles()]
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for key, config in sessions:
+            simulation.manager.attach(key.decode(), config)
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return max(0, after - before) / instances
+
+
+def simulate(instances, days=1, snooze_rate=0.2, early_resume_rate=0.3, seed=1, memory=True, table=False):
+    """Run a simulation and return its report as a dict"""
+    simulation = Simulation(instances, days, snooze_rate, early_resume_rate, seed, table)
+    simulation.populate()
+    wall = simulation.run()
+    # For the table the due queries are part of the scheduling cost
+    scheduler_seconds = simulation.scheduler_seconds + getattr(simulation.manager, 'query_seconds', 0.0)
+    transitions = simulation.manager.transitions
+    fired = simulation.scheduler.fired
+    report = {
+        'instances': instances,
+        'days': days,
+        'representation': 'table' if table else 'objects',
+        'transitions': transitions,
+        'deadlines': fired,
+        'events': dict(sorted(simulation.counts.items())),
+        'wall_seconds': wall,
+        'transitions_per_second': transitions / wall if wall > 0 else 0.0,
+        'simulated_seconds_per_second': days * DAY / wall if wall > 0 else 0.0,
+        'scheduler_seconds': scheduler_seconds,
+        'scheduler_fraction': scheduler_seconds / wall if wall > 0 else 0.0,
+        'scheduler_ns_per_deadline': scheduler_seconds / fired * 1e9 if fired else 0.0,
+        'violations': simulation.violations,
+    }
+    if memory:
+        report['bytes_per_instance'] = measure_memory(instances, seed, table)
+    return report
+
+
+def format_report(report):
+    """Human-readable summary of a simulate() report"""
+    lines = [
+        f"{report['instances']} sessions ({report['representation']}), {report['days']:g} simulated day(s): "
+        f"{report['transitions']} transitions from {report['deadlines']} deadlines in {report['wall_seconds']:.2f} s",
+        f"  {report['transitions_per_second']:,.0f} transitions/s "
+        f"({report['simulated_seconds_per_second']:,.0f}x real time)",
+        f"  scheduler: {report['scheduler_ns_per_deadline']:,.0f} ns per deadline, "
+        f"{report['scheduler_fraction'] * 100:.1f}% of the run",
+    ]
+    if 'bytes_per_instance' in report:
+        lines.append(f"  memory: {report['bytes_per_instance']:,.0f} bytes per session")
+    lines.append("  events: " + ", ".join(f"{name} {count}" for name, count in report['events'].items()))
+    if report['violations']:
+        lines.append(f"  out-of-order events: {report['violations']}")
+    return "\n".join(lines)
@@ -0,0 +1,152 @@
+"""
+Timer state for Pomodoro Lock
+
+The countdown runs on the timer thread, the GUI reads it on the GTK (or
+Tkinter) thread and button clicks, config reloads and control requests
+change it from wherever they arrive. The state therefore lives in one
+immutable TimerState record. Writers build a new record and publish it by
+replacing a single reference; readers take that reference once and get a
+consistent view (a break is never rendered with the work countdown).
+Writers are serialized by a lock so that read-modify-write updates such as
+a deadline firing while a pause click arrives do not lose each other;
+readers never lock.
+
+A running session is described by its deadline on the monotonic clock, so
+nothing has to count down: remaining is only meaningful while paused (it is
+the time that was left when the pause started) and left() works out the
+seconds to go at any moment. A snooze is charged to snooze_used in full
+when it starts and the unused part is refunded on an early resume, so the
+per-session snooze limit is checked without any timer.
+"""
+
+import math
+import time
+import threading
+
+
+class TimerState:
+    """Immutable snapshot of the timer: session, countdown and pause state"""
+
+    __slots__ = ('remaining', 'deadline', 'is_work_session', 'is_paused', 'paused_time',
+                 'snooze_deadline', 'snooze_used', 'version')
+
+    def __init__(self, remaining, deadline=None, is_work_session=True, is_paused=False,
+                 paused_time=None, snooze_deadline=None, snooze_used=0, version=0):
+        set_field = object.__setattr__
+        set_field(self, 'remaining', remaining)
+        set_field(self, 'deadline', deadline)
+        set_field(self, 'is_work_session', is_work_session)
+        set_field(self, 'is_paused', is_paused)
+        set_field(self, 'paused_time', paused_time)
+        set_field(self, 'snooze_deadline', snooze_deadline)
+        set_field(self, 'snooze_used', snooze_used)
+        set_field(self, 'version', version)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"TimerState is immutable (tried to set {name})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"TimerState is immutable (tried to delete {name})")
+
+    def __eq__(self, other):
+        if not isinstance(other, TimerState):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"TimerState({fields})"
+
+    @property
+    def session(self):
+        """'work' or 'break'"""
+        return 'work' if self.is_work_session else 'break'
+
+    def left(self, now=None):
+        """Whole seconds left in the session (frozen while paused)"""
+        if self.deadline is None:
+            return self.remaining
+        if now is None:
+            now = time.monotonic()
+        return max(0, math.ceil(self.deadline - now - 1e-6))
+
+    def snooze_left(self, limit):
+        """Seconds of snooze this session may still use under limit"""
+        return max(0, limit - self.snooze_used)
+
+    def paused(self, now, snooze_seconds, limit=None):
+        """
+        The state after pausing at now with an auto-resume snooze_seconds later.
+
+        With a limit the snooze is cut to what the session has left and
+        charged to snooze_used up front. Returns None if already paused or
+        no snooze is left.
+        """
+        if self.is_paused:
+            return None
+        granted = snooze_seconds if limit is None else min(snooze_seconds, self.snooze_left(limit))
+        if granted <= 0:
+            return None
+        left = self.left(now)
+        return self.replace(
+            is_paused=True,
+            remaining=left,
+            paused_time=left,
+            deadline=None,
+            snooze_deadline=now + granted,
+            snooze_used=self.snooze_used + (granted if limit is not None else 0)
+        )
+
+    def resumed(self, now):
+        """The state after resuming at now, refunding unused snooze; None if not paused"""
+        if not self.is_paused:
+            return None
+        return self.replace(
+            is_paused=False,
+            deadline=now + self.remaining,
+            snooze_deadline=None,
+            snooze_used=max(0, self.snooze_used - max(0, self.snooze_deadline - now))
+        )
+
+    def as_tuple(self):
+        """Field values in __slots__ order"""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def replace(self, **changes):
+        """A copy with some fields changed and the version bumped"""
+        values = {name: getattr(self, name) for name in self.__slots__}
+        values.update(changes)
+        values['version'] = self.version + 1
+        return TimerState(**values)
+
+
+class StateCell:
+    """Holds the current TimerState; readers get() it, writers publish a replacement"""
+
+    def __init__(self, state):
+        self._state = state
+        self._lock = threading.Lock()
+
+    def get(self):
+        """The current snapshot (a single reference read, never blocks)"""
+        return self._state
+
+    def update(self, **changes):
+        """Publish a copy of the current state with changes applied; returns it"""
+        return self.transform(lambda state: state.replace(**changes))
+
+    def transform(self, func):
+        """
+        Publish func(current state) atomically with respect to other writers.
+
+        func may return None to leave the state alone. Returns the published
+        state, or None if nothing was published.
+        """
+        with self._lock:
+            new = func(self._state)
+            if new is not None:
+                self._state = new
+            return new
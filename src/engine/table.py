@@ -0,0 +1,475 @@
+"""
+Compact session table for Pomodoro Lock
+
+SessionManager keeps a Session object, a TimerState and up to three heap
+entries per session, nearly 2 KB each. SessionTable holds the same state
+as a struct of arrays: one `array` column per field, indexed by a slot
+number, with the session lengths stored once per distinct configuration.
+A session costs under 200 bytes including its key. The columns are:
+
+    deadline      float64  end of the running session (inf while paused)
+    warning       float64  break warning (inf when none is due)
+    snooze        float64  end of the snooze (inf unless paused)
+    snooze_used   float64  snooze charged to this session
+    remaining     int32    seconds left, frozen while paused
+    flags         uint8    FLAG_ACTIVE, FLAG_WORK, FLAG_PAUSED
+    profile       uint16   index into the shared configurations
+    clients       uint16   attached clients
+
+Instead of a heap entry per deadline, the table keeps one wakeup in the
+shared DeadlineScheduler at its earliest deadline. When it fires, one
+vectorized query over the three time columns finds every session that is
+due and only those are advanced. With NumPy the query runs over views of
+the arrays without copying; without it the same query is a plain loop.
+
+SessionTable has the interface of SessionManager (attach, detach, remove,
+pause, resume, snapshot, stats) and emits the same events, so the session
+daemon can use either.
+"""
+
+import math
+import time
+import logging
+import threading
+from array import array
+from functools import partial
+
+from settings.loader import validate_config
+from .sessions import SessionError, DEADLINE_EXPIRE, DEFAULT_EXPIRE_AFTER
+
+NUMPY_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+
+INF = float('inf')
+
+FLAG_ACTIVE = 0x01
+FLAG_WORK = 0x02
+FLAG_PAUSED = 0x04
+
+# Name of the table's wakeup in the shared scheduler
+DEADLINE_TABLE = 'session-table'
+
+# Column name and array typecode
+COLUMNS = (
+    ('deadline', 'd'),
+    ('warning', 'd'),
+    ('snooze', 'd'),
+    ('snooze_used', 'd'),
+    ('remaining', 'i'),
+    ('flags', 'B'),
+    ('profile', 'H'),
+    ('clients', 'H'),
+)
+
+
+class Profile:
+    """Session lengths in seconds, shared by every session with the same config"""
+
+    # The config keys a profile depends on; other keys never make a new profile
+    KEYS = ('work_time_minutes', 'break_time_minutes', 'notification_time_minutes',
+            'snooze_time_minutes', 'max_snooze_minutes')
+
+    __slots__ = ('signature', 'sessions', 'work_time', 'break_time', 'notification_time',
+                 'snooze_time', 'max_snooze')
+
+    def __init__(self, config):
+        self.signature = self.key(config)
+        # Sessions using the profile; it is freed with the last one
+        self.sessions = 0
+        self.work_time = config["work_time_minutes"] * 60
+        self.break_time = config["break_time_minutes"] * 60
+        self.notification_time = config["notification_time_minutes"] * 60
+        self.snooze_time = config["snooze_time_minutes"] * 60
+        self.max_snooze = config["max_snooze_minutes"] * 60
+
+    @classmethod
+    def key(cls, config):
+        """Profile signature of a validated config"""
+        return tuple(config[key] for key in cls.KEYS)
+
+    def length(self, is_work_session):
+        return self.work_time if is_work_session else self.break_time
+
+
+class SessionTable:
+    """Timer state of many sessions as columns of arrays, woken by one shared deadline"""
+
+    def __init__(self, scheduler, on_event=None, expire_after=DEFAULT_EXPIRE_AFTER, use_numpy=NUMPY_AVAILABLE):
+        self.scheduler = scheduler
+        self.clock = scheduler.clock
+        self.on_event = on_event
+        self.expire_after = expire_after
+        self.use_numpy = use_numpy and NUMPY_AVAILABLE
+        self.transitions = 0
+        # Due queries run and the time spent in them
+        self.queries = 0
+        self.query_seconds = 0.0
+        for name, typecode in COLUMNS:
+            setattr(self, name, array(typecode))
+        self._slots = {}
+        self._keys = []
+        self._free = []
+        self._profiles = []
+        self._profile_index = {}
+        self._free_profiles = []
+        self._armed = INF
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __contains__(self, key):
+        return key in self._slots
+
+    def keys(self):
+        """Keys of the sessions in the table"""
+        return list(self._slots)
+
+    def column_bytes(self):
+        """Bytes held by the columns, per allocated slot"""
+        return sum(array(typecode).itemsize for _, typecode in COLUMNS)
+
+    def attach(self, key, config=None):
+        """
+        Register a client of key and return its slot.
+
+        A new key starts a work session. An existing one keeps running and
+        takes the client's config if it differs.
+        """
+        config = validate_config(config or {})
+        with self._lock:
+            profile = self._profile(config)
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = self._allocate(key, profile)
+                self._run(slot, True, self._profiles[profile].work_time)
+                self._emit(slot, "work_start")
+            elif profile != self.profile[slot]:
+                self._reconfigure(slot, profile)
+            self.clients[slot] += 1
+            self.scheduler.cancel((key, DEADLINE_EXPIRE))
+            return slot
+
+    def detach(self, key):
+        """A client of key went away; the last one leaves the session to expire"""
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                return
+            if self.clients[slot] > 0:
+                self.clients[slot] -= 1
+            if self.clients[slot] == 0:
+                self.scheduler.schedule_in((key, DEADLINE_EXPIRE), self.expire_after, partial(self._expire, key))
+
+    def remove(self, key):
+        """Forget a session; False if there was none"""
+        with self._lock:
+            slot = self._slots.pop(key, None)
+            if slot is None:
+                return False
+            self.scheduler.cancel((key, DEADLINE_EXPIRE))
+            self._release_profile(self.profile[slot])
+            self._keys[slot] = None
+            self.flags[slot] = 0
+            self.deadline[slot] = self.warning[slot] = self.snooze[slot] = INF
+            self.clients[slot] = 0
+            self._free.append(slot)
+            return True
+
+    def pause(self, key, snooze_seconds=None):
+        """Pause within the session's snooze limit; returns the seconds granted (0 if refused)"""
+        with self._lock:
+            slot = self._get(key)
+            profile = self._profiles[self.profile[slot]]
+            requested = profile.snooze_time if snooze_seconds is None else snooze_seconds
+            if self.flags[slot] & FLAG_PAUSED:
+                return 0
+            granted = self._pause(slot, requested, self.clock())
+            if granted:
+                self._emit(slot, "pause", snooze_seconds=granted, limited=granted < requested)
+            else:
+                self._emit(slot, "snooze_denied")
+            return granted
+
+    def resume(self, key):
+        """Resume a paused session; False if it was not paused"""
+        with self._lock:
+            slot = self._get(key)
+            if not self._resume(slot, self.clock()):
+                return False
+            self._emit(slot, "resume")
+            return True
+
+    def snapshot(self, key):
+        """Describe a session the way PomodoroTimer._state_snapshot does"""
+        with self._lock:
+            return self._snapshot(self._get(key))
+
+    def stats(self):
+        """Counts for the daemon's status and metrics"""
+        with self._lock:
+            return {
+                'sessions': len(self._slots),
+                'clients': sum(self.clients),
+                'deadlines': len(self.scheduler),
+                'transitions': self.transitions,
+                'slots': len(self.flags),
+                'profiles': len(self._profile_index)
+            }
+
+    def next_deadline(self):
+        """Earliest deadline of any session (inf if none)"""
+        if not self.flags:
+            return INF
+        if self.use_numpy:
+            return float(self._earliest().min())
+        return min(min(self.deadline), min(self.warning), min(self.snooze))
+
+    def due(self, now):
+        """Slots with a deadline at or before now, earliest first"""
+        return self._due(now)[0]
+
+    def run_due(self, now=None):
+        """Advance every session that is due; returns how many were"""
+        with self._lock:
+            if now is None:
+                now = self.clock()
+            slots, earliest = self._due(now)
+            for slot in slots:
+                self._advance(slot, now)
+            if earliest is not None and slots:
+                # Only the advanced rows changed; no second pass over the columns
+                started = time.perf_counter()
+                for slot in slots:
+                    earliest[slot] = min(self.deadline[slot], self.warning[slot], self.snooze[slot])
+                next_deadline = float(earliest.min())
+                self.query_seconds += time.perf_counter() - started
+            else:
+                next_deadline = self.next_deadline()
+            self._armed = INF
+            self._arm(next_deadline)
+            return len(slots)
+
+    def _earliest(self):
+        """Per-slot earliest deadline, computed over views of the columns"""
+        return np.minimum(
+            np.minimum(np.frombuffer(self.deadline), np.frombuffer(self.warning)),
+            np.frombuffer(self.snooze)
+        )
+
+    def _due(self, now):
+        """(due slots earliest first, per-slot earliest array or None)"""
+        started = time.perf_counter()
+        self.queries += 1
+        if not self.flags:
+            return [], None
+        if self.use_numpy:
+            earliest = self._earliest()
+            slots = np.flatnonzero(earliest <= now)
+            if len(slots) > 1:
+                slots = slots[np.argsort(earliest[slots], kind='stable')]
+            self.query_seconds += time.perf_counter() - started
+            return slots.tolist(), earliest
+        due = []
+        for slot, times in enumerate(zip(self.deadline, self.warning, self.snooze)):
+            earliest = min(times)
+            if earliest <= now:
+                due.append((earliest, slot))
+        due.sort()
+        self.query_seconds += time.perf_counter() - started
+        return [slot for _, slot in due], None
+
+    def _get(self, key):
+        slot = self._slots.get(key)
+        if slot is None:
+            raise SessionError(f"no such session: {key}")
+        return slot
+
+    def _profile(self, config):
+        """Index of the shared Profile for a validated config (called with the lock held)"""
+        signature = Profile.key(config)
+        index = self._profile_index.get(signature)
+        if index is None:
+            if self._free_profiles:
+                index = self._free_profiles.pop()
+                self._profiles[index] = Profile(config)
+            else:
+                if len(self._profiles) > 0xFFFF:
+                    raise SessionError("too many distinct session configurations")
+                index = len(self._profiles)
+                self._profiles.append(Profile(config))
+            self._profile_index[signature] = index
+        return index
+
+    def _release_profile(self, index):
+        """A session stopped using a profile; free it with its last session"""
+        profile = self._profiles[index]
+        profile.sessions -= 1
+        if profile.sessions <= 0:
+            del self._profile_index[profile.signature]
+            self._profiles[index] = None
+            self._free_profiles.append(index)
+
+    def _allocate(self, key, profile):
+        """Take a free slot (or grow the columns) for a new session"""
+        if self._free:
+            slot = self._free.pop()
+            self._keys[slot] = key
+        else:
+            slot = len(self.flags)
+            for name, typecode in COLUMNS:
+                getattr(self, name).append(INF if typecode == 'd' else 0)
+            self._keys.append(key)
+        self._slots[key] = slot
+        self.flags[slot] = FLAG_ACTIVE
+        self.profile[slot] = profile
+        self._profiles[profile].sessions += 1
+        self.snooze_used[slot] = 0.0
+        self.clients[slot] = 0
+        return slot
+
+    def _arm(self, when):
+        """Make sure the shared scheduler wakes the table by when"""
+        if when < self._armed:
+            self._armed = when
+            self.scheduler.schedule(DEADLINE_TABLE, when, self.run_due)
+
+    def _arm_session(self, slot, now):
+        """Set the warning for a running session and wake the table in time"""
+        profile = self._profiles[self.profile[slot]]
+        deadline = self.deadline[slot]
+        notification_time = profile.notification_time
+        if self.flags[slot] & FLAG_WORK and 0 < notification_time < self._left(slot, now):
+            self.warning[slot] = deadline - notification_time
+        else:
+            self.warning[slot] = INF
+        self._arm(min(deadline, self.warning[slot]))
+
+    def _run(self, slot, is_work_session, remaining, snooze_used=0):
+        """Start counting down a work or break session of remaining seconds"""
+        now = self.clock()
+        self.flags[slot] = FLAG_ACTIVE | (FLAG_WORK if is_work_session else 0)
+        self.remaining[slot] = remaining
+        self.deadline[slot] = now + remaining
+        self.snooze[slot] = INF
+        self.snooze_used[slot] = snooze_used
+        self._arm_session(slot, now)
+
+    def _left(self, slot, now):
+        """Whole seconds left in the session (frozen while paused)"""
+        if self.flags[slot] & FLAG_PAUSED:
+            return self.remaining[slot]
+        return max(0, math.ceil(self.deadline[slot] - now - 1e-6))
+
+    def _pause(self, slot, snooze_seconds, now):
+        limit = self._profiles[self.profile[slot]].max_snooze
+        granted = min(snooze_seconds, max(0, limit - self.snooze_used[slot]))
+        if granted <= 0:
+            return 0
+        self.remaining[slot] = self._left(slot, now)
+        self.flags[slot] |= FLAG_PAUSED
+        self.deadline[slot] = self.warning[slot] = INF
+        self.snooze[slot] = now + granted
+        self.snooze_used[slot] += granted
+        self._arm(self.snooze[slot])
+        return int(round(self.snooze[slot] - now))
+
+    def _resume(self, slot, now):
+        if not self.flags[slot] & FLAG_PAUSED:
+            return False
+        # The unused part of the snooze is given back
+        self.snooze_used[slot] = max(0, self.snooze_used[slot] - max(0, self.snooze[slot] - now))
+        self.flags[slot] &= ~FLAG_PAUSED
+        self.deadline[slot] = now + self.remaining[slot]
+        self.snooze[slot] = INF
+        self._arm_session(slot, now)
+        return True
+
+    def _reconfigure(self, slot, profile):
+        """Apply new lengths to a running session, keeping elapsed time"""
+        now = self.clock()
+        is_work_session = bool(self.flags[slot] & FLAG_WORK)
+        old_length = self._profiles[self.profile[slot]].length(is_work_session)
+        self._profiles[profile].sessions += 1
+        self._release_profile(self.profile[slot])
+        self.profile[slot] = profile
+        new = self._profiles[profile]
+        # A session already longer than its new length ends a second from now
+        remaining = max(new.length(is_work_session) - (old_length - self._left(slot, now)), 1)
+        self.remaining[slot] = remaining
+        if not self.flags[slot] & FLAG_PAUSED:
+            self.deadline[slot] = now + remaining
+            self._arm_session(slot, now)
+        self._emit(
+            slot, "config",
+            work_time=new.work_time,
+            break_time=new.break_time,
+            notification_time=new.notification_time
+        )
+
+    def _advance(self, slot, now):
+        """Run the transitions of one session that are due at now, in order"""
+        while self.flags[slot] & FLAG_ACTIVE:
+            deadline, warning, snooze = self.deadline[slot], self.warning[slot], self.snooze[slot]
+            if snooze <= now and snooze <= deadline:
+                self._resume(slot, now)
+                self._emit(slot, "resume", auto=True)
+            elif warning <= now and warning < deadline:
+                self.warning[slot] = INF
+                self._emit(slot, "warning")
+            elif deadline <= now:
+                if self.flags[slot] & FLAG_WORK:
+                    self._run(slot, False, self._profiles[self.profile[slot]].break_time)
+                    self._emit(slot, "break_start")
+                else:
+                    self._run(slot, True, self._profiles[self.profile[slot]].work_time)
+                    self._emit(slot, "break_end")
+                    self._emit(slot, "work_start")
+            else:
+                return
+
+    def _expire(self, key):
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is not None and self.clients[slot] == 0:
+                self.remove(key)
+                logging.info(f"Session {key} expired with no client attached")
+
+    def _snapshot(self, slot):
+        profile = self._profiles[self.profile[slot]]
+        is_work_session = bool(self.flags[slot] & FLAG_WORK)
+        is_paused = bool(self.flags[slot] & FLAG_PAUSED)
+        now = time.time()
+        monotonic_now = self.clock()
+        left = self._left(slot, monotonic_now)
+        snapshot = {
+            'state': 'work' if is_work_session else 'break',
+            'paused': is_paused,
+            'remaining': left,
+            'deadline': now + left,
+            'session_length': profile.length(is_work_session),
+            'snooze_left': int(max(0, profile.max_snooze - self.snooze_used[slot])),
+            'snooze_time': profile.snooze_time,
+            'notification_time': profile.notification_time,
+            'time': now
+        }
+        if is_paused:
+            snapshot['snooze_until'] = now + (self.snooze[slot] - monotonic_now)
+        return snapshot
+
+    def _emit(self, slot, event, **details):
+        self.transitions += 1
+        if self.on_event is None:
+            return
+        message = self._snapshot(slot)
+        message['event'] = event
+        message.update(details)
+        try:
+            self.on_event(self._keys[slot], message)
+        except Exception as e:
+            logging.error(f"Session event handler failed for {self._keys[slot]}: {e}")
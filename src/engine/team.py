@@ -0,0 +1,121 @@
+"""
+Team schedules for Pomodoro Lock
+
+In team sync mode every timer of a team follows one schedule: work and
+break lengths plus an epoch, the wall-clock time at which some work session
+of the team started. The team's cycle repeats every work_time + break_time
+seconds from the epoch, so any timer that knows the schedule can work out
+locally what the team is doing and for how much longer; the coordinator
+only has to send the schedule when it changes, and a timer that loses the
+coordinator keeps following the last schedule it received.
+"""
+
+import math
+import time
+
+from settings.loader import CONFIG_LIMITS
+
+DEFAULT_TEAM = "default"
+MAX_TEAM_NAME = 64
+# A work session shorter than this is not started; the timer stays on break with the team
+MIN_WORK = 60
+
+
+class ScheduleError(ValueError):
+    """Raised for a team schedule that cannot be used"""
+
+
+class TeamSchedule:
+    """Immutable work/break cycle of a team; lengths in seconds, epoch in wall-clock seconds"""
+
+    __slots__ = ('team', 'epoch', 'work_time', 'break_time', 'version')
+
+    def __init__(self, team, epoch, work_time, break_time, version=0):
+        set_field = object.__setattr__
+        set_field(self, 'team', team)
+        set_field(self, 'epoch', epoch)
+        set_field(self, 'work_time', work_time)
+        set_field(self, 'break_time', break_time)
+        set_field(self, 'version', version)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"TeamSchedule is immutable (tried to set {name})")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"TeamSchedule is immutable (tried to delete {name})")
+
+    def __eq__(self, other):
+        if not isinstance(other, TeamSchedule):
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    def __hash__(self):
+        return hash(self.as_tuple())
+
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"TeamSchedule({fields})"
+
+    def as_tuple(self):
+        """Field values in __slots__ order"""
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    @property
+    def cycle(self):
+        """Length of one work session and break"""
+        return self.work_time + self.break_time
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a schedule from its wire form; raises ScheduleError"""
+        if not isinstance(data, dict):
+            raise ScheduleError("schedule must be a JSON object")
+        team = data.get('team', DEFAULT_TEAM)
+        if not isinstance(team, str) or not team or len(team) > MAX_TEAM_NAME:
+            raise ScheduleError(f"team must be a name of 1 to {MAX_TEAM_NAME} characters")
+        epoch = data.get('epoch')
+        if isinstance(epoch, bool) or not isinstance(epoch, (int, float)) or not math.isfinite(epoch):
+            raise ScheduleError(f"epoch must be a time in seconds, got {epoch!r}")
+        lengths = []
+        for key in ("work_time_minutes", "break_time_minutes"):
+            value = data.get(key)
+            low, high = CONFIG_LIMITS[key]
+            if isinstance(value, bool) or not isinstance(value, int) or not low <= value <= high:
+                raise ScheduleError(f"{key} must be a whole number between {low} and {high}, got {value!r}")
+            lengths.append(value * 60)
+        version = data.get('version', 0)
+        if isinstance(version, bool) or not isinstance(version, int):
+            raise ScheduleError(f"version must be a whole number, got {version!r}")
+        return cls(team, epoch, lengths[0], lengths[1], version)
+
+    def as_dict(self):
+        """Wire form, as sent by the coordinator"""
+        return {
+            'team': self.team,
+            'epoch': self.epoch,
+            'work_time_minutes': self.work_time // 60,
+            'break_time_minutes': self.break_time // 60,
+            'version': self.version
+        }
+
+    def replace(self, **changes):
+        """A copy with some fields changed"""
+        fields = {name: getattr(self, name) for name in self.__slots__}
+        fields.update(changes)
+        return TeamSchedule(**fields)
+
+    def phase(self, now=None):
+        """
+        (is_work_session, seconds left) of the team at wall-clock time now.
+
+        The last MIN_WORK seconds of a work session count as part of the
+        following break, so a timer that joins late is not sent back to work
+        for a few seconds.
+        """
+        if now is None:
+            now = time.time()
+        offset = (now - self.epoch) % self.cycle
+        left = self.work_time - offset
+        if left >= min(MIN_WORK, self.work_time):
+            return True, left
+        return False, self.cycle - offset
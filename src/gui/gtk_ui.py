@@ -18,6 +18,10 @@ class TimerWindow(Gtk.Window):
         self.on_power = on_power
         self.on_pause_snooze = on_pause_snooze
         
+        # Pause/snooze tooltips, set by the timer on each transition
+        self.pause_tooltip = "Pause timer"
+        self.resume_tooltip = "Resume timer"
+        
         self.set_title("Pomodoro Lock")
         self.set_decorated(False)
         self.set_keep_above(True)
@@ -172,7 +176,7 @@ class TimerWindow(Gtk.Window):
         self.pause_snooze_button.set_margin_top(5)
         
         # Add tooltip for pause/snooze button
-        self.pause_snooze_button.set_tooltip_text("Pause and auto-resume in 10 minutes")
+        self.pause_snooze_button.set_tooltip_text(self.pause_tooltip)
         
         pause_style = self.pause_snooze_button.get_style_context()
         pause_style.add_provider(css_provider, Gtk.STYLE_PROVIDER_PRIORITY_APPLICATION)
@@ -280,17 +284,22 @@ class TimerWindow(Gtk.Window):
                 # Last resort - set a safe default
                 self.label.set_text("00:00")
     
+    def set_pause_tooltips(self, pause_tooltip, resume_tooltip):
+        """Set the pause/snooze button tooltips (plain attributes, safe from any thread)"""
+        self.pause_tooltip = pause_tooltip
+        self.resume_tooltip = resume_tooltip
+    
     def _update_pause_button(self, is_paused):
         """Update the pause/snooze button appearance based on timer state"""
         try:
             if is_paused:
                 # Show play icon when paused
                 self.pause_snooze_button.set_label("▶")
-                self.pause_snooze_button.set_tooltip_text("Resume timer")
+                self.pause_snooze_button.set_tooltip_text(self.resume_tooltip)
             else:
                 # Show pause icon when running
                 self.pause_snooze_button.set_label("⏸")
-                self.pause_snooze_button.set_tooltip_text("Pause and auto-resume in 10 minutes")
+                self.pause_snooze_button.set_tooltip_text(self.pause_tooltip)
         except Exception as e:
             # Fallback if button update fails
             pass
@@ -333,19 +342,19 @@ class TimerWindow(Gtk.Window):
             self.destroy()
             
         except RecursionError as e:
-            print(f"Recursion error in destroy_window: {e}")
+            logging.error(f"Recursion error in destroy_window: {e}")
             # Fallback to basic destroy
             try:
                 self.destroy()
             except Exception as fallback_error:
-                print(f"Fallback destroy also failed: {fallback_error}")
+                logging.error(f"Fallback destroy also failed: {fallback_error}")
         except Exception as e:
-            print(f"Error in destroy_window: {e}")
+            logging.error(f"Error in destroy_window: {e}")
             # Try to force destroy
             try:
                 self.destroy()
             except Exception as force_error:
-                print(f"Force destroy also failed: {force_error}")
+                logging.error(f"Force destroy also failed: {force_error}")
     
     def lower_window(self):
         """Lower the window to ensure overlay is on top"""
@@ -353,11 +362,11 @@ class TimerWindow(Gtk.Window):
             # Use the correct GTK method
             self.get_window().lower()
         except RecursionError as e:
-            print(f"Recursion error in lower_window: {e}")
+            logging.error(f"Recursion error in lower_window: {e}")
             # Fallback - just hide the window
             self.hide()
         except Exception as e:
-            print(f"Error in lower_window: {e}")
+            logging.error(f"Error in lower_window: {e}")
     
     def raise_window(self):
         """Raise the window back to normal level"""
@@ -365,11 +374,11 @@ class TimerWindow(Gtk.Window):
             # Use the correct GTK method
             self.get_window().raise_()
         except RecursionError as e:
-            print(f"Recursion error in raise_window: {e}")
+            logging.error(f"Recursion error in raise_window: {e}")
             # Fallback - just show the window
             self.show_all()
         except Exception as e:
-            print(f"Error in raise_window: {e}")
+            logging.error(f"Error in raise_window: {e}")
     
     def lower(self):
         """Lower the window (alias for lower_window)"""
@@ -496,14 +505,14 @@ class FullScreenOverlay(Gtk.Window):
             try:
                 self.get_window().raise_()
             except Exception as e:
-                print(f"Error raising overlay window: {e}")
+                logging.error(f"Error raising overlay window: {e}")
             
             # Force the window to stay on top
             self.set_keep_above(True)
             
         except RecursionError as e:
             # Handle recursion error specifically
-            print(f"Recursion error in show_overlay: {e}")
+            logging.error(f"Recursion error in show_overlay: {e}")
             # Fallback to basic show without raise
             self.show_all()
             self.present()
@@ -520,9 +529,9 @@ class FullScreenOverlay(Gtk.Window):
                 try:
                     self.get_window().raise_()
                 except Exception as e:
-                    print(f"Error raising overlay window: {e}")
+                    logging.error(f"Error raising overlay window: {e}")
             except Exception as fallback_error:
-                print(f"Fallback show_overlay also failed: {fallback_error}")
+                logging.error(f"Fallback show_overlay also failed: {fallback_error}")
                 # Last resort - just show the window
                 self.show_all()
     
@@ -552,19 +561,19 @@ class FullScreenOverlay(Gtk.Window):
             self.destroy()
             
         except RecursionError as e:
-            print(f"Recursion error in destroy_overlay: {e}")
+            logging.error(f"Recursion error in destroy_overlay: {e}")
             # Fallback to basic destroy
             try:
                 self.destroy()
             except Exception as fallback_error:
-                print(f"Fallback destroy also failed: {fallback_error}")
+                logging.error(f"Fallback destroy also failed: {fallback_error}")
         except Exception as e:
-            print(f"Error in destroy_overlay: {e}")
+            logging.error(f"Error in destroy_overlay: {e}")
             # Try to force destroy
             try:
                 self.destroy()
             except Exception as force_error:
-                print(f"Force destroy also failed: {force_error}")
+                logging.error(f"Force destroy also failed: {force_error}")
     
     def raise_(self):
         """Raise the overlay (alias for raise_window)"""
@@ -572,7 +581,7 @@ class FullScreenOverlay(Gtk.Window):
             # Use the correct GTK method name
             self.get_window().raise_()
         except Exception as e:
-            print(f"Error in FullScreenOverlay.raise_(): {e}")
+            logging.error(f"Error in FullScreenOverlay.raise_(): {e}")
             # Fallback to just showing the window
             self.show_all()
 
@@ -587,7 +596,7 @@ class MultiDisplayOverlay:
         """Create overlays for all connected displays"""
         try:
             if not self.display:
-                print("No display available")
+                logging.warning("No display available")
                 return
             
             # Clear existing overlays
@@ -595,49 +604,49 @@ class MultiDisplayOverlay:
             
             # Get number of monitors
             n_monitors = self.display.get_n_monitors()
-            print(f"Creating overlays for {n_monitors} monitors")
+            logging.info(f"Creating overlays for {n_monitors} monitors")
             
             # Create overlay for each monitor
             for i in range(n_monitors):
                 try:
-                    print(f"Creating overlay for monitor {i}")
+                    logging.debug(f"Creating overlay for monitor {i}")
                     overlay = FullScreenOverlay(monitor_index=i)
                     self.overlays.append(overlay)
                 except Exception as e:
                     # Log error but continue with other monitors
-                    print(f"Failed to create overlay for monitor {i}: {e}")
+                    logging.error(f"Failed to create overlay for monitor {i}: {e}")
             
-            print(f"Successfully created {len(self.overlays)} overlays")
+            logging.info(f"Successfully created {len(self.overlays)} overlays")
         except Exception as e:
-            print(f"Error creating overlays: {e}")
+            logging.error(f"Error creating overlays: {e}")
     
     def show_all(self):
         """Show all overlays"""
-        print(f"Showing {len(self.overlays)} overlays")
+        logging.info(f"Showing {len(self.overlays)} overlays")
         for i, overlay in enumerate(self.overlays):
             try:
-                print(f"Showing overlay {i}")
+                logging.debug(f"Showing overlay {i}")
                 overlay.show_overlay()
             except RecursionError as e:
-                print(f"Recursion error showing overlay {i}: {e}")
+                logging.error(f"Recursion error showing overlay {i}: {e}")
                 # Skip this overlay to prevent infinite recursion
                 continue
             except Exception as e:
-                print(f"Failed to show overlay {i}: {e}")
+                logging.error(f"Failed to show overlay {i}: {e}")
     
     def hide_all(self):
         """Hide all overlays"""
-        print(f"Hiding {len(self.overlays)} overlays")
+        logging.info(f"Hiding {len(self.overlays)} overlays")
         for i, overlay in enumerate(self.overlays):
             try:
-                print(f"Hiding overlay {i}")
+                logging.debug(f"Hiding overlay {i}")
                 overlay.hide_overlay()
             except RecursionError as e:
-                print(f"Recursion error hiding overlay {i}: {e}")
+                logging.error(f"Recursion error hiding overlay {i}: {e}")
                 # Skip this overlay to prevent infinite recursion
                 continue
             except Exception as e:
-                print(f"Failed to hide overlay {i}: {e}")
+                logging.error(f"Failed to hide overlay {i}: {e}")
     
     def update_timer(self, seconds):
         """Update timer on all overlays"""
@@ -645,15 +654,15 @@ class MultiDisplayOverlay:
             try:
                 overlay.update_timer(seconds)
             except RecursionError as e:
-                print(f"Recursion error updating overlay {i} timer: {e}")
+                logging.error(f"Recursion error updating overlay {i} timer: {e}")
                 # Skip this overlay to prevent infinite recursion
                 continue
             except Exception as e:
-                print(f"Failed to update overlay {i} timer: {e}")
+                logging.error(f"Failed to update overlay {i} timer: {e}")
     
     def destroy_all(self):
         """Destroy all overlays with enhanced error handling"""
-        print(f"Destroying {len(self.overlays)} overlays")
+        logging.info(f"Destroying {len(self.overlays)} overlays")
         
         # Create a copy of the list to avoid modification during iteration
         overlays_to_destroy = list(self.overlays)
@@ -664,13 +673,13 @@ class MultiDisplayOverlay:
                 continue
                 
             try:
-                print(f"Destroying overlay {i}")
+                logging.debug(f"Destroying overlay {i}")
                 
                 # First hide the overlay to prevent any active operations
                 try:
                     overlay.hide_overlay()
                 except Exception as hide_error:
-                    print(f"Error hiding overlay {i} before destroy: {hide_error}")
+                    logging.error(f"Error hiding overlay {i} before destroy: {hide_error}")
                 
                 # Small delay to allow GTK to process the hide operation
                 import time
@@ -680,19 +689,19 @@ class MultiDisplayOverlay:
                 overlay.destroy_overlay()
                 
             except RecursionError as e:
-                print(f"Recursion error destroying overlay {i}: {e}")
+                logging.error(f"Recursion error destroying overlay {i}: {e}")
                 # Force destroy by setting overlay to None
                 overlays_to_destroy[i] = None
                 continue
             except Exception as e:
-                print(f"Failed to destroy overlay {i}: {e}")
+                logging.error(f"Failed to destroy overlay {i}: {e}")
                 # Try to force destroy the window
                 try:
                     if hasattr(overlay, 'destroy') and overlay.destroy:
                         overlay.destroy()
                 except Exception as force_error:
-                    print(f"Force destroy also failed for overlay {i}: {force_error}")
+                    logging.error(f"Force destroy also failed for overlay {i}: {force_error}")
         
         # Final cleanup - ensure the list is empty
         self.overlays.clear()
-        print("Overlay destruction completed") 
\ No newline at end of file
+        logging.info("Overlay destruction completed")
\ No newline at end of file
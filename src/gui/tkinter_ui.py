@@ -16,6 +16,10 @@ class TimerWindow(tk.Toplevel):
         self.on_power = on_power
         self.on_pause_snooze = on_pause_snooze
         
+        # Pause/snooze tooltips, set by the timer on each transition
+        self.pause_tooltip = "Pause timer"
+        self.resume_tooltip = "Resume timer"
+        
         self.title("Pomodoro Lock")
         self.overrideredirect(True)  # Remove window decorations
         self.attributes('-topmost', True)
@@ -101,7 +105,7 @@ class TimerWindow(tk.Toplevel):
         self.pause_snooze_button.pack(side='right')
         
         # Add tooltip for pause/snooze button
-        self._create_tooltip(self.pause_snooze_button, "Pause and auto-resume in 10 minutes")
+        self._create_tooltip(self.pause_snooze_button, self.pause_tooltip)
         
         # Bind mouse events for dragging
         self.bind('<Button-1>', self._on_button_press)
@@ -197,17 +201,22 @@ class TimerWindow(tk.Toplevel):
         # Update pause/snooze button appearance
         self._update_pause_button(is_paused)
     
+    def set_pause_tooltips(self, pause_tooltip, resume_tooltip):
+        """Set the pause/snooze button tooltips (plain attributes, safe from any thread)"""
+        self.pause_tooltip = pause_tooltip
+        self.resume_tooltip = resume_tooltip
+    
     def _update_pause_button(self, is_paused):
         """Update the pause/snooze button appearance based on timer state"""
         try:
             if is_paused:
                 # Show play icon when paused
                 self.pause_snooze_button.config(text="▶")
-                self._create_tooltip(self.pause_snooze_button, "Resume timer")
+                self._create_tooltip(self.pause_snooze_button, self.resume_tooltip)
             else:
                 # Show pause icon when running
                 self.pause_snooze_button.config(text="⏸")
-                self._create_tooltip(self.pause_snooze_button, "Pause and auto-resume in 10 minutes")
+                self._create_tooltip(self.pause_snooze_button, self.pause_tooltip)
         except Exception as e:
             # Fallback if button update fails
             pass
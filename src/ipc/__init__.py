@@ -0,0 +1,32 @@
+"""
+Inter-process communication for Pomodoro Lock
+Lets panels, prompts and tools observe the running timer
+"""
+
+from .status_page import (
+    StatusPageWriter,
+    StatusPageReader,
+    StatusSnapshot,
+    default_status_path,
+    runtime_dir
+)
+from .control import (
+    ControlServer,
+    ControlError,
+    send_command,
+    subscribe,
+    default_control_path
+)
+
+__all__ = [
+    'StatusPageWriter',
+    'StatusPageReader',
+    'StatusSnapshot',
+    'default_status_path',
+    'runtime_dir',
+    'ControlServer',
+    'ControlError',
+    'send_command',
+    'subscribe',
+    'default_control_path'
+]
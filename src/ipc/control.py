@@ -0,0 +1,523 @@
+"""
+Local control channel for Pomodoro Lock
+
+The running timer listens on a Unix domain socket in the runtime directory.
+Clients send one JSON object per line, e.g. {"cmd": "status"}, and receive
+one JSON line in reply. {"cmd": "subscribe"} turns the connection into an
+event stream: the server pushes one JSON line per state transition until the
+client disconnects.
+A subscription may name a topic; publishing to a topic reaches only the
+connections subscribed to it, so one server can serve many independent
+timers (the session daemon publishes each session on its own topic).
+A server (and a client) can also use TCP instead of a Unix socket by
+giving an address of the form tcp://host:port; peers are then anonymous.
+
+Each subscriber has a bounded outbound queue. Publishing encodes the event
+once and appends it to every queue (O(1) per subscriber); a subscriber whose
+queue is full is considered too slow and is disconnected.
+"""
+
+import os
+import json
+import struct
+import socket
+import logging
+import selectors
+import threading
+from collections import deque
+
+from .status_page import runtime_dir
+
+MAX_LINE = 64 * 1024
+DEFAULT_QUEUE_SIZE = 64
+TCP_PREFIX = "tcp://"
+
+CONTROL_AVAILABLE = hasattr(socket, 'AF_UNIX')
+
+
+class ControlError(Exception):
+    """Raised by clients when the control channel cannot be used"""
+
+
+def default_control_path():
+    """Return the default location of the control socket"""
+    return runtime_dir() / "control.sock"
+
+
+def parse_address(address):
+    """
+    Split a control address into (family, address).
+
+    tcp://host:port (or tcp://[v6-host]:port) is a TCP address; anything
+    else is the path of a Unix socket. Without a host (tcp://:port) only
+    the loopback interface is used; every interface has to be asked for
+    with tcp://0.0.0.0:port or tcp://[::]:port.
+    """
+    address = str(address)
+    if not address.startswith(TCP_PREFIX):
+        return socket.AF_UNIX if CONTROL_AVAILABLE else None, address
+    host, sep, port = address[len(TCP_PREFIX):].rpartition(':')
+    if not sep or not port.isdigit() or int(port) > 65535:
+        raise ControlError(f"invalid TCP address {address} (expected tcp://host:port)")
+    host = host.strip('[]') or '127.0.0.1'
+    return socket.AF_INET6 if ':' in host else socket.AF_INET, (host, int(port))
+
+
+def format_address(family, address):
+    """Inverse of parse_address"""
+    if family == socket.AF_INET6:
+        return f"{TCP_PREFIX}[{address[0]}]:{address[1]}"
+    if family == socket.AF_INET:
+        return f"{TCP_PREFIX}{address[0]}:{address[1]}"
+    return address
+
+
+def peer_uid(sock):
+    """uid of the process at the other end of a Unix socket, or None where unsupported"""
+    # TCP peers are anonymous (Linux would report uid -1)
+    if not hasattr(socket, 'SO_PEERCRED') or sock.family != socket.AF_UNIX:
+        return None
+    try:
+        creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+    except OSError:
+        return None
+    return struct.unpack('3i', creds)[1]
+
+
+def encode_message(message):
+    """Encode a message as one compact JSON line"""
+    return json.dumps(message, separators=(',', ':')).encode('utf-8') + b'\n'
+
+
+class _Connection:
+    """Per-client state kept by the server"""
+
+    __slots__ = ('sock', 'inbuf', 'outbuf', 'queue', 'subscribed', 'closing', 'topic', 'uid', 'host')
+
+    def __init__(self, sock, uid=None, host=None):
+        self.sock = sock
+        self.inbuf = b''
+        self.outbuf = b''
+        self.queue = deque()
+        self.subscribed = False
+        self.closing = False
+        self.topic = None
+        self.uid = uid
+        self.host = host
+
+
+class ControlServer:
+    """Serves control requests and event subscriptions on a Unix socket or TCP port"""
+
+    def __init__(self, handlers=None, path=None, queue_size=DEFAULT_QUEUE_SIZE,
+                 mode=0o600, dir_mode=0o700, backlog=16):
+        # A Unix socket path, or tcp://host:port (port 0 picks a free port, see path after start)
+        self.path = str(path if path else default_control_path())
+        self.handlers = dict(handlers or {})
+        self.queue_size = queue_size
+        self.mode = mode
+        self.dir_mode = dir_mode
+        self.backlog = backlog
+        # Called as on_disconnect(topic) when a subscriber goes away
+        self.on_disconnect = None
+        self.selector = None
+        self.listener = None
+        self.thread = None
+        self.running = False
+        self.connections = {}
+        self.subscribers = set()
+        self.topics = {}
+        self.dropped = 0
+        self._dirty = set()
+        self._lock = threading.Lock()
+        self._wake_r = None
+        self._wake_w = None
+        self._snapshot = None
+
+    def add_handler(self, command, handler):
+        """
+        Register handler(request) -> dict for a command name.
+
+        request['peer_uid'] is set to the client's uid where the platform
+        reports it, and request['peer_host'] to the address of a TCP client. A 'subscribe' handler builds the reply that starts an
+        event stream; a 'topic' in its reply subscribes the client to that
+        topic only.
+        """
+        self.handlers[command] = handler
+
+    def set_snapshot(self, snapshot):
+        """Set the callable that provides the initial state sent to new subscribers"""
+        self._snapshot = snapshot
+
+    def start(self):
+        """Bind the socket and start the server thread"""
+        try:
+            family, address = parse_address(self.path)
+        except ControlError as e:
+            logging.error(f"Failed to start control channel: {e}")
+            return False
+        if family is None:
+            logging.warning("Unix sockets not available - control channel disabled")
+            return False
+
+        try:
+            if family == socket.AF_UNIX:
+                os.makedirs(os.path.dirname(self.path), mode=self.dir_mode, exist_ok=True)
+                # We hold the single-instance lock, so any existing socket is stale
+                if os.path.exists(self.path):
+                    os.unlink(self.path)
+
+            self.listener = socket.socket(family, socket.SOCK_STREAM)
+            if family == socket.AF_UNIX:
+                self.listener.bind(self.path)
+                os.chmod(self.path, self.mode)
+            else:
+                self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                self.listener.bind(address)
+                self.path = format_address(family, self.listener.getsockname()[:2])
+            self.listener.listen(self.backlog)
+            self.listener.setblocking(False)
+
+            self._wake_r, self._wake_w = socket.socketpair()
+            self._wake_r.setblocking(False)
+            self._wake_w.setblocking(False)
+
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.listener, selectors.EVENT_READ, 'accept')
+            self.selector.register(self._wake_r, selectors.EVENT_READ, 'wake')
+        except Exception as e:
+            logging.error(f"Failed to start control channel on {self.path}: {e}")
+            self._close_sockets()
+            return False
+
+        self.running = True
+        self.thread = threading.Thread(target=self._serve, name="control-channel", daemon=True)
+        self.thread.start()
+        logging.info(f"Control channel listening on {self.path}")
+        return True
+
+    def stop(self):
+        """Stop the server thread and remove the socket"""
+        if not self.running:
+            return
+        self.running = False
+        self._wake()
+        if self.thread is not None and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2)
+        self._close_sockets()
+        if self.path.startswith(TCP_PREFIX):
+            return
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def publish(self, event, topic=None):
+        """Queue an event for every subscriber (or those of one topic); safe to call from any thread"""
+        if not self.running:
+            return
+        data = encode_message(event)
+        with self._lock:
+            targets = self.subscribers if topic is None else self.topics.get(topic)
+            if not targets:
+                return
+            for conn in targets:
+                if len(conn.queue) >= self.queue_size:
+                    conn.closing = True
+                else:
+                    conn.queue.append(data)
+                self._dirty.add(conn)
+        self._wake()
+
+    @property
+    def subscriber_count(self):
+        """Number of connected subscribers"""
+        return len(self.subscribers)
+
+    def _wake(self):
+        """Interrupt the selector so queued output gets flushed"""
+        try:
+            self._wake_w.send(b'\0')
+        except (BlockingIOError, OSError, AttributeError):
+            pass
+
+    def _serve(self):
+        """Server thread main loop"""
+        while self.running:
+            try:
+                events = self.selector.select(timeout=1.0)
+            except Exception as e:
+                logging.error(f"Control channel select failed: {e}")
+                break
+
+            for key, mask in events:
+                if key.data == 'accept':
+                    self._accept()
+                elif key.data == 'wake':
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, OSError):
+                        pass
+                else:
+                    conn = key.data
+                    if mask & selectors.EVENT_READ:
+                        self._read(conn)
+                    if mask & selectors.EVENT_WRITE and not conn.closing:
+                        self._flush(conn)
+
+            self._service_subscribers()
+
+    def _accept(self):
+        """Accept pending client connections"""
+        while True:
+            try:
+                sock, address = self.listener.accept()
+            except (BlockingIOError, OSError):
+                return
+            sock.setblocking(False)
+            host = address[0] if isinstance(address, tuple) else None
+            conn = _Connection(sock, peer_uid(sock), host)
+            self.connections[sock] = conn
+            self.selector.register(sock, selectors.EVENT_READ, conn)
+
+    def _read(self, conn):
+        """Read and dispatch request lines from a client"""
+        try:
+            data = conn.sock.recv(4096)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._drop(conn)
+            return
+
+        conn.inbuf += data
+        if len(conn.inbuf) > MAX_LINE:
+            self._drop(conn)
+            return
+
+        while b'\n' in conn.inbuf:
+            line, conn.inbuf = conn.inbuf.split(b'\n', 1)
+            if line.strip():
+                self._dispatch(conn, line)
+
+    def _dispatch(self, conn, line):
+        """Handle one request line"""
+        try:
+            request = json.loads(line)
+            command = request.get('cmd') if isinstance(request, dict) else None
+        except ValueError:
+            request, command = {}, None
+        if isinstance(request, dict):
+            # Set by the server only, so clients cannot claim another uid
+            request['peer_uid'] = conn.uid
+            request['peer_host'] = conn.host
+
+        if command == 'subscribe':
+            self._subscribe(conn, request)
+            return
+
+        handler = self.handlers.get(command)
+        if handler is None:
+            reply = {'ok': False, 'error': f"unknown command: {command}"}
+        else:
+            try:
+                reply = handler(request) or {}
+                reply.setdefault('ok', True)
+            except Exception as e:
+                logging.error(f"Control command {command} failed: {e}")
+                reply = {'ok': False, 'error': str(e)}
+        with self._lock:
+            conn.queue.append(encode_message(reply))
+            self._dirty.add(conn)
+
+    def _subscribe(self, conn, request):
+        """Turn a connection into an event stream"""
+        reply = {'ok': True, 'event': 'subscribed'}
+        handler = self.handlers.get('subscribe')
+        if handler is not None:
+            try:
+                reply.update(handler(request) or {})
+            except Exception as e:
+                logging.error(f"Control command subscribe failed: {e}")
+                with self._lock:
+                    conn.queue.append(encode_message({'ok': False, 'error': str(e)}))
+                    self._dirty.add(conn)
+                return
+        elif self._snapshot is not None:
+            try:
+                reply.update(self._snapshot())
+            except Exception as e:
+                logging.error(f"Control channel snapshot failed: {e}")
+
+        # Subscribing again replaces the previous subscription
+        if conn.subscribed:
+            self._unsubscribe(conn)
+        topic = reply.get('topic')
+        with self._lock:
+            conn.queue.appendleft(encode_message(reply))
+            conn.subscribed = True
+            conn.topic = topic
+            self.subscribers.add(conn)
+            if topic is not None:
+                self.topics.setdefault(topic, set()).add(conn)
+            self._dirty.add(conn)
+
+    def _unsubscribe(self, conn):
+        """Remove a connection from the subscribers and report it"""
+        with self._lock:
+            if not conn.subscribed:
+                return
+            topic, conn.topic, conn.subscribed = conn.topic, None, False
+            self.subscribers.discard(conn)
+            members = self.topics.get(topic)
+            if members is not None:
+                members.discard(conn)
+                if not members:
+                    del self.topics[topic]
+        if self.on_disconnect is not None and self.running:
+            try:
+                self.on_disconnect(topic)
+            except Exception as e:
+                logging.error(f"Control channel disconnect callback failed: {e}")
+
+    def _service_subscribers(self):
+        """Drop slow clients and flush connections with new output"""
+        with self._lock:
+            pending, self._dirty = self._dirty, set()
+        for conn in pending:
+            if conn.sock not in self.connections:
+                continue
+            if conn.closing:
+                self.dropped += 1
+                logging.warning("Dropping slow control channel subscriber")
+                self._drop(conn)
+            else:
+                self._flush(conn)
+
+    def _flush(self, conn):
+        """Send as much queued output as the socket accepts"""
+        if conn.sock not in self.connections:
+            return
+        with self._lock:
+            while conn.queue:
+                conn.outbuf += conn.queue.popleft()
+        try:
+            while conn.outbuf:
+                sent = conn.sock.send(conn.outbuf)
+                conn.outbuf = conn.outbuf[sent:]
+        except BlockingIOError:
+            pass
+        except OSError:
+            self._drop(conn)
+            return
+
+        # A client that cannot drain its socket buffer counts against its queue
+        if len(conn.outbuf) > MAX_LINE * 4:
+            conn.closing = True
+            with self._lock:
+                self._dirty.add(conn)
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if conn.outbuf else 0)
+        try:
+            self.selector.modify(conn.sock, events, conn)
+        except (KeyError, ValueError):
+            pass
+
+    def _drop(self, conn):
+        """Disconnect a client"""
+        self._unsubscribe(conn)
+        with self._lock:
+            conn.queue.clear()
+        self.connections.pop(conn.sock, None)
+        try:
+            self.selector.unregister(conn.sock)
+        except (KeyError, ValueError):
+            pass
+        try:
+            conn.sock.close()
+        except OSError:
+            pass
+
+    def _close_sockets(self):
+        """Close every socket owned by the server"""
+        for conn in list(self.connections.values()):
+            self._drop(conn)
+        for sock in (self.listener, self._wake_r, self._wake_w):
+            if sock is not None:
+                try:
+                    sock.close()
+                except OSError:
+                    pass
+        if self.selector is not None:
+            try:
+                self.selector.close()
+            except Exception:
+                pass
+        self.listener = self._wake_r = self._wake_w = self.selector = None
+
+
+def _connect(path, timeout):
+    """Open a client connection to the control socket (or a tcp:// address)"""
+    path = str(path if path else default_control_path())
+    family, address = parse_address(path)
+    if family is None:
+        raise ControlError("Unix sockets are not available on this platform")
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(address)
+    except OSError as e:
+        sock.close()
+        raise ControlError(f"Pomodoro Lock is not running ({path}: {e})")
+    if family != socket.AF_UNIX:
+        # Subscriptions may stay silent for hours; let the kernel notice a dead peer
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    return sock
+
+
+def _read_lines(sock):
+    """Yield decoded JSON lines from a socket until it closes"""
+    buf = b''
+    while True:
+        data = sock.recv(4096)
+        if not data:
+            return
+        buf += data
+        while b'\n' in buf:
+            line, buf = buf.split(b'\n', 1)
+            if line.strip():
+                yield json.loads(line)
+
+
+def send_command(command, path=None, timeout=5.0, **fields):
+    """Send one command to the running timer and return its reply"""
+    request = dict(fields)
+    request['cmd'] = command
+    sock = _connect(path, timeout)
+    try:
+        sock.sendall(encode_message(request))
+        for reply in _read_lines(sock):
+            return reply
+    except (OSError, ValueError) as e:
+        raise ControlError(f"Control channel error: {e}")
+    finally:
+        sock.close()
+    raise ControlError("Control channel closed without a reply")
+
+
+def subscribe(path=None, timeout=None, **fields):
+    """Yield state-transition events pushed by the running timer"""
+    request = dict(fields)
+    request['cmd'] = 'subscribe'
+    sock = _connect(path, 5.0)
+    sock.settimeout(timeout)
+    try:
+        sock.sendall(encode_message(request))
+        for event in _read_lines(sock):
+            yield event
+    except (OSError, ValueError) as e:
+        raise ControlError(f"Control channel error: {e}")
+    finally:
+        sock.close()
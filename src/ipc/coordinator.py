@@ -0,0 +1,346 @@
+"""
+Team schedule coordinator for Pomodoro Lock
+
+Timers in team sync mode keep one persistent control-channel subscription
+to a coordinator, {"cmd": "subscribe", "team": "platform"}, and follow the
+TeamSchedule in the reply. The coordinator sends nothing else until the
+schedule of that team changes, when every subscriber of the team receives
+one {"event": "schedule", ...} line; the timers work out their deadlines
+from the schedule themselves. It listens on a Unix socket and optionally on
+TCP (tcp://host:port), one selector thread per address, so a coordinator
+holds thousands of idle clients.
+
+Only root and the coordinator's own user may change schedules, over the
+Unix socket (`pomodoro-lock team`); changed schedules are kept in a JSON
+file, so a restarted coordinator hands out the same epochs. Any client may
+start a team by subscribing to it. Such teams follow the default schedule
+from a fixed epoch, so they are not saved, and they are released when their
+last timer leaves. Each peer (a local user or a TCP host) may start
+max_teams_per_peer teams, and none are started once the coordinator serves
+max_teams teams.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from pathlib import Path
+
+from engine.team import TeamSchedule, ScheduleError, DEFAULT_TEAM, MAX_TEAM_NAME
+from settings.loader import DEFAULT_CONFIG
+from .control import ControlServer, ControlError, subscribe
+
+COORDINATOR_DIR = "/run/pomodoro-lock-coordinator"
+
+# Reconnect delays after losing the coordinator, in seconds
+RECONNECT_MIN = 1
+RECONNECT_MAX = 60
+
+# Teams served before clients can no longer start new ones
+MAX_TEAMS = 1000
+
+# Teams one peer may have started at a time
+MAX_TEAMS_PER_PEER = 16
+
+
+def default_coordinator_path():
+    """Socket of the local coordinator (POMODORO_COORDINATOR_SOCKET overrides it)"""
+    path = os.environ.get('POMODORO_COORDINATOR_SOCKET')
+    if path:
+        return Path(os.path.expanduser(path))
+    return Path(COORDINATOR_DIR) / "coordinator.sock"
+
+
+def team_name(request):
+    """Team a request is about"""
+    team = request.get('team') or DEFAULT_TEAM
+    if not isinstance(team, str) or len(team) > MAX_TEAM_NAME:
+        raise ControlError(f"team must be a name of at most {MAX_TEAM_NAME} characters")
+    return team
+
+
+class TeamCoordinator:
+    """Hands out team schedules and pushes their changes to subscribed timers"""
+
+    def __init__(self, addresses=None, state_path=None,
+                 work_minutes=DEFAULT_CONFIG["work_time_minutes"],
+                 break_minutes=DEFAULT_CONFIG["break_time_minutes"], clock=time.time,
+                 max_teams=MAX_TEAMS, max_teams_per_peer=MAX_TEAMS_PER_PEER):
+        self.state_path = Path(state_path) if state_path else None
+        self.work_minutes = work_minutes
+        self.break_minutes = break_minutes
+        self.max_teams = max_teams
+        self.max_teams_per_peer = max_teams_per_peer
+        self.clock = clock
+        self.schedules = {}
+        # Unchanged teams started by a client: team -> peer, and peer -> teams
+        self._started = {}
+        self._peer_teams = {}
+        self.changes = 0
+        self._lock = threading.Lock()
+        handlers = {
+            'subscribe': self._subscribe,
+            'schedule': self._schedule,
+            'set-schedule': self._set_schedule,
+            'teams': self._teams,
+        }
+        self.servers = [
+            ControlServer(handlers, address, mode=0o666, dir_mode=0o755, backlog=1024)
+            for address in (addresses or [default_coordinator_path()])
+        ]
+        for server in self.servers:
+            server.on_disconnect = self._on_disconnect
+
+    @property
+    def paths(self):
+        """Addresses the coordinator listens on (TCP ports resolved after start)"""
+        return [server.path for server in self.servers]
+
+    def start(self):
+        """Load the saved schedules and listen on every address"""
+        self._load()
+        for server in self.servers:
+            if not server.start():
+                self.stop()
+                return False
+        logging.info(f"Team coordinator serving {len(self.schedules)} team(s) on {', '.join(self.paths)}")
+        return True
+
+    def stop(self):
+        """Stop listening; clients keep their last schedule"""
+        for server in self.servers:
+            server.stop()
+
+    @property
+    def subscriber_count(self):
+        return sum(server.subscriber_count for server in self.servers)
+
+    def schedule(self, team):
+        """The team's schedule; a team not seen before follows the default one"""
+        with self._lock:
+            return self._current(team)
+
+    def _current(self, team):
+        """The team's schedule (called with the lock held)"""
+        schedule = self.schedules.get(team)
+        if schedule is None:
+            # Every new team counts its cycles from the same epoch, so coordinators
+            # agree without saved state and only changed schedules need saving
+            schedule = TeamSchedule(team, 0, self.work_minutes * 60, self.break_minutes * 60)
+        return schedule
+
+    def start_team(self, team, peer):
+        """The team's schedule, starting the team for peer if needed; raises ControlError"""
+        with self._lock:
+            schedule = self.schedules.get(team)
+            if schedule is not None:
+                return schedule
+            if len(self.schedules) >= self.max_teams:
+                raise ControlError(f"no more teams can be started (limit {self.max_teams})")
+            teams = self._peer_teams.setdefault(peer, set())
+            if len(teams) >= self.max_teams_per_peer:
+                raise ControlError(f"at most {self.max_teams_per_peer} teams can be started per peer")
+            schedule = self.schedules[team] = self._current(team)
+            self._started[team] = peer
+            teams.add(team)
+        logging.info(f"Started a schedule for team {team}")
+        return schedule
+
+    def _on_disconnect(self, team):
+        """Release an unchanged team once its last timer has left"""
+        if team is None or any(team in server.topics for server in self.servers):
+            return
+        with self._lock:
+            schedule = self.schedules.get(team)
+            if schedule is None or schedule.version:
+                return
+            del self.schedules[team]
+            self._forget(team)
+        logging.info(f"Released team {team}")
+
+    def _forget(self, team):
+        """Stop counting a team against the peer that started it (called with the lock held)"""
+        peer = self._started.pop(team, None)
+        teams = self._peer_teams.get(peer)
+        if teams is not None:
+            teams.discard(team)
+            if not teams:
+                del self._peer_teams[peer]
+
+    def set_schedule(self, team, epoch=None, work_minutes=None, break_minutes=None):
+        """Change a team's schedule and push it to the team's timers; returns the new schedule"""
+        # One lock hold from reading the version to publishing, so concurrent changes
+        # neither lose an update nor reach the timers out of order
+        with self._lock:
+            current = self._current(team)
+            data = current.as_dict()
+            if epoch is not None:
+                data['epoch'] = epoch
+            if work_minutes is not None:
+                data['work_time_minutes'] = work_minutes
+            if break_minutes is not None:
+                data['break_time_minutes'] = break_minutes
+            data['version'] = current.version + 1
+            try:
+                schedule = TeamSchedule.from_dict(data)
+            except ScheduleError as e:
+                raise ControlError(str(e))
+
+            self.schedules[team] = schedule
+            # A changed team is kept for good, so it no longer counts against a peer
+            self._forget(team)
+            self.changes += 1
+            self._save()
+            event = schedule.as_dict()
+            event['event'] = 'schedule'
+            for server in self.servers:
+                server.publish(event, topic=team)
+        logging.info(f"Team {team} schedule changed to {data}")
+        return schedule
+
+    def _load(self):
+        if self.state_path is None:
+            return
+        try:
+            with open(self.state_path) as f:
+                entries = json.load(f)
+            schedules = {entry['team']: TeamSchedule.from_dict(entry) for entry in entries}
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            logging.error(f"Ignoring unreadable team schedules in {self.state_path}: {e}")
+            return
+        with self._lock:
+            self.schedules = schedules
+
+    def _save(self):
+        """Write the changed schedules (called with the lock held)"""
+        if self.state_path is None:
+            return
+        temp_path = self.state_path.with_suffix('.tmp')
+        try:
+            self.state_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(temp_path, 'w') as f:
+                json.dump([schedule.as_dict() for schedule in self.schedules.values() if schedule.version], f, indent=2)
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            logging.error(f"Failed to save team schedules to {self.state_path}: {e}")
+
+    def _subscribe(self, request):
+        """Handle `subscribe`: the team's schedule, then its changes"""
+        team = team_name(request)
+        peer = request.get('peer_host') or request.get('peer_uid')
+        reply = self.start_team(team, peer).as_dict()
+        reply['topic'] = team
+        return reply
+
+    def _schedule(self, request):
+        """Handle `schedule`"""
+        return self.schedule(team_name(request)).as_dict()
+
+    def _set_schedule(self, request):
+        """Handle `set-schedule` from root or the coordinator's user"""
+        if request.get('peer_uid') not in (0, os.getuid()):
+            raise ControlError("only root or the coordinator's user may change team schedules")
+        epoch = request.get('epoch')
+        if epoch == 'now':
+            epoch = self.clock()
+        schedule = self.set_schedule(
+            team_name(request), epoch,
+            request.get('work_time_minutes'), request.get('break_time_minutes')
+        )
+        return schedule.as_dict()
+
+    def _teams(self, request):
+        """Handle `teams`: each team's schedule and subscriber count"""
+        with self._lock:
+            teams = {team: schedule.as_dict() for team, schedule in self.schedules.items()}
+        for team in teams:
+            teams[team]['subscribers'] = sum(len(server.topics.get(team, ())) for server in self.servers)
+        return {'teams': teams, 'subscribers': self.subscriber_count, 'changes': self.changes}
+
+
+class TeamSyncClient:
+    """Keeps a timer subscribed to its team's schedule, surviving coordinator restarts"""
+
+    def __init__(self, on_schedule, address=None, team=DEFAULT_TEAM, cache_path=None):
+        # Called as on_schedule(schedule) from the sync thread whenever the schedule changes
+        self.on_schedule = on_schedule
+        self.address = str(address if address else default_coordinator_path())
+        self.team = team
+        self.cache_path = Path(cache_path) if cache_path else None
+        self.schedule = None
+        self.connected = False
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    def start(self):
+        """Follow the cached schedule right away, then subscribe in the background"""
+        cached = self._load_cache()
+        if cached is not None:
+            logging.info(f"Following cached schedule of team {self.team} until the coordinator answers")
+            self._apply(cached)
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._listen, name="team-sync", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _listen(self):
+        """Sync thread: stay subscribed, reconnecting with backoff"""
+        delay = RECONNECT_MIN
+        while not self.stop_event.is_set():
+            try:
+                for event in subscribe(self.address, team=self.team):
+                    if not event.get('ok', True):
+                        raise ControlError(event.get('error', "subscription refused"))
+                    if not self.connected:
+                        self.connected = True
+                        logging.info(f"Connected to team coordinator {self.address}")
+                    delay = RECONNECT_MIN
+                    try:
+                        self._apply(TeamSchedule.from_dict(event))
+                    except ScheduleError as e:
+                        logging.warning(f"Ignoring invalid schedule from the coordinator: {e}")
+                    if self.stop_event.is_set():
+                        return
+                raise ControlError("connection closed")
+            except ControlError as e:
+                if self.connected or delay == RECONNECT_MIN:
+                    logging.warning(f"Team coordinator unavailable, keeping the last schedule: {e}")
+                self.connected = False
+            self.stop_event.wait(delay)
+            delay = min(delay * 2, RECONNECT_MAX)
+
+    def _apply(self, schedule):
+        if schedule == self.schedule:
+            return
+        self.schedule = schedule
+        self._save_cache(schedule)
+        try:
+            self.on_schedule(schedule)
+        except Exception as e:
+            logging.error(f"Team schedule handler failed: {e}")
+
+    def _load_cache(self):
+        if self.cache_path is None:
+            return None
+        try:
+            with open(self.cache_path) as f:
+                schedule = TeamSchedule.from_dict(json.load(f))
+        except (OSError, ValueError):
+            return None
+        return schedule if schedule.team == self.team else None
+
+    def _save_cache(self, schedule):
+        if self.cache_path is None:
+            return
+        temp_path = self.cache_path.with_suffix('.tmp')
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(schedule.as_dict(), f)
+            os.replace(temp_path, self.cache_path)
+        except OSError as e:
+            logging.warning(f"Failed to cache team schedule: {e}")
@@ -0,0 +1,205 @@
+"""
+Multi-session daemon for Pomodoro Lock
+
+On hosts with many desktop sessions (terminal servers, VDI) one system
+daemon keeps the timer of every session and each desktop runs only a thin
+client that shows the overlays when told to. The daemon serves the control
+protocol on a socket in /run/pomodoro-lock that every local user may open;
+the kernel reports each client's uid, and a session is keyed by that uid
+and a session name chosen by the client, so users can only see and change
+their own timers. The sessions live in a compact SessionTable.
+
+A client subscribes with its settings, {"cmd": "subscribe", "session":
+"default", "config": {...}}, and then receives the transitions of that
+session only. The daemon merges the settings with the system policy, as the
+timer does, so locked keys keep their policy values. pause, resume and
+status take the same "session" field. The session keeps running for a
+while after its last client disconnects, so a client that restarts finds
+its countdown where it left it; each user may keep at most
+max_sessions_per_user sessions.
+"""
+
+import os
+import time
+import logging
+import threading
+from pathlib import Path
+
+from engine.scheduler import DeadlineScheduler
+from engine.sessions import SessionManager, DEFAULT_EXPIRE_AFTER
+from engine.table import SessionTable
+from settings.loader import ConfigError
+from settings.layers import read_policy, merge_layers
+from telemetry.metrics import MetricsRegistry
+from telemetry.prometheus import process_rss_bytes
+from .control import ControlServer, ControlError
+
+DAEMON_DIR = "/run/pomodoro-lock"
+DEFAULT_SESSION = "default"
+MAX_SESSION_NAME = 64
+MAX_SESSIONS_PER_USER = 16
+
+
+def default_daemon_path():
+    """Socket of the session daemon (POMODORO_DAEMON_SOCKET overrides it)"""
+    path = os.environ.get('POMODORO_DAEMON_SOCKET')
+    if path:
+        return Path(os.path.expanduser(path))
+    return Path(DAEMON_DIR) / "daemon.sock"
+
+
+def session_key(request):
+    """Table key of the session a request is about: the client's uid and session name"""
+    uid = request.get('peer_uid')
+    if uid is None:
+        raise ControlError("cannot identify the client (no peer credentials)")
+    name = str(request.get('session') or DEFAULT_SESSION)
+    if len(name) > MAX_SESSION_NAME:
+        raise ControlError(f"session name longer than {MAX_SESSION_NAME} characters")
+    return f"{uid}:{name}"
+
+
+class SessionDaemon:
+    """Serves the timers of all sessions on the host from one scheduler thread"""
+
+    def __init__(self, path=None, clock=time.monotonic, expire_after=DEFAULT_EXPIRE_AFTER, compact=True,
+                 policy_path=None, max_sessions_per_user=MAX_SESSIONS_PER_USER):
+        self.policy_path = policy_path
+        self.max_sessions_per_user = max_sessions_per_user
+        # Session keys started by each uid (pruned of expired ones when checked)
+        self._user_sessions = {}
+        self.scheduler = DeadlineScheduler(clock)
+        # The compact table needs under 200 bytes per session; SessionManager keeps objects
+        table = SessionTable if compact else SessionManager
+        self.sessions = table(self.scheduler, self._publish, expire_after)
+        self.server = ControlServer({
+            'subscribe': self._subscribe,
+            'pause': self._pause,
+            'resume': self._resume,
+            'status': self._status,
+            'sessions': self._sessions,
+            'metrics': self._metrics,
+        }, path if path else default_daemon_path(), mode=0o666, dir_mode=0o755, backlog=128)
+        self.server.on_disconnect = self._on_disconnect
+        self.stop_event = threading.Event()
+        self.thread = None
+
+        self.metrics = MetricsRegistry()
+        self.deadline_lateness = self.metrics.histogram(
+            'timer_deadline_lateness_seconds', "How late the scheduler thread runs each deadline")
+        self.scheduler.observer = lambda name, lateness: self.deadline_lateness.observe(lateness)
+        self.metrics.gauge('daemon_sessions', "Sessions in the table").set_function(lambda: len(self.sessions))
+        self.metrics.gauge('daemon_subscribers', "Connected thin clients").set_function(
+            lambda: self.server.subscriber_count)
+        self.metrics.gauge('daemon_deadlines', "Deadlines in the scheduler heap").set_function(
+            lambda: len(self.scheduler))
+        self.metrics.gauge('process_resident_memory_bytes', "Resident memory of the daemon").set_function(
+            process_rss_bytes)
+
+    @property
+    def path(self):
+        return self.server.path
+
+    def start(self):
+        """Open the socket and start the scheduler thread"""
+        if not self.server.start():
+            return False
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name="session-scheduler", daemon=True)
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """Stop serving; the sessions are forgotten"""
+        self.stop_event.set()
+        self.scheduler.wake()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+            self.thread = None
+        self.server.stop()
+        self.scheduler.clear()
+
+    def _run(self):
+        logging.info(f"Session daemon running on {self.path}")
+        self.scheduler.run(self.stop_event)
+        logging.info("Session daemon stopped")
+
+    def _publish(self, key, message):
+        """SessionManager callback: send a transition to the clients of its session"""
+        self.server.publish(message, topic=key)
+
+    def _on_disconnect(self, topic):
+        if topic is not None:
+            self.sessions.detach(topic)
+
+    def _subscribe(self, request):
+        """Handle `subscribe`: attach to (or start) the client's session and stream it"""
+        key = session_key(request)
+        config = request.get('config')
+        if config is not None and not isinstance(config, dict):
+            raise ControlError("config must be a JSON object")
+        config = self._settings(config)
+        if key not in self.sessions:
+            self._count_session(request['peer_uid'], key)
+        self.sessions.attach(key, config)
+        reply = self.sessions.snapshot(key)
+        reply['topic'] = key
+        return reply
+
+    def _settings(self, config):
+        """The client's settings with the system policy applied"""
+        try:
+            policy = read_policy(self.policy_path)
+        except ConfigError as e:
+            # Like the timer: an unreadable policy leaves only the defaults
+            logging.error(f"Failed to load policy, using the defaults: {e}")
+            return merge_layers({}, {}, {}).as_config()
+        try:
+            return merge_layers(policy, config or {}, {}).as_config()
+        except ConfigError as e:
+            raise ControlError(str(e))
+
+    def _count_session(self, uid, key):
+        """Record a new session of uid, refusing it past the per-user limit"""
+        keys = self._user_sessions.get(uid, set())
+        keys = {other for other in keys if other in self.sessions}
+        if len(keys) >= self.max_sessions_per_user:
+            raise ControlError(f"at most {self.max_sessions_per_user} sessions per user")
+        keys.add(key)
+        self._user_sessions[uid] = keys
+
+    def _pause(self, request):
+        """Handle `pause`: snooze within the session's limit"""
+        key = session_key(request)
+        seconds = request.get('seconds')
+        if seconds is not None and (isinstance(seconds, bool) or not isinstance(seconds, int) or seconds <= 0):
+            raise ControlError("seconds must be a positive whole number")
+        granted = self.sessions.pause(key, seconds)
+        reply = self.sessions.snapshot(key)
+        reply['snooze_seconds'] = granted
+        return reply
+
+    def _resume(self, request):
+        """Handle `resume`"""
+        key = session_key(request)
+        resumed = self.sessions.resume(key)
+        reply = self.sessions.snapshot(key)
+        reply['resumed'] = resumed
+        return reply
+
+    def _status(self, request):
+        """Handle `status` for the client's session"""
+        return self.sessions.snapshot(session_key(request))
+
+    def _sessions(self, request):
+        """Handle `sessions`: table counts, and the keys for root"""
+        reply = self.sessions.stats()
+        reply['subscribers'] = self.server.subscriber_count
+        reply['rss_bytes'] = process_rss_bytes()
+        if request.get('peer_uid') == 0:
+            reply['keys'] = sorted(self.sessions.keys())
+        return reply
+
+    def _metrics(self, request):
+        """Handle `metrics`: dump the daemon's metrics registry"""
+        return {'metrics': self.metrics.snapshot(), 'time': time.time()}
@@ -0,0 +1,244 @@
+"""
+Memory-mapped status page for Pomodoro Lock
+
+The running timer publishes a small fixed-layout binary record that panels,
+status bars and shell prompts can map once and then read without any further
+system calls. The record is only rewritten on state transitions; readers
+compute the remaining time themselves from the absolute deadline.
+
+Layout (little endian, 64 bytes, see PAGE_STRUCT):
+
+    offset  size  field
+    0       4     magic            b'PMLK'
+    4       2     version          currently 1
+    6       2     page size        64
+    8       8     sequence         even = stable, odd = write in progress
+    16      1     state            0 = stopped, 1 = work, 2 = break
+    17      1     paused           1 if the timer is paused
+    18      2     reserved
+    20      4     pid              process id of the writer
+    24      8     deadline         session end, seconds since the epoch
+    32      8     remaining        seconds left when paused (else 0)
+    40      8     session length   total length of the current session
+    48      8     updated          time of the last transition
+    56      8     reserved
+
+Readers use the sequence counter as a seqlock: read it, copy the record,
+read it again and retry if it changed or is odd.
+"""
+
+import os
+import sys
+import mmap
+import time
+import struct
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from collections import namedtuple
+
+MAGIC = b'PMLK'
+VERSION = 1
+PAGE_SIZE = 64
+PAGE_STRUCT = struct.Struct('<4sHHQBBxxIdddd8x')
+SEQUENCE_STRUCT = struct.Struct('<Q')
+SEQUENCE_OFFSET = 8
+
+STATE_STOPPED = 0
+STATE_WORK = 1
+STATE_BREAK = 2
+
+STATE_NAMES = {
+    STATE_STOPPED: 'stopped',
+    STATE_WORK: 'work',
+    STATE_BREAK: 'break',
+}
+
+StatusSnapshot = namedtuple('StatusSnapshot', [
+    'sequence', 'state', 'paused', 'pid', 'deadline',
+    'remaining', 'session_length', 'updated'
+])
+
+
+def runtime_dir():
+    """Return the per-user runtime directory used for sockets and pages"""
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    if base:
+        return Path(base) / "pomodoro-lock"
+    # Windows and sessions without a runtime dir fall back to the temp dir
+    user = os.environ.get('USER') or os.environ.get('USERNAME') or 'user'
+    return Path(tempfile.gettempdir()) / f"pomodoro-lock-{user}"
+
+
+def default_status_path():
+    """Return the default location of the status page"""
+    return runtime_dir() / "status"
+
+
+class StatusPageWriter:
+    """Publishes timer state into a memory-mapped file"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else default_status_path()
+        self.sequence = 0
+        self.map = None
+        self._fd = None
+        self._last = None
+        self._lock = threading.Lock()
+        try:
+            self._open()
+        except Exception as e:
+            logging.error(f"Failed to create status page {self.path}: {e}")
+            self.close()
+
+    def _open(self):
+        """Create (or reuse) the page file and map it"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.chmod(self.path.parent, 0o700)
+        except OSError:
+            pass
+        flags = os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+        self._fd = os.open(self.path, flags, 0o644)
+        if os.fstat(self._fd).st_size != PAGE_SIZE:
+            os.ftruncate(self._fd, PAGE_SIZE)
+        self.map = mmap.mmap(self._fd, PAGE_SIZE)
+
+        # Continue the sequence of a previous instance so readers that kept
+        # their mapping across a restart still see it change
+        try:
+            magic, version, _, sequence = struct.unpack_from('<4sHHQ', self.map, 0)
+            if magic == MAGIC and version == VERSION:
+                self.sequence = sequence + (sequence & 1)
+        except struct.error:
+            pass
+
+    @property
+    def available(self):
+        """Whether the page is mapped and can be written"""
+        return self.map is not None
+
+    def publish(self, state, paused, deadline, remaining=0.0, session_length=0.0):
+        """Write a new record; skipped if nothing changed since the last one"""
+        if self.map is None:
+            return False
+
+        record = (state, bool(paused), float(deadline), float(remaining), float(session_length))
+        with self._lock:
+            return self._write(record)
+
+    def _write(self, record):
+        """Write one record under the seqlock protocol"""
+        if record == self._last:
+            return True
+
+        state, paused, deadline, remaining, session_length = record
+        try:
+            # Odd sequence marks the write as in progress
+            SEQUENCE_STRUCT.pack_into(self.map, SEQUENCE_OFFSET, self.sequence + 1)
+            PAGE_STRUCT.pack_into(
+                self.map, 0,
+                MAGIC, VERSION, PAGE_SIZE, self.sequence + 1,
+                state, 1 if paused else 0, os.getpid(),
+                deadline, remaining, session_length, time.time()
+            )
+            self.sequence += 2
+            SEQUENCE_STRUCT.pack_into(self.map, SEQUENCE_OFFSET, self.sequence)
+            self._last = record
+            return True
+        except Exception as e:
+            logging.error(f"Failed to publish status page: {e}")
+            return False
+
+    def close(self, mark_stopped=True):
+        """Mark the page as stopped and unmap it (the file is kept for readers)"""
+        if self.map is not None:
+            if mark_stopped:
+                self.publish(STATE_STOPPED, False, 0.0)
+            try:
+                self.map.close()
+            except Exception as e:
+                logging.error(f"Failed to unmap status page: {e}")
+            self.map = None
+        if self._fd is not None:
+            try:
+                os.close(self._fd)
+            except OSError:
+                pass
+            self._fd = None
+
+
+class StatusPageReader:
+    """Reads the status page; only the first access touches the filesystem"""
+
+    def __init__(self, path=None, max_retries=100):
+        self.path = Path(path) if path else default_status_path()
+        self.max_retries = max_retries
+        self.map = None
+
+    def _map(self):
+        """Map the page read-only; returns False when no timer has published yet"""
+        try:
+            with open(self.path, 'rb') as f:
+                self.map = mmap.mmap(f.fileno(), PAGE_SIZE, access=mmap.ACCESS_READ)
+            return True
+        except (OSError, ValueError):
+            self.map = None
+            return False
+
+    def read(self):
+        """Return a consistent StatusSnapshot, or None if no page is available"""
+        if self.map is None and not self._map():
+            return None
+
+        for _ in range(self.max_retries):
+            before = SEQUENCE_STRUCT.unpack_from(self.map, SEQUENCE_OFFSET)[0]
+            if before & 1:
+                continue
+            fields = PAGE_STRUCT.unpack_from(self.map, 0)
+            after = SEQUENCE_STRUCT.unpack_from(self.map, SEQUENCE_OFFSET)[0]
+            if before != after:
+                continue
+            magic, version = fields[0], fields[1]
+            if magic != MAGIC or version != VERSION:
+                return None
+            return StatusSnapshot(*fields[3:])
+        return None
+
+    def remaining(self, now=None):
+        """Seconds left in the current session, or None when not running"""
+        snapshot = self.read()
+        if snapshot is None or snapshot.state == STATE_STOPPED:
+            return None
+        if snapshot.paused:
+            return snapshot.remaining
+        if now is None:
+            now = time.time()
+        return max(0.0, snapshot.deadline - now)
+
+    def format(self, now=None):
+        """Short prompt-friendly text such as 'work 12:34' or 'break 03:00 (paused)'"""
+        snapshot = self.read()
+        if snapshot is None or snapshot.state == STATE_STOPPED:
+            return ""
+        if snapshot.paused:
+            left = snapshot.remaining
+        else:
+            left = max(0.0, snapshot.deadline - (time.time() if now is None else now))
+        left = int(left + 0.999)
+        text = f"{STATE_NAMES.get(snapshot.state, '?')} {left // 60:02d}:{left % 60:02d}"
+        if snapshot.paused:
+            text += " (paused)"
+        return text
+
+    def close(self):
+        """Unmap the page"""
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+
+if __name__ == "__main__":
+    # Allows `python3 -m ipc.status_page` from a prompt command
+    print(StatusPageReader(sys.argv[1] if len(sys.argv) > 1 else None).format())
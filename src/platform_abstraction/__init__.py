@@ -28,11 +28,14 @@ elif SYSTEM == "windows":
 else:
     raise ImportError(f"Unsupported platform: {SYSTEM}")
 
+from .dispatcher import NotificationDispatcher
+
 __all__ = [
     'NotificationManager',
     'SystemTrayManager', 
     'ScreenManager',
     'AutostartManager',
     'FileLockManager',
+    'NotificationDispatcher',
     'SYSTEM'
 ] 
\ No newline at end of file
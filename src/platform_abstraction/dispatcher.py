@@ -0,0 +1,185 @@
+"""
+Asynchronous notification dispatcher for Pomodoro Lock
+
+Sending a desktop notification is a D-Bus round trip to the notification
+daemon; when the daemon hangs, so does the caller. The dispatcher keeps
+that off the timer thread: send_notification() only appends a request to a
+small bounded queue and a worker thread, which owns the connection to the
+daemon, does the sending. When the queue is full the oldest request is
+dropped, and requests still queued after max_age seconds are discarded as
+stale instead of popping up long after the event they describe.
+
+Requests may name a category ("session", "snooze"). A categorized request
+is held for a short coalescing window, and a newer request of the same
+category arriving meanwhile replaces it, so a burst of pause/resume clicks
+produces one notification. The sender is expected to keep one live
+notification per category and update it in place.
+
+A sender returns True or False once the daemon has answered, or None if it
+only started an asynchronous call; it then reports the outcome later
+through completed().
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+
+DEFAULT_CAPACITY = 8
+DEFAULT_MAX_AGE = 30.0
+DEFAULT_COALESCE_WINDOW = 0.25
+
+
+class NotificationRequest:
+    """One queued notification"""
+
+    __slots__ = ('title', 'message', 'urgency', 'timeout', 'category',
+                 'queued_at', 'expires_at', 'not_before', 'sent_at', 'coalesced')
+
+    def __init__(self, title, message, urgency, timeout, category, queued_at, expires_at, not_before):
+        self.title = title
+        self.message = message
+        self.urgency = urgency
+        self.timeout = timeout
+        self.category = category
+        self.queued_at = queued_at
+        self.expires_at = expires_at
+        self.not_before = not_before
+        self.sent_at = None
+        self.coalesced = 0
+
+
+class NotificationDispatcher:
+    """Bounded, drop-oldest notification queue drained by a worker thread"""
+
+    def __init__(self, send, capacity=DEFAULT_CAPACITY, max_age=DEFAULT_MAX_AGE,
+                 coalesce_window=DEFAULT_COALESCE_WINDOW, name="notifications",
+                 clock=time.monotonic):
+        self.send = send
+        self.capacity = capacity
+        self.max_age = max_age
+        self.coalesce_window = coalesce_window
+        self.name = name
+        self.clock = clock
+        # Called as observer(queued_seconds, send_seconds, ok) after every send
+        self.observer = None
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.expired = 0
+        self.coalesced = 0
+        self._queue = deque()
+        self._busy = False
+        self._stopping = False
+        self._thread = None
+        self._cond = threading.Condition()
+
+    def submit(self, title, message, urgency="normal", timeout=10, category=None):
+        """Queue a notification; never blocks on the notification daemon"""
+        now = self.clock()
+        with self._cond:
+            if self._stopping:
+                return False
+            if category is not None:
+                for queued in self._queue:
+                    if queued.category == category:
+                        # Latest wins; the burst is sent once the window has passed
+                        queued.title, queued.message = title, message
+                        queued.urgency, queued.timeout = urgency, timeout
+                        queued.expires_at = now + self.max_age
+                        queued.coalesced += 1
+                        self.coalesced += 1
+                        return True
+            not_before = now + self.coalesce_window if category is not None else now
+            request = NotificationRequest(
+                title, message, urgency, timeout, category, now, now + self.max_age, not_before
+            )
+            if len(self._queue) >= self.capacity:
+                dropped = self._queue.popleft()
+                self.dropped += 1
+                logging.warning(f"Notification queue full, dropped: {dropped.message}")
+            self._queue.append(request)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+        return True
+
+    def pending(self):
+        """Number of queued requests"""
+        with self._cond:
+            return len(self._queue)
+
+    def flush(self, timeout=5.0):
+        """Wait until the queue is empty and no send is in progress"""
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while self._queue or self._busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def stop(self, timeout=1.0):
+        """Stop the worker; requests still queued are discarded"""
+        with self._cond:
+            self._stopping = True
+            self._queue.clear()
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    if self._queue:
+                        delay = self._queue[0].not_before - self.clock()
+                        if delay <= 0:
+                            break
+                        self._cond.wait(delay)
+                    else:
+                        self._cond.wait()
+                if self._stopping:
+                    return
+                request = self._queue.popleft()
+                self._busy = True
+            try:
+                self._deliver(request)
+            finally:
+                with self._cond:
+                    self._busy = False
+                    self._cond.notify_all()
+
+    def _deliver(self, request):
+        """Send one request on the worker thread"""
+        start = self.clock()
+        if start > request.expires_at:
+            self.expired += 1
+            logging.warning(f"Notification expired after {start - request.queued_at:.1f} s in the queue: {request.message}")
+            return
+        request.sent_at = start
+        try:
+            ok = self.send(request)
+        except Exception as e:
+            logging.error(f"Failed to send notification: {e}")
+            ok = False
+        if ok is not None:
+            self.completed(request, bool(ok))
+
+    def completed(self, request, ok):
+        """Record the outcome of a send; asynchronous senders call this from their reply handler"""
+        now = self.clock()
+        sent_at = request.sent_at if request.sent_at is not None else now
+        with self._cond:
+            if ok:
+                self.sent += 1
+            else:
+                self.failed += 1
+        if self.observer is not None:
+            try:
+                self.observer(sent_at - request.queued_at, now - sent_at, ok)
+            except Exception as e:
+                logging.error(f"Notification observer failed: {e}")
@@ -9,9 +9,13 @@ import fcntl
 import subprocess
 import logging
 import warnings
+import threading
+import importlib.util
 import platform as platform_module
 from pathlib import Path
 
+from .dispatcher import NotificationDispatcher
+
 # Suppress all appindicator-related deprecation warnings
 warnings.filterwarnings("ignore", message=".*libayatana-appindicator is deprecated.*")
 warnings.filterwarnings("ignore", message=".*libayatana-appindicator.*")
@@ -26,6 +30,7 @@ if platform_module.system().lower() != "linux":
 GTK_AVAILABLE = False
 XLIB_AVAILABLE = False
 NOTIFY2_AVAILABLE = False
+GIO_AVAILABLE = False
 APPINDICATOR_AVAILABLE = False
 APPINDICATOR_NEW_API = False
 
@@ -45,10 +50,19 @@ except ImportError:
     logging.warning("python-xlib not available - screen detection will be limited")
 
 try:
-    import notify2
-    NOTIFY2_AVAILABLE = True
-except ImportError:
-    logging.warning("notify2 not available - notifications will be disabled")
+    gi.require_version('Gio', '2.0')
+    from gi.repository import Gio, GLib
+    GIO_AVAILABLE = True
+except (ImportError, NameError, ValueError):
+    pass
+
+# notify2 (and dbus-python) is only imported if its backend is selected
+NOTIFY2_AVAILABLE = importlib.util.find_spec('notify2') is not None
+if not NOTIFY2_AVAILABLE and not GIO_AVAILABLE:
+    logging.warning("Neither Gio nor notify2 available - notifications will be disabled")
+
+# Which notification backend to use: "gio" (default) or "notify2"
+NOTIFY_BACKEND_ENV = 'POMODORO_NOTIFY_BACKEND'
 
 # Try to import the newer libayatana-appindicator-glib first
 try:
@@ -76,48 +90,223 @@ except ImportError:
     except ImportError:
         logging.warning("No appindicator library available - system tray will be disabled")
 
-class NotificationManager:
-    """Linux notification manager using notify2"""
+def _notification_timeout(urgency, timeout):
+    """Display time in seconds for an urgency level"""
+    if urgency == "low":
+        # Low urgency notifications disappear faster
+        return min(timeout, 5)
+    if urgency == "high":
+        # High urgency notifications stay longer
+        return max(timeout, 15)
+    # Normal notifications use default timeout
+    return min(timeout, 10)
+
+class Notify2Backend:
+    """Sends notifications with notify2 (dbus-python), waiting for each on the dispatcher thread
+    
+    notify2's D-Bus call has no timeout, so it runs on a helper thread that
+    the dispatcher waits on for at most CALL_TIMEOUT. A call the daemon never
+    answers is abandoned, sends time out straight away until it returns, and
+    the next send after it connects to D-Bus again.
+    """
+    
+    name = "notify2"
+    CALL_TIMEOUT = 5.0
     
     def __init__(self):
-        self.initialized = False
-        if NOTIFY2_AVAILABLE:
+        self.notify2 = None
+        # One live notification per category, updated in place (replaces_id)
+        self._live = {}
+        # Helper thread of a call the daemon has not answered yet
+        self._stuck = None
+        # Connect again before the next send (set after a call timed out)
+        self._reconnect = False
+    
+    def show(self, request):
+        """Send one queued notification (runs on the dispatcher thread)"""
+        if self._stuck is not None:
+            if self._stuck.is_alive():
+                raise TimeoutError("notification daemon has not answered an earlier notification")
+            self._stuck = None
+        
+        result = {}
+        call = threading.Thread(target=self._call, args=(request, result), name="notify2-call", daemon=True)
+        call.start()
+        call.join(self.CALL_TIMEOUT)
+        if call.is_alive():
+            self._stuck = call
+            self._reconnect = True
+            raise TimeoutError(f"notification daemon did not answer within {self.CALL_TIMEOUT:g} s")
+        if 'error' in result:
+            raise result['error']
+        return True
+    
+    def _call(self, request, result):
+        """The blocking notify2 send (runs on a helper thread)"""
+        try:
+            self._send(request)
+        except Exception as e:
+            result['error'] = e
+    
+    def _send(self, request):
+        if self._reconnect:
+            self._reconnect = False
+            self.notify2 = None
+            self._live = {}
+        if self.notify2 is None:
+            import notify2
+            # One call at a time uses this D-Bus connection
+            notify2.init("Pomodoro Lock")
+            self.notify2 = notify2
+        notify2 = self.notify2
+        
+        notification = self._live.get(request.category)
+        if notification is None:
+            notification = notify2.Notification(request.title, request.message)
+            if request.category is not None:
+                self._live[request.category] = notification
+        else:
+            # show() passes the previous id as replaces_id, so the bubble is updated in place
+            notification.update(request.title, request.message)
+        
+        # Convert string urgency to notify2 constants
+        if request.urgency == "low":
+            notification.set_urgency(notify2.URGENCY_LOW)
+        elif request.urgency == "high":
+            notification.set_urgency(notify2.URGENCY_CRITICAL)
+        else:  # normal
+            notification.set_urgency(notify2.URGENCY_NORMAL)
+        
+        # Set timeout for auto-disappear (in milliseconds)
+        notification.set_timeout(_notification_timeout(request.urgency, request.timeout) * 1000)
+        
+        notification.show()
+
+class GioBackend:
+    """Sends notifications over the process's shared GDBus connection, asynchronously
+    
+    The session bus is connected on the first send. Notify replies are handled
+    by the GLib main loop that already runs the GUI, so no second D-Bus stack
+    or main loop integration is loaded.
+    """
+    
+    name = "gio"
+    BUS_NAME = "org.freedesktop.Notifications"
+    OBJECT_PATH = "/org/freedesktop/Notifications"
+    URGENCY = {"low": 0, "normal": 1, "high": 2}
+    CALL_TIMEOUT_MS = 5000
+    
+    def __init__(self, complete):
+        # complete(request, ok) reports the outcome of an asynchronous send
+        self.complete = complete
+        self.connection = None
+        self._ids = {}
+        self._in_flight = set()
+        self._deferred = {}
+        self._lock = threading.Lock()
+    
+    def show(self, request):
+        """Start sending one notification; the reply arrives on the main loop"""
+        if self.connection is None:
+            self.connection = Gio.bus_get_sync(Gio.BusType.SESSION, None)
+        
+        with self._lock:
+            if request.category is not None:
+                if request.category in self._in_flight:
+                    # Wait for the previous id so this one replaces it
+                    superseded = self._deferred.get(request.category)
+                    self._deferred[request.category] = request
+                    if superseded is not None:
+                        self.complete(superseded, True)
+                    return None
+                self._in_flight.add(request.category)
+            replaces_id = self._ids.get(request.category, 0)
+        
+        hints = {"urgency": GLib.Variant("y", self.URGENCY.get(request.urgency, 1))}
+        timeout_ms = _notification_timeout(request.urgency, request.timeout) * 1000
+        self.connection.call(
+            self.BUS_NAME, self.OBJECT_PATH, self.BUS_NAME, "Notify",
+            GLib.Variant("(susssasa{sv}i)", (
+                "Pomodoro Lock", replaces_id, "", request.title, request.message, [], hints, timeout_ms
+            )),
+            GLib.VariantType.new("(u)"),
+            Gio.DBusCallFlags.NONE,
+            self.CALL_TIMEOUT_MS,
+            None,
+            self._on_reply,
+            request
+        )
+        return None
+    
+    def _on_reply(self, connection, result, request):
+        """Notify reply (or timeout) for one request"""
+        try:
+            notification_id = connection.call_finish(result).unpack()[0]
+            ok = True
+        except Exception as e:
+            logging.error(f"Failed to send notification: {e}")
+            notification_id, ok = 0, False
+        
+        deferred = None
+        with self._lock:
+            if request.category is not None:
+                if ok:
+                    self._ids[request.category] = notification_id
+                self._in_flight.discard(request.category)
+                deferred = self._deferred.pop(request.category, None)
+        self.complete(request, ok)
+        
+        if deferred is not None:
             try:
-                notify2.init("Pomodoro Lock")
-                self.initialized = True
+                self.show(deferred)
             except Exception as e:
-                logging.error(f"Failed to initialize notify2: {e}")
+                logging.error(f"Failed to send notification: {e}")
+                self.complete(deferred, False)
+
+class NotificationManager:
+    """Linux notification manager, sending from a worker thread via Gio (default) or notify2"""
     
-    def send_notification(self, title, message, urgency="normal", timeout=10):
-        """Send a desktop notification with auto-disappear timeout"""
+    def __init__(self, backend=None):
+        backend = backend or os.environ.get(NOTIFY_BACKEND_ENV, "gio")
+        self.dispatcher = NotificationDispatcher(self._show, name="notifications")
+        if (backend == "gio" or not NOTIFY2_AVAILABLE) and GIO_AVAILABLE:
+            self.backend = GioBackend(self.dispatcher.completed)
+        elif NOTIFY2_AVAILABLE:
+            self.backend = Notify2Backend()
+        else:
+            self.backend = None
+        self.initialized = self.backend is not None
+    
+    def send_notification(self, title, message, urgency="normal", timeout=10, category=None):
+        """Queue a desktop notification with auto-disappear timeout (never blocks)
+        
+        Notifications with the same category replace each other on screen.
+        """
         if not self.initialized:
             logging.warning("Notifications not available")
             return False
         
+        return self.dispatcher.submit(title, message, urgency, timeout, category)
+    
+    def close(self):
+        """Stop the notification worker"""
+        self.dispatcher.stop()
+    
+    def _show(self, request):
+        """Send one queued notification (runs on the dispatcher thread)"""
         try:
-            notification = notify2.Notification(title, message)
-            
-            # Convert string urgency to notify2 constants
-            if urgency == "low":
-                notification.set_urgency(notify2.URGENCY_LOW)
-                # Low urgency notifications disappear faster
-                timeout = min(timeout, 5)
-            elif urgency == "high":
-                notification.set_urgency(notify2.URGENCY_CRITICAL)
-                # High urgency notifications stay longer
-                timeout = max(timeout, 15)
-            else:  # normal
-                notification.set_urgency(notify2.URGENCY_NORMAL)
-                # Normal notifications use default timeout
-                timeout = min(timeout, 10)
-            
-            # Set timeout for auto-disappear (in milliseconds)
-            notification.set_timeout(timeout * 1000)
-            
-            notification.show()
-            return True
+            return self.backend.show(request)
+        except TimeoutError as e:
+            # Only this notification is lost; the backend reconnects on the next one
+            logging.warning(f"Notification not sent ({self.backend.name}): {e}")
+            return False
+        except ImportError as e:
+            logging.error(f"Notifications not available ({self.backend.name}): {e}")
+            self.initialized = False
+            return False
         except Exception as e:
-            logging.error(f"Failed to send notification: {e}")
+            # An initialization that failed is retried with the next notification
+            logging.error(f"Failed to send notification ({self.backend.name}): {e}")
             return False
 
 class SystemTrayManager:
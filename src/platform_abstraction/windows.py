@@ -58,8 +58,8 @@ class NotificationManager:
             except Exception as e:
                 logging.error(f"Failed to initialize toast notifier: {e}")
     
-    def send_notification(self, title, message, urgency="normal", timeout=10):
-        """Send a Windows toast notification with auto-disappear timeout"""
+    def send_notification(self, title, message, urgency="normal", timeout=10, category=None):
+        """Send a Windows toast notification with auto-disappear timeout (category is ignored)"""
         if not self.toaster:
             logging.warning("Notifications not available")
             return False
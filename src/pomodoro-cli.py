@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Pomodoro Lock CLI - Talks to the running timer
+
+Commands that query or control the running Pomodoro Lock instance over its
+local control channel. The launcher (`pomodoro-lock`) forwards to this script.
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+
+# Allow running from the source tree as well as from the install directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ipc.control import ControlError, send_command, subscribe
+from ipc.status_page import StatusPageReader
+from ipc.coordinator import default_coordinator_path
+from engine.team import TeamSchedule, DEFAULT_TEAM
+from storage.history import default_history_dir, KIND_NAMES
+from storage.history_query import HistoryIndex, format_report
+from storage import analytics
+from storage.export import export_history, parse_time, EXPORT_FORMATS
+from settings.loader import DEFAULT_CONFIG
+from settings.layers import SettingsLoader
+from telemetry.metrics import format_metrics
+from telemetry.prometheus import render
+
+
+def format_event(event):
+    """Format a status or transition event as one human-readable line"""
+    remaining = int(event.get('remaining', 0))
+    stamp = time.strftime('%H:%M:%S', time.localtime(event.get('time', time.time())))
+    text = f"{stamp} {event.get('event', 'status'):<11} {event.get('state', '?'):<5} {remaining // 60:02d}:{remaining % 60:02d}"
+    if event.get('paused'):
+        until = event.get('snooze_until')
+        text += f" (paused until {time.strftime('%H:%M:%S', time.localtime(until))})" if until else " (paused)"
+    return text
+
+
+def print_event(event, as_json):
+    """Print one event and flush so pipes see it immediately"""
+    if as_json:
+        print(json.dumps(event, separators=(',', ':')))
+    else:
+        print(format_event(event))
+    sys.stdout.flush()
+
+
+def cmd_status(args):
+    """Show the current state, or stream transitions with --watch"""
+    if args.watch:
+        try:
+            for event in subscribe():
+                if event.get('event') == 'subscribed':
+                    event['event'] = 'status'
+                print_event(event, args.json)
+        except KeyboardInterrupt:
+            return 0
+        except ControlError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print("Pomodoro Lock stopped", file=sys.stderr)
+        return 1
+
+    try:
+        reply = send_command('status')
+    except ControlError:
+        # Fall back to the status page, e.g. when the socket is not reachable
+        text = StatusPageReader().format()
+        if not text:
+            print("Pomodoro Lock is not running", file=sys.stderr)
+            return 1
+        print(text)
+        return 0
+    print_event(reply, args.json)
+    return 0
+
+
+def print_heatmap(args):
+    """Print the focus heatmap, rolling average, break compliance and streaks"""
+    if not analytics.NUMPY_AVAILABLE:
+        print("The heatmap needs NumPy (install python3-numpy)", file=sys.stderr)
+        return 1
+
+    columns = analytics.load_columns(args.history_dir)
+    recent = columns.select(columns.timestamp >= time.time() - args.days * 86400)
+    print(f"Focus by weekday and hour of session start, last {args.days} days")
+    print(analytics.format_heatmap(analytics.heatmap(recent)))
+    print("-" * 60)
+
+    rolling = analytics.rolling_focus(columns, window=7, days=1)[-1]
+    compliance = analytics.break_compliance(recent)[0]
+    longest, current = analytics.streaks(columns)
+    print(f"7-day focus average {int(rolling) // 60}m per day")
+    if compliance == compliance:
+        print(f"Breaks taken to the end {compliance:.0%}")
+    print(f"Streak {current[0]} days (longest {longest[0]})")
+    return 0
+
+
+def cmd_report(args):
+    """Print focus, break and snooze totals from the session history"""
+    if args.heatmap:
+        return print_heatmap(args)
+
+    index = HistoryIndex(args.history_dir)
+    index.refresh()
+
+    if args.weekly:
+        summaries = index.weekly(args.weeks)
+        label = "Week"
+    else:
+        summaries = index.daily(args.days)
+        label = "Day"
+
+    if args.json:
+        for summary in summaries:
+            row = summary._asdict()
+            row[label.lower()] = str(summary[0])
+            print(json.dumps(row, separators=(',', ':')))
+        return 0
+
+    print(format_report(summaries, label))
+    totals = index.totals(args.weeks * 7 if args.weekly else args.days)
+    focus = totals['focus_seconds'] // 60
+    print("-" * 60)
+    print(
+        f"Total focus {focus // 60}h{focus % 60:02d}m in {totals['sessions']} sessions, "
+        f"{totals['breaks']} breaks taken, {totals['skipped_breaks']} skipped, "
+        f"{totals['snoozes']} snoozes"
+    )
+    return 0
+
+
+def cmd_export(args):
+    """Stream the session history as CSV or JSON Lines"""
+    try:
+        start = parse_time(args.since) if args.since else None
+        end = parse_time(args.until) if args.until else None
+    except ValueError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    kinds = {kind for kind, name in KIND_NAMES.items() if name in args.event} if args.event else None
+
+    try:
+        if args.output:
+            with open(args.output, 'w', newline='') as out:
+                count = export_history(out, args.history_dir, args.format, start, end, kinds)
+            print(f"Exported {count} records to {args.output}", file=sys.stderr)
+        else:
+            export_history(sys.stdout, args.history_dir, args.format, start, end, kinds)
+            sys.stdout.flush()
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head); stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    return 0
+
+
+def cmd_config(args):
+    """Show the effective settings and the layer each value comes from"""
+    settings = SettingsLoader().get_or_fallback()
+    if args.json:
+        print(json.dumps({
+            key: {
+                'value': getattr(settings, key),
+                'source': settings.source(key),
+                'locked': key in settings.locked
+            }
+            for key in DEFAULT_CONFIG
+        }, separators=(',', ':')))
+        return 0
+
+    for key in DEFAULT_CONFIG:
+        note = "locked by policy" if key in settings.locked else settings.source(key)
+        print(f"{key:<30} {getattr(settings, key):>4}  ({note})")
+    return 0
+
+
+def cmd_metrics(args):
+    """Show the running timer's hot-path metrics"""
+    try:
+        reply = send_command('metrics')
+    except ControlError:
+        print("Pomodoro Lock is not running", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(reply.get('metrics', {}), separators=(',', ':')))
+    elif args.prometheus:
+        sys.stdout.write(render(reply.get('metrics', {})))
+    else:
+        print(format_metrics(reply.get('metrics', {})))
+    return 0
+
+
+def cmd_team(args):
+    """Show a team's schedule on the coordinator, or change it"""
+    address = args.coordinator or os.environ.get('POMODORO_TEAM_SYNC')
+    if not address or address == '1':
+        address = default_coordinator_path()
+    team = args.team or os.environ.get('POMODORO_TEAM') or DEFAULT_TEAM
+    changes = {}
+    if args.start_now:
+        changes['epoch'] = 'now'
+    if args.work_minutes is not None:
+        changes['work_time_minutes'] = args.work_minutes
+    if args.break_minutes is not None:
+        changes['break_time_minutes'] = args.break_minutes
+
+    try:
+        reply = send_command('set-schedule' if changes else 'schedule', path=address, team=team, **changes)
+    except ControlError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if not reply.get('ok', True):
+        print(f"Error: {reply.get('error')}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(reply, separators=(',', ':')))
+        return 0
+
+    schedule = TeamSchedule.from_dict(reply)
+    working, left = schedule.phase()
+    left = int(left)
+    # New teams count from epoch 0 until a start time is set
+    since = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(schedule.epoch)) if schedule.epoch else "the default epoch"
+    print(f"Team {schedule.team}: {schedule.work_time // 60}m work, {schedule.break_time // 60}m break "
+          f"from {since} (version {schedule.version})")
+    print(f"Now: {'work' if working else 'break'}, {left // 60:02d}:{left % 60:02d} left")
+    return 0
+
+
+def build_parser():
+    """Build the argument parser"""
+    parser = argparse.ArgumentParser(
+        prog="pomodoro-lock",
+        description="Query and control the running Pomodoro Lock timer"
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    status = commands.add_parser("status", help="Show the timer state")
+    status.add_argument("--watch", action="store_true",
+                        help="Stream state transitions as they happen")
+    status.add_argument("--json", action="store_true",
+                        help="Print JSON lines instead of text")
+    status.set_defaults(func=cmd_status)
+
+    report = commands.add_parser("report", help="Summarize the session history")
+    report.add_argument("--days", type=int, default=7,
+                        help="Number of days to show (default: 7)")
+    report.add_argument("--weekly", action="store_true",
+                        help="Show ISO weeks instead of days")
+    report.add_argument("--weeks", type=int, default=4,
+                        help="Number of weeks with --weekly (default: 4)")
+    report.add_argument("--json", action="store_true",
+                        help="Print JSON lines instead of a table")
+    report.add_argument("--heatmap", action="store_true",
+                        help="Show focus by weekday and hour, streaks and break compliance")
+    report.add_argument("--history-dir", default=str(default_history_dir()),
+                        help=argparse.SUPPRESS)
+    report.set_defaults(func=cmd_report)
+
+    export = commands.add_parser("export", help="Stream the session history as CSV or JSON Lines")
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="csv",
+                        help="Output format (default: csv)")
+    export.add_argument("--since",
+                        help="Start of the range: ISO date/time (local) or epoch seconds")
+    export.add_argument("--until",
+                        help="End of the range: ISO date/time (local) or epoch seconds")
+    export.add_argument("--event", action="append", choices=sorted(KIND_NAMES.values()),
+                        help="Only export these events (repeatable)")
+    export.add_argument("-o", "--output",
+                        help="Write to a file instead of standard output")
+    export.add_argument("--history-dir", default=str(default_history_dir()),
+                        help=argparse.SUPPRESS)
+    export.set_defaults(func=cmd_export)
+
+    config = commands.add_parser("config", help="Show the effective settings and where they come from")
+    config.add_argument("--json", action="store_true",
+                        help="Print JSON instead of text")
+    config.set_defaults(func=cmd_config)
+
+    metrics = commands.add_parser("metrics", help="Show session counters and tick, GUI, overlay and notification timings")
+    metrics.add_argument("--json", action="store_true",
+                        help="Print the raw metrics as JSON")
+    metrics.add_argument("--prometheus", action="store_true",
+                        help="Print the metrics in the Prometheus text format")
+    metrics.set_defaults(func=cmd_metrics)
+
+    team = commands.add_parser("team", help="Show or change a team schedule on the team coordinator")
+    team.add_argument("--team",
+                      help=f"Team name (default: $POMODORO_TEAM or {DEFAULT_TEAM})")
+    team.add_argument("--coordinator",
+                      help=f"Coordinator socket or tcp://host:port (default: {default_coordinator_path()})")
+    team.add_argument("--start-now", action="store_true",
+                      help="Start the team's next work session now")
+    team.add_argument("--work-minutes", type=int,
+                      help="Change the team's work session length")
+    team.add_argument("--break-minutes", type=int,
+                      help="Change the team's break length")
+    team.add_argument("--json", action="store_true",
+                      help="Print JSON instead of text")
+    team.set_defaults(func=cmd_team)
+
+    return parser
+
+
+def main(argv=None):
+    """Main entry point"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if not getattr(args, 'func', None):
+        parser.print_help()
+        return 1
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
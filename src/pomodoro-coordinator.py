@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Pomodoro Lock team coordinator - shared work and break schedules for teams
+
+Runs as a system service (pomodoro-lock-coordinator.service). Timers with
+POMODORO_TEAM_SYNC set subscribe to it and align their sessions to their
+team's schedule. The launcher (`pomodoro-lock coordinator`) forwards to
+this script.
+"""
+
+import os
+import sys
+import signal
+import logging
+import argparse
+import threading
+
+# Allow running from the source tree as well as from the install directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ipc.coordinator import TeamCoordinator, default_coordinator_path, MAX_TEAMS, MAX_TEAMS_PER_PEER
+from settings.loader import DEFAULT_CONFIG
+from telemetry.logsetup import LOG_FORMAT
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def raise_file_limit():
+    """Allow as many open connections as the hard limit permits"""
+    if resource is None:
+        return
+    try:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft != hard:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+            logging.info(f"Raised the open file limit from {soft} to {hard}")
+    except (ValueError, OSError) as e:
+        logging.warning(f"Could not raise the open file limit: {e}")
+
+
+def build_parser():
+    """Build the argument parser"""
+    parser = argparse.ArgumentParser(
+        prog="pomodoro-lock coordinator",
+        description="Distribute team work and break schedules to Pomodoro Lock timers"
+    )
+    parser.add_argument('--listen', action='append', default=None, metavar='ADDRESS',
+                        help=f"Unix socket path or tcp://host:port to listen on, may be repeated "
+                             f"(default: {default_coordinator_path()})")
+    parser.add_argument('--state', default=None,
+                        help="JSON file the team schedules are kept in")
+    parser.add_argument('--work-minutes', type=int, default=DEFAULT_CONFIG["work_time_minutes"],
+                        help="Work session length of new teams")
+    parser.add_argument('--break-minutes', type=int, default=DEFAULT_CONFIG["break_time_minutes"],
+                        help="Break length of new teams")
+    parser.add_argument('--max-teams', type=int, default=MAX_TEAMS,
+                        help="Teams served before timers can no longer start new ones")
+    parser.add_argument('--max-teams-per-peer', type=int, default=MAX_TEAMS_PER_PEER,
+                        help="Teams one local user or TCP host may start")
+    return parser
+
+
+def main(argv=None):
+    """Main entry point"""
+    args = build_parser().parse_args(argv)
+    # Under systemd the journal records stderr
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+    raise_file_limit()
+
+    coordinator = TeamCoordinator(args.listen, args.state, args.work_minutes, args.break_minutes,
+                                  max_teams=args.max_teams, max_teams_per_peer=args.max_teams_per_peer)
+    stop_event = threading.Event()
+
+    def signal_handler(signum, frame):
+        logging.info(f"Received signal {signum}, stopping team coordinator")
+        stop_event.set()
+
+    signal.signal(signal.SIGTERM, signal_handler)
+    signal.signal(signal.SIGINT, signal_handler)
+
+    if not coordinator.start():
+        return 1
+    while not stop_event.wait(3600):
+        pass
+    coordinator.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
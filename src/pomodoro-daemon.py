@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Pomodoro Lock session daemon - one timer service for every session on the host
+
+Runs as a system service (pomodoro-lock-daemon.service). Desktop sessions
+connect with pomodoro-session-client.py instead of each running the full
+timer. The launcher (`pomodoro-lock daemon`) forwards to this script.
+"""
+
+import os
+import sys
+import signal
+import logging
+import argparse
+
+# Allow running from the source tree as well as from the install directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from ipc.session_daemon import SessionDaemon, default_daemon_path, MAX_SESSIONS_PER_USER
+from engine.sessions import DEFAULT_EXPIRE_AFTER
+from telemetry.logsetup import LOG_FORMAT
+
+
+def build_parser():
+    """Build the argument parser"""
+    parser = argparse.ArgumentParser(
+        prog="pomodoro-lock daemon",
+        description="Serve Pomodoro Lock timers for all desktop sessions on this host"
+    )
+    parser.add_argument('--socket', default=None,
+                        help=f"Socket to listen on (default: {default_daemon_path()})")
+    parser.add_argument('--expire-after', type=int, default=DEFAULT_EXPIRE_AFTER,
+                        help="Seconds a session is kept after its last client disconnects")
+    parser.add_argument('--max-sessions-per-user', type=int, default=MAX_SESSIONS_PER_USER,
+                        help="Sessions each user may keep at once")
+    return parser
+
+
+def main(argv=None):
+    """Main entry point"""
+    args = build_parser().parse_args(argv)
+    # Under systemd the journal records stderr
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
+    daemon = SessionDaemon(args.socket, expire_after=args.expire_after,
+                           max_sessions_per_user=args.max_sessions_per_user)
+
+    def signal_handler(signum, frame):
+        logging.info(f"Received signal {signum}, stopping session daemon")
+        daemon.stop_event.set()
+
+    signal.signal(signal.SIGTERM, signal_handler)
+    signal.signal(signal.SIGINT, signal_handler)
+
+    if not daemon.start():
+        return 1
+    while not daemon.stop_event.wait(3600):
+        pass
+    daemon.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Pomodoro Lock session client - thin desktop front end of the session daemon
+
+Shows the timer window, break overlays and notifications of one session
+whose timer runs in pomodoro-daemon.py. It keeps no timer of its own: the
+daemon pushes every transition and the window works out the countdown from
+the deadline in the last one. The launcher (`pomodoro-lock client`)
+forwards to this script.
+"""
+
+import os
+import sys
+import math
+import time
+import logging
+import argparse
+import threading
+
+# Allow running from the source tree as well as from the install directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import gi
+gi.require_version('Gtk', '3.0')
+gi.require_version('GLib', '2.0')
+from gi.repository import Gtk, GLib
+
+from platform_abstraction.linux import NotificationManager
+from gui.gtk_ui import TimerWindow, MultiDisplayOverlay
+from ipc.control import ControlError, send_command, subscribe
+from ipc.session_daemon import default_daemon_path, DEFAULT_SESSION
+from settings.layers import SettingsLoader
+from settings.loader import default_config_path
+from telemetry.logsetup import configure_logging
+
+# Reconnect delays after losing the daemon, in seconds
+RECONNECT_MIN = 1
+RECONNECT_MAX = 60
+
+
+def format_duration(seconds):
+    """Describe a snooze length for notifications ("10 minutes", "45 seconds")"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} second{'s' if seconds != 1 else ''}"
+    minutes = (seconds + 59) // 60
+    return f"{minutes} minute{'s' if minutes != 1 else ''}"
+
+
+class SessionClient:
+    """Renders one daemon session: timer window, break overlays and notifications"""
+
+    def __init__(self, path=None, session=DEFAULT_SESSION):
+        self.path = str(path if path else default_daemon_path())
+        self.session = session
+        self.settings_loader = SettingsLoader(user_path=default_config_path())
+        self.notification_manager = NotificationManager()
+        self.timer_window = TimerWindow(
+            on_close=self._on_timer_close,
+            on_power=self.quit_application,
+            on_pause_snooze=self._on_pause_snooze_clicked
+        )
+        self.multi_overlay = MultiDisplayOverlay()
+        self.overlays_shown = False
+        # Last event from the daemon (None until connected)
+        self.state = None
+        self.stop_event = threading.Event()
+
+    def start(self):
+        """Connect to the daemon and run the GTK main loop"""
+        threading.Thread(target=self._listen, name="session-events", daemon=True).start()
+        # Repaints the countdown only; every state change comes from the daemon
+        GLib.timeout_add(1000, self._refresh)
+        self.timer_window.show_window()
+        Gtk.main()
+
+    def quit_application(self):
+        """Disconnect and quit; the daemon keeps the session for a while"""
+        logging.info("Quitting Pomodoro Lock session client")
+        self.stop_event.set()
+        try:
+            self.multi_overlay.destroy_all()
+            self.timer_window.destroy_window()
+            self.notification_manager.close()
+        except Exception as e:
+            logging.error(f"Error during cleanup: {e}")
+        Gtk.main_quit()
+
+    def _listen(self):
+        """Event thread: stay subscribed, reconnecting with backoff"""
+        delay = RECONNECT_MIN
+        while not self.stop_event.is_set():
+            config = self.settings_loader.get_or_fallback().as_config()
+            try:
+                for event in subscribe(self.path, session=self.session, config=config):
+                    if not event.get('ok', True):
+                        raise ControlError(event.get('error', "subscription refused"))
+                    delay = RECONNECT_MIN
+                    GLib.idle_add(self._on_event, event)
+                    if self.stop_event.is_set():
+                        return
+                logging.warning("Session daemon closed the connection")
+            except ControlError as e:
+                logging.warning(f"Session daemon unavailable: {e}")
+            self.stop_event.wait(delay)
+            delay = min(delay * 2, RECONNECT_MAX)
+
+    def _on_event(self, event):
+        """Apply one event from the daemon (GTK thread)"""
+        self.state = event
+        name = event.get('event')
+        is_break = event.get('state') == 'break'
+        if name in ('subscribed', 'break_start', 'break_end', 'work_start'):
+            self._set_overlays(is_break)
+
+        if name == 'warning':
+            self._notify(f"Break starting in {event.get('notification_time', 0) // 60} minutes!", timeout=8)
+        elif name == 'break_start':
+            self._notify("Break time! Take a rest.", "high", timeout=5)
+        elif name == 'break_end':
+            self._notify("Break ended! Back to work.", timeout=6)
+        elif name == 'pause':
+            self._notify(f"Timer paused. Will resume in {format_duration(event.get('snooze_seconds', 0))}",
+                         timeout=10, category="snooze")
+        elif name == 'resume':
+            self._notify("Timer resumed automatically!" if event.get('auto') else "Timer resumed!",
+                         timeout=5, category="snooze")
+        elif name == 'snooze_denied':
+            self._notify("No snooze left for this session", timeout=5, category="snooze")
+        self._update_tooltips(event)
+        self._refresh()
+        return False
+
+    def _set_overlays(self, is_break):
+        """Show the break overlays during a break and hide them otherwise"""
+        try:
+            if is_break and not self.overlays_shown:
+                self.timer_window.lower_window()
+                self.multi_overlay.create_overlays()
+                self.multi_overlay.show_all()
+                self.overlays_shown = True
+            elif not is_break and self.overlays_shown:
+                self.multi_overlay.hide_all()
+                self.timer_window.raise_window()
+                self.overlays_shown = False
+        except Exception as e:
+            logging.error(f"Failed to update break overlay: {e}")
+
+    def _refresh(self):
+        """Repaint the countdown from the last event's deadline"""
+        if self.stop_event.is_set():
+            return False
+        event = self.state
+        if event is None:
+            return True
+        try:
+            if event.get('paused'):
+                left = int(event.get('remaining', 0))
+            else:
+                left = max(0, math.ceil(event.get('deadline', 0) - time.time()))
+            self.timer_window.update_timer(left, event.get('state', 'work'), bool(event.get('paused')))
+            if event.get('state') == 'break' and not event.get('paused'):
+                self.multi_overlay.update_timer(left)
+        except Exception as e:
+            logging.error(f"Failed to update GUI: {e}")
+        return True
+
+    def _update_tooltips(self, event):
+        """Describe the snooze on the pause button"""
+        available = min(event.get('snooze_time', 0), event.get('snooze_left', 0))
+        if available > 0:
+            pause_tooltip = f"Pause and auto-resume in {format_duration(available)}"
+        else:
+            pause_tooltip = "Snooze limit reached for this session"
+        resume_tooltip = "Resume timer"
+        if event.get('paused') and event.get('snooze_until'):
+            resume_tooltip += f" (resumes automatically at {time.strftime('%H:%M', time.localtime(event['snooze_until']))})"
+        self.timer_window.set_pause_tooltips(pause_tooltip, resume_tooltip)
+
+    def _notify(self, message, urgency="normal", timeout=5, category="session"):
+        try:
+            self.notification_manager.send_notification("Pomodoro Lock", message, urgency,
+                                                        timeout=timeout, category=category)
+        except Exception as e:
+            logging.error(f"Failed to send notification: {e}")
+
+    def _on_timer_close(self):
+        self.timer_window.hide_window()
+
+    def _on_pause_snooze_clicked(self):
+        """Ask the daemon to pause or resume; the result arrives as an event"""
+        command = 'resume' if self.state is not None and self.state.get('paused') else 'pause'
+
+        def send():
+            try:
+                send_command(command, self.path, session=self.session)
+            except ControlError as e:
+                logging.error(f"Failed to {command} the timer: {e}")
+
+        threading.Thread(target=send, name="session-command", daemon=True).start()
+
+
+def main(argv=None):
+    """Main entry point"""
+    parser = argparse.ArgumentParser(
+        prog="pomodoro-lock client",
+        description="Show the Pomodoro Lock timer of this desktop session, run by the session daemon"
+    )
+    parser.add_argument('--socket', default=None,
+                        help=f"Session daemon socket (default: {default_daemon_path()})")
+    parser.add_argument('--session', default=DEFAULT_SESSION,
+                        help="Session name; clients with the same name share one timer")
+    args = parser.parse_args(argv)
+
+    configure_logging(os.path.expanduser('~/.local/share/pomodoro-lock/pomodoro-client.log'))
+    SessionClient(args.socket, args.session).start()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
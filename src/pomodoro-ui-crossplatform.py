@@ -54,6 +54,42 @@ elif SYSTEM == "windows":
 else:
     raise ImportError(f"Unsupported platform: {SYSTEM}")
 
+# Platform-independent IPC
+from ipc.status_page import StatusPageWriter, STATE_WORK, STATE_BREAK
+from ipc.control import ControlServer
+from ipc.coordinator import TeamSyncClient
+from storage.checkpoint import StateCheckpoint, resume_plan
+from storage.history import (
+    HistoryLog,
+    KIND_WORK_START,
+    KIND_WORK_END,
+    KIND_BREAK_START,
+    KIND_BREAK_END,
+    KIND_PAUSE,
+    KIND_RESUME,
+    KIND_SNOOZE_DENIED,
+    FLAG_COMPLETED,
+    FLAG_AUTO,
+    FLAG_BREAK,
+    FLAG_LIMITED
+)
+from storage.history_query import HistoryIndex
+from settings.loader import DEFAULT_CONFIG
+from settings.layers import SettingsLoader
+from settings.watcher import ConfigWatcher
+from telemetry.logsetup import configure_logging, flush_log_summaries
+from telemetry.metrics import MetricsRegistry
+from telemetry.prometheus import TextfileExporter, MetricsSocketServer, process_rss_bytes
+from telemetry.flight import FlightRecorder, install_crash_hooks
+from engine.state import TimerState, StateCell
+from engine.team import DEFAULT_TEAM
+from engine.scheduler import (
+    DeadlineScheduler,
+    DEADLINE_WARNING,
+    DEADLINE_SESSION_END,
+    DEADLINE_SNOOZE_END
+)
+
 # Setup logging
 def setup_logging():
     """Setup logging based on platform"""
@@ -62,17 +98,16 @@ def setup_logging():
     else:  # Windows
         log_path = os.path.expanduser('~/AppData/Local/pomodoro-lock/pomodoro-ui.log')
     
-    # Ensure log directory exists
-    Path(log_path).parent.mkdir(parents=True, exist_ok=True)
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_path),
-            logging.StreamHandler()
-        ]
-    )
+    # Log calls only enqueue; a listener thread writes the rotated file and the console
+    configure_logging(log_path)
+
+def format_duration(seconds):
+    """Describe a snooze length for notifications and tooltips ("10 minutes", "45 seconds")"""
+    seconds = int(round(seconds))
+    if seconds < 60:
+        return f"{seconds} second{'s' if seconds != 1 else ''}"
+    minutes = (seconds + 59) // 60
+    return f"{minutes} minute{'s' if minutes != 1 else ''}"
 
 class PomodoroTimer:
     """Cross-platform Pomodoro timer with platform-specific features"""
@@ -84,8 +119,13 @@ class PomodoroTimer:
         # Setup paths
         self._setup_paths()
         
-        # Load configuration
-        self.config = self._load_config()
+        # Ring buffer of recent events, dumped on SIGUSR2 or an uncaught exception
+        self.flight = FlightRecorder()
+        install_crash_hooks(self.flight, self.flight_dir)
+        
+        # Load configuration (policy, user file and environment, merged)
+        self.settings_loader = SettingsLoader(user_path=self.config_dir / "config.json")
+        self.settings = self._load_settings()
         
         # Initialize platform-specific components (but NOT tray yet)
         self.notification_manager = NotificationManager()
@@ -94,20 +134,68 @@ class PomodoroTimer:
         self.file_lock = FileLockManager(str(self.lock_file))
         
         # Timer state
-        self.work_time = self.config.get('work_time_minutes', 25) * 60
-        self.break_time = self.config.get('break_time_minutes', 5) * 60
-        self.notification_time = self.config.get('notification_time_minutes', 2) * 60
-        self.current_time = self.work_time
-        self.is_work_session = True
-        self.is_paused = False
+        self.work_time = self.settings.work_time
+        self.break_time = self.settings.break_time
+        self.notification_time = self.settings.notification_time
+        self.snooze_time = self.settings.snooze_time
+        self.max_snooze = self.settings.max_snooze
+        # Countdown, session and pause state: an immutable snapshot swapped atomically
+        self.timer_state = StateCell(TimerState(self.work_time))
         self.is_running = False
         self.timer_thread = None
         self.stop_event = threading.Event()
         
-        # Snooze functionality
-        self.snooze_timer = None
-        self.snooze_timeout_id = None  # For GLib timeouts on Linux
-        self.paused_time = None
+        # Warning, session end and snooze end, all run by the timer thread
+        self.scheduler = DeadlineScheduler()
+        self._arm_lock = threading.Lock()
+        
+        # Crash-safe checkpoint, written on transitions only
+        self.checkpoint = None
+        self._restored = False
+        
+        # Structured session history (written by a background thread)
+        self.history = None
+        self._paused_at = None
+        
+        # Memory-mapped status page for panels and prompts
+        self.status_page = None
+        
+        # Local control channel (status requests and event subscriptions)
+        self.control_server = None
+        
+        # Reloads the settings when config.json or the policy changes
+        self.config_watcher = None
+        
+        # Optional team sync: sessions follow the team schedule of a coordinator
+        self.team_sync = None
+        self.team_schedule = None
+        
+        # Hot-path metrics, served by the `metrics` control command
+        self.metrics = MetricsRegistry()
+        self.deadline_lateness = self.metrics.histogram(
+            'timer_deadline_lateness_seconds', "How late the timer thread runs each deadline")
+        self.scheduler.observer = lambda name, lateness: self.deadline_lateness.observe(lateness)
+        self.gui_update_duration = self.metrics.histogram(
+            'gui_update_seconds', "Duration of the periodic GUI update callback")
+        self.overlay_show_duration = self.metrics.histogram(
+            'overlay_show_seconds', "Time MultiDisplayOverlay.show_all blocks")
+        self.notification_duration = self.metrics.histogram(
+            'notification_send_seconds', "Time taken to send a desktop notification")
+        self.notification_queue_delay = self.metrics.histogram(
+            'notification_queue_seconds', "Time a notification waited in the send queue")
+        dispatcher = getattr(self.notification_manager, 'dispatcher', None)
+        if dispatcher is not None:
+            dispatcher.observer = self._on_notification_sent
+        self.transition_counters = {
+            'work_start': self.metrics.counter('work_sessions_total', "Work sessions started"),
+            'break_start': self.metrics.counter('breaks_enforced_total', "Breaks that locked the screen"),
+            'break_end': self.metrics.counter('breaks_completed_total', "Breaks that ran to the end"),
+        }
+        self.breaks_snoozed = self.metrics.counter('breaks_snoozed_total', "Breaks paused with the snooze")
+        self.metrics.gauge('process_resident_memory_bytes', "Resident memory of the timer process").set_function(process_rss_bytes)
+        
+        # Optional Prometheus exporters (textfile and Unix socket)
+        self.metrics_exporters = []
         
         # Setup signal handlers (no SIGUSR1)
         self._setup_signal_handlers()
@@ -117,6 +205,21 @@ class PomodoroTimer:
             self._show_already_running_dialog()
             return
         
+        # Only the instance holding the lock publishes status
+        self.status_page = StatusPageWriter()
+        self.checkpoint = StateCheckpoint(self.state_file)
+        self.history = HistoryLog(self.history_dir)
+        HistoryIndex(self.history_dir).attach(self.history)
+        self.history.start()
+        self._start_control_server()
+        self.config_watcher = ConfigWatcher(
+            self.settings_loader.paths,
+            self._on_config_changed,
+            load=self.settings_loader.get
+        )
+        self.config_watcher.start(self.settings)
+        self._start_metrics_exporters()
+        
         # Only now, after lock is acquired, create tray and GUI
         self._init_gui_components()
         
@@ -131,6 +234,9 @@ class PomodoroTimer:
         # Always show the timer window on startup
         self.timer_window.show_window()
         
+        # Continue the session that was running before a crash or restart
+        self._restore_checkpoint()
+        
         # Check and enable systemd service on first launch
         self._check_and_enable_service()
         
@@ -143,44 +249,140 @@ class PomodoroTimer:
             self.config_dir = Path.home() / ".local" / "share" / "pomodoro-lock" / "config"
             self.lock_file = Path.home() / ".local" / "share" / "pomodoro-lock" / "pomodoro-ui.lock"
             self.service_enabled_file = Path.home() / ".local" / "share" / "pomodoro-lock" / ".service-enabled"
+            self.state_file = Path.home() / ".local" / "share" / "pomodoro-lock" / "state"
+            self.history_dir = Path.home() / ".local" / "share" / "pomodoro-lock" / "history"
+            self.flight_dir = Path.home() / ".local" / "share" / "pomodoro-lock" / "flight"
         else:  # Windows
             self.config_dir = Path.home() / "AppData" / "Local" / "pomodoro-lock" / "config"
             self.lock_file = Path.home() / "AppData" / "Local" / "pomodoro-lock" / "pomodoro-ui.lock"
             self.service_enabled_file = Path.home() / "AppData" / "Local" / "pomodoro-lock" / ".service-enabled"
+            self.state_file = Path.home() / "AppData" / "Local" / "pomodoro-lock" / "state"
+            self.history_dir = Path.home() / "AppData" / "Local" / "pomodoro-lock" / "history"
+            self.flight_dir = Path.home() / "AppData" / "Local" / "pomodoro-lock" / "flight"
         
         self.config_dir.mkdir(parents=True, exist_ok=True)
     
-    def _load_config(self):
-        """Load configuration from file"""
+    def _load_settings(self):
+        """Load the effective settings, creating the user config file on first run"""
         config_file = self.config_dir / "config.json"
         
-        default_config = {
-            "work_time_minutes": 25,
-            "break_time_minutes": 5,
-            "notification_time_minutes": 2,
-            "inactivity_threshold_minutes": 10
-        }
-        
-        if config_file.exists():
+        if not config_file.exists():
             try:
-                with open(config_file, 'r') as f:
-                    config = json.load(f)
-                    # Merge with defaults
-                    for key, value in default_config.items():
-                        if key not in config:
-                            config[key] = value
-                    return config
+                with open(config_file, 'w') as f:
+                    json.dump(DEFAULT_CONFIG, f, indent=4)
             except Exception as e:
-                logging.error(f"Failed to load config: {e}")
+                logging.error(f"Failed to save default config: {e}")
         
-        # Create default config
-        try:
-            with open(config_file, 'w') as f:
-                json.dump(default_config, f, indent=4)
-        except Exception as e:
-            logging.error(f"Failed to save default config: {e}")
+        return self.settings_loader.get_or_fallback()
+    
+    def _on_config_changed(self, settings):
+        """Config watcher callback (worker thread): apply on the GUI thread"""
+        if SYSTEM == "linux":
+            import gi
+            gi.require_version('GLib', '2.0')
+            from gi.repository import GLib
+            GLib.idle_add(self.apply_config, settings)
+        else:
+            self.apply_config(settings)
+    
+    def apply_config(self, settings):
+        """Apply new session lengths to the running timer, keeping elapsed time"""
+        old_work_time, old_break_time = self.work_time, self.break_time
+        
+        self.settings = settings
+        self.work_time = settings.work_time
+        self.break_time = settings.break_time
+        self.notification_time = settings.notification_time
+        self.snooze_time = settings.snooze_time
+        self.max_snooze = settings.max_snooze
+        if self.team_schedule is not None:
+            # In team sync mode the team's lengths win over the local ones
+            self.work_time = self.team_schedule.work_time
+            self.break_time = self.team_schedule.break_time
         
-        return default_config
+        now = time.monotonic()
+        
+        def rescale(state):
+            old_length = old_work_time if state.is_work_session else old_break_time
+            length = self.work_time if state.is_work_session else self.break_time
+            # A session already longer than its new length ends a second from now
+            remaining = max(length - (old_length - state.left(now)), 1)
+            if state.is_paused:
+                return state.replace(remaining=remaining, paused_time=remaining)
+            return state.replace(remaining=remaining, deadline=now + remaining)
+        
+        state = self.timer_state.transform(rescale)
+        self._arm_deadlines()
+        logging.info(
+            f"Applied config: work {self.work_time // 60}m, break {self.break_time // 60}m, "
+            f"notification {self.notification_time // 60}m; {state.left(now)}s left in session"
+        )
+        self._on_transition(
+            "config",
+            work_time=self.work_time,
+            break_time=self.break_time,
+            notification_time=self.notification_time
+        )
+        # Runs as a GLib idle callback on Linux; the GUI picks up the change on its next update
+        return False
+    
+    def _start_team_sync(self):
+        """Follow a team schedule when POMODORO_TEAM_SYNC names a coordinator ('1' for the local one)"""
+        address = os.environ.get('POMODORO_TEAM_SYNC')
+        if not address:
+            return
+        self.team_sync = TeamSyncClient(
+            self._on_team_schedule,
+            None if address == '1' else os.path.expanduser(address),
+            os.environ.get('POMODORO_TEAM') or DEFAULT_TEAM,
+            cache_path=self.state_file.with_name("team-schedule.json")
+        )
+        self.team_sync.start()
+    
+    def _on_team_schedule(self, schedule):
+        """Team sync callback (sync thread): apply on the GUI thread"""
+        if SYSTEM == "linux":
+            import gi
+            gi.require_version('GLib', '2.0')
+            from gi.repository import GLib
+            GLib.idle_add(self.apply_team_schedule, schedule)
+        else:
+            self.apply_team_schedule(schedule)
+    
+    def apply_team_schedule(self, schedule):
+        """Take the team's lengths and move the running work session into step with the team"""
+        old_work_time = self.work_time
+        self.team_schedule = schedule
+        self.work_time = schedule.work_time
+        self.break_time = schedule.break_time
+        
+        state = self.timer_state.get()
+        team_working, left = schedule.phase()
+        logging.info(
+            f"Following team {schedule.team} (version {schedule.version}): "
+            f"{'work' if team_working else 'break'}, {int(left)}s left"
+        )
+        if state.is_work_session and not state.is_paused:
+            if team_working:
+                self.timer_state.transform(
+                    lambda state: None if state.is_paused else
+                    state.replace(remaining=left, deadline=time.monotonic() + left)
+                )
+                self._arm_deadlines()
+            else:
+                # The team is on break: join it now
+                self._record_history(KIND_WORK_END, max(0, old_work_time - state.left()))
+                self._start_break(left)
+        # A break or snooze runs its course; the next session starts in step with the team
+        self._on_transition("sync", team=schedule.team, version=schedule.version)
+        return False
+    
+    def _team_left(self, is_work_session):
+        """Seconds left in the team's current session if it is of this kind, else None"""
+        if self.team_schedule is None:
+            return None
+        team_working, left = self.team_schedule.phase()
+        return left if team_working == is_work_session else None
     
     def _init_gui_components(self):
         """Initialize GUI components"""
@@ -232,14 +434,31 @@ class PomodoroTimer:
             except Exception as e:
                 logging.warning(f"Could not install GLib assertion handler: {e}")
         
+        def dump_handler(signum, frame):
+            self.dump_flight_recorder("signal")
+        
         # Set up system signal handlers
         import signal
         signal.signal(signal.SIGINT, signal_handler)
         signal.signal(signal.SIGTERM, signal_handler)
+        if hasattr(signal, 'SIGUSR2'):
+            signal.signal(signal.SIGUSR2, dump_handler)
+    
+    def dump_flight_recorder(self, reason="requested"):
+        """Write the recent-events ring buffer to the flight directory"""
+        try:
+            path = self.flight.dump(self.flight_dir, reason)
+            logging.info(f"Flight recorder written to {path}")
+            return path
+        except Exception as e:
+            logging.error(f"Failed to write flight recorder dump: {e}")
+            return None
     
     def _acquire_lock(self):
         """Acquire file lock to prevent multiple instances"""
-        return self.file_lock.acquire_lock()
+        acquired = self.file_lock.acquire_lock()
+        self.flight.record('lock', 'instance lock acquired' if acquired else 'instance lock busy')
+        return acquired
     
     def _show_already_running_dialog(self):
         """Show dialog when another instance is running and exit"""
@@ -284,68 +503,105 @@ class PomodoroTimer:
         # Show system tray (now safe, only one instance)
         self._show_system_tray()
         
+        # Start the first work session (a restored session already did)
+        if not self._restored:
+            self._run_session(True, self.work_time)
+            self._on_transition("work_start")
+        
+        # Aligns the running session once the team schedule is known
+        self._start_team_sync()
+        
         # Start timer thread
-        self.timer_thread = threading.Thread(target=self._timer_loop, daemon=True)
+        self.timer_thread = threading.Thread(target=self._timer_loop, name="timer", daemon=True)
         self.timer_thread.start()
         
         # Start GUI event loop
         self._start_gui_loop()
     
     def _timer_loop(self):
-        """Main timer loop"""
+        """Main timer loop: sleep until the next deadline and run it"""
         logging.info("Starting timer loop")
-        while self.is_running and not self.stop_event.is_set():
-            try:
-                if not self.is_paused:
-                    if self.current_time > 0:
-                        self.current_time -= 1
-                        
-                        # Check for notification time
-                        if self.current_time == self.notification_time:
-                            self._send_break_notification()
-                        
-                        # Check if session ended
-                        if self.current_time == 0:
-                            self._session_ended()
-                    
-                    # Note: GUI updates are handled by the main thread callbacks
-                    # (_gtk_update_callback or _tkinter_update_callback)
-                    # This prevents race conditions and memory corruption
-                
-                time.sleep(1)
-            except Exception as e:
-                logging.error(f"Error in timer loop: {e}")
-                # Continue the timer loop even if there's an error
-                # Don't quit the application due to timer errors
-                time.sleep(1)
-        
+        # Nothing counts down: the scheduler wakes only for the warning, the
+        # end of the session and the end of a snooze
+        self.scheduler.run(self.stop_event)
         logging.info("Timer loop ended")
     
+    def _run_session(self, is_work_session, remaining, snooze_used=0):
+        """Start counting down a work or break session of remaining seconds"""
+        self.timer_state.update(
+            is_work_session=is_work_session,
+            remaining=remaining,
+            deadline=time.monotonic() + remaining,
+            is_paused=False,
+            paused_time=None,
+            snooze_deadline=None,
+            snooze_used=snooze_used
+        )
+        self._arm_deadlines()
+    
+    def _arm_deadlines(self):
+        """Schedule the warning and session end for the current state, or cancel them while paused"""
+        with self._arm_lock:
+            state = self.timer_state.get()
+            if state.is_paused or state.deadline is None:
+                self.scheduler.cancel(DEADLINE_WARNING)
+                self.scheduler.cancel(DEADLINE_SESSION_END)
+                return
+            self.scheduler.schedule(DEADLINE_SESSION_END, state.deadline, self._on_session_deadline)
+            if state.is_work_session and 0 < self.notification_time < state.left():
+                self.scheduler.schedule(
+                    DEADLINE_WARNING, state.deadline - self.notification_time, self._on_warning_deadline
+                )
+            else:
+                self.scheduler.cancel(DEADLINE_WARNING)
+    
+    def _on_warning_deadline(self):
+        """Scheduler callback: the break is notification_time away"""
+        if self.timer_state.get().is_work_session:
+            self._on_transition("warning")
+        self._send_break_notification()
+    
+    def _on_session_deadline(self):
+        """Scheduler callback: the session has run out"""
+        state = self.timer_state.get()
+        # A pause or config change since the deadline was taken re-arms it
+        if state.is_paused or state.left() > 0:
+            return
+        self._session_ended()
+    
     def _send_break_notification(self):
         """Send notification before break"""
-        if self.is_work_session:
-            self.notification_manager.send_notification(
+        if self.timer_state.get().is_work_session:
+            self._send_notification(
                 "Pomodoro Lock",
                 f"Break starting in {self.notification_time // 60} minutes!",
                 "normal",
-                timeout=8  # 8 seconds for break warning
+                timeout=8,  # 8 seconds for break warning
+                category="session"
             )
     
     def _session_ended(self):
         """Handle session end"""
-        if self.is_work_session:
-            # Work session ended, start break
-            self._start_break()
+        state = self.timer_state.get()
+        team_break_left = self._team_left(False)
+        if state.is_work_session:
+            # Work session ended, start break (as long as the team's, if it is on break)
+            self._record_history(KIND_WORK_END, self.work_time, FLAG_COMPLETED)
+            self._start_break(team_break_left)
+        elif team_break_left is not None:
+            # Out of step with a team that is still on break: stay on break with it
+            self._run_session(False, team_break_left, state.snooze_used)
+            self._on_transition("sync", team=self.team_schedule.team, version=self.team_schedule.version)
         else:
-            # Break ended, start work
-            self._end_break()
+            # Break ended, start work (until the team's break, in team sync mode)
+            self._end_break(self._team_left(True))
     
-    def _start_break(self):
+    def _start_break(self, remaining=None, snooze_used=0):
         """Start break session"""
         try:
             logging.info("Starting break session")
-            self.is_work_session = False
-            self.current_time = self.break_time
+            self._run_session(False, self.break_time if remaining is None else remaining, snooze_used)
+            self._on_transition("break_start")
             
             # Lower timer window to ensure overlay is on top
             try:
@@ -356,17 +612,19 @@ class PomodoroTimer:
             # Show break overlay
             try:
                 self.multi_overlay.create_overlays()
-                self.multi_overlay.show_all()
+                self._record_monitors("break start")
+                self._show_overlays()
             except Exception as e:
                 logging.error(f"Failed to show break overlay: {e}")
             
             # Send notification
             try:
-                self.notification_manager.send_notification(
+                self._send_notification(
                     "Pomodoro Lock",
                     "Break time! Take a rest.",
                     "high",
-                    timeout=5  # 5 seconds for break start notification
+                    timeout=5,  # 5 seconds for break start notification
+                    category="session"
                 )
             except Exception as e:
                 logging.error(f"Failed to send break notification: {e}")
@@ -376,15 +634,17 @@ class PomodoroTimer:
         except Exception as e:
             logging.error(f"Error starting break session: {e}")
     
-    def _end_break(self):
+    def _end_break(self, remaining=None):
         """End break session"""
         try:
             logging.info("Ending break session")
-            self.is_work_session = True
-            self.current_time = self.work_time
+            self._run_session(True, self.work_time if remaining is None else remaining)
+            self._on_transition("break_end")
+            self._on_transition("work_start")
             
             # Hide break overlay
             try:
+                self.flight.record('lock', 'hiding overlays')
                 self.multi_overlay.hide_all()
             except Exception as e:
                 logging.error(f"Failed to hide break overlay: {e}")
@@ -397,11 +657,12 @@ class PomodoroTimer:
             
             # Send notification
             try:
-                self.notification_manager.send_notification(
+                self._send_notification(
                     "Pomodoro Lock",
                     "Break ended! Back to work.",
                     "normal",
-                    timeout=6  # 6 seconds for break end
+                    timeout=6,  # 6 seconds for break end
+                    category="session"
                 )
             except Exception as e:
                 logging.error(f"Failed to send break end notification: {e}")
@@ -411,21 +672,220 @@ class PomodoroTimer:
         except Exception as e:
             logging.error(f"Error ending break session: {e}")
     
+    def _start_control_server(self):
+        """Start the local control channel used by `pomodoro-lock status`"""
+        self.control_server = ControlServer({
+            'status': self._control_status,
+            'reload-config': self._control_reload_config,
+            'metrics': self._control_metrics,
+        })
+        self.control_server.set_snapshot(self._state_snapshot)
+        if not self.control_server.start():
+            self.control_server = None
+    
+    def _start_metrics_exporters(self):
+        """Start the Prometheus exporters enabled in the environment"""
+        textfile = os.environ.get('POMODORO_METRICS_TEXTFILE')
+        if textfile:
+            exporter = TextfileExporter(self.metrics, os.path.expanduser(textfile))
+            exporter.start()
+            self.metrics_exporters.append(exporter)
+        
+        socket_path = os.environ.get('POMODORO_METRICS_SOCKET')
+        if socket_path:
+            server = MetricsSocketServer(
+                self.metrics, None if socket_path == '1' else os.path.expanduser(socket_path)
+            )
+            if server.start():
+                self.metrics_exporters.append(server)
+    
+    def _state_snapshot(self):
+        """Describe the current timer state for control channel clients"""
+        state = self.timer_state.get()
+        now = time.time()
+        left = state.left()
+        snapshot = {
+            'state': state.session,
+            'paused': state.is_paused,
+            'remaining': left,
+            'deadline': now + left,
+            'session_length': self.work_time if state.is_work_session else self.break_time,
+            'snooze_left': int(state.snooze_left(self.max_snooze)),
+            'time': now
+        }
+        if state.is_paused:
+            snapshot['snooze_until'] = now + (state.snooze_deadline - time.monotonic())
+        if self.team_sync is not None:
+            snapshot['team'] = self.team_sync.team
+            snapshot['team_connected'] = self.team_sync.connected
+        return snapshot
+    
+    def _control_status(self, request):
+        """Handle the `status` control command"""
+        return self._state_snapshot()
+    
+    def _control_reload_config(self, request):
+        """Handle `reload-config`: apply the settings files now and report what was applied"""
+        settings = self.settings_loader.get()
+        changed = settings != self.settings
+        if changed:
+            # The file watcher will see the same settings and skip them
+            if self.config_watcher is not None:
+                self.config_watcher.current = settings
+            if not self._apply_config_and_wait(settings):
+                return {'ok': False, 'error': "timed out applying the configuration"}
+        
+        reply = self._state_snapshot()
+        reply['changed'] = changed
+        reply['settings'] = self.settings.as_config()
+        reply['locked'] = sorted(self.settings.locked)
+        return reply
+    
+    def _control_metrics(self, request):
+        """Handle `metrics`: dump the hot-path metrics registry"""
+        return {'metrics': self.metrics.snapshot(), 'time': time.time()}
+    
+    def _apply_config_and_wait(self, settings, timeout=2.0):
+        """Apply settings on the GUI thread and wait until that has happened"""
+        if SYSTEM != "linux":
+            self.apply_config(settings)
+            return True
+        
+        import gi
+        gi.require_version('GLib', '2.0')
+        from gi.repository import GLib
+        done = threading.Event()
+        
+        def apply():
+            try:
+                self.apply_config(settings)
+            finally:
+                done.set()
+            return False
+        
+        GLib.idle_add(apply)
+        return done.wait(timeout)
+    
+    def _restore_checkpoint(self):
+        """Resume the session stored in the checkpoint, if it is still current"""
+        plan = resume_plan(self.checkpoint.load(), self.break_time)
+        if plan is None:
+            return
+        
+        self._restored = True
+        logging.info(
+            f"Restoring {'work' if plan['is_work_session'] else 'break'} session "
+            f"with {plan['remaining']} seconds remaining"
+        )
+        snooze_used = plan.get('snooze_used', 0)
+        if not plan['is_work_session']:
+            self._start_break(plan['remaining'], snooze_used)
+        else:
+            self._run_session(True, plan['remaining'], snooze_used)
+            self._on_transition("work_start")
+        
+        if plan['is_paused']:
+            # Already charged to snooze_used before the restart
+            self._pause(plan['snooze_remaining'], charge=False)
+            self._on_transition("pause", snooze_seconds=plan['snooze_remaining'])
+    
+    def _save_checkpoint(self):
+        """Persist the current state with absolute deadlines"""
+        checkpoint = self.checkpoint
+        if checkpoint is None:
+            return
+        state = self.timer_state.get()
+        # The checkpoint outlives this process, so it stores wall-clock deadlines
+        offset = time.time() - time.monotonic()
+        left = state.left()
+        checkpoint.save(
+            state.is_work_session,
+            state.is_paused,
+            offset + state.deadline if state.deadline is not None else offset + time.monotonic() + left,
+            left,
+            snooze_deadline=offset + state.snooze_deadline if state.is_paused else None,
+            work_time=self.work_time,
+            break_time=self.break_time,
+            snooze_used=state.snooze_used
+        )
+    
+    def _on_transition(self, event, **details):
+        """Propagate a state transition to the status page and subscribers"""
+        state = self.timer_state.get()
+        self.flight.record('transition', f"{event} remaining={state.left()} paused={state.is_paused}")
+        self._publish_status()
+        counter = self.transition_counters.get(event)
+        if counter is not None:
+            counter.inc()
+        elif event == "pause" and not state.is_work_session:
+            self.breaks_snoozed.inc()
+        if event in ("work_start", "break_start", "pause", "resume", "config", "sync"):
+            self._save_checkpoint()
+        
+        during_break = 0 if state.is_work_session else FLAG_BREAK
+        if event == "work_start":
+            self._record_history(KIND_WORK_START, state.left())
+        elif event == "break_start":
+            self._record_history(KIND_BREAK_START, state.left())
+        elif event == "break_end":
+            self._record_history(KIND_BREAK_END, self.break_time, FLAG_COMPLETED)
+        elif event == "pause":
+            self._paused_at = time.time()
+            flags = during_break | (FLAG_LIMITED if details.get('limited') else 0)
+            self._record_history(KIND_PAUSE, details.get('snooze_seconds', 0), flags)
+        elif event == "resume":
+            paused_for = time.time() - self._paused_at if self._paused_at else 0
+            self._paused_at = None
+            flags = during_break | (FLAG_AUTO if details.get('auto') else 0)
+            self._record_history(KIND_RESUME, paused_for, flags)
+        elif event == "snooze_denied":
+            self._record_history(KIND_SNOOZE_DENIED, state.snooze_used, during_break)
+        self._update_snooze_tooltips(state)
+        if self.control_server is not None:
+            message = self._state_snapshot()
+            message['event'] = event
+            message.update(details)
+            self.control_server.publish(message)
+    
+    def _record_history(self, kind, value=0, flags=0):
+        """Queue a history record (never blocks on disk)"""
+        if self.history is not None:
+            self.history.record(kind, value, flags)
+    
+    def _publish_status(self):
+        """Publish the current state to the memory-mapped status page"""
+        if self.status_page is None:
+            return
+        
+        state = self.timer_state.get()
+        deadline = time.time() + state.left()
+        self.status_page.publish(
+            STATE_WORK if state.is_work_session else STATE_BREAK,
+            state.is_paused,
+            deadline,
+            state.remaining if state.is_paused else 0,
+            self.work_time if state.is_work_session else self.break_time
+        )
+    
     def _update_gui(self):
         """Update GUI components"""
         try:
+            # One snapshot for the whole update, so the window, overlay and tray agree
+            state = self.timer_state.get()
+            left = state.left()
+            
             # Update timer window
             if hasattr(self.timer_window, 'update_timer'):
                 self.timer_window.update_timer(
-                    self.current_time,
-                    'break' if not self.is_work_session else 'work',
-                    self.is_paused
+                    left,
+                    state.session,
+                    state.is_paused
                 )
             
             # Update break overlay only if not in work session and not paused
-            if not self.is_work_session and not self.is_paused:
+            if not state.is_work_session and not state.is_paused:
                 try:
-                    self.multi_overlay.update_timer(self.current_time)
+                    self.multi_overlay.update_timer(left)
                 except RecursionError as e:
                     logging.error(f"Recursion error in overlay update: {e}")
                     # Force cleanup and recreate overlays
@@ -434,7 +894,7 @@ class PomodoroTimer:
                     logging.error(f"Failed to update break overlay: {e}")
             
             # Update system tray
-            self._update_system_tray()
+            self._update_system_tray(state)
         except Exception as e:
             logging.error(f"Failed to update GUI: {e}")
             # Don't re-raise - just log and continue
@@ -446,19 +906,47 @@ class PomodoroTimer:
             self.multi_overlay.destroy_all()
             time.sleep(0.1)  # Small delay to ensure cleanup
             self.multi_overlay.create_overlays()
-            if not self.is_work_session:
-                self.multi_overlay.show_all()
+            self._record_monitors("recreated")
+            if not self.timer_state.get().is_work_session:
+                self._show_overlays()
         except Exception as e:
             logging.error(f"Failed to recreate overlays: {e}")
     
-    def _update_system_tray(self):
+    def _record_monitors(self, reason):
+        """Record how many monitor overlays exist after (re)creating them"""
+        overlays = getattr(self.multi_overlay, 'overlays', ())
+        self.flight.record('monitors', f"{len(overlays)} overlays ({reason})")
+    
+    def _send_notification(self, *args, **kwargs):
+        """Send a desktop notification (queued where the platform supports it)"""
+        self.flight.record('notify', args[1] if len(args) > 1 else kwargs.get('message'))
+        if getattr(self.notification_manager, 'dispatcher', None) is not None:
+            return self.notification_manager.send_notification(*args, **kwargs)
+        with self.notification_duration.time():
+            return self.notification_manager.send_notification(*args, **kwargs)
+    
+    def _on_notification_sent(self, queued_seconds, send_seconds, ok):
+        """Record the latency of a notification sent by the dispatcher thread"""
+        self.notification_queue_delay.observe(queued_seconds)
+        self.notification_duration.observe(send_seconds)
+        self.flight.record('notify', f"{'sent' if ok else 'failed'} after {(queued_seconds + send_seconds) * 1000:.0f} ms")
+    
+    def _show_overlays(self):
+        """Show the break overlays on every monitor, timing how long that blocks"""
+        self.flight.record('lock', 'showing overlays')
+        with self.overlay_show_duration.time():
+            self.multi_overlay.show_all()
+        self.flight.record('lock', 'overlays shown')
+    
+    def _update_system_tray(self, state=None):
         """Update system tray status"""
         try:
             if self.system_tray is None:
                 return  # System tray not available
             
-            state = 'break' if not self.is_work_session else 'work'
-            self.system_tray.update_status(state, self.current_time)
+            if state is None:
+                state = self.timer_state.get()
+            self.system_tray.update_status(state.session, state.left())
         except Exception as e:
             logging.error(f"Failed to update system tray: {e}")
             # Don't re-raise - just log and continue
@@ -503,7 +991,9 @@ class PomodoroTimer:
                 Gtk.main_quit()
                 return False
             
-            self._update_gui()
+            self.flight.record('gui-update')
+            with self.gui_update_duration.time():
+                self._update_gui()
             return True
         except Exception as e:
             logging.error(f"Error in GTK update callback: {e}")
@@ -518,7 +1008,9 @@ class PomodoroTimer:
                 self.root.quit()
                 return
             
-            self._update_gui()
+            self.flight.record('gui-update')
+            with self.gui_update_duration.time():
+                self._update_gui()
             self.root.after(1000, self._tkinter_update_callback)
         except Exception as e:
             logging.error(f"Error in Tkinter update callback: {e}")
@@ -532,76 +1024,58 @@ class PomodoroTimer:
     
     def _on_timer_close(self):
         """Handle timer window close"""
+        self.flight.record('gui-click', 'close')
         self.timer_window.hide_window()
     
     def _on_power_clicked(self):
         """Handle power button click"""
+        self.flight.record('gui-click', 'power')
         self.quit_application()
     
     def _on_pause_snooze_clicked(self):
         """Handle pause/snooze button click"""
+        self.flight.record('gui-click', 'pause/snooze')
         try:
-            if self.is_paused:
+            if self.timer_state.get().is_paused:
                 # If already paused, resume the timer immediately
-                self.is_paused = False
-                
-                # Cancel any pending auto-resume timer
-                if hasattr(self, 'snooze_timeout_id') and self.snooze_timeout_id:
-                    try:
-                        if SYSTEM == "linux":
-                            import gi
-                            gi.require_version('GLib', '2.0')
-                            from gi.repository import GLib
-                            GLib.source_remove(self.snooze_timeout_id)
-                            logging.info("Cancelled active GLib snooze timeout")
-                        else:
-                            # For Windows, cancel the threading timer
-                            if self.snooze_timer and self.snooze_timer.is_alive():
-                                self.snooze_timer.cancel()
-                                logging.info("Cancelled active threading snooze timer")
-                    except Exception as e:
-                        logging.error(f"Error cancelling snooze timer: {e}")
-                    finally:
-                        self.snooze_timeout_id = None
-                        self.snooze_timer = None
-                
-                logging.info("Timer resumed manually")
-                self.notification_manager.send_notification(
-                    "Pomodoro Lock",
-                    "Timer resumed!",
-                    "normal",
-                    timeout=5  # 5 seconds for resume notification
-                )
+                if self._resume():
+                    self._on_transition("resume")
+                    logging.info("Timer resumed manually")
+                    self._send_notification(
+                        "Pomodoro Lock",
+                        "Timer resumed!",
+                        "normal",
+                        timeout=5,  # 5 seconds for resume notification
+                        category="snooze"
+                    )
             else:
-                # Pause the timer and set up auto-resume after 10 minutes
-                self.is_paused = True
-                snooze_seconds = 10 * 60  # 10 minutes
-                
-                # Store the original time when paused
-                self.paused_time = self.current_time
+                # Pause the timer and set up auto-resume, within this session's snooze limit
+                snooze_seconds = self._pause(self.snooze_time)
                 
-                # Set up auto-resume timer using platform-appropriate method
-                if SYSTEM == "linux":
-                    # Use GLib timeout for Linux (main thread safe)
-                    import gi
-                    gi.require_version('GLib', '2.0')
-                    from gi.repository import GLib
-                    self.snooze_timeout_id = GLib.timeout_add_seconds(snooze_seconds, self._auto_resume_timer)
-                    self.snooze_timer = None  # Not used on Linux
-                else:
-                    # Use threading.Timer for Windows
-                    self.snooze_timer = threading.Timer(snooze_seconds, self._auto_resume_timer)
-                    self.snooze_timer.daemon = True
-                    self.snooze_timer.start()
-                    self.snooze_timeout_id = None  # Not used on Windows
-                
-                logging.info(f"Timer paused and will auto-resume in {snooze_seconds // 60} minutes")
-                self.notification_manager.send_notification(
-                    "Pomodoro Lock",
-                    f"Timer paused. Will resume in {snooze_seconds // 60} minutes",
-                    "normal",
-                    timeout=10  # 10 seconds for pause notification
-                )
+                if snooze_seconds:
+                    self._on_transition(
+                        "pause",
+                        snooze_seconds=snooze_seconds,
+                        limited=snooze_seconds < self.snooze_time
+                    )
+                    logging.info(f"Timer paused and will auto-resume in {format_duration(snooze_seconds)}")
+                    self._send_notification(
+                        "Pomodoro Lock",
+                        f"Timer paused. Will resume in {format_duration(snooze_seconds)}",
+                        "normal",
+                        timeout=10,  # 10 seconds for pause notification
+                        category="snooze"
+                    )
+                elif not self.timer_state.get().is_paused:
+                    self._on_transition("snooze_denied")
+                    logging.info("Snooze refused: the snooze limit for this session is used up")
+                    self._send_notification(
+                        "Pomodoro Lock",
+                        f"No snooze left: {format_duration(self.max_snooze)} per session already used",
+                        "normal",
+                        timeout=5,  # 5 seconds for refused snooze notification
+                        category="snooze"
+                    )
             
             # Update GUI to reflect the new state
             self._update_gui()
@@ -609,34 +1083,66 @@ class PomodoroTimer:
         except Exception as e:
             logging.error(f"Error in pause/snooze functionality: {e}")
     
+    def _pause(self, snooze_seconds, charge=True):
+        """
+        Freeze the countdown and schedule the auto-resume.
+        
+        With charge the snooze is limited to what is left of max_snooze and
+        charged to the session up front. Returns the seconds granted, or 0
+        if the timer was already paused or no snooze is left.
+        """
+        now = time.monotonic()
+        limit = self.max_snooze if charge else None
+        paused = self.timer_state.transform(lambda state: state.paused(now, snooze_seconds, limit))
+        if paused is None:
+            return 0
+        self._arm_deadlines()
+        self.scheduler.schedule(DEADLINE_SNOOZE_END, paused.snooze_deadline, self._auto_resume_timer)
+        return int(round(paused.snooze_deadline - now))
+    
+    def _resume(self):
+        """Continue a paused countdown and cancel its auto-resume; False if not paused"""
+        now = time.monotonic()
+        resumed = self.timer_state.transform(lambda state: state.resumed(now))
+        if resumed is None:
+            return False
+        self.scheduler.cancel(DEADLINE_SNOOZE_END)
+        self._arm_deadlines()
+        return True
+    
+    def _update_snooze_tooltips(self, state):
+        """Describe the snooze on the pause button; the texts change only on transitions"""
+        timer_window = getattr(self, 'timer_window', None)
+        if timer_window is None or not hasattr(timer_window, 'set_pause_tooltips'):
+            return
+        available = min(self.snooze_time, state.snooze_left(self.max_snooze))
+        if available > 0:
+            pause_tooltip = f"Pause and auto-resume in {format_duration(available)}"
+        else:
+            pause_tooltip = "Snooze limit reached for this session"
+        resume_tooltip = "Resume timer"
+        if state.is_paused:
+            resume_at = time.time() + (state.snooze_deadline - time.monotonic())
+            resume_tooltip += f" (resumes automatically at {time.strftime('%H:%M', time.localtime(resume_at))})"
+        timer_window.set_pause_tooltips(pause_tooltip, resume_tooltip)
+    
     def _auto_resume_timer(self):
-        """Automatically resume the timer after snooze period"""
+        """Scheduler callback: resume the timer after the snooze period"""
         try:
-            if self.is_paused:
-                self.is_paused = False
+            # A manual resume may have got there first
+            if self._resume():
+                self._on_transition("resume", auto=True)
                 logging.info("Timer auto-resumed after snooze period")
-                self.notification_manager.send_notification(
+                self._send_notification(
                     "Pomodoro Lock",
                     "Timer resumed automatically!",
                     "normal",
-                    timeout=5  # 5 seconds for auto-resume notification
+                    timeout=5,  # 5 seconds for auto-resume notification
+                    category="snooze"
                 )
-                
-                # Update GUI to reflect the new state
-                self._update_gui()
-                
-                # Clean up timeout ID
-                if hasattr(self, 'snooze_timeout_id'):
-                    self.snooze_timeout_id = None
-                if hasattr(self, 'snooze_timer'):
-                    self.snooze_timer = None
-                
+                # The GUI picks up the change on its next update
         except Exception as e:
             logging.error(f"Error in auto-resume functionality: {e}")
-        
-        # Return False to stop the GLib timeout (Linux only)
-        if SYSTEM == "linux":
-            return False
     
     def quit_application(self):
         """Quit the application with enhanced cleanup"""
@@ -644,25 +1150,15 @@ class PomodoroTimer:
         self.is_running = False
         self.stop_event.set()
         
-        # Cancel any active snooze timer
-        if hasattr(self, 'snooze_timeout_id') and self.snooze_timeout_id:
+        # Drop pending deadlines (including any snooze) and wake the timer thread
+        self.scheduler.clear()
+        
+        # Stop the notification worker
+        if hasattr(self.notification_manager, 'close'):
             try:
-                if SYSTEM == "linux":
-                    import gi
-                    gi.require_version('GLib', '2.0')
-                    from gi.repository import GLib
-                    GLib.source_remove(self.snooze_timeout_id)
-                    logging.info("Cancelled active GLib snooze timeout")
-                else:
-                    # For Windows, cancel the threading timer
-                    if self.snooze_timer and self.snooze_timer.is_alive():
-                        self.snooze_timer.cancel()
-                        logging.info("Cancelled active threading snooze timer")
+                self.notification_manager.close()
             except Exception as e:
-                logging.error(f"Error cancelling snooze timer: {e}")
-            finally:
-                self.snooze_timeout_id = None
-                self.snooze_timer = None
+                logging.error(f"Error stopping notifications: {e}")
         
         # Stop system tray
         if self.system_tray is not None and hasattr(self.system_tray, 'stop'):
@@ -671,8 +1167,47 @@ class PomodoroTimer:
             except Exception as e:
                 logging.error(f"Error stopping system tray: {e}")
         
+        # Record a break cut short by quitting, then commit the history
+        if self.history is not None:
+            state = self.timer_state.get()
+            if not state.is_work_session:
+                self._record_history(KIND_BREAK_END, self.break_time - state.left())
+            self.history.close()
+            self.history = None
+        
+        # Stop watching the config file
+        if self.config_watcher is not None:
+            self.config_watcher.stop()
+            self.config_watcher = None
+        
+        # Stop following the team coordinator
+        if self.team_sync is not None:
+            self.team_sync.stop()
+            self.team_sync = None
+        
+        # Stop the metrics exporters (removes the textfile and socket)
+        for exporter in self.metrics_exporters:
+            exporter.stop()
+        self.metrics_exporters = []
+        
+        # Stop the control channel
+        if self.control_server is not None:
+            self.control_server.stop()
+            self.control_server = None
+        
+        # Mark the status page as stopped
+        if self.status_page is not None:
+            self.status_page.close()
+            self.status_page = None
+        
+        # A clean quit ends the session; only a crash leaves a checkpoint to resume
+        if self.checkpoint is not None:
+            checkpoint, self.checkpoint = self.checkpoint, None
+            checkpoint.clear()
+        
         # Release lock
         try:
+            self.flight.record('lock', 'instance lock released')
             self.file_lock.release_lock()
         except Exception as e:
             logging.error(f"Error releasing lock: {e}")
@@ -707,6 +1242,9 @@ class PomodoroTimer:
         except Exception as e:
             logging.error(f"Error during GUI cleanup: {e}")
         
+        # Report failures the log rate limit is still holding back
+        flush_log_summaries()
+        
         # Quit GUI loop with error handling
         try:
             if SYSTEM == "linux":
@@ -0,0 +1,36 @@
+"""
+Configuration for Pomodoro Lock
+Layered loading, validation and live reloading of the timer settings
+"""
+
+from .loader import (
+    DEFAULT_CONFIG,
+    CONFIG_LIMITS,
+    ConfigError,
+    validate_config,
+    load_config_file,
+    default_config_path
+)
+from .layers import (
+    Settings,
+    SettingsLoader,
+    merge_layers,
+    get_settings,
+    default_policy_path
+)
+from .watcher import ConfigWatcher
+
+__all__ = [
+    'DEFAULT_CONFIG',
+    'CONFIG_LIMITS',
+    'ConfigError',
+    'validate_config',
+    'load_config_file',
+    'default_config_path',
+    'Settings',
+    'SettingsLoader',
+    'merge_layers',
+    'get_settings',
+    'default_policy_path',
+    'ConfigWatcher'
+]
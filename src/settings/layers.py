@@ -0,0 +1,214 @@
+"""
+Layered settings for Pomodoro Lock
+
+The effective settings are merged from, in increasing priority:
+
+    1. built-in defaults (DEFAULT_CONFIG)
+    2. system policy     /etc/pomodoro-lock/policy.json
+    3. user file         ~/.local/share/pomodoro-lock/config/config.json
+    4. environment       POMODORO_WORK_TIME_MINUTES and friends
+
+The policy file holds the same keys as config.json plus an optional "locked"
+list; locked keys keep the policy value whatever the user file or the
+environment say. The merge result is an immutable, validated Settings object.
+SettingsLoader caches it and only merges again when one of the files or the
+relevant environment variables changed.
+"""
+
+import os
+import json
+import logging
+import threading
+from pathlib import Path
+from collections import namedtuple
+
+from .loader import DEFAULT_CONFIG, ConfigError, validate_config, default_config_path
+
+ENV_PREFIX = "POMODORO_"
+
+LAYER_DEFAULT = "default"
+LAYER_POLICY = "policy"
+LAYER_USER = "user"
+LAYER_ENV = "env"
+
+_SettingsBase = namedtuple('_SettingsBase', list(DEFAULT_CONFIG) + ['locked', 'sources'])
+
+
+class Settings(_SettingsBase):
+    """Immutable effective settings; lengths in minutes, with second-based properties"""
+
+    __slots__ = ()
+
+    @property
+    def work_time(self):
+        return self.work_time_minutes * 60
+
+    @property
+    def break_time(self):
+        return self.break_time_minutes * 60
+
+    @property
+    def notification_time(self):
+        return self.notification_time_minutes * 60
+
+    @property
+    def inactivity_threshold(self):
+        return self.inactivity_threshold_minutes * 60
+
+    @property
+    def snooze_time(self):
+        return self.snooze_time_minutes * 60
+
+    @property
+    def max_snooze(self):
+        return self.max_snooze_minutes * 60
+
+    def source(self, key):
+        """Layer the value of `key` came from"""
+        return dict(self.sources).get(key, LAYER_DEFAULT)
+
+    def as_config(self):
+        """The settings as a config.json dict"""
+        return {key: getattr(self, key) for key in DEFAULT_CONFIG}
+
+
+def default_policy_path():
+    """Return the system policy path for this platform"""
+    if os.name == 'nt':
+        return Path(os.environ.get('PROGRAMDATA', 'C:\\ProgramData')) / "pomodoro-lock" / "policy.json"
+    return Path("/etc/pomodoro-lock/policy.json")
+
+
+def env_name(key):
+    """Environment variable that overrides a config key"""
+    return ENV_PREFIX + key.upper()
+
+
+def _read_json(path, layer):
+    """Read one JSON layer; a missing file is an empty layer"""
+    try:
+        with open(path, 'r') as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return {}
+    except ValueError as e:
+        raise ConfigError(f"{layer} file {path} is not valid JSON: {e}")
+    if not isinstance(data, dict):
+        raise ConfigError(f"{layer} file {path} must hold a JSON object")
+    return data
+
+
+def read_policy(path=None):
+    """The system policy layer; a missing file is an empty layer"""
+    return _read_json(Path(path) if path else default_policy_path(), LAYER_POLICY)
+
+
+def _read_env(environ):
+    """Config overrides from the environment"""
+    values = {}
+    for key in DEFAULT_CONFIG:
+        text = environ.get(env_name(key))
+        if text is None or text == "":
+            continue
+        try:
+            values[key] = int(text)
+        except ValueError:
+            raise ConfigError(f"{env_name(key)} must be a whole number, got {text!r}")
+    return values
+
+
+def merge_layers(policy, user, env):
+    """Merge the policy, user and environment layers into Settings"""
+    locked = policy.get('locked', [])
+    if not isinstance(locked, list):
+        raise ConfigError("policy 'locked' must be a list of keys")
+    locked = frozenset(key for key in locked if key in DEFAULT_CONFIG)
+
+    merged = {}
+    sources = {}
+    for layer, values in ((LAYER_POLICY, policy), (LAYER_USER, user), (LAYER_ENV, env)):
+        for key, value in values.items():
+            if key not in DEFAULT_CONFIG:
+                continue
+            if key in locked and layer != LAYER_POLICY:
+                if value != policy.get(key):
+                    logging.info(f"{key} is locked by policy, ignoring {layer} value {value}")
+                continue
+            merged[key] = value
+            sources[key] = layer
+
+    config = validate_config(merged)
+    return Settings(
+        **{key: config[key] for key in DEFAULT_CONFIG},
+        locked=locked,
+        sources=tuple(sorted(sources.items()))
+    )
+
+
+class SettingsLoader:
+    """Merges the settings layers once per change and caches the result"""
+
+    def __init__(self, user_path=None, policy_path=None, environ=None):
+        self.user_path = Path(user_path) if user_path else default_config_path()
+        self.policy_path = Path(policy_path) if policy_path else default_policy_path()
+        self.environ = os.environ if environ is None else environ
+        self.merges = 0
+        self._settings = None
+        self._signature = None
+        self._lock = threading.Lock()
+
+    @property
+    def paths(self):
+        """Files the settings are read from"""
+        return [self.policy_path, self.user_path]
+
+    def _current_signature(self):
+        """What the cached settings depend on"""
+        signature = []
+        for path in self.paths:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+            except OSError:
+                signature.append(None)
+        signature.extend(self.environ.get(env_name(key)) for key in DEFAULT_CONFIG)
+        return tuple(signature)
+
+    def get(self):
+        """Return the effective Settings, merging again only if an input changed"""
+        with self._lock:
+            signature = self._current_signature()
+            if self._settings is not None and signature == self._signature:
+                return self._settings
+            settings = merge_layers(
+                _read_json(self.policy_path, LAYER_POLICY),
+                _read_json(self.user_path, LAYER_USER),
+                _read_env(self.environ)
+            )
+            self._settings = settings
+            self._signature = signature
+            self.merges += 1
+            return settings
+
+    def get_or_fallback(self):
+        """Like get(), but fall back to policy and defaults if a layer is invalid"""
+        try:
+            return self.get()
+        except ConfigError as e:
+            logging.error(f"Failed to load config: {e}")
+        try:
+            return merge_layers(_read_json(self.policy_path, LAYER_POLICY), {}, {})
+        except ConfigError as e:
+            logging.error(f"Failed to load policy: {e}")
+        return merge_layers({}, {}, {})
+
+
+_default_loader = None
+
+
+def get_settings():
+    """Effective settings from the default locations (cached per process)"""
+    global _default_loader
+    if _default_loader is None:
+        _default_loader = SettingsLoader()
+    return _default_loader.get()
@@ -0,0 +1,75 @@
+"""
+Configuration loading and validation for Pomodoro Lock
+"""
+
+import os
+import json
+from pathlib import Path
+
+DEFAULT_CONFIG = {
+    "work_time_minutes": 25,
+    "break_time_minutes": 5,
+    "notification_time_minutes": 2,
+    "inactivity_threshold_minutes": 10,
+    "snooze_time_minutes": 10,
+    "max_snooze_minutes": 20
+}
+
+# Accepted range for each key, in minutes (same bounds as configure-pomodoro.py)
+CONFIG_LIMITS = {
+    "work_time_minutes": (1, 120),
+    "break_time_minutes": (1, 60),
+    "notification_time_minutes": (1, 10),
+    "inactivity_threshold_minutes": (1, 60),
+    "snooze_time_minutes": (1, 60),
+    # Total snooze allowed per work session or break; 0 disables snoozing
+    "max_snooze_minutes": (0, 240)
+}
+
+
+class ConfigError(ValueError):
+    """Raised for configuration that cannot be applied"""
+
+
+def default_config_path():
+    """Return the user's config.json path for this platform"""
+    if os.name == 'nt':
+        return Path.home() / "AppData" / "Local" / "pomodoro-lock" / "config" / "config.json"
+    return Path.home() / ".local" / "share" / "pomodoro-lock" / "config" / "config.json"
+
+
+def validate_config(data):
+    """Return a complete, checked copy of a config dict, filling in defaults"""
+    if not isinstance(data, dict):
+        raise ConfigError("Configuration must be a JSON object")
+
+    config = dict(DEFAULT_CONFIG)
+    for key, value in data.items():
+        if key not in CONFIG_LIMITS:
+            # Unknown keys are kept so newer files still load
+            config[key] = value
+            continue
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or value != int(value):
+            raise ConfigError(f"{key} must be a whole number of minutes, got {value!r}")
+        low, high = CONFIG_LIMITS[key]
+        if not low <= value <= high:
+            raise ConfigError(f"{key} must be between {low} and {high}, got {value}")
+        config[key] = int(value)
+
+    if config["notification_time_minutes"] >= config["work_time_minutes"]:
+        raise ConfigError("notification_time_minutes must be shorter than work_time_minutes")
+    return config
+
+
+def load_config_file(path):
+    """Read and validate a config file; a missing file yields the defaults"""
+    try:
+        with open(path, 'r') as f:
+            text = f.read()
+    except FileNotFoundError:
+        return dict(DEFAULT_CONFIG)
+    try:
+        data = json.loads(text)
+    except ValueError as e:
+        raise ConfigError(f"{path} is not valid JSON: {e}")
+    return validate_config(data)
@@ -0,0 +1,159 @@
+"""
+Config file watcher for Pomodoro Lock
+
+Watches the directories holding the settings files (so editors and
+configurators that replace a file by rename are seen) with a Gio.FileMonitor,
+which is inotify backed on Linux. Files whose directory cannot be monitored
+(Windows, or a policy directory that does not exist yet) are polled. Bursts
+of events are debounced, and the settings are parsed and validated on a
+worker thread; only a valid result that differs from the current one is
+passed to the callback.
+"""
+
+import os
+import logging
+import threading
+from pathlib import Path
+
+from .loader import ConfigError, load_config_file
+
+GIO_AVAILABLE = False
+
+try:
+    import gi
+    gi.require_version('Gio', '2.0')
+    from gi.repository import Gio
+    GIO_AVAILABLE = True
+except (ImportError, ValueError):
+    pass
+
+
+class ConfigWatcher:
+    """Reload settings when their files change and hand valid results to a callback"""
+
+    def __init__(self, paths, on_change, load=None, debounce=0.3,
+                 poll_interval=2.0, use_gio=True):
+        if isinstance(paths, (str, os.PathLike)):
+            paths = [paths]
+        self.paths = [Path(path) for path in paths]
+        self.on_change = on_change
+        self.load = load or (lambda: load_config_file(self.paths[0]))
+        self.debounce = debounce
+        self.poll_interval = poll_interval
+        self.use_gio = use_gio and GIO_AVAILABLE
+        self.current = None
+        self.reloads = 0
+        self._monitors = []
+        self._polled = []
+        self._poll_thread = None
+        self._timer = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def start(self, current=None):
+        """Start watching; `current` is the configuration already applied"""
+        self.current = current
+        for directory in sorted({path.parent for path in self.paths}):
+            names = {path.name for path in self.paths if path.parent == directory}
+            if self.use_gio and directory.is_dir() and self._monitor_directory(directory, names):
+                continue
+            self._polled.extend(path for path in self.paths if path.parent == directory)
+
+        if self._polled:
+            self._poll_thread = threading.Thread(target=self._poll_loop, name="config-watcher", daemon=True)
+            self._poll_thread.start()
+            logging.info(f"Polling {', '.join(map(str, self._polled))} every {self.poll_interval}s")
+
+    def _monitor_directory(self, directory, names):
+        """Watch one directory with Gio; returns False if that is not possible"""
+        try:
+            monitor = Gio.File.new_for_path(str(directory)).monitor_directory(
+                Gio.FileMonitorFlags.WATCH_MOVES, None
+            )
+            handler = monitor.connect('changed', self._on_monitor_event, names)
+        except Exception as e:
+            logging.warning(f"File monitor unavailable for {directory}, polling: {e}")
+            return False
+        self._monitors.append((monitor, handler))
+        logging.info(f"Watching {directory} for changes")
+        return True
+
+    def stop(self):
+        """Stop watching and cancel a pending reload"""
+        self._stop.set()
+        for monitor, handler in self._monitors:
+            try:
+                monitor.disconnect(handler)
+                monitor.cancel()
+            except Exception as e:
+                logging.error(f"Error stopping config monitor: {e}")
+        self._monitors = []
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if self._poll_thread is not None:
+            self._poll_thread.join(timeout=self.poll_interval + 1)
+            self._poll_thread = None
+
+    def _on_monitor_event(self, monitor, changed, other, event_type, names):
+        """Gio callback: schedule a reload if the event concerns a watched file"""
+        changed_names = {changed.get_basename()}
+        if other is not None:
+            changed_names.add(other.get_basename())
+        if names & changed_names:
+            self.schedule_reload()
+
+    def _signature(self):
+        """Identity of the polled files as far as stat can tell"""
+        signature = []
+        for path in self._polled:
+            try:
+                stat = os.stat(path)
+                signature.append((stat.st_mtime_ns, stat.st_size, stat.st_ino))
+            except OSError:
+                signature.append(None)
+        return signature
+
+    def _poll_loop(self):
+        """Fallback for files that cannot be monitored"""
+        last = self._signature()
+        while not self._stop.wait(self.poll_interval):
+            signature = self._signature()
+            if signature != last:
+                last = signature
+                self.schedule_reload()
+
+    def schedule_reload(self):
+        """Reload after `debounce` seconds without further events"""
+        with self._lock:
+            if self._stop.is_set():
+                return
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce, self._reload)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _reload(self):
+        """Parse and validate the settings (worker thread) and report real changes"""
+        with self._lock:
+            self._timer = None
+        try:
+            config = self.load()
+        except ConfigError as e:
+            logging.warning(f"Ignoring invalid configuration: {e}")
+            return
+        except Exception as e:
+            logging.error(f"Failed to reload configuration: {e}")
+            return
+
+        if config == self.current:
+            return
+        self.current = config
+        self.reloads += 1
+        logging.info(f"Configuration changed, applying {config}")
+        try:
+            self.on_change(config)
+        except Exception as e:
+            logging.error(f"Error applying configuration: {e}")
@@ -0,0 +1,38 @@
+"""
+Persistent storage for Pomodoro Lock
+Timer checkpoints and session history kept under the user's data directory
+"""
+
+from .checkpoint import (
+    StateCheckpoint,
+    atomic_write,
+    resume_plan
+)
+from .history import (
+    HistoryLog,
+    HistoryRecord,
+    iter_records,
+    list_segments,
+    default_history_dir
+)
+from .history_query import (
+    HistoryIndex,
+    DaySummary,
+    WeekSummary,
+    format_report
+)
+
+__all__ = [
+    'StateCheckpoint',
+    'atomic_write',
+    'resume_plan',
+    'HistoryLog',
+    'HistoryRecord',
+    'iter_records',
+    'list_segments',
+    'default_history_dir',
+    'HistoryIndex',
+    'DaySummary',
+    'WeekSummary',
+    'format_report'
+]
@@ -0,0 +1,234 @@
+"""
+Productivity analytics over the session history
+
+History segments are loaded straight into columnar NumPy arrays (the 16-byte
+records map onto a structured dtype, so a segment is one np.frombuffer call)
+and every aggregation is a vectorized operation over those columns: bincount
+for day and hour buckets, cumsum for rolling windows and np.diff over a
+per-user grid of active days for streaks. Several history directories (one
+per user) can be loaded together; each record then carries the index of the
+directory it came from.
+
+NumPy is optional. Without it NUMPY_AVAILABLE is False and only the plain
+rollups in history_query are available.
+"""
+
+import time
+from datetime import date
+
+from .history import (
+    list_segments,
+    live_segments,
+    valid_header,
+    default_history_dir,
+    HEADER_SIZE,
+    RECORD_SIZE,
+    KIND_WORK_END,
+    KIND_BREAK_END,
+    FLAG_COMPLETED
+)
+
+NUMPY_AVAILABLE = False
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+    # Same layout as RECORD_STRUCT ('<dBBxxI')
+    RECORD_DTYPE = np.dtype({
+        'names': ['timestamp', 'kind', 'flags', 'value'],
+        'formats': ['<f8', 'u1', 'u1', '<u4'],
+        'offsets': [0, 8, 9, 12],
+        'itemsize': RECORD_SIZE,
+    })
+except ImportError:
+    np = None
+    RECORD_DTYPE = None
+
+SECONDS_PER_DAY = 86400
+WEEKDAYS = ('Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun')
+HEAT_SHADES = ' .:-=+*#%@'
+
+
+class HistoryColumns:
+    """Session history of one or more users as parallel arrays"""
+
+    def __init__(self, timestamp, kind, flags, value, user, users=1):
+        self.timestamp = timestamp
+        self.kind = kind
+        self.flags = flags
+        self.value = value
+        self.user = user
+        self.users = users
+        self._kind_index = {}
+        self._local = {}
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def of_kind(self, kind):
+        """Indices of the records of one kind (computed once per kind)"""
+        if kind not in self._kind_index:
+            self._kind_index[kind] = np.flatnonzero(self.kind == kind)
+        return self._kind_index[kind]
+
+    def local_seconds(self, kind):
+        """Local wall-clock seconds of the records of one kind (computed once per kind)"""
+        if kind not in self._local:
+            self._local[kind] = local_seconds(self.timestamp[self.of_kind(kind)])
+        return self._local[kind]
+
+    def select(self, mask):
+        """Columns restricted to the records where mask is True"""
+        return HistoryColumns(self.timestamp[mask], self.kind[mask], self.flags[mask],
+                              self.value[mask], self.user[mask], self.users)
+
+
+def _read_segment_array(path):
+    """One segment as a structured array (torn tail records are ignored, foreign files skipped)"""
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except FileNotFoundError:
+        # Removed by a compaction since it was listed; the merged segment holds its records
+        return np.empty(0, dtype=RECORD_DTYPE)
+    usable = (len(data) - HEADER_SIZE) // RECORD_SIZE
+    if usable <= 0 or not valid_header(data[:HEADER_SIZE], path):
+        return np.empty(0, dtype=RECORD_DTYPE)
+    return np.frombuffer(data, dtype=RECORD_DTYPE, count=usable, offset=HEADER_SIZE)
+
+
+def load_columns(directories=None, start=None, end=None):
+    """Load one history directory, or a list of them (one per user), into HistoryColumns"""
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("NumPy is required for history analytics")
+    if directories is None:
+        directories = [default_history_dir()]
+    elif not isinstance(directories, (list, tuple)):
+        directories = [directories]
+
+    arrays = []
+    users = []
+    for user, directory in enumerate(directories):
+        # Sources left by an interrupted compaction would count their records twice
+        for segment in live_segments(list_segments(directory, start, end)):
+            records = _read_segment_array(segment.path)
+            arrays.append(records)
+            users.append(np.full(len(records), user, dtype=np.uint32))
+
+    if arrays:
+        records = np.concatenate(arrays)
+        user = np.concatenate(users)
+    else:
+        records = np.empty(0, dtype=RECORD_DTYPE)
+        user = np.empty(0, dtype=np.uint32)
+
+    columns = HistoryColumns(records['timestamp'], records['kind'], records['flags'],
+                             records['value'].astype(np.int64), user, len(directories))
+    if start is not None or end is not None:
+        mask = np.ones(len(columns), dtype=bool)
+        if start is not None:
+            mask &= columns.timestamp >= start
+        if end is not None:
+            mask &= columns.timestamp <= end
+        columns = columns.select(mask)
+    return columns
+
+
+def local_seconds(timestamps):
+    """Local wall-clock seconds since the epoch for an array of timestamps"""
+    if len(timestamps) == 0:
+        return timestamps.astype(np.int64)
+    seconds = timestamps.astype(np.int64)
+    # The UTC offset is looked up once per day in the range, not per record
+    days = seconds // SECONDS_PER_DAY
+    first = int(days.min())
+    span = int(days.max()) - first + 1
+    offsets = np.array([
+        time.localtime((first + d) * SECONDS_PER_DAY + SECONDS_PER_DAY // 2).tm_gmtoff
+        for d in range(span)
+    ], dtype=np.int64)
+    return seconds + offsets[days - first]
+
+
+def _local_days(columns, kind):
+    """Local day ordinals (as date.toordinal()) of the records of one kind"""
+    return columns.local_seconds(kind) // SECONDS_PER_DAY + date(1970, 1, 1).toordinal()
+
+
+def daily_focus(columns, days=28, today=None):
+    """Focus seconds per day for the last `days` days (summed over users), oldest first"""
+    today = (today or date.today()).toordinal()
+    index = _local_days(columns, KIND_WORK_END) - (today - days + 1)
+    keep = (index >= 0) & (index < days)
+    value = columns.value[columns.of_kind(KIND_WORK_END)]
+    return np.bincount(index[keep], weights=value[keep], minlength=days)
+
+
+def rolling_focus(columns, window=7, days=28, today=None):
+    """Rolling mean of daily focus seconds over `window` days, one value per day"""
+    focus = daily_focus(columns, days + window - 1, today)
+    totals = np.cumsum(np.concatenate(([0.0], focus)))
+    return (totals[window:] - totals[:-window]) / window
+
+
+def break_compliance(columns):
+    """Share of breaks taken to the end, per user (NaN for users without breaks)"""
+    ends = columns.of_kind(KIND_BREAK_END)
+    user = columns.user[ends]
+    total = np.bincount(user, minlength=columns.users)
+    completed = np.bincount(user[(columns.flags[ends] & FLAG_COMPLETED) > 0], minlength=columns.users)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return completed / total
+
+
+def heatmap(columns):
+    """7x24 grid (Monday first) of focus seconds by local weekday and hour of session start"""
+    value = columns.value[columns.of_kind(KIND_WORK_END)]
+    started = columns.local_seconds(KIND_WORK_END) - value
+    # 1970-01-01 was a Thursday
+    weekday = (started // SECONDS_PER_DAY + 3) % 7
+    hour = (started % SECONDS_PER_DAY) // 3600
+    grid = np.bincount(weekday * 24 + hour, weights=value, minlength=7 * 24)
+    return grid.reshape(7, 24)
+
+
+def streaks(columns, today=None):
+    """Longest and current run of consecutive days with a completed session, per user"""
+    sessions = columns.of_kind(KIND_WORK_END)
+    completed = (columns.flags[sessions] & FLAG_COMPLETED) > 0
+    longest = np.zeros(columns.users, dtype=np.int64)
+    current = np.zeros(columns.users, dtype=np.int64)
+    if not completed.any():
+        return longest, current
+
+    days = _local_days(columns, KIND_WORK_END)[completed]
+    first = int(days.min())
+    # One row of active days per user; the extra last column stays empty so
+    # runs never continue from one user's row into the next
+    width = int(days.max()) - first + 2
+    active = np.zeros((columns.users, width), dtype=np.int8)
+    active[columns.user[sessions][completed], days - first] = 1
+
+    edges = np.diff(np.concatenate(([0], active.ravel(), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    lengths = ends - starts
+    run_user = starts // width
+    run_last = (ends - 1) % width + first
+    np.maximum.at(longest, run_user, lengths)
+
+    today = (today or date.today()).toordinal()
+    live = run_last >= today - 1
+    current[run_user[live]] = lengths[live]
+    return longest, current
+
+
+def format_heatmap(grid):
+    """Render a weekday x hour grid as shaded text, one row per weekday"""
+    peak = grid.max()
+    scale = (len(HEAT_SHADES) - 1) / peak if peak else 0
+    shades = np.ceil(grid * scale).astype(int)
+    lines = ["     " + "".join(f"{h:<3d}" for h in range(0, 24, 3)).rstrip()]
+    for name, row, seconds in zip(WEEKDAYS, shades, grid.sum(axis=1)):
+        lines.append(f"{name}  " + "".join(HEAT_SHADES[s] for s in row) + f"  {int(seconds) // 60:>5}m")
+    return "\n".join(lines)
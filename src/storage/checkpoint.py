@@ -0,0 +1,184 @@
+"""
+Crash-safe timer state checkpointing for Pomodoro Lock
+
+The timer writes a small JSON checkpoint on state transitions only (session
+start, pause, resume, break), never per tick. Each write goes to a temporary
+file that is fsynced and atomically renamed over the previous checkpoint, so
+a crash leaves either the old or the new state on disk, never a torn file.
+
+Deadlines are stored as absolute wall-clock times, so a restarted timer can
+work out where the schedule would be now instead of starting over.
+"""
+
+import os
+import json
+import math
+import time
+import logging
+import threading
+from pathlib import Path
+
+CHECKPOINT_VERSION = 1
+
+# Checkpoints older than this are ignored (e.g. after a night powered off)
+MAX_CHECKPOINT_AGE = 12 * 60 * 60
+
+
+def atomic_write(path, data, mode=0o600):
+    """Write bytes to path via fsync + rename so readers never see partial data"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+    fd = os.open(tmp_path, flags, mode)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+
+    # Persist the rename itself (not supported on Windows)
+    if hasattr(os, 'O_DIRECTORY'):
+        try:
+            dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+        except OSError:
+            pass
+
+
+class StateCheckpoint:
+    """Persists the timer state on transitions"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.writes = 0
+        self._last = None
+        self._lock = threading.Lock()
+
+    def save(self, is_work_session, is_paused, deadline, remaining,
+             snooze_deadline=None, work_time=None, break_time=None, snooze_used=0):
+        """Write a checkpoint; identical consecutive states are not rewritten"""
+        state = {
+            'version': CHECKPOINT_VERSION,
+            'is_work_session': bool(is_work_session),
+            'is_paused': bool(is_paused),
+            'deadline': round(float(deadline), 3),
+            'remaining': int(remaining),
+            'snooze_deadline': round(float(snooze_deadline), 3) if snooze_deadline else None,
+            'snooze_used': int(round(snooze_used)),
+            'work_time': work_time,
+            'break_time': break_time,
+        }
+        with self._lock:
+            if state == self._last:
+                return True
+            record = dict(state, saved_at=round(time.time(), 3))
+            try:
+                atomic_write(self.path, json.dumps(record, indent=1).encode('utf-8'))
+            except Exception as e:
+                logging.error(f"Failed to write state checkpoint: {e}")
+                return False
+            self._last = state
+            self.writes += 1
+            return True
+
+    def load(self):
+        """Return the stored checkpoint as a dict, or None if missing or invalid"""
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.error(f"Ignoring unreadable state checkpoint: {e}")
+            return None
+        if not isinstance(state, dict) or state.get('version') != CHECKPOINT_VERSION:
+            logging.warning("Ignoring state checkpoint with unknown version")
+            return None
+        return state
+
+    def clear(self):
+        """Remove the checkpoint"""
+        with self._lock:
+            self._last = None
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logging.error(f"Failed to remove state checkpoint: {e}")
+
+
+def resume_plan(state, break_time, now=None):
+    """
+    Work out where a restored session should continue.
+
+    Returns a dict with is_work_session, remaining, is_paused,
+    snooze_remaining and snooze_used (the session's snooze so far, so a
+    restart does not reset the snooze limit), or None when a fresh work
+    session should start.
+    A work session whose deadline passed while the timer was down resumes
+    in the break it owes rather than skipping it.
+    """
+    if not state:
+        return None
+    if now is None:
+        now = time.time()
+
+    try:
+        saved_at = float(state['saved_at'])
+        is_work_session = bool(state['is_work_session'])
+        snooze_used = int(state.get('snooze_used') or 0)
+        if now - saved_at > MAX_CHECKPOINT_AGE or saved_at > now + 60:
+            return None
+
+        if state.get('is_paused'):
+            remaining = int(state['remaining'])
+            snooze_deadline = state.get('snooze_deadline')
+            if snooze_deadline is None:
+                return None
+            snooze_left = float(snooze_deadline) - now
+            if snooze_left > 0:
+                return {
+                    'is_work_session': is_work_session,
+                    'remaining': remaining,
+                    'is_paused': True,
+                    'snooze_remaining': int(math.ceil(snooze_left)),
+                    'snooze_used': snooze_used,
+                }
+            # The snooze expired while we were down: the timer resumed then
+            deadline = float(snooze_deadline) + remaining
+        else:
+            deadline = float(state['deadline'])
+    except (KeyError, TypeError, ValueError) as e:
+        logging.warning(f"Ignoring malformed state checkpoint: {e}")
+        return None
+
+    left = deadline - now
+    if left > 0:
+        return {
+            'is_work_session': is_work_session,
+            'remaining': int(math.ceil(left)),
+            'is_paused': False,
+            'snooze_remaining': 0,
+            'snooze_used': snooze_used,
+        }
+
+    if is_work_session:
+        break_left = deadline + break_time - now
+        if break_left > 0:
+            return {
+                'is_work_session': False,
+                'remaining': int(math.ceil(break_left)),
+                'is_paused': False,
+                'snooze_remaining': 0,
+                'snooze_used': 0,
+            }
+    return None
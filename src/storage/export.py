@@ -0,0 +1,110 @@
+"""
+Streaming history export for Pomodoro Lock
+
+Exports are a chain of generators: segments overlapping the requested range
+(chosen from their file names, so others are never opened) -> records ->
+rows -> CSV or JSON Lines text written as it is produced. Nothing holds more
+than one read chunk of a segment, so memory use does not grow with the
+length of the history.
+"""
+
+import csv
+import json
+from datetime import datetime
+
+from .history import (
+    iter_records,
+    KIND_NAMES,
+    FLAG_COMPLETED,
+    FLAG_AUTO,
+    FLAG_BREAK
+)
+
+EXPORT_FORMATS = ('csv', 'jsonl')
+EXPORT_FIELDS = ('timestamp', 'time', 'event', 'value', 'completed', 'auto', 'during_break')
+
+
+def parse_time(text):
+    """Parse an export bound: seconds since the epoch, or an ISO date/datetime (local time unless it has an offset)"""
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    return datetime.fromisoformat(text).timestamp()
+
+
+def export_rows(records, kinds=None):
+    """Turn HistoryRecords into row tuples ordered as EXPORT_FIELDS"""
+    for record in records:
+        if kinds and record.kind not in kinds:
+            continue
+        yield (
+            f"{record.timestamp:.3f}",
+            datetime.fromtimestamp(record.timestamp).astimezone().isoformat(timespec='seconds'),
+            KIND_NAMES.get(record.kind, str(record.kind)),
+            record.value,
+            int(bool(record.flags & FLAG_COMPLETED)),
+            int(bool(record.flags & FLAG_AUTO)),
+            int(bool(record.flags & FLAG_BREAK)),
+        )
+
+
+def csv_lines(rows):
+    """Write rows as CSV lines with a header, one line at a time"""
+    buffer = _LineBuffer()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(EXPORT_FIELDS)
+    yield buffer.take()
+    for row in rows:
+        writer.writerow(row)
+        yield buffer.take()
+
+
+def jsonl_lines(rows):
+    """Write rows as JSON Lines"""
+    for row in rows:
+        item = dict(zip(EXPORT_FIELDS, row))
+        item['timestamp'] = float(item['timestamp'])
+        yield json.dumps(item, separators=(',', ':')) + '\n'
+
+
+def export_history(out, directory, fmt='csv', start=None, end=None, kinds=None):
+    """Stream the history in [start, end] to a text file object; returns the number of rows"""
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    counter = _Counter(export_rows(iter_records(directory, start, end), kinds))
+    lines = csv_lines(counter) if fmt == 'csv' else jsonl_lines(counter)
+    for line in lines:
+        out.write(line)
+    return counter.count
+
+
+class _LineBuffer:
+    """Minimal file object that hands back what csv.writer wrote"""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, text):
+        self.parts.append(text)
+
+    def take(self):
+        text = "".join(self.parts)
+        self.parts.clear()
+        return text
+
+
+class _Counter:
+    """Pass-through iterator that counts the items it yields"""
+
+    def __init__(self, iterable):
+        self.iterable = iter(iterable)
+        self.count = 0
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        item = next(self.iterable)
+        self.count += 1
+        return item
@@ -0,0 +1,501 @@
+"""
+Append-only session history for Pomodoro Lock
+
+Every timer transition is stored as one fixed-size 16-byte record appended to
+a segment file in ~/.local/share/pomodoro-lock/history:
+
+    offset  size  field
+    0       8     timestamp   seconds since the epoch (float64)
+    8       1     kind        see KIND_* below
+    9       1     flags       FLAG_* bits
+    10      2     reserved
+    12      4     value       seconds (planned length, elapsed time, snooze)
+
+Segments start with a 16-byte header (magic, version, record size, creation
+time). Each new segment takes the next sequence number of the directory. The
+segment being written is named seg-<first>.<seq>.active; rotated segments
+are sealed as seg-<first>-<last>.<seq>.seg, so the directory listing is an
+index of the history, and names stay unique when two segments fall in the
+same second. A compacted segment is named after the sequence numbers it
+replaced (seg-<first>-<last>.<seq>-<seq>.seg).
+
+The timer thread only encodes a record and puts it on a queue. A writer
+thread appends records and group-commits them: one fsync per batch of
+records or seconds, whichever comes first. Segments are rotated by size or
+age, and small sealed neighbours are compacted into larger segments.
+"""
+
+import os
+import re
+import time
+import queue
+import struct
+import logging
+import threading
+from pathlib import Path
+from collections import namedtuple
+
+SEGMENT_MAGIC = b'PMLH'
+SEGMENT_VERSION = 1
+HEADER_STRUCT = struct.Struct('<4sHHd')
+RECORD_STRUCT = struct.Struct('<dBBxxI')
+HEADER_SIZE = HEADER_STRUCT.size
+RECORD_SIZE = RECORD_STRUCT.size
+
+# Record kinds
+KIND_WORK_START = 1
+KIND_WORK_END = 2
+KIND_BREAK_START = 3
+KIND_BREAK_END = 4
+KIND_PAUSE = 5
+KIND_RESUME = 6
+KIND_SNOOZE_DENIED = 7
+
+KIND_NAMES = {
+    KIND_WORK_START: 'work_start',
+    KIND_WORK_END: 'work_end',
+    KIND_BREAK_START: 'break_start',
+    KIND_BREAK_END: 'break_end',
+    KIND_PAUSE: 'pause',
+    KIND_RESUME: 'resume',
+    KIND_SNOOZE_DENIED: 'snooze_denied',
+}
+
+# Record flags
+FLAG_COMPLETED = 0x01   # work session or break ran to its end
+FLAG_AUTO = 0x02        # resume triggered by the snooze deadline
+FLAG_BREAK = 0x04       # pause/resume happened during a break
+FLAG_LIMITED = 0x08     # snooze shortened by the per-session snooze limit
+
+ACTIVE_SUFFIX = '.active'
+SEALED_SUFFIX = '.seg'
+SEGMENT_PATTERN = re.compile(r'^seg-(\d+)(?:-(\d+))?(?:\.(\d+)(?:-(\d+))?)?\.(active|seg)$')
+
+HistoryRecord = namedtuple('HistoryRecord', ['timestamp', 'kind', 'flags', 'value'])
+# seq_first/seq_last: sequence numbers the segment holds (0 for segments named before sequence numbers)
+SegmentInfo = namedtuple('SegmentInfo', ['path', 'first', 'last', 'sealed', 'size', 'seq_first', 'seq_last'])
+
+
+def default_history_dir():
+    """Return the default history directory for this platform"""
+    if os.name == 'nt':
+        return Path.home() / "AppData" / "Local" / "pomodoro-lock" / "history"
+    return Path.home() / ".local" / "share" / "pomodoro-lock" / "history"
+
+
+def list_segments(directory, start=None, end=None):
+    """
+    Return SegmentInfo for segments overlapping [start, end], in the order they were written.
+
+    Only file names are inspected, so segments outside the range are never
+    opened. The active segment is treated as open-ended.
+    """
+    directory = Path(directory)
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+
+    segments = []
+    for name in names:
+        match = SEGMENT_PATTERN.match(name)
+        if not match:
+            continue
+        first = int(match.group(1))
+        sealed = match.group(5) == 'seg'
+        last = int(match.group(2)) if match.group(2) else None
+        seq_first = int(match.group(3)) if match.group(3) else 0
+        seq_last = int(match.group(4)) if match.group(4) else seq_first
+        if start is not None and last is not None and last < int(start):
+            continue
+        if end is not None and first > end:
+            continue
+        path = directory / name
+        try:
+            size = path.stat().st_size
+        except OSError:
+            continue
+        segments.append(SegmentInfo(path, first, last, sealed, size, seq_first, seq_last))
+
+    segments.sort(key=lambda segment: (segment.seq_first, segment.first, segment.sealed is False))
+    return segments
+
+
+def valid_header(header, path):
+    """Whether a segment header is one this version reads (logs why not)"""
+    if len(header) < HEADER_SIZE:
+        return False
+    magic, version, record_size, _ = HEADER_STRUCT.unpack(header[:HEADER_SIZE])
+    if magic != SEGMENT_MAGIC or version != SEGMENT_VERSION or record_size != RECORD_SIZE:
+        logging.warning(f"Skipping history segment with unknown format: {path}")
+        return False
+    return True
+
+
+def read_segment(path, start=None, end=None, offset=0):
+    """Yield HistoryRecords from one segment, optionally limited to [start, end], skipping `offset` records"""
+    with open(path, 'rb') as f:
+        if not valid_header(f.read(HEADER_SIZE), path):
+            return
+        if offset:
+            f.seek(HEADER_SIZE + offset * RECORD_SIZE)
+        while True:
+            chunk = f.read(RECORD_SIZE * 4096)
+            if not chunk:
+                return
+            usable = len(chunk) - len(chunk) % RECORD_SIZE
+            for record in RECORD_STRUCT.iter_unpack(chunk[:usable]):
+                timestamp = record[0]
+                if start is not None and timestamp < start:
+                    continue
+                if end is not None and timestamp > end:
+                    continue
+                yield HistoryRecord(*record)
+            if usable < len(chunk):
+                return
+
+
+def iter_records(directory, start=None, end=None):
+    """Yield HistoryRecords across segments in write order, reading only overlapping segments"""
+    # Sources left by an interrupted compaction are already in the merged segment
+    for segment in live_segments(list_segments(directory, start, end)):
+        try:
+            yield from read_segment(segment.path, start, end)
+        except FileNotFoundError:
+            # Merged away by a compaction since it was listed
+            continue
+
+
+def live_segments(segments):
+    """Drop segments whose records a compacted segment in the list already holds"""
+    return [
+        segment for segment in segments
+        if not any(other is not segment and _covers(other, segment) for other in segments)
+    ]
+
+
+def _segment_header(created):
+    """Encode a segment header"""
+    return HEADER_STRUCT.pack(SEGMENT_MAGIC, SEGMENT_VERSION, RECORD_SIZE, created)
+
+
+def _sealed_name(first, last, seq_first, seq_last):
+    """Name of a sealed segment covering [first, last] and sequence numbers [seq_first, seq_last]"""
+    seq = f"{seq_first:06d}" if seq_first == seq_last else f"{seq_first:06d}-{seq_last:06d}"
+    return f"seg-{int(first):010d}-{int(last):010d}.{seq}{SEALED_SUFFIX}"
+
+
+def _covers(other, segment):
+    """Whether other is a compacted segment holding every record of segment"""
+    if segment.seq_last == 0:
+        # Named before sequence numbers: judge by time range and size
+        return other.first <= segment.first and segment.last <= other.last and other.size > segment.size
+    return (
+        other.seq_first <= segment.seq_first and segment.seq_last <= other.seq_last
+        and (other.seq_first, other.seq_last) != (segment.seq_first, segment.seq_last)
+    )
+
+
+class HistoryLog:
+    """Append-only history writer with group commit, rotation and compaction"""
+
+    def __init__(self, directory=None, batch_records=32, batch_seconds=5.0,
+                 segment_bytes=1024 * 1024, segment_seconds=7 * 24 * 60 * 60,
+                 compact_seconds=31 * 24 * 60 * 60):
+        self.directory = Path(directory) if directory else default_history_dir()
+        self.batch_records = batch_records
+        self.batch_seconds = batch_seconds
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.compact_seconds = compact_seconds
+
+        self.records_written = 0
+        self.fsyncs = 0
+        self._queue = queue.SimpleQueue()
+        self._thread = None
+        self._running = False
+        self._fd = None
+        self._active_path = None
+        self._active_first = None
+        self._active_last = None
+        self._active_size = 0
+        self._active_seq = 0
+        self._next_seq = 1
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """Call listener(records) on the writer thread after each group commit"""
+        self._listeners.append(listener)
+
+    def start(self):
+        """Start the writer thread"""
+        if self._running:
+            return True
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logging.error(f"Failed to create history directory {self.directory}: {e}")
+            return False
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="history-writer", daemon=True)
+        self._thread.start()
+        return True
+
+    def record(self, kind, value=0, flags=0, timestamp=None):
+        """Queue one record; never blocks on disk"""
+        if not self._running:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        self._queue.put(RECORD_STRUCT.pack(timestamp, kind, flags, max(0, int(value))))
+
+    def flush(self, timeout=5.0):
+        """Wait until everything queued so far has been committed"""
+        if not self._running:
+            return False
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """Commit pending records and stop the writer thread"""
+        if not self._running:
+            return
+        self._queue.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self._running = False
+
+    # Writer thread
+
+    def _run(self):
+        """Writer thread: group-commit queued records"""
+        try:
+            self._open_active()
+            self.compact()
+        except Exception as e:
+            logging.error(f"Failed to open history: {e}")
+
+        pending = []
+        waiters = []
+        commit_deadline = None
+        stopping = False
+
+        while not stopping:
+            timeout = None if commit_deadline is None else max(0.0, commit_deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+
+            if item is None:
+                stopping = True
+            elif isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not False:
+                pending.append(item)
+                if commit_deadline is None:
+                    commit_deadline = time.monotonic() + self.batch_seconds
+
+            due = commit_deadline is not None and time.monotonic() >= commit_deadline
+            if pending and (stopping or waiters or due or len(pending) >= self.batch_records):
+                self._commit(pending)
+                pending = []
+                commit_deadline = None
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+
+        self._close_active()
+
+    def _commit(self, pending):
+        """Append a batch of encoded records and fsync once"""
+        try:
+            for data in pending:
+                timestamp = RECORD_STRUCT.unpack(data)[0]
+                if self._needs_rotation(timestamp):
+                    self._rotate()
+                if self._fd is None:
+                    self._create_active(timestamp)
+                os.write(self._fd, data)
+                self._active_size += RECORD_SIZE
+                self._active_last = timestamp
+            os.fsync(self._fd)
+            self.fsyncs += 1
+            self.records_written += len(pending)
+        except Exception as e:
+            logging.error(f"Failed to write session history: {e}")
+            return
+
+        if self._listeners:
+            records = [HistoryRecord(*RECORD_STRUCT.unpack(data)) for data in pending]
+            for listener in self._listeners:
+                try:
+                    listener(records)
+                except Exception as e:
+                    logging.error(f"History listener failed: {e}")
+
+    def _needs_rotation(self, timestamp):
+        """Whether the active segment is full or too old"""
+        if self._fd is None:
+            return False
+        if self._active_size + RECORD_SIZE > self.segment_bytes:
+            return True
+        return timestamp - self._active_first > self.segment_seconds
+
+    def _open_active(self):
+        """Reopen an active segment left by a previous run, dropping a torn tail"""
+        segments = list_segments(self.directory)
+        self._next_seq = max([segment.seq_last for segment in segments] + [0]) + 1
+        for segment in segments:
+            if segment.sealed:
+                continue
+            if self._fd is not None:
+                # More than one active segment: seal the older one
+                self._rotate()
+            size = segment.size
+            valid = size - (size - HEADER_SIZE) % RECORD_SIZE if size >= HEADER_SIZE else 0
+            fd = os.open(segment.path, os.O_RDWR | getattr(os, 'O_BINARY', 0))
+            if valid < HEADER_SIZE:
+                os.close(fd)
+                os.unlink(segment.path)
+                continue
+            if valid != size:
+                logging.warning(f"Truncating torn history record in {segment.path.name}")
+                os.ftruncate(fd, valid)
+            os.lseek(fd, 0, os.SEEK_END)
+            self._fd = fd
+            self._active_path = segment.path
+            self._active_first = segment.first
+            self._active_seq = segment.seq_first
+            self._active_size = valid
+            self._active_last = None
+            if valid > HEADER_SIZE:
+                os.lseek(fd, valid - RECORD_SIZE, os.SEEK_SET)
+                self._active_last = RECORD_STRUCT.unpack(os.read(fd, RECORD_SIZE))[0]
+                os.lseek(fd, 0, os.SEEK_END)
+
+    def _create_active(self, timestamp):
+        """Start a new active segment"""
+        path = self.directory / f"seg-{int(timestamp):010d}.{self._next_seq:06d}{ACTIVE_SUFFIX}"
+        flags = os.O_RDWR | os.O_CREAT | os.O_EXCL | os.O_APPEND | getattr(os, 'O_BINARY', 0)
+        self._fd = os.open(path, flags, 0o600)
+        os.write(self._fd, _segment_header(time.time()))
+        self._active_path = path
+        self._active_first = int(timestamp)
+        self._active_seq = self._next_seq
+        self._next_seq += 1
+        self._active_size = HEADER_SIZE
+        self._active_last = None
+
+    def _rotate(self):
+        """Seal the active segment under its final time range"""
+        if self._fd is None:
+            return
+        sealed = None
+        if self._active_last is not None:
+            sealed = self.directory / _sealed_name(
+                self._active_first, self._active_last, self._active_seq, self._active_seq
+            )
+            if sealed.exists():
+                # Never overwrite sealed history
+                raise FileExistsError(f"history segment {sealed.name} already exists")
+        os.fsync(self._fd)
+        os.close(self._fd)
+        self._fd = None
+        if sealed is None:
+            # Empty segment: nothing worth keeping
+            os.unlink(self._active_path)
+        else:
+            os.replace(self._active_path, sealed)
+            self._fsync_directory()
+            self.compact()
+        self._active_path = None
+
+    def _close_active(self):
+        """Flush and close the active segment without sealing it"""
+        if self._fd is not None:
+            try:
+                os.fsync(self._fd)
+                os.close(self._fd)
+            except OSError as e:
+                logging.error(f"Failed to close history segment: {e}")
+            self._fd = None
+
+    def _fsync_directory(self):
+        """Persist renames in the history directory (POSIX only)"""
+        if not hasattr(os, 'O_DIRECTORY'):
+            return
+        try:
+            fd = os.open(self.directory, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+    def compact(self):
+        """
+        Merge runs of small adjacent sealed segments.
+
+        A merged segment is fully written and renamed into place before its
+        sources are removed. If we crash in between, the sources are left
+        fully covered by the merged range and are removed on the next run.
+        """
+        sealed = [segment for segment in list_segments(self.directory) if segment.sealed]
+        sealed = self._drop_covered(sealed)
+
+        run = []
+        for segment in sealed + [None]:
+            if segment is not None and run:
+                size = sum(s.size - HEADER_SIZE for s in run) + segment.size
+                span = segment.last - run[0].first
+                if size <= self.segment_bytes and span <= self.compact_seconds:
+                    run.append(segment)
+                    continue
+            if len(run) > 1:
+                self._merge(run)
+            run = [segment] if segment is not None else []
+
+    def _drop_covered(self, sealed):
+        """Remove sealed segments left behind by an interrupted compaction"""
+        kept = []
+        for segment in sealed:
+            covered = any(other is not segment and _covers(other, segment) for other in sealed)
+            if covered:
+                logging.info(f"Removing compacted history segment {segment.path.name}")
+                try:
+                    os.unlink(segment.path)
+                except OSError:
+                    pass
+            else:
+                kept.append(segment)
+        return kept
+
+    def _merge(self, run):
+        """Write run's records into one sealed segment and delete the sources"""
+        target = self.directory / _sealed_name(run[0].first, run[-1].last, run[0].seq_first, run[-1].seq_last)
+        tmp = target.with_name(target.name + '.tmp')
+        try:
+            with open(tmp, 'wb') as out:
+                out.write(_segment_header(time.time()))
+                for segment in run:
+                    with open(segment.path, 'rb') as f:
+                        f.seek(HEADER_SIZE)
+                        data = f.read()
+                    out.write(data[:len(data) - len(data) % RECORD_SIZE])
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(tmp, target)
+            self._fsync_directory()
+            for segment in run:
+                if segment.path != target:
+                    os.unlink(segment.path)
+            logging.info(f"Compacted {len(run)} history segments into {target.name}")
+        except Exception as e:
+            logging.error(f"Failed to compact history segments: {e}")
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
@@ -0,0 +1,205 @@
+"""
+History queries and reports for Pomodoro Lock
+
+Reports are answered from per-day and per-week rollups instead of raw
+records. The rollups are stored next to the history segments together with a
+cursor: the position of the next record in write order (how many records are
+already folded in). Segment sizes tell which segment and offset that is, so
+each refresh skips every older segment without opening it and seeks straight
+to the first new record. Compaction keeps records in write order, so the
+position stays valid, and records written after the wall clock stepped back
+are still counted. Asking for the last 90 days then costs 90 dictionary
+lookups, independent of how many records the history holds.
+"""
+
+import json
+import logging
+import threading
+from datetime import date, timedelta
+from pathlib import Path
+from collections import namedtuple
+
+from .checkpoint import atomic_write
+from .history import (
+    list_segments,
+    live_segments,
+    read_segment,
+    default_history_dir,
+    HEADER_SIZE,
+    RECORD_SIZE,
+    KIND_WORK_END,
+    KIND_BREAK_END,
+    KIND_PAUSE,
+    KIND_RESUME,
+    FLAG_COMPLETED
+)
+
+ROLLUP_VERSION = 2
+ROLLUP_FILE = "rollups.json"
+
+# Order of the counters kept per day and per week
+FIELDS = (
+    'focus_seconds',
+    'sessions',
+    'breaks',
+    'skipped_breaks',
+    'snoozes',
+    'snooze_seconds',
+)
+FOCUS, SESSIONS, BREAKS, SKIPPED, SNOOZES, SNOOZE_SECONDS = range(len(FIELDS))
+
+DaySummary = namedtuple('DaySummary', ('day',) + FIELDS)
+WeekSummary = namedtuple('WeekSummary', ('week',) + FIELDS)
+
+
+def week_key(day):
+    """ISO week of a date as 'YYYY-Www'"""
+    year, week, _ = day.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class HistoryIndex:
+    """Incrementally maintained daily and weekly rollups of the session history"""
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory else default_history_dir()
+        self.path = self.directory / ROLLUP_FILE
+        self.days = {}
+        self.weeks = {}
+        # Records folded in so far, in the order they were written
+        self.position = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        """Load stored rollups; a missing or damaged file means a full rebuild"""
+        try:
+            with open(self.path, 'r') as f:
+                stored = json.load(f)
+            if stored.get('version') != ROLLUP_VERSION:
+                return
+            self.days = {int(day): counters for day, counters in stored['days'].items()}
+            self.weeks = dict(stored['weeks'])
+            self.position = int(stored['position'])
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logging.warning(f"Rebuilding history rollups: {e}")
+            self.days, self.weeks, self.position = {}, {}, 0
+
+    def save(self):
+        """Persist the rollups and cursor atomically"""
+        with self._lock:
+            data = {
+                'version': ROLLUP_VERSION,
+                'position': self.position,
+                'days': self.days,
+                'weeks': self.weeks,
+            }
+            payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        try:
+            atomic_write(self.path, payload)
+        except Exception as e:
+            logging.error(f"Failed to save history rollups: {e}")
+
+    def _apply_new(self):
+        """Fold records past the cursor into the rollups (called with the lock held)"""
+        applied = 0
+        first = 0
+        for segment in live_segments(list_segments(self.directory)):
+            count = max(0, segment.size - HEADER_SIZE) // RECORD_SIZE
+            if segment.sealed and first + count <= self.position:
+                first += count
+                continue
+            try:
+                for record in read_segment(segment.path, offset=max(0, self.position - first)):
+                    self._apply_one(record)
+                    self.position += 1
+                    applied += 1
+            except FileNotFoundError:
+                # Compacted while we read; the next refresh continues from here
+                break
+            first += count
+            if segment.sealed:
+                # A segment skipped as unreadable still takes up its positions
+                self.position = max(self.position, first)
+        return applied
+
+    def _apply_one(self, record):
+        """Update the day and week counters for one record"""
+        if record.kind == KIND_WORK_END:
+            updates = ((FOCUS, record.value), (SESSIONS, 1))
+        elif record.kind == KIND_BREAK_END:
+            updates = ((BREAKS, 1),) if record.flags & FLAG_COMPLETED else ((SKIPPED, 1),)
+        elif record.kind == KIND_PAUSE:
+            updates = ((SNOOZES, 1),)
+        elif record.kind == KIND_RESUME:
+            updates = ((SNOOZE_SECONDS, record.value),)
+        else:
+            return
+
+        day = date.fromtimestamp(record.timestamp)
+        day_counters = self.days.setdefault(day.toordinal(), [0] * len(FIELDS))
+        week_counters = self.weeks.setdefault(week_key(day), [0] * len(FIELDS))
+        for field, amount in updates:
+            day_counters[field] += amount
+            week_counters[field] += amount
+
+    def refresh(self, save=True):
+        """Read records written since the last refresh; returns how many were new"""
+        with self._lock:
+            applied = self._apply_new()
+        if applied and save:
+            self.save()
+        return applied
+
+    def attach(self, history_log):
+        """Keep the rollups current after each commit of a running HistoryLog"""
+        # Refreshing from disk (rather than applying the committed batch)
+        # also picks up anything written before the rollups existed
+        history_log.add_listener(lambda records: self.refresh())
+
+    def daily(self, days=7, today=None):
+        """DaySummary for each of the last `days` days, oldest first"""
+        today = today or date.today()
+        empty = [0] * len(FIELDS)
+        summaries = []
+        for offset in range(days - 1, -1, -1):
+            day = today - timedelta(days=offset)
+            summaries.append(DaySummary(day, *self.days.get(day.toordinal(), empty)))
+        return summaries
+
+    def weekly(self, weeks=4, today=None):
+        """WeekSummary for each of the last `weeks` ISO weeks, oldest first"""
+        today = today or date.today()
+        empty = [0] * len(FIELDS)
+        summaries = []
+        for offset in range(weeks - 1, -1, -1):
+            key = week_key(today - timedelta(weeks=offset))
+            summaries.append(WeekSummary(key, *self.weeks.get(key, empty)))
+        return summaries
+
+    def totals(self, days=7, today=None):
+        """Sum of the counters over the last `days` days"""
+        totals = [0] * len(FIELDS)
+        for summary in self.daily(days, today):
+            for i, value in enumerate(summary[1:]):
+                totals[i] += value
+        return dict(zip(FIELDS, totals))
+
+
+def format_report(summaries, label):
+    """Render day or week summaries as a plain text table"""
+    lines = [
+        f"{label:<10} {'Focus':>7} {'Sessions':>8} {'Breaks':>6} {'Skipped':>7} {'Snoozes':>7} {'Snoozed':>7}",
+        "-" * 60,
+    ]
+    for summary in summaries:
+        name = summary[0].isoformat() if isinstance(summary[0], date) else summary[0]
+        focus = summary.focus_seconds // 60
+        snoozed = summary.snooze_seconds // 60
+        lines.append(
+            f"{name:<10} {focus // 60:>4}:{focus % 60:02d} {summary.sessions:>8} {summary.breaks:>6} "
+            f"{summary.skipped_breaks:>7} {summary.snoozes:>7} {snoozed:>6}m"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,47 @@
+"""
+Telemetry for Pomodoro Lock
+Logging that keeps disk and journald writes off the timer and GUI threads,
+metrics cheap enough to update on every tick, and a flight recorder
+"""
+
+from .logsetup import (
+    configure_logging,
+    flush_log_summaries,
+    shutdown_logging
+)
+from .ratelimit import RateLimitFilter
+from .metrics import (
+    MetricsRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    format_metrics
+)
+from .prometheus import (
+    render,
+    TextfileExporter,
+    MetricsSocketServer,
+    default_metrics_path
+)
+from .flight import (
+    FlightRecorder,
+    install_crash_hooks
+)
+
+__all__ = [
+    'configure_logging',
+    'flush_log_summaries',
+    'shutdown_logging',
+    'RateLimitFilter',
+    'MetricsRegistry',
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'format_metrics',
+    'render',
+    'TextfileExporter',
+    'MetricsSocketServer',
+    'default_metrics_path',
+    'FlightRecorder',
+    'install_crash_hooks'
+]
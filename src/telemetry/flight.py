@@ -0,0 +1,123 @@
+"""
+Flight recorder for Pomodoro Lock
+
+Keeps the most recent events (transitions, GUI callbacks, notifications,
+monitor changes, lock actions) in a fixed-size ring buffer allocated up
+front. Recording is a counter increment and three list stores, with no lock,
+no I/O and no background thread, so the recorder costs nothing while idle.
+The buffer is written to a file on request (SIGUSR2) or when an uncaught
+exception reaches sys.excepthook or threading.excepthook, which gives bug
+reports the context the log usually lacks.
+"""
+
+import os
+import sys
+import time
+import logging
+import itertools
+import threading
+from pathlib import Path
+
+from storage.checkpoint import atomic_write
+
+DEFAULT_CAPACITY = 8192
+DUMPS_KEPT = 5
+CRASH_DUMP_INTERVAL = 60.0
+
+
+class FlightRecorder:
+    """Preallocated ring buffer of (monotonic time, kind, detail) events"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, clock=time.monotonic):
+        self.capacity = capacity
+        self.clock = clock
+        self._times = [0.0] * capacity
+        self._kinds = [None] * capacity
+        self._details = [None] * capacity
+        self._counter = itertools.count()
+
+    def record(self, kind, detail=None):
+        """Record an event; safe to call from any thread"""
+        slot = next(self._counter) % self.capacity
+        self._times[slot] = self.clock()
+        self._kinds[slot] = kind
+        self._details[slot] = detail
+
+    def entries(self):
+        """Recorded events, oldest first"""
+        events = [
+            (t, kind, detail)
+            for t, kind, detail in zip(list(self._times), list(self._kinds), list(self._details))
+            if kind is not None
+        ]
+        events.sort(key=lambda event: event[0])
+        return events
+
+    def format(self, reason=''):
+        """Render the buffer as text, with wall-clock and relative times"""
+        now = self.clock()
+        wall_offset = time.time() - now
+        events = self.entries()
+        lines = [
+            f"# Pomodoro Lock flight recorder dump: {reason or 'requested'}",
+            f"# pid {os.getpid()}, {time.strftime('%Y-%m-%d %H:%M:%S')}, {len(events)} events (capacity {self.capacity})",
+        ]
+        for t, kind, detail in events:
+            stamp = time.strftime('%H:%M:%S', time.localtime(wall_offset + t))
+            millis = int((wall_offset + t) % 1 * 1000)
+            line = f"{stamp}.{millis:03d} {t - now:+11.3f}s {kind:<12}"
+            if detail is not None:
+                line += f" {detail}"
+            lines.append(line)
+        return "\n".join(lines) + "\n"
+
+    def dump(self, directory, reason='requested', keep=DUMPS_KEPT):
+        """Write the buffer to a new file in directory and prune old dumps; returns the path"""
+        directory = Path(directory)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        path = directory / f"flight-{stamp}-{os.getpid()}-{reason}.log"
+        atomic_write(path, self.format(reason).encode('utf-8'))
+
+        dumps = sorted(directory.glob("flight-*.log"), key=lambda p: p.stat().st_mtime)
+        for old in dumps[:-keep] if keep else []:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+        return path
+
+
+def install_crash_hooks(recorder, directory, min_interval=CRASH_DUMP_INTERVAL):
+    """Dump the recorder when an uncaught exception reaches the interpreter or a thread"""
+    last_dump = [None]
+
+    def crash_dump(reason, description):
+        recorder.record('crash', description)
+        now = time.monotonic()
+        # Exceptions escaping a GTK callback recur every second; one dump is enough
+        if last_dump[0] is not None and now - last_dump[0] < min_interval:
+            return
+        last_dump[0] = now
+        try:
+            path = recorder.dump(directory, reason)
+            logging.error(f"Uncaught exception ({description}); flight recorder written to {path}")
+        except Exception as e:
+            logging.error(f"Failed to write flight recorder dump: {e}")
+
+    previous_excepthook = sys.excepthook
+
+    def excepthook(exc_type, exc_value, exc_traceback):
+        if not issubclass(exc_type, KeyboardInterrupt):
+            crash_dump('crash', f"{exc_type.__name__}: {exc_value}")
+        previous_excepthook(exc_type, exc_value, exc_traceback)
+
+    previous_thread_excepthook = threading.excepthook
+
+    def thread_excepthook(args):
+        if not issubclass(args.exc_type, SystemExit):
+            name = args.thread.name if args.thread is not None else '?'
+            crash_dump('thread-crash', f"{name}: {args.exc_type.__name__}: {args.exc_value}")
+        previous_thread_excepthook(args)
+
+    sys.excepthook = excepthook
+    threading.excepthook = thread_excepthook
@@ -0,0 +1,92 @@
+"""
+Non-blocking logging for Pomodoro Lock
+
+The timer and GUI threads only put log records on an in-memory queue
+(QueueHandler). A QueueListener thread formats them and does the slow part:
+writing the size-rotated log file and the console/journald stream. A slow
+disk or a stalled journald pipe therefore never delays the countdown.
+A RateLimitFilter on the QueueHandler drops repeats of the same failure
+before they are queued; its pending summaries are written before the log
+file rotates and at shutdown.
+"""
+
+import atexit
+import queue
+import logging
+import logging.handlers
+from pathlib import Path
+
+from .ratelimit import RateLimitFilter
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+LOG_MAX_BYTES = 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+_listener = None
+_rate_limit = None
+
+
+class _RotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Size-rotated log file that reports suppressed failures before rolling over"""
+
+    def doRollover(self):
+        flush_log_summaries()
+        super().doRollover()
+
+
+def configure_logging(log_path, level=logging.INFO, max_bytes=LOG_MAX_BYTES,
+                      backup_count=LOG_BACKUP_COUNT, stream=True, handlers=None,
+                      rate_limit=True):
+    """Route the root logger through a queue to a rotating file (and the console)"""
+    global _listener, _rate_limit
+    shutdown_logging()
+
+    if handlers is None:
+        Path(log_path).parent.mkdir(parents=True, exist_ok=True)
+        handlers = [_RotatingFileHandler(
+            log_path, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8'
+        )]
+        if stream:
+            handlers.append(logging.StreamHandler())
+    formatter = logging.Formatter(LOG_FORMAT)
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    if rate_limit:
+        _rate_limit = rate_limit if isinstance(rate_limit, logging.Filter) else RateLimitFilter()
+        queue_handler.addFilter(_rate_limit)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return _listener
+
+
+def flush_log_summaries():
+    """Log the suppressed counts the rate limit has not reported yet"""
+    if _rate_limit is not None:
+        _rate_limit.flush()
+
+
+def shutdown_logging():
+    """Write out pending summaries and queued records, and stop the listener thread"""
+    global _listener, _rate_limit
+    if _listener is not None:
+        flush_log_summaries()
+        _listener.stop()
+        for handler in _listener.handlers:
+            try:
+                handler.close()
+            except Exception:
+                pass
+        _listener = None
+    _rate_limit = None
+
+
+atexit.register(shutdown_logging)
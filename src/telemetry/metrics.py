@@ -0,0 +1,187 @@
+"""
+In-process metrics for Pomodoro Lock
+
+A small registry of counters, gauges and fixed-bucket histograms, cheap
+enough to update on every tick and GUI callback. Histogram buckets are fixed
+when the metric is created, so an observation is a bisect and three
+additions under a lock; nothing is allocated on the hot path. The running
+timer returns snapshot() over the control channel (`pomodoro-lock metrics`)
+and telemetry.prometheus renders it for scrapers.
+"""
+
+import time
+import bisect
+import threading
+
+# Upper bounds in seconds, from sub-millisecond callbacks to multi-second stalls
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Counter:
+    """Monotonically increasing count"""
+
+    kind = 'counter'
+
+    def __init__(self, name, help=''):
+        self.name = name
+        self.help = help
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return {'type': self.kind, 'help': self.help, 'value': self.value}
+
+
+class Gauge:
+    """Value that can go up and down"""
+
+    kind = 'gauge'
+
+    def __init__(self, name, help=''):
+        self.name = name
+        self.help = help
+        self.value = 0
+        self._function = None
+
+    def set(self, value):
+        self.value = value
+
+    def set_function(self, function):
+        """Read the value from function() whenever a snapshot is taken"""
+        self._function = function
+
+    def snapshot(self):
+        value = self._function() if self._function is not None else self.value
+        return {'type': self.kind, 'help': self.help, 'value': value}
+
+
+class Histogram:
+    """Distribution of observations over fixed buckets"""
+
+    kind = 'histogram'
+
+    def __init__(self, name, help='', buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.bounds = tuple(sorted(buckets))
+        # One count per bound plus the overflow (+Inf) bucket
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.bounds, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+            self.count += 1
+            if value > self.max:
+                self.max = value
+
+    def time(self):
+        """Context manager observing the duration of its block"""
+        return _Timer(self)
+
+    def snapshot(self):
+        with self._lock:
+            counts = list(self.counts)
+            total, count, largest = self.sum, self.count, self.max
+        return {
+            'type': self.kind,
+            'help': self.help,
+            'buckets': [[bound, n] for bound, n in zip(self.bounds, counts)] + [['+Inf', counts[-1]]],
+            'sum': total,
+            'count': count,
+            'max': largest
+        }
+
+
+class _Timer:
+    """Times a block for Histogram.time()"""
+
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class MetricsRegistry:
+    """Named metrics, created on first use"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, *args)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} is a {metric.kind}, not a {cls.kind}")
+            return metric
+
+    def counter(self, name, help=''):
+        return self._get(Counter, name, help)
+
+    def gauge(self, name, help=''):
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name, help='', buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help, buckets)
+
+    def metrics(self):
+        """All metrics, sorted by name"""
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def snapshot(self):
+        """JSON-serializable view of every metric"""
+        return {metric.name: metric.snapshot() for metric in self.metrics()}
+
+
+def bucket_quantile(snapshot, fraction):
+    """Upper bound of the bucket holding the given quantile of a histogram snapshot"""
+    count = snapshot['count']
+    if not count:
+        return 0.0
+    rank = fraction * count
+    seen = 0
+    for bound, n in snapshot['buckets']:
+        seen += n
+        if seen >= rank:
+            return snapshot['max'] if bound == '+Inf' else min(bound, snapshot['max'])
+    return snapshot['max']
+
+
+def format_metrics(snapshot):
+    """Human-readable lines for a registry snapshot"""
+    lines = []
+    for name, metric in snapshot.items():
+        if metric['type'] == 'histogram':
+            count = metric['count']
+            mean = metric['sum'] / count if count else 0.0
+            lines.append(
+                f"{name:<36} n={count:<7} mean={mean * 1000:8.2f} ms"
+                f"  p50<={bucket_quantile(metric, 0.5) * 1000:8.2f} ms"
+                f"  p99<={bucket_quantile(metric, 0.99) * 1000:8.2f} ms"
+                f"  max={metric['max'] * 1000:8.2f} ms"
+            )
+        else:
+            lines.append(f"{name:<36} {metric['value']}")
+    return "\n".join(lines)
@@ -0,0 +1,194 @@
+"""
+Prometheus exposition for Pomodoro Lock metrics
+
+Renders a MetricsRegistry snapshot in the Prometheus text format (0.0.4)
+and offers two optional ways to hand it to a collector:
+
+- TextfileExporter rewrites a .prom file atomically every interval, for the
+  node exporter textfile collector
+- MetricsSocketServer answers HTTP GET requests on a Unix socket, for
+  scrapers that connect to local sockets
+
+Both render on demand from the in-memory registry; a scrape costs well under
+a millisecond, so a 15 s scrape interval is no load at all.
+"""
+
+import os
+import socket
+import logging
+import threading
+import socketserver
+from pathlib import Path
+from http.server import BaseHTTPRequestHandler
+
+from storage.checkpoint import atomic_write
+from ipc.status_page import runtime_dir
+
+NAMESPACE = "pomodoro_lock"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+TEXTFILE_INTERVAL = 15.0
+
+METRICS_SOCKET_AVAILABLE = hasattr(socket, 'AF_UNIX')
+
+
+def default_metrics_path():
+    """Return the default location of the metrics socket"""
+    return runtime_dir() / "metrics.sock"
+
+
+def process_rss_bytes():
+    """Resident set size of this process in bytes (0 if unknown)"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+        # Peak rather than current RSS, in KiB on Linux and bytes on macOS
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    except Exception:
+        return 0
+
+
+def _escape_help(text):
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _number(value):
+    if value == '+Inf':
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render(snapshot, namespace=NAMESPACE):
+    """Format a registry snapshot in the Prometheus text exposition format"""
+    lines = []
+    for name, metric in snapshot.items():
+        full = f"{namespace}_{name}" if namespace else name
+        if metric.get('help'):
+            lines.append(f"# HELP {full} {_escape_help(metric['help'])}")
+        lines.append(f"# TYPE {full} {metric['type']}")
+        if metric['type'] == 'histogram':
+            cumulative = 0
+            for bound, count in metric['buckets']:
+                cumulative += count
+                lines.append(f'{full}_bucket{{le="{_number(bound)}"}} {cumulative}')
+            lines.append(f"{full}_sum {_number(metric['sum'])}")
+            lines.append(f"{full}_count {metric['count']}")
+        else:
+            lines.append(f"{full} {_number(metric['value'])}")
+    return "\n".join(lines) + "\n"
+
+
+class TextfileExporter:
+    """Periodically writes the metrics to a file for the textfile collector"""
+
+    def __init__(self, registry, path, interval=TEXTFILE_INTERVAL):
+        self.registry = registry
+        self.path = Path(path)
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def write(self):
+        """Write the current metrics now"""
+        try:
+            atomic_write(self.path, render(self.registry.snapshot()).encode('utf-8'), mode=0o644)
+            return True
+        except OSError as e:
+            logging.error(f"Failed to write metrics to {self.path}: {e}")
+            return False
+
+    def start(self):
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-textfile", daemon=True)
+        self._thread.start()
+        logging.info(f"Writing metrics to {self.path} every {self.interval:g} s")
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._thread.join(timeout=2)
+        self._thread = None
+        # A stale file would report a stopped timer as healthy
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.write()
+            self._stop_event.wait(self.interval)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves GET /metrics (any path) from the server's registry"""
+
+    def do_GET(self):
+        body = render(self.server.registry.snapshot()).encode('utf-8')
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self):
+        # Unix socket peers have no address
+        return "local"
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _UnixHTTPServer(socketserver.UnixStreamServer):
+    timeout = 5
+
+
+class MetricsSocketServer:
+    """HTTP listener for metrics scrapes on a Unix socket"""
+
+    def __init__(self, registry, path=None):
+        self.registry = registry
+        self.path = Path(path) if path else default_metrics_path()
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Start serving; returns False if the socket cannot be created"""
+        if not METRICS_SOCKET_AVAILABLE:
+            logging.info("Unix sockets not available, metrics socket disabled")
+            return False
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True, mode=0o700)
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+            self._server = _UnixHTTPServer(str(self.path), _MetricsHandler)
+            self._server.registry = self.registry
+            os.chmod(self.path, 0o600)
+        except OSError as e:
+            logging.error(f"Failed to start metrics socket at {self.path}: {e}")
+            self._server = None
+            return False
+
+        self._thread = threading.Thread(target=self._server.serve_forever, name="metrics-socket", daemon=True)
+        self._thread.start()
+        logging.info(f"Serving metrics on {self.path}")
+        return True
+
+    def stop(self):
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join(timeout=2)
+        self._server = None
+        self._thread = None
+        try:
+            self.path.unlink()
+        except OSError:
+            pass
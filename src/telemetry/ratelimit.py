@@ -0,0 +1,171 @@
+"""
+Log suppression for repeating failures
+
+A broken tray icon or widget makes the once-per-second GUI callbacks log the
+same exception forever. RateLimitFilter keys warnings and errors by call
+site (file and line) and the exception being handled. Each key may log a short burst; after
+that, repeats pass with an exponentially growing interval, and the record
+that passes carries the number of repeats suppressed since the last one.
+Keys that went quiet have their suppressed counts reported by a periodic
+sweep, and flush() reports every pending count at once (before the log file
+rotates and at shutdown). A global hourly budget caps the volume across all
+keys, whatever the failure mode.
+
+The filter runs on the logging thread's caller (it is attached to the
+QueueHandler), so sys.exc_info() identifies the exception being handled
+even when the message is logged without exc_info.
+"""
+
+import sys
+import time
+import logging
+import threading
+
+SUMMARY_LOGGER = "pomodoro.ratelimit"
+
+
+class _KeyState:
+    """Suppression state of one call site / exception type"""
+
+    __slots__ = ('passed', 'suppressed', 'interval', 'next_allowed', 'last_seen')
+
+    def __init__(self):
+        self.passed = 0
+        self.suppressed = 0
+        self.interval = 0.0
+        self.next_allowed = 0.0
+        self.last_seen = 0.0
+
+
+class RateLimitFilter(logging.Filter):
+    """Exponential-backoff suppression of repeated log records"""
+
+    def __init__(self, burst=3, initial_interval=1.0, max_interval=600.0,
+                 hourly_budget=2000, sweep_interval=60.0, level=logging.WARNING,
+                 clock=time.monotonic):
+        super().__init__()
+        self.level = level
+        self.burst = burst
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.hourly_budget = hourly_budget
+        self.sweep_interval = sweep_interval
+        self.clock = clock
+        self.keys = {}
+        self.suppressed_total = 0
+        self._budget = hourly_budget
+        self._budget_refill = None
+        self._over_budget = 0
+        self._next_sweep = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def filter(self, record):
+        if getattr(self._local, 'summarizing', False):
+            return True
+
+        exc_type = record.exc_info[0] if record.exc_info else sys.exc_info()[0]
+        key = (record.pathname, record.lineno, exc_type.__name__ if exc_type else None)
+        now = self.clock()
+        with self._lock:
+            allowed = self._allow(key, now, record)
+            summaries = self._sweep(now)
+        if summaries:
+            self._emit_summaries(summaries)
+        return allowed
+
+    def _allow(self, key, now, record):
+        """Decide for one record; called with the lock held"""
+        if record.levelno < self.level:
+            if self._take_budget(now):
+                return True
+            self.suppressed_total += 1
+            self._over_budget += 1
+            return False
+
+        state = self.keys.get(key)
+        if state is None:
+            state = self.keys[key] = _KeyState()
+        elif now - state.last_seen > max(self.max_interval, 2 * state.interval):
+            # Quiet for a long time: start over with a fresh burst
+            state.passed = 0
+            state.interval = 0.0
+        state.last_seen = now
+
+        if state.passed >= self.burst and now < state.next_allowed:
+            state.suppressed += 1
+            self.suppressed_total += 1
+            return False
+
+        if not self._take_budget(now) and record.levelno < logging.CRITICAL:
+            state.suppressed += 1
+            self.suppressed_total += 1
+            self._over_budget += 1
+            return False
+
+        state.passed += 1
+        if state.passed >= self.burst:
+            state.interval = min(self.max_interval, max(self.initial_interval, state.interval * 2))
+            state.next_allowed = now + state.interval
+        if state.suppressed:
+            record.msg = f"{record.msg} (suppressed {state.suppressed} similar messages)"
+            state.suppressed = 0
+        return True
+
+    def _take_budget(self, now):
+        """Consume one record from the hourly budget"""
+        if self._budget_refill is None or now >= self._budget_refill:
+            self._budget = self.hourly_budget
+            self._budget_refill = now + 3600
+        if self._budget <= 0:
+            return False
+        self._budget -= 1
+        return True
+
+    def _sweep(self, now):
+        """Collect summaries for keys that stopped repeating; called with the lock held"""
+        if self._next_sweep is None:
+            self._next_sweep = now + self.sweep_interval
+            return []
+        if now < self._next_sweep:
+            return []
+        self._next_sweep = now + self.sweep_interval
+        return self._collect(now)
+
+    def flush(self):
+        """Report every pending suppressed count now, even for failures still repeating"""
+        with self._lock:
+            summaries = self._collect(self.clock(), force=True)
+        if summaries:
+            self._emit_summaries(summaries)
+
+    def _collect(self, now, force=False):
+        """Take the pending suppressed counts; called with the lock held"""
+        summaries = []
+        for key, state in list(self.keys.items()):
+            if state.suppressed and (force or now >= state.next_allowed):
+                summaries.append((key, state.suppressed))
+                state.suppressed = 0
+            elif not state.suppressed and now - state.last_seen > max(self.max_interval, 2 * state.interval):
+                del self.keys[key]
+        if self._over_budget:
+            summaries.append((None, self._over_budget))
+            self._over_budget = 0
+        return summaries
+
+    def _emit_summaries(self, summaries):
+        """Log summaries without passing them through the filter again"""
+        logger = logging.getLogger(SUMMARY_LOGGER)
+        self._local.summarizing = True
+        try:
+            for key, count in summaries:
+                if key is None:
+                    logger.warning(f"Hourly log budget reached; dropped {count} messages")
+                    continue
+                pathname, lineno, exc_name = key
+                source = f"{pathname.rsplit('/', 1)[-1]}:{lineno}"
+                if exc_name:
+                    source += f" ({exc_name})"
+                logger.warning(f"Suppressed {count} similar messages from {source}")
+        finally:
+            self._local.summarizing = False
@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+
+"""
+Analytics Test Script for Pomodoro Lock
+Checks the vectorized history analytics behind `pomodoro-lock report --heatmap` (no display required)
+"""
+
+import os
+import sys
+import time
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path for storage imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from storage.history import (
+    HistoryLog,
+    list_segments,
+    HEADER_SIZE,
+    RECORD_SIZE,
+    KIND_WORK_START,
+    KIND_WORK_END,
+    KIND_BREAK_END,
+    FLAG_COMPLETED
+)
+from storage import analytics
+
+TODAY = datetime(2024, 3, 14).date()   # a Thursday
+
+def at(day_offset, hour):
+    """Local timestamp `day_offset` days before TODAY at `hour`"""
+    moment = datetime.combine(TODAY - timedelta(days=day_offset), datetime.min.time())
+    return time.mktime((moment + timedelta(hours=hour)).timetuple())
+
+def write_history(directory, days, hour=9, skipped_every=0):
+    """One completed 25-minute session and one break on each of the given days"""
+    log = HistoryLog(directory, batch_records=64)
+    log.start()
+    for n, day_offset in enumerate(sorted(days, reverse=True)):
+        start = at(day_offset, hour)
+        log.record(KIND_WORK_START, 1500, timestamp=start)
+        log.record(KIND_WORK_END, 1500, FLAG_COMPLETED, timestamp=start + 1500)
+        completed = not (skipped_every and n % skipped_every == 0)
+        log.record(KIND_BREAK_END, 300, FLAG_COMPLETED if completed else 0, timestamp=start + 1800)
+    log.close()
+
+def test_load_columns(tmp_dir):
+    """Segments load into columns matching the records written"""
+    print("Testing columnar load...")
+    first, second = Path(tmp_dir) / "alice", Path(tmp_dir) / "bob"
+    write_history(first, range(10))
+    write_history(second, range(3))
+    columns = analytics.load_columns([first, second])
+    ok = (
+        len(columns) == 39
+        and columns.users == 2
+        and int((columns.user == 1).sum()) == 9
+        and int(columns.value[columns.kind == KIND_WORK_END].sum()) == 13 * 1500
+    )
+    window = analytics.load_columns(first, start=at(2, 0))
+    ok = ok and len(window) == 9
+    print("OK Columns loaded" if ok else f"FAIL Loaded {len(columns)} records")
+    return ok
+
+def test_interrupted_compaction(tmp_dir):
+    """Sources left by an interrupted compaction and foreign files are not counted"""
+    print("Testing leftovers of an interrupted compaction...")
+    directory = Path(tmp_dir) / "leftovers"
+    log = HistoryLog(directory, batch_records=1, segment_bytes=HEADER_SIZE + RECORD_SIZE * 3)
+    log.start()
+    for i in range(9):
+        log.record(KIND_WORK_END, 1500, FLAG_COMPLETED, timestamp=at(0, 9) + i * 60)
+    log.close()
+    sources = {s.path: s.path.read_bytes() for s in list_segments(directory) if s.sealed}
+
+    # Compact, then put the sources back as a crash before their removal would leave them
+    log = HistoryLog(directory, segment_bytes=HEADER_SIZE + RECORD_SIZE * 100)
+    log.start()
+    log.flush()
+    log.close()
+    for path, data in sources.items():
+        path.write_bytes(data)
+    (directory / "seg-0000000001-0000000002.009999.seg").write_bytes(b'NOPE' + bytes(HEADER_SIZE + RECORD_SIZE * 4))
+
+    columns = analytics.load_columns(directory)
+    ok = len(sources) == 2 and len(columns) == 9
+    print("OK Each record counted once" if ok else f"FAIL Loaded {len(columns)} records from {len(sources)} sources")
+    return ok
+
+def test_aggregations(tmp_dir):
+    """Heatmap, rolling focus, compliance and streaks match the written history"""
+    print("Testing aggregations...")
+    directory = Path(tmp_dir) / "aggregate"
+    # Streak of 4 days up to today, a gap, then an older streak of 6 days
+    write_history(directory, [0, 1, 2, 3] + list(range(5, 11)), hour=14, skipped_every=5)
+    columns = analytics.load_columns(directory)
+
+    grid = analytics.heatmap(columns)
+    thursday = TODAY.weekday()
+    ok = grid.shape == (7, 24) and grid[thursday, 14] == 1500 * 2 and grid.sum() == 1500 * 10
+
+    rolling = analytics.rolling_focus(columns, window=7, days=3, today=TODAY)
+    ok = ok and [round(v) for v in rolling * 7] == [6 * 1500] * 3
+
+    compliance = analytics.break_compliance(columns)
+    ok = ok and abs(compliance[0] - 0.8) < 1e-9
+
+    longest, current = analytics.streaks(columns, today=TODAY)
+    ok = ok and longest[0] == 6 and current[0] == 4
+    ok = ok and "Thu" in analytics.format_heatmap(grid)
+    print("OK Aggregations correct" if ok else
+          f"FAIL grid={grid.sum()} rolling={rolling} compliance={compliance} streaks={longest}/{current}")
+    return ok
+
+def test_many_users():
+    """A year of history for 500 users aggregates in under a second"""
+    print("Testing 500-user aggregation speed...")
+    np = analytics.np
+    users, per_user = 500, 10000
+    count = users * per_user
+    rng = np.random.default_rng(1)
+    year_start = time.mktime(datetime(2023, 1, 1).timetuple())
+    kinds = np.array([KIND_WORK_START, KIND_WORK_END, KIND_BREAK_END], dtype=np.uint8)
+    columns = analytics.HistoryColumns(
+        timestamp=np.sort(year_start + rng.random(count) * 365 * 86400),
+        kind=kinds[rng.integers(0, 3, count)],
+        flags=rng.integers(0, 2, count).astype(np.uint8),
+        value=rng.integers(60, 1500, count),
+        user=rng.integers(0, users, count).astype(np.uint32),
+        users=users,
+    )
+
+    start = time.perf_counter()
+    analytics.heatmap(columns)
+    analytics.rolling_focus(columns, days=365, today=datetime(2023, 12, 31).date())
+    analytics.break_compliance(columns)
+    longest, _ = analytics.streaks(columns)
+    elapsed = time.perf_counter() - start
+
+    ok = elapsed < 1.0 and len(longest) == users
+    print(f"{'OK' if ok else 'FAIL'} {count} records from {users} users in {elapsed * 1000:.0f} ms")
+    return ok
+
+def main():
+    print("Starting Analytics Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    if not analytics.NUMPY_AVAILABLE:
+        print("WARN NumPy not available, analytics tests skipped")
+        return 0
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Columnar Load", lambda: test_load_columns(tmp_dir)),
+            ("Interrupted Compaction", lambda: test_interrupted_compaction(tmp_dir)),
+            ("Aggregations", lambda: test_aggregations(tmp_dir)),
+            ("Many Users", test_many_users),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+"""
+Checkpoint Test Script for Pomodoro Lock
+Checks crash-safe state checkpoints and session restore decisions (no display required)
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+from pathlib import Path
+
+# Add src to path for storage imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from storage.checkpoint import StateCheckpoint, resume_plan, MAX_CHECKPOINT_AGE
+
+BREAK_TIME = 5 * 60
+
+def test_save_and_load(tmp_dir):
+    """Checkpoints round-trip and identical states are not rewritten"""
+    print("Testing checkpoint save/load...")
+    path = Path(tmp_dir) / "state"
+    checkpoint = StateCheckpoint(path)
+    deadline = time.time() + 600
+    checkpoint.save(True, False, deadline, 600, work_time=1500, break_time=300)
+    checkpoint.save(True, False, deadline, 600, work_time=1500, break_time=300)
+
+    state = checkpoint.load()
+    ok = (
+        state is not None
+        and state['is_work_session'] is True
+        and abs(state['deadline'] - deadline) < 0.01
+        and checkpoint.writes == 1
+        and not [p for p in Path(tmp_dir).iterdir() if p.name.endswith('.tmp')]
+    )
+
+    # A clean quit clears the checkpoint, so the next start has nothing to resume
+    checkpoint.clear()
+    ok = ok and not path.exists() and checkpoint.load() is None
+    print("OK Checkpoint round trip" if ok else f"FAIL Unexpected checkpoint {state}")
+    return ok
+
+def test_corrupt_checkpoint(tmp_dir):
+    """A damaged file is ignored instead of crashing startup"""
+    print("Testing corrupt checkpoint...")
+    path = Path(tmp_dir) / "state-corrupt"
+    path.write_text('{"version": 1, "is_work')
+    ok = StateCheckpoint(path).load() is None
+    print("OK Corrupt checkpoint ignored" if ok else "FAIL Corrupt checkpoint loaded")
+    return ok
+
+def make_state(now, **fields):
+    """Build a checkpoint dict as StateCheckpoint would write it"""
+    state = {
+        'version': 1,
+        'is_work_session': True,
+        'is_paused': False,
+        'deadline': now + 600,
+        'remaining': 600,
+        'snooze_deadline': None,
+        'saved_at': now - 10,
+    }
+    state.update(fields)
+    return state
+
+def test_resume_plans():
+    """Restores follow the stored absolute deadlines"""
+    print("Testing resume decisions...")
+    now = time.time()
+    cases = [
+        # Work session still running
+        (make_state(now), (True, 600, False)),
+        # Work deadline passed during the outage: the break is still owed
+        (make_state(now, deadline=now - 60), (False, BREAK_TIME - 60, False)),
+        # Work and break both passed: fresh session
+        (make_state(now, deadline=now - BREAK_TIME - 1), None),
+        # Break running
+        (make_state(now, is_work_session=False, deadline=now + 120), (False, 120, False)),
+        # Paused with snooze time left
+        (make_state(now, is_paused=True, remaining=300, snooze_deadline=now + 200), (True, 300, True)),
+        # Snooze expired while down: counted from the snooze deadline
+        (make_state(now, is_paused=True, remaining=300, snooze_deadline=now - 100), (True, 200, False)),
+        # Stale checkpoint
+        (make_state(now, saved_at=now - MAX_CHECKPOINT_AGE - 1), None),
+        (None, None),
+    ]
+
+    failures = []
+    for state, expected in cases:
+        plan = resume_plan(state, BREAK_TIME, now=now)
+        actual = None if plan is None else (plan['is_work_session'], plan['remaining'], plan['is_paused'])
+        if actual != expected:
+            failures.append((expected, actual))
+
+    ok = not failures
+    print("OK All resume decisions correct" if ok else f"FAIL {failures}")
+    return ok
+
+def main():
+    print("Starting Checkpoint Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Save and Load", lambda: test_save_and_load(tmp_dir)),
+            ("Corrupt Checkpoint", lambda: test_corrupt_checkpoint(tmp_dir)),
+            ("Resume Plans", test_resume_plans),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
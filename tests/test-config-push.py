@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+
+"""
+Config Push Test Script for Pomodoro Lock
+Checks that configure-pomodoro.py writes atomically and pushes settings over the control channel (no display required)
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import tempfile
+import importlib.util
+from pathlib import Path
+from contextlib import redirect_stdout
+
+# Add src to path for settings and ipc imports
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, os.path.join(ROOT, 'src'))
+
+from ipc.control import ControlServer
+from settings.layers import SettingsLoader
+
+def load_configurator():
+    """Import scripts/configure-pomodoro.py as a module"""
+    spec = importlib.util.spec_from_file_location(
+        "configure_pomodoro", os.path.join(ROOT, 'scripts', 'configure-pomodoro.py')
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+class FakeTimer:
+    """Stands in for PomodoroTimer's reload-config handler"""
+
+    def __init__(self, user_path, policy_path):
+        self.loader = SettingsLoader(user_path, policy_path, {})
+        self.settings = self.loader.get()
+        self.applied = []
+
+    def reload_config(self, request):
+        settings = self.loader.get()
+        changed = settings != self.settings
+        if changed:
+            self.settings = settings
+            self.applied.append(settings)
+        return {
+            'state': 'work',
+            'remaining': 600,
+            'changed': changed,
+            'settings': settings.as_config(),
+            'locked': sorted(settings.locked),
+        }
+
+def test_push(tmp_dir):
+    """Saving a preset is applied by the running timer and reported back"""
+    print("Testing config push...")
+    home = Path(tmp_dir) / "home"
+    os.environ['HOME'] = str(home)
+    configurator = load_configurator()
+    config_path = configurator.default_config_path()
+    policy_path = Path(tmp_dir) / "policy.json"
+    policy_path.write_text(json.dumps({"break_time_minutes": 10, "locked": ["break_time_minutes"]}))
+
+    timer = FakeTimer(config_path, policy_path)
+    control_path = str(Path(tmp_dir) / "control.sock")
+    server = ControlServer({'reload-config': timer.reload_config}, path=control_path)
+    server.start()
+    try:
+        os.makedirs(config_path.parent, exist_ok=True)
+        configurator.atomic_write(config_path, json.dumps({"work_time_minutes": 45, "break_time_minutes": 15}).encode())
+
+        out = io.StringIO()
+        start = time.monotonic()
+        with redirect_stdout(out):
+            pushed = configurator.notify_running_instance(control_path)
+        elapsed = time.monotonic() - start
+        text = out.getvalue()
+
+        ok = (
+            pushed
+            and len(timer.applied) == 1
+            and timer.applied[0].work_time_minutes == 45
+            and timer.applied[0].break_time_minutes == 10
+            and "work 45 min" in text and "break 10 min" in text and "locked by policy" in text
+            and elapsed < 0.5
+            and not [p for p in config_path.parent.iterdir() if p.name.endswith('.tmp')]
+        )
+
+        # Pushing again reports the settings as already applied
+        with redirect_stdout(io.StringIO()) as again:
+            configurator.notify_running_instance(control_path)
+        ok = ok and "Already in effect" in again.getvalue() and len(timer.applied) == 1
+    finally:
+        server.stop()
+
+    print(f"{'OK' if ok else 'FAIL'} Pushed in {elapsed * 1000:.0f} ms")
+    if not ok:
+        print(text)
+    return ok
+
+def test_user_layer_only(tmp_dir):
+    """Saving keeps policy and environment values out of the user's config.json"""
+    print("Testing that only the user's own settings are saved...")
+    home = Path(tmp_dir) / "layers"
+    os.environ['HOME'] = str(home)
+    configurator = load_configurator()
+    config_path = configurator.default_config_path()
+    os.makedirs(config_path.parent, exist_ok=True)
+    config_path.write_text(json.dumps({"inactivity_threshold_minutes": 20}))
+    policy_path = Path(tmp_dir) / "layers-policy.json"
+    policy_path.write_text(json.dumps({"break_time_minutes": 10, "snooze_time_minutes": 5,
+                                       "locked": ["break_time_minutes"]}))
+    configurator.LOADER = SettingsLoader(config_path, policy_path, {"POMODORO_MAX_SNOOZE_MINUTES": "40"})
+    configurator.notify_running_instance = lambda: False
+
+    # Interactive: the work time is changed, the other unlocked prompts are kept
+    answers = iter(["50", "", "", "", "", "y"])
+    configurator.input = lambda prompt: next(answers)
+    with redirect_stdout(io.StringIO()):
+        configurator.configure_interactive()
+    interactive = json.loads(config_path.read_text())
+
+    answers = iter(["y"])
+    with redirect_stdout(io.StringIO()):
+        configurator.configure_preset('short')
+    preset = json.loads(config_path.read_text())
+
+    ok = (
+        interactive == {"inactivity_threshold_minutes": 20, "work_time_minutes": 50}
+        and preset == {"inactivity_threshold_minutes": 5, "work_time_minutes": 15,
+                       "notification_time_minutes": 1}
+    )
+    print(f"{'OK' if ok else 'FAIL'} Saved {interactive}, then {preset}")
+    return ok
+
+def test_not_running(tmp_dir):
+    """Without a running timer the configurator says so instead of failing"""
+    print("Testing push without a running timer...")
+    configurator = load_configurator()
+    out = io.StringIO()
+    with redirect_stdout(out):
+        pushed = configurator.notify_running_instance(str(Path(tmp_dir) / "missing.sock"))
+    ok = pushed is False and "not running" in out.getvalue()
+    print("OK Reported not running" if ok else f"FAIL {out.getvalue()}")
+    return ok
+
+def main():
+    print("Starting Config Push Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    saved_home = os.environ.get('HOME')
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Config Push", test_push),
+            ("User Layer Only", test_user_layer_only),
+            ("Not Running", test_not_running),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func(tmp_dir)))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+    if saved_home is not None:
+        os.environ['HOME'] = saved_home
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
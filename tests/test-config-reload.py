@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+
+"""
+Config Reload Test Script for Pomodoro Lock
+Checks config validation and the config.json watcher (no display required)
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+# Add src to path for settings imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from settings.loader import DEFAULT_CONFIG, ConfigError, validate_config, load_config_file
+from settings.watcher import ConfigWatcher
+
+def write_config(path, **values):
+    """Write a config file the way configure-pomodoro.py does"""
+    config = dict(DEFAULT_CONFIG)
+    config.update(values)
+    with open(path, 'w') as f:
+        json.dump(config, f, indent=4)
+
+def test_validation():
+    """Valid files load with defaults filled in; invalid values are rejected"""
+    print("Testing config validation...")
+    ok = validate_config({"work_time_minutes": 50})["break_time_minutes"] == DEFAULT_CONFIG["break_time_minutes"]
+    bad = [
+        {"work_time_minutes": 0},
+        {"work_time_minutes": "25"},
+        {"break_time_minutes": 1.5},
+        {"work_time_minutes": 5, "notification_time_minutes": 5},
+        [],
+    ]
+    for data in bad:
+        try:
+            validate_config(data)
+            print(f"FAIL Accepted {data}")
+            ok = False
+        except ConfigError:
+            pass
+    print("OK Validation" if ok else "FAIL Validation")
+    return ok
+
+def test_missing_and_corrupt(tmp_dir):
+    """A missing file gives the defaults, a corrupt one raises ConfigError"""
+    print("Testing missing and corrupt files...")
+    path = Path(tmp_dir) / "config.json"
+    ok = load_config_file(path) == DEFAULT_CONFIG
+    path.write_text('{"work_time_minutes": ')
+    try:
+        load_config_file(path)
+        ok = False
+    except ConfigError:
+        pass
+    print("OK Missing and corrupt files handled" if ok else "FAIL Missing or corrupt file")
+    return ok
+
+def test_watcher(tmp_dir):
+    """Changes are debounced, parsed off the caller's thread and delivered once"""
+    print("Testing config watcher...")
+    path = Path(tmp_dir) / "watched" / "config.json"
+    path.parent.mkdir()
+    write_config(path)
+
+    applied = []
+    threads = set()
+    changed = threading.Event()
+
+    def on_change(config):
+        applied.append(config)
+        threads.add(threading.current_thread())
+        changed.set()
+
+    watcher = ConfigWatcher(path, on_change, debounce=0.2, poll_interval=0.05, use_gio=False)
+    watcher.start(load_config_file(path))
+    try:
+        # A burst of writes (e.g. an editor saving twice) applies once
+        for minutes in (40, 45, 50):
+            write_config(path, work_time_minutes=minutes)
+            time.sleep(0.06)
+        changed.wait(3)
+        time.sleep(0.4)
+        ok = len(applied) == 1 and applied[0]["work_time_minutes"] == 50
+        ok = ok and threading.main_thread() not in threads
+
+        # Invalid and unchanged files are not passed on
+        path.write_text('{"work_time_minutes": 500}')
+        time.sleep(0.5)
+        write_config(path, work_time_minutes=50)
+        time.sleep(0.5)
+        ok = ok and len(applied) == 1
+
+        # Replacing the file by rename is picked up
+        changed.clear()
+        replacement = path.with_suffix('.tmp')
+        write_config(replacement, work_time_minutes=30, break_time_minutes=10)
+        os.replace(replacement, path)
+        changed.wait(3)
+        ok = ok and len(applied) == 2 and applied[1]["break_time_minutes"] == 10
+    finally:
+        watcher.stop()
+
+    print(f"{'OK' if ok else 'FAIL'} {len(applied)} configurations applied")
+    return ok
+
+def main():
+    print("Starting Config Reload Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Validation", test_validation),
+            ("Missing and Corrupt", lambda: test_missing_and_corrupt(tmp_dir)),
+            ("Watcher", lambda: test_watcher(tmp_dir)),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
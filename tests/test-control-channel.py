@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+
+"""
+Control Channel Test Script for Pomodoro Lock
+Checks commands and event subscriptions over the local control socket (no display required)
+"""
+
+import os
+import sys
+import time
+import socket
+import tempfile
+import threading
+from pathlib import Path
+
+# Add src to path for ipc imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ipc.control import ControlServer, ControlError, send_command, subscribe, encode_message, parse_address
+
+def wait_for(condition, timeout=5.0):
+    """Poll until condition() is true or the timeout expires"""
+    end = time.time() + timeout
+    while time.time() < end:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_commands(server, path):
+    """Commands get exactly one reply"""
+    print("Testing command replies...")
+    reply = send_command('status', path=path)
+    ok = reply.get('ok') and reply.get('state') == 'work'
+    unknown = send_command('no-such-command', path=path)
+    ok = ok and unknown.get('ok') is False
+    print("OK Commands answered" if ok else f"FAIL Unexpected replies: {reply} {unknown}")
+    return ok
+
+def test_subscription(server, path):
+    """Every subscriber receives every event in order"""
+    print("Testing event subscriptions...")
+    received = {i: [] for i in range(5)}
+
+    def listen(index):
+        try:
+            for event in subscribe(path=path, timeout=5):
+                received[index].append(event.get('event'))
+                if event.get('event') == 'break_end':
+                    return
+        except ControlError:
+            pass
+
+    threads = [threading.Thread(target=listen, args=(i,), daemon=True) for i in received]
+    for thread in threads:
+        thread.start()
+    wait_for(lambda: server.subscriber_count == len(threads))
+
+    for name in ('warning', 'break_start', 'pause', 'resume', 'break_end'):
+        server.publish({'event': name})
+    for thread in threads:
+        thread.join(timeout=5)
+
+    expected = ['subscribed', 'warning', 'break_start', 'pause', 'resume', 'break_end']
+    ok = all(events == expected for events in received.values())
+    print("OK All subscribers saw all events" if ok else f"FAIL Received {received}")
+    return ok
+
+def test_slow_subscriber_dropped(server, path):
+    """A client that never reads is disconnected once its queue is full"""
+    print("Testing slow subscriber handling...")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    sock.connect(path)
+    sock.sendall(encode_message({'cmd': 'subscribe'}))
+    wait_for(lambda: server.subscriber_count == 1)
+
+    dropped_before = server.dropped
+    payload = 'x' * 1024
+    for i in range(5000):
+        server.publish({'event': 'tick', 'seq': i, 'payload': payload})
+        if server.dropped > dropped_before:
+            break
+    ok = wait_for(lambda: server.dropped > dropped_before and server.subscriber_count == 0)
+    sock.close()
+    print("OK Slow subscriber dropped" if ok else "FAIL Slow subscriber still connected")
+    return ok
+
+def test_not_running(tmp_dir):
+    """Clients report a clear error when no timer is running"""
+    print("Testing client without server...")
+    try:
+        send_command('status', path=str(Path(tmp_dir) / "missing.sock"))
+    except ControlError:
+        print("OK ControlError raised")
+        return True
+    print("FAIL No error raised")
+    return False
+
+def test_tcp_addresses():
+    """TCP addresses without a host stay on the loopback interface"""
+    print("Testing TCP address parsing...")
+    parsed = [parse_address(address)[1] for address in
+              ("tcp://:7420", "tcp://0.0.0.0:7420", "tcp://[::]:7420", "tcp://example.com:7420")]
+    ok = parsed == [('127.0.0.1', 7420), ('0.0.0.0', 7420), ('::', 7420), ('example.com', 7420)]
+    try:
+        parse_address("tcp://localhost")
+        ok = False
+    except ControlError:
+        pass
+    print(f"{'OK' if ok else 'FAIL'} {parsed}")
+    return ok
+
+def main():
+    print("Starting Control Channel Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = str(Path(tmp_dir) / "control.sock")
+        server = ControlServer({'status': lambda request: {'state': 'work'}}, path=path, queue_size=8)
+        if not server.start():
+            print("FAIL Could not start control server")
+            return 1
+
+        tests = [
+            ("Commands", lambda: test_commands(server, path)),
+            ("Subscription", lambda: test_subscription(server, path)),
+            ("Slow Subscriber", lambda: test_slow_subscriber_dropped(server, path)),
+            ("Not Running", lambda: test_not_running(tmp_dir)),
+            ("TCP Addresses", test_tcp_addresses),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+        server.stop()
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+
+"""
+Deadline Scheduler Test Script for Pomodoro Lock
+Checks ordering, rescheduling and cancellation of named deadlines, the single wakeup thread and O(log n) costs (no display required)
+"""
+
+import os
+import sys
+import time
+import random
+import threading
+
+# Add src to path for engine imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from engine.scheduler import DeadlineScheduler
+
+def heap_ok(scheduler):
+    """The heap property holds and every entry knows its position"""
+    heap = scheduler._heap
+    for i, entry in enumerate(heap):
+        if entry.index != i or scheduler._by_name[entry.name] is not entry:
+            return False
+        if i and entry < heap[(i - 1) // 2]:
+            return False
+    return len(heap) == len(scheduler._by_name)
+
+def test_ordering():
+    """Random schedule/reschedule/cancel sequences fire in deadline order"""
+    print("Testing ordering against a reference...")
+    rng = random.Random(44)
+    scheduler = DeadlineScheduler(clock=lambda: 0.0)
+    expected = {}
+    for step in range(20000):
+        name = f"session-{rng.randrange(500)}"
+        if rng.random() < 0.3:
+            scheduler.cancel(name)
+            expected.pop(name, None)
+        else:
+            when = rng.uniform(0, 1000)
+            scheduler.schedule(name, when, lambda: None)
+            expected[name] = when
+        if step % 1000 == 0 and not heap_ok(scheduler):
+            print(f"FAIL Heap invariant broken at step {step}")
+            return False
+
+    fired = [(entry.when, entry.name) for entry in scheduler.pop_due(500.0)]
+    rest = [(entry.when, entry.name) for entry in scheduler.pop_due(1000.0)]
+    reference = sorted((when, name) for name, when in expected.items())
+    ok = fired + rest == reference and all(when <= 500.0 for when, _ in fired) and len(scheduler) == 0
+    print(f"{'OK' if ok else 'FAIL'} {len(reference)} deadlines fired in order")
+    return ok
+
+def test_wakeup():
+    """One thread runs deadlines; an earlier deadline wakes it, scheduling starts no threads"""
+    print("Testing the wakeup thread...")
+    scheduler = DeadlineScheduler()
+    stop = threading.Event()
+    fired = []
+    scheduler.schedule_in('session-end', 60, lambda: fired.append('session-end'))
+    runner = threading.Thread(target=scheduler.run, args=(stop,), daemon=True)
+    runner.start()
+
+    threads_before = threading.active_count()
+    start = time.monotonic()
+    scheduler.schedule_in('snooze-end', 0.1, lambda: fired.append(('snooze-end', time.monotonic() - start)))
+    scheduler.schedule_in('warning', 0.05, lambda: fired.append('warning'))
+    scheduler.schedule_in('cancelled', 0.02, lambda: fired.append('cancelled'))
+    scheduler.cancel('cancelled')
+    threads_during = threading.active_count()
+    time.sleep(0.3)
+
+    stop.set()
+    scheduler.wake()
+    runner.join(1.0)
+    ok = (
+        fired[:1] == ['warning'] and len(fired) == 2
+        and fired[1][0] == 'snooze-end' and 0.1 <= fired[1][1] < 0.2
+        and threads_during == threads_before and not runner.is_alive()
+        and 'session-end' in scheduler
+    )
+    print(f"{'OK' if ok else 'FAIL'} fired {fired}, {threads_during - threads_before} extra threads")
+    return ok
+
+def test_callback_errors():
+    """A failing callback does not stop later deadlines"""
+    print("Testing callback errors...")
+    scheduler = DeadlineScheduler(clock=lambda: 10.0)
+    fired = []
+    late = []
+    scheduler.observer = lambda name, lateness: late.append((name, lateness))
+
+    def broken():
+        raise RuntimeError("overlay failed")
+
+    scheduler.schedule('warning', 1.0, broken)
+    scheduler.schedule('session-end', 2.0, lambda: fired.append('session-end'))
+    ran = scheduler.run_due()
+    ok = ran == 2 and fired == ['session-end'] and late == [('warning', 9.0), ('session-end', 8.0)]
+    print(f"{'OK' if ok else 'FAIL'} ran {ran}, lateness {late}")
+    return ok
+
+def test_scaling():
+    """Benchmark: schedule and cancel cost grows logarithmically with the number of deadlines"""
+    print("Benchmarking schedule/cancel at different sizes...")
+    costs = {}
+    for size in (1000, 100000):
+        scheduler = DeadlineScheduler(clock=lambda: 0.0)
+        rng = random.Random(size)
+        for i in range(size):
+            scheduler.schedule(f"session-{i}", rng.uniform(0, 86400), None)
+        operations = 20000
+        names = [f"session-{rng.randrange(size)}" for _ in range(operations)]
+        start = time.perf_counter()
+        for name in names:
+            scheduler.cancel(name)
+            scheduler.schedule(name, rng.uniform(0, 86400), None)
+        costs[size] = (time.perf_counter() - start) / operations * 1e6
+    ratio = costs[100000] / costs[1000]
+    # log2(100000) / log2(1000) is about 1.7; a linear structure would be ~100x
+    ok = ratio < 4 and costs[100000] < 50
+    print(f"{'OK' if ok else 'FAIL'} cancel+schedule: {costs[1000]:.1f} us at 1k, {costs[100000]:.1f} us at 100k (x{ratio:.1f})")
+    return ok
+
+def main():
+    print("Starting Deadline Scheduler Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    tests = [
+        ("Ordering", test_ordering),
+        ("Wakeup Thread", test_wakeup),
+        ("Callback Errors", test_callback_errors),
+        ("Scaling", test_scaling),
+    ]
+    for test_name, test_func in tests:
+        print(f"\n--- {test_name} ---")
+        try:
+            results.append((test_name, test_func()))
+        except Exception as e:
+            print(f"FAIL {test_name} test crashed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+
+"""
+Engine Benchmark Test Script for Pomodoro Lock
+Drives thousands of simulated sessions through days of work, breaks and snoozes on a virtual clock,
+reports transitions per second, memory per session and scheduler overhead, and fails when memory
+or the scheduler's share of the run regress past tests/benchmark-thresholds.json (no display required).
+The gated run is repeated after a warm-up and the best run counts; throughput depends on the
+machine, so it is only reported.
+
+POMODORO_BENCH_INSTANCES and POMODORO_BENCH_DAYS override the size of the gated run;
+POMODORO_BENCH_REPORT names a file to write its report to as JSON.
+"""
+
+import os
+import sys
+import json
+
+# Add src to path for engine imports
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(TESTS_DIR, '..', 'src'))
+
+from engine.simulation import simulate, format_report, DAY
+
+with open(os.path.join(TESTS_DIR, "benchmark-thresholds.json")) as f:
+    THRESHOLDS = json.load(f)
+
+def test_consistency():
+    """Every session follows the work/warning/break cycle through a simulated week"""
+    print("Testing event order over 7 simulated days...")
+    report = simulate(200, days=7, memory=False)
+    events = report['events']
+    # Lengths range from 25+5 to 90+20 minutes, so each session completes 13-48 cycles a day
+    cycles = events.get('break_end', 0) / (200 * 7)
+    ok = (
+        not report['violations']
+        and 13 <= cycles <= 48
+        and 0 <= events.get('pause', 0) - events.get('resume', 0) <= 200
+        and events.get('snooze_denied', 0) > 0
+    )
+    print(format_report(report))
+    print(f"{'OK' if ok else 'FAIL'} {cycles:.1f} cycles per session per day")
+    return ok
+
+def test_scheduler_growth():
+    """Scheduler cost per deadline grows with the log of the session count, not linearly"""
+    print("Testing scheduler overhead at 1,000 and 8,000 sessions...")
+    small = simulate(1000, days=8 * 3600 / DAY, memory=False)
+    large = simulate(8000, days=3600 / DAY, memory=False)
+    growth = large['scheduler_ns_per_deadline'] / small['scheduler_ns_per_deadline']
+    ok = growth < THRESHOLDS['max_scheduler_growth']
+    print(f"{'OK' if ok else 'FAIL'} {small['scheduler_ns_per_deadline']:,.0f} ns -> "
+          f"{large['scheduler_ns_per_deadline']:,.0f} ns per deadline ({growth:.2f}x for 8x the sessions)")
+    return ok
+
+def test_regression_gate():
+    """The best of several benchmark runs stays within the committed thresholds"""
+    instances = int(os.environ.get('POMODORO_BENCH_INSTANCES', THRESHOLDS['instances']))
+    days = float(os.environ.get('POMODORO_BENCH_DAYS', THRESHOLDS['days']))
+    runs = THRESHOLDS['runs']
+    print(f"Benchmarking {instances} sessions over {days:g} simulated day(s), best of {runs} runs...")
+    simulate(min(instances, 200), days=0.1, memory=False)
+    # Memory is measured once; it does not depend on timing
+    reports = [simulate(instances, days=days, memory=(run == 0)) for run in range(runs)]
+    report = dict(max(reports, key=lambda r: r['transitions_per_second']),
+                  bytes_per_instance=reports[0]['bytes_per_instance'],
+                  scheduler_fraction=min(r['scheduler_fraction'] for r in reports),
+                  violations=[v for r in reports for v in r['violations']],
+                  runs=runs)
+    print(format_report(report))
+
+    path = os.environ.get('POMODORO_BENCH_REPORT')
+    if path:
+        with open(path, 'w') as f:
+            json.dump(dict(report, thresholds=THRESHOLDS), f, indent=2)
+
+    if report['transitions_per_second'] < THRESHOLDS['expected_transitions_per_second']:
+        print(f"WARN {report['transitions_per_second']:,.0f} transitions/s "
+              f"< {THRESHOLDS['expected_transitions_per_second']:,} (not gated)")
+
+    failures = []
+    if report['violations']:
+        failures.append(f"{len(report['violations'])} out-of-order events")
+    if report['bytes_per_instance'] > THRESHOLDS['max_bytes_per_instance']:
+        failures.append(f"{report['bytes_per_instance']:,.0f} bytes per session "
+                        f"> {THRESHOLDS['max_bytes_per_instance']:,}")
+    if report['scheduler_fraction'] > THRESHOLDS['max_scheduler_fraction']:
+        failures.append(f"scheduler {report['scheduler_fraction'] * 100:.0f}% of the run "
+                        f"> {THRESHOLDS['max_scheduler_fraction'] * 100:.0f}%")
+    print(f"FAIL {'; '.join(failures)}" if failures else "OK Within the benchmark thresholds")
+    return not failures
+
+def main():
+    print("Starting Engine Benchmark Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    tests = [
+        ("Consistency", test_consistency),
+        ("Scheduler Growth", test_scheduler_growth),
+        ("Regression Gate", test_regression_gate),
+    ]
+    for test_name, test_func in tests:
+        print(f"\n--- {test_name} ---")
+        try:
+            results.append((test_name, test_func()))
+        except Exception as e:
+            print(f"FAIL {test_name} test crashed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
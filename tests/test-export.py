@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+"""
+Export Test Script for Pomodoro Lock
+Checks streaming CSV/JSON Lines export of the session history (no display required)
+"""
+
+import io
+import os
+import sys
+import csv
+import json
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add src to path for storage imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from storage import history
+from storage.history import (
+    HistoryLog,
+    list_segments,
+    HEADER_SIZE,
+    RECORD_SIZE,
+    KIND_WORK_START,
+    KIND_WORK_END,
+    FLAG_COMPLETED
+)
+from storage.export import export_history, parse_time
+
+BASE = 1700000000.0
+
+class NullWriter:
+    """Text sink that only counts what is written"""
+
+    def __init__(self):
+        self.lines = 0
+
+    def write(self, text):
+        self.lines += text.count('\n')
+
+def write_history(directory, count, segment_records=None):
+    """Write `count` records one minute apart, alternating work start/end"""
+    segment_bytes = HEADER_SIZE + RECORD_SIZE * segment_records if segment_records else 1024 * 1024
+    log = HistoryLog(directory, batch_records=256, segment_bytes=segment_bytes)
+    log.start()
+    for i in range(count):
+        if i % 2:
+            log.record(KIND_WORK_END, 1500, FLAG_COMPLETED, timestamp=BASE + i * 60)
+        else:
+            log.record(KIND_WORK_START, 1500, timestamp=BASE + i * 60)
+    log.close()
+
+def test_formats(tmp_dir):
+    """CSV and JSON Lines carry the same rows"""
+    print("Testing export formats...")
+    directory = Path(tmp_dir) / "formats"
+    write_history(directory, 10)
+
+    out = io.StringIO()
+    count = export_history(out, directory, 'csv')
+    rows = list(csv.DictReader(io.StringIO(out.getvalue())))
+
+    out = io.StringIO()
+    export_history(out, directory, 'jsonl', kinds={KIND_WORK_END})
+    items = [json.loads(line) for line in out.getvalue().splitlines()]
+
+    ok = (
+        count == 10 and len(rows) == 10
+        and rows[0]['event'] == 'work_start' and rows[1]['completed'] == '1'
+        and len(items) == 5 and all(item['event'] == 'work_end' for item in items)
+        and items[0]['timestamp'] == BASE + 60
+    )
+    print("OK CSV and JSON Lines" if ok else f"FAIL rows={rows[:2]} items={items[:2]}")
+    return ok
+
+def test_range_pushdown(tmp_dir):
+    """Segments outside the requested range are never opened"""
+    print("Testing range pushdown...")
+    directory = Path(tmp_dir) / "pushdown"
+    write_history(directory, 100, segment_records=10)
+    segments = list_segments(directory)
+
+    opened = []
+    original = history.read_segment
+
+    def tracking_read_segment(path, start=None, end=None):
+        opened.append(path)
+        return original(path, start, end)
+
+    history.read_segment = tracking_read_segment
+    try:
+        out = io.StringIO()
+        count = export_history(out, directory, 'csv', start=BASE + 30 * 60, end=BASE + 39 * 60)
+    finally:
+        history.read_segment = original
+
+    ok = count == 10 and len(segments) >= 10 and len(opened) <= 2
+    print(f"{'OK' if ok else 'FAIL'} {count} rows from {len(opened)} of {len(segments)} segments")
+    return ok
+
+def test_compaction_leftovers(tmp_dir):
+    """Compaction leftovers are exported once, and segments removed mid-export are skipped"""
+    print("Testing export during and after compaction...")
+    directory = Path(tmp_dir) / "leftovers"
+    write_history(directory, 30, segment_records=10)
+    sources = {s.path: s.path.read_bytes() for s in list_segments(directory) if s.sealed}
+
+    # Compact, then put the sources back as a crash before their removal would leave them
+    log = HistoryLog(directory, segment_bytes=HEADER_SIZE + RECORD_SIZE * 100)
+    log.start()
+    log.flush()
+    log.close()
+    for path, data in sources.items():
+        path.write_bytes(data)
+    leftover_rows = export_history(io.StringIO(), directory, 'csv')
+
+    # A segment that disappears between listing and reading is skipped
+    original = history.read_segment
+    active = [s.path for s in list_segments(directory) if not s.sealed][0]
+
+    def racing_read_segment(path, start=None, end=None):
+        if path == active:
+            path.unlink()
+        return original(path, start, end)
+
+    history.read_segment = racing_read_segment
+    try:
+        raced_rows = export_history(io.StringIO(), directory, 'csv')
+    finally:
+        history.read_segment = original
+
+    ok = len(sources) == 2 and leftover_rows == 30 and raced_rows == 20
+    print(f"{'OK' if ok else 'FAIL'} {leftover_rows} rows with leftovers, {raced_rows} with a segment removed mid-export")
+    return ok
+
+def test_constant_memory(tmp_dir):
+    """Exporting a long history does not build it up in memory"""
+    print("Testing export memory use...")
+    directory = Path(tmp_dir) / "memory"
+    write_history(directory, 30000)
+
+    tracemalloc.start()
+    sink = NullWriter()
+    count = export_history(sink, directory, 'jsonl')
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    ok = count == 30000 and sink.lines == 30000 and peak < 2 * 1024 * 1024
+    print(f"{'OK' if ok else 'FAIL'} {count} rows with {peak / 1024:.0f} KiB peak")
+    return ok
+
+def test_parse_time():
+    """Range bounds accept epoch seconds and ISO dates"""
+    print("Testing range bound parsing...")
+    ok = parse_time("1700000000") == 1700000000.0
+    ok = ok and parse_time("2024-03-14T12:00") - parse_time("2024-03-14") == 12 * 3600
+    # An explicit UTC offset is honoured rather than read as local time
+    ok = ok and parse_time("2024-03-14T12:00+02:00") == parse_time("2024-03-14T10:00+00:00") == 1710410400.0
+    print("OK Bounds parsed" if ok else "FAIL Bounds misparsed")
+    return ok
+
+def main():
+    print("Starting Export Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Formats", lambda: test_formats(tmp_dir)),
+            ("Range Pushdown", lambda: test_range_pushdown(tmp_dir)),
+            ("Compaction Leftovers", lambda: test_compaction_leftovers(tmp_dir)),
+            ("Constant Memory", lambda: test_constant_memory(tmp_dir)),
+            ("Parse Time", test_parse_time),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+
+"""
+Flight Recorder Test Script for Pomodoro Lock
+Checks the ring buffer, dumps on signal and on uncaught exceptions, and the recording cost (no display required)
+"""
+
+import os
+import sys
+import time
+import signal
+import tempfile
+import threading
+from pathlib import Path
+
+# Add src to path for telemetry imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from telemetry.flight import FlightRecorder, install_crash_hooks
+
+def test_ring():
+    """Only the newest events are kept, oldest first"""
+    print("Testing the ring buffer...")
+    recorder = FlightRecorder(capacity=8)
+    for i in range(20):
+        recorder.record('transition', f"event {i}")
+    events = recorder.entries()
+    ok = len(events) == 8 and [detail for _, _, detail in events] == [f"event {i}" for i in range(12, 20)]
+    print("OK Ring keeps the newest events" if ok else f"FAIL {events}")
+    return ok
+
+def test_dump(tmp_dir):
+    """Dumps are written to new files and old dumps are pruned"""
+    print("Testing dumps...")
+    directory = Path(tmp_dir) / "dumps"
+    recorder = FlightRecorder(capacity=16)
+    recorder.record('transition', "break_start remaining=300 paused=False")
+    recorder.record('lock', "overlays shown")
+    recorder.record('gui-update')
+    paths = []
+    for i in range(4):
+        paths.append(recorder.dump(directory, f"test{i}", keep=3))
+        time.sleep(0.01)
+    text = paths[-1].read_text()
+    remaining = sorted(p.name for p in directory.iterdir())
+    ok = (
+        len(remaining) == 3 and not paths[0].exists()
+        and "flight recorder dump: test3" in text
+        and "lock         overlays shown" in text
+        and text.count("\n") == 5
+    )
+    print(f"{'OK' if ok else 'FAIL'} {len(remaining)} dumps kept")
+    if not ok:
+        print(text)
+    return ok
+
+def test_signal(tmp_dir):
+    """SIGUSR2 writes a dump"""
+    print("Testing the dump signal...")
+    if not hasattr(signal, 'SIGUSR2'):
+        print("WARN SIGUSR2 not available - skipped")
+        return True
+    directory = Path(tmp_dir) / "signal"
+    recorder = FlightRecorder()
+    recorder.record('notify', "Break time! Take a rest.")
+    previous = signal.signal(signal.SIGUSR2, lambda signum, frame: recorder.dump(directory, "signal"))
+    try:
+        os.kill(os.getpid(), signal.SIGUSR2)
+        time.sleep(0.05)
+    finally:
+        signal.signal(signal.SIGUSR2, previous)
+    dumps = list(directory.glob("flight-*-signal.log")) if directory.exists() else []
+    ok = len(dumps) == 1 and "Break time!" in dumps[0].read_text()
+    print("OK Signal wrote a dump" if ok else "FAIL No dump after SIGUSR2")
+    return ok
+
+def test_crash(tmp_dir):
+    """An exception escaping a thread writes one dump, even if it repeats"""
+    print("Testing crash dumps...")
+    directory = Path(tmp_dir) / "crash"
+    recorder = FlightRecorder()
+    saved = sys.excepthook, threading.excepthook
+    threading.excepthook = lambda args: None
+    install_crash_hooks(recorder, directory)
+    try:
+        recorder.record('transition', "work_start remaining=1500 paused=False")
+
+        def broken():
+            raise RuntimeError("overlay thread died")
+
+        for _ in range(3):
+            thread = threading.Thread(target=broken, name="overlay")
+            thread.start()
+            thread.join()
+    finally:
+        sys.excepthook, threading.excepthook = saved
+
+    dumps = list(directory.glob("flight-*-thread-crash.log")) if directory.exists() else []
+    text = dumps[0].read_text() if dumps else ""
+    ok = len(dumps) == 1 and "overlay: RuntimeError: overlay thread died" in text and "work_start" in text
+    print(f"{'OK' if ok else 'FAIL'} {len(dumps)} crash dump(s)")
+    return ok
+
+def test_overhead():
+    """Benchmark: recording an event costs about a microsecond"""
+    print("Benchmarking event recording...")
+    recorder = FlightRecorder()
+    calls = 200000
+    start = time.perf_counter()
+    for _ in range(calls):
+        recorder.record('gui-update')
+    per_call = (time.perf_counter() - start) / calls * 1e6
+    ok = per_call < 5
+    print(f"{'OK' if ok else 'FAIL'} {per_call:.2f} us per event")
+    return ok
+
+def main():
+    print("Starting Flight Recorder Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Ring Buffer", test_ring),
+            ("Dumps", lambda: test_dump(tmp_dir)),
+            ("Dump Signal", lambda: test_signal(tmp_dir)),
+            ("Crash Dump", lambda: test_crash(tmp_dir)),
+            ("Overhead", test_overhead),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
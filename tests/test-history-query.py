@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+
+"""
+History Query Test Script for Pomodoro Lock
+Checks the daily/weekly rollups behind `pomodoro-lock report` (no display required)
+"""
+
+import os
+import sys
+import time
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add src to path for storage imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from storage.history import (
+    HistoryLog,
+    HEADER_SIZE,
+    RECORD_SIZE,
+    KIND_WORK_START,
+    KIND_WORK_END,
+    KIND_BREAK_START,
+    KIND_BREAK_END,
+    KIND_PAUSE,
+    KIND_RESUME,
+    FLAG_COMPLETED
+)
+from storage.history_query import HistoryIndex, ROLLUP_FILE, format_report
+
+TODAY = datetime(2024, 3, 14).date()
+
+def at(day_offset, hour):
+    """Local timestamp `day_offset` days before TODAY at `hour`"""
+    moment = datetime.combine(TODAY - timedelta(days=day_offset), datetime.min.time())
+    return time.mktime((moment + timedelta(hours=hour)).timetuple())
+
+def write_day(log, day_offset, sessions, skipped=0, snoozes=0):
+    """Record a day of work sessions, breaks and snoozes"""
+    for i in range(sessions):
+        start = at(day_offset, 9 + i)
+        log.record(KIND_WORK_START, 1500, timestamp=start)
+        for j in range(snoozes if i == 0 else 0):
+            log.record(KIND_PAUSE, 600, timestamp=start + 100 + j * 200)
+            log.record(KIND_RESUME, 300, timestamp=start + 200 + j * 200)
+        log.record(KIND_WORK_END, 1500, FLAG_COMPLETED, timestamp=start + 1500)
+        log.record(KIND_BREAK_START, 300, timestamp=start + 1500)
+        flags = 0 if i < skipped else FLAG_COMPLETED
+        log.record(KIND_BREAK_END, 300, flags, timestamp=start + 1800)
+
+def test_daily_rollups(tmp_dir):
+    """Per-day counters match the recorded sessions"""
+    print("Testing daily rollups...")
+    directory = Path(tmp_dir) / "daily"
+    log = HistoryLog(directory, batch_records=1)
+    log.start()
+    write_day(log, 2, sessions=4, skipped=1, snoozes=2)
+    write_day(log, 0, sessions=2)
+    log.close()
+
+    index = HistoryIndex(directory)
+    index.refresh()
+    days = index.daily(3, today=TODAY)
+    ok = (
+        [d.sessions for d in days] == [4, 0, 2]
+        and days[0].focus_seconds == 4 * 1500
+        and days[0].breaks == 3 and days[0].skipped_breaks == 1
+        and days[0].snoozes == 2 and days[0].snooze_seconds == 600
+        and index.totals(3, today=TODAY)['sessions'] == 6
+    )
+    weeks = index.weekly(2, today=TODAY)
+    ok = ok and sum(w.sessions for w in weeks) == 6
+    ok = ok and "2024-03-14" in format_report(days, "Day")
+    print("OK Daily and weekly counters" if ok else f"FAIL {days} {weeks}")
+    return ok
+
+def test_incremental_refresh(tmp_dir):
+    """Refreshes only fold in records written since the stored cursor"""
+    print("Testing incremental refresh...")
+    directory = Path(tmp_dir) / "incremental"
+    log = HistoryLog(directory, batch_records=1)
+    log.start()
+    write_day(log, 1, sessions=3)
+    log.close()
+
+    first = HistoryIndex(directory).refresh()
+    ok = first == 12 and (directory / ROLLUP_FILE).exists()
+
+    # A new index resumes from the saved cursor instead of re-reading everything
+    log = HistoryLog(directory, batch_records=1)
+    log.start()
+    write_day(log, 0, sessions=1)
+    log.close()
+    index = HistoryIndex(directory)
+    second = index.refresh()
+    ok = ok and second == 4 and index.refresh() == 0
+    ok = ok and [d.sessions for d in index.daily(2, today=TODAY)] == [3, 1]
+    print("OK Incremental refresh" if ok else f"FAIL Applied {first} then {second}")
+    return ok
+
+def test_clock_step_back(tmp_dir):
+    """Records written after the wall clock stepped back are still counted"""
+    print("Testing a clock step back...")
+    directory = Path(tmp_dir) / "step-back"
+    log = HistoryLog(directory, batch_records=1)
+    log.start()
+    write_day(log, 0, sessions=2)
+    log.close()
+    index = HistoryIndex(directory)
+    first = index.refresh()
+
+    # The clock is set back a day: these records are older than the ones already counted
+    log = HistoryLog(directory, batch_records=1)
+    log.start()
+    write_day(log, 1, sessions=1)
+    log.close()
+    second = HistoryIndex(directory).refresh()
+    ok = first == 8 and second == 4
+    ok = ok and [d.sessions for d in HistoryIndex(directory).daily(2, today=TODAY)] == [1, 2]
+    print("OK Records after the step back counted" if ok else f"FAIL Applied {first} then {second}")
+    return ok
+
+def test_compacted_cursor(tmp_dir):
+    """The cursor stays valid when the segments it points into are compacted"""
+    print("Testing the cursor across compaction...")
+    directory = Path(tmp_dir) / "compacted"
+    log = HistoryLog(directory, batch_records=1, segment_bytes=HEADER_SIZE + RECORD_SIZE * 3)
+    log.start()
+    write_day(log, 1, sessions=3)
+    log.close()
+    first = HistoryIndex(directory).refresh()
+
+    # Reopening with a larger segment size merges the small segments
+    log = HistoryLog(directory, batch_records=1, segment_bytes=HEADER_SIZE + RECORD_SIZE * 100)
+    log.start()
+    write_day(log, 0, sessions=1)
+    log.close()
+    index = HistoryIndex(directory)
+    second = index.refresh()
+    ok = first == 12 and second == 4 and index.refresh() == 0
+    ok = ok and [d.sessions for d in index.daily(2, today=TODAY)] == [3, 1]
+    print("OK Cursor survived compaction" if ok else f"FAIL Applied {first} then {second}")
+    return ok
+
+def test_attached_index(tmp_dir):
+    """An attached index follows a running log after each commit"""
+    print("Testing attached index...")
+    directory = Path(tmp_dir) / "attached"
+    log = HistoryLog(directory, batch_records=1)
+    index = HistoryIndex(directory)
+    index.attach(log)
+    log.start()
+    write_day(log, 0, sessions=2)
+    log.close()
+    ok = index.daily(1, today=TODAY)[0].sessions == 2
+    ok = ok and HistoryIndex(directory).daily(1, today=TODAY)[0].sessions == 2
+    print("OK Index follows the log" if ok else "FAIL Index missed records")
+    return ok
+
+def test_damaged_rollups(tmp_dir):
+    """A damaged rollup file triggers a rebuild from the segments"""
+    print("Testing damaged rollups...")
+    directory = Path(tmp_dir) / "damaged"
+    log = HistoryLog(directory, batch_records=1)
+    log.start()
+    write_day(log, 0, sessions=2)
+    log.close()
+    (directory / ROLLUP_FILE).write_text('{"version": 1, "days"')
+    index = HistoryIndex(directory)
+    index.refresh()
+    ok = index.daily(1, today=TODAY)[0].sessions == 2
+    print("OK Rollups rebuilt" if ok else "FAIL Rollups not rebuilt")
+    return ok
+
+def main():
+    print("Starting History Query Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Daily Rollups", test_daily_rollups),
+            ("Incremental Refresh", test_incremental_refresh),
+            ("Clock Step Back", test_clock_step_back),
+            ("Compacted Cursor", test_compacted_cursor),
+            ("Attached Index", test_attached_index),
+            ("Damaged Rollups", test_damaged_rollups),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func(tmp_dir)))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
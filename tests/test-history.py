@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+
+"""
+Session History Test Script for Pomodoro Lock
+Checks the append-only history log: group commit, rotation, compaction and recovery (no display required)
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add src to path for storage imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from storage.history import (
+    HistoryLog,
+    iter_records,
+    list_segments,
+    HEADER_SIZE,
+    RECORD_SIZE,
+    KIND_WORK_START,
+    KIND_WORK_END,
+    KIND_PAUSE
+)
+
+def test_group_commit(tmp_dir):
+    """Records are persisted with far fewer fsyncs than records"""
+    print("Testing group commit...")
+    directory = Path(tmp_dir) / "group"
+    log = HistoryLog(directory, batch_records=50, batch_seconds=60)
+    log.start()
+    base = time.time()
+    for i in range(500):
+        log.record(KIND_WORK_START if i % 2 == 0 else KIND_WORK_END, 1500, timestamp=base + i)
+    log.close()
+
+    records = list(iter_records(directory))
+    ok = len(records) == 500 and log.fsyncs <= 11 and records[0].value == 1500
+    ok = ok and all(a.timestamp <= b.timestamp for a, b in zip(records, records[1:]))
+    print(f"{'OK' if ok else 'FAIL'} {len(records)} records with {log.fsyncs} fsyncs")
+    return ok
+
+def test_record_latency(tmp_dir):
+    """Recording never waits for the disk"""
+    print("Testing record() latency...")
+    log = HistoryLog(Path(tmp_dir) / "latency", batch_records=1)
+    log.start()
+    count = 2000
+    start = time.perf_counter()
+    for i in range(count):
+        log.record(KIND_PAUSE, 600)
+    per_call = (time.perf_counter() - start) / count
+    log.close()
+    ok = per_call < 0.0005
+    print(f"{'OK' if ok else 'FAIL'} {per_call * 1e6:.1f} us per record()")
+    return ok
+
+def test_rotation_and_compaction(tmp_dir):
+    """Full segments are sealed, and small sealed neighbours merged"""
+    print("Testing rotation and compaction...")
+    directory = Path(tmp_dir) / "rotate"
+    segment_bytes = HEADER_SIZE + RECORD_SIZE * 10
+    log = HistoryLog(directory, batch_records=1, segment_bytes=segment_bytes)
+    log.start()
+    base = 1700000000.0
+    for i in range(35):
+        log.record(KIND_WORK_START, i, timestamp=base + i * 60)
+    log.close()
+
+    segments = list_segments(directory)
+    sealed = [s for s in segments if s.sealed]
+    ok = len(sealed) == 3 and all(s.size == segment_bytes for s in sealed)
+    ok = ok and [r.value for r in iter_records(directory)] == list(range(35))
+
+    # Reopen with a larger target size: sealed segments are merged
+    log = HistoryLog(directory, segment_bytes=segment_bytes * 4)
+    log.start()
+    log.flush()
+    log.close()
+    merged = [s for s in list_segments(directory) if s.sealed]
+    ok = ok and len(merged) == 1 and [r.value for r in iter_records(directory)] == list(range(35))
+
+    # Range queries only touch overlapping segments
+    window = list(iter_records(directory, base + 600, base + 900))
+    ok = ok and [r.value for r in window] == list(range(10, 16))
+    print("OK Rotation and compaction" if ok else f"FAIL Segments: {[s.path.name for s in list_segments(directory)]}")
+    return ok
+
+def test_same_second(tmp_dir):
+    """Segments sealed within the same second keep distinct names and survive compaction"""
+    print("Testing rotations within one second...")
+    directory = Path(tmp_dir) / "same-second"
+    log = HistoryLog(directory, batch_records=1, segment_bytes=HEADER_SIZE + RECORD_SIZE * 2)
+    log.start()
+    base = 1700000000.0
+    for i in range(9):
+        log.record(KIND_WORK_START, i, timestamp=base + i / 100)
+    log.close()
+    names = [s.path.name for s in list_segments(directory)]
+    ok = len(names) == 5 and len(set(names)) == 5
+    ok = ok and [r.value for r in iter_records(directory)] == list(range(9))
+
+    log = HistoryLog(directory, segment_bytes=HEADER_SIZE + RECORD_SIZE * 100)
+    log.start()
+    log.flush()
+    log.close()
+    merged = [s for s in list_segments(directory) if s.sealed]
+    ok = ok and len(merged) == 1 and [r.value for r in iter_records(directory)] == list(range(9))
+    print(f"{'OK' if ok else 'FAIL'} Segments {names}, then {[s.path.name for s in list_segments(directory)]}")
+    return ok
+
+def test_recovery(tmp_dir):
+    """Torn tails and interrupted compactions are repaired on open"""
+    print("Testing crash recovery...")
+    directory = Path(tmp_dir) / "recover"
+    log = HistoryLog(directory, batch_records=1)
+    log.start()
+    base = time.time()
+    for i in range(5):
+        log.record(KIND_WORK_START, i, timestamp=base + i)
+    log.close()
+
+    active = [s for s in list_segments(directory) if not s.sealed][0]
+    with open(active.path, 'ab') as f:
+        f.write(b'\x01\x02\x03')  # torn record
+
+    log = HistoryLog(directory, batch_records=1)
+    log.start()
+    log.record(KIND_WORK_START, 5, timestamp=base + 5)
+    log.close()
+    ok = [r.value for r in iter_records(directory)] == list(range(6))
+    ok = ok and (active.path.stat().st_size - HEADER_SIZE) % RECORD_SIZE == 0
+    print("OK Torn record dropped" if ok else "FAIL Torn record not repaired")
+    return ok
+
+def main():
+    print("Starting Session History Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Group Commit", test_group_commit),
+            ("Record Latency", test_record_latency),
+            ("Rotation and Compaction", test_rotation_and_compaction),
+            ("Same Second", test_same_second),
+            ("Recovery", test_recovery),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func(tmp_dir)))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+
+"""
+Log Rate-Limit Test Script for Pomodoro Lock
+Checks that repeating failures are suppressed with backoff and summaries, and that log volume per hour is bounded (no display required)
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+from pathlib import Path
+
+# Add src to path for telemetry imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from telemetry.logsetup import configure_logging, shutdown_logging
+from telemetry.ratelimit import RateLimitFilter
+
+class VirtualClock:
+    """Monotonic clock advanced by the test"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class ListHandler(logging.Handler):
+    """Collects formatted messages"""
+
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+def install(**kwargs):
+    """Queue logging through a RateLimitFilter driven by a virtual clock"""
+    clock = VirtualClock()
+    handler = ListHandler()
+    rate_limit = RateLimitFilter(clock=clock, **kwargs)
+    configure_logging(None, handlers=[handler], rate_limit=rate_limit)
+    return clock, handler, rate_limit
+
+def broken_tray():
+    """Fails like _update_system_tray on a desktop without a tray"""
+    try:
+        raise AttributeError("'NoneType' object has no attribute 'set_from_file'")
+    except Exception as e:
+        logging.error(f"Failed to update system tray: {e}")
+
+def broken_overlay(error):
+    """Fails like the overlay update with different exception types"""
+    try:
+        raise error
+    except Exception as e:
+        logging.error(f"Failed to update break overlay: {e}")
+
+def test_backoff():
+    """One failure per second for an hour produces a bounded, summarized log"""
+    print("Testing backoff on a failure repeating every second...")
+    clock, handler, rate_limit = install()
+    for _ in range(3600):
+        broken_tray()
+        clock.now += 1
+    shutdown_logging()
+
+    tray = [m for m in handler.messages if m.startswith("Failed to update system tray")]
+    suppressed = sum(int(m.split("suppressed ")[1].split()[0]) for m in tray if "suppressed" in m)
+    # Shutdown reports what is still pending
+    flushed = sum(int(m.split()[1]) for m in handler.messages if m.startswith("Suppressed"))
+    pending = sum(state.suppressed for state in rate_limit.keys.values())
+    ok = 3 <= len(tray) <= 30 and len(tray) + suppressed + flushed == 3600 and tray[:3] == [tray[0]] * 3
+    ok = ok and pending == 0
+    print(f"{'OK' if ok else 'FAIL'} {len(tray)} of 3600 records logged, {suppressed} reported as suppressed")
+    return ok
+
+def test_keys():
+    """Different exception types at one call site are limited separately"""
+    print("Testing per exception type keys...")
+    clock, handler, rate_limit = install()
+    for _ in range(100):
+        broken_overlay(RecursionError("maximum recursion depth exceeded"))
+        broken_overlay(ValueError("bad monitor geometry"))
+        clock.now += 0.1
+    shutdown_logging()
+
+    recursion = [m for m in handler.messages if "recursion" in m]
+    geometry = [m for m in handler.messages if "geometry" in m]
+    ok = len(rate_limit.keys) == 2 and len(recursion) == len(geometry) and 3 <= len(recursion) < 20
+    print(f"{'OK' if ok else 'FAIL'} {len(rate_limit.keys)} keys, {len(recursion)} + {len(geometry)} records logged")
+    return ok
+
+def test_summary_sweep():
+    """Suppressed counts are reported after the failure stops"""
+    print("Testing summaries for failures that stopped...")
+    clock, handler, rate_limit = install(sweep_interval=60)
+    for _ in range(50):
+        broken_tray()
+        clock.now += 0.01
+    clock.now += 120
+    logging.info("Work session started")
+    shutdown_logging()
+
+    summaries = [m for m in handler.messages if m.startswith("Suppressed")]
+    ok = len(summaries) == 1 and "(AttributeError)" in summaries[0] and "Suppressed 47 " in summaries[0]
+    print(f"{'OK' if ok else 'FAIL'} {summaries}")
+    return ok
+
+def test_flush():
+    """Counts still pending are reported at shutdown and before the log file rotates"""
+    print("Testing summaries at shutdown and rotation...")
+    clock, handler, rate_limit = install()
+    for _ in range(50):
+        broken_tray()
+        clock.now += 0.01
+    shutdown_logging()
+    at_shutdown = [m for m in handler.messages if m.startswith("Suppressed")]
+    ok = len(at_shutdown) == 1 and "Suppressed 47 " in at_shutdown[0]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_path = Path(tmp_dir) / "pomodoro-ui.log"
+        configure_logging(log_path, max_bytes=2048, backup_count=2, stream=False,
+                          rate_limit=RateLimitFilter(clock=clock))
+        for _ in range(50):
+            broken_tray()
+            clock.now += 0.01
+        for i in range(40):
+            logging.info(f"Work session {i} started")
+
+        def logged():
+            return "".join(path.read_text() for path in Path(tmp_dir).glob("pomodoro-ui.log*"))
+
+        # Written by the rollover, before shutdown reports anything
+        end = time.time() + 5
+        while "Suppressed 47 " not in logged() and time.time() < end:
+            time.sleep(0.01)
+        at_rotation = "Suppressed 47 " in logged() and Path(f"{log_path}.1").exists()
+        shutdown_logging()
+        ok = ok and at_rotation and logged().count("Suppressed") == 1
+    print(f"{'OK' if ok else 'FAIL'} at shutdown {at_shutdown}; at rotation {at_rotation}")
+    return ok
+
+def test_hourly_budget():
+    """Many distinct failures cannot exceed the hourly budget"""
+    print("Testing the hourly budget...")
+    clock, handler, rate_limit = install(hourly_budget=100)
+    for i in range(1000):
+        logging.warning(f"Monitor {i} disappeared")
+        logging.info(f"Overlay {i} recreated")
+        clock.now += 1
+    clock.now += 3600
+    logging.info("Work session started")
+    shutdown_logging()
+
+    ok = (
+        sum(1 for m in handler.messages if m.startswith(("Monitor", "Overlay"))) == 100
+        and any(m.startswith("Hourly log budget reached") for m in handler.messages)
+        and handler.messages[-1] == "Work session started"
+    )
+    print(f"{'OK' if ok else 'FAIL'} {len(handler.messages)} records logged")
+    return ok
+
+def main():
+    print("Starting Log Rate-Limit Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    tests = [
+        ("Backoff", test_backoff),
+        ("Keys", test_keys),
+        ("Summary Sweep", test_summary_sweep),
+        ("Flush", test_flush),
+        ("Hourly Budget", test_hourly_budget),
+    ]
+    for test_name, test_func in tests:
+        print(f"\n--- {test_name} ---")
+        try:
+            results.append((test_name, test_func()))
+        except Exception as e:
+            print(f"FAIL {test_name} test crashed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
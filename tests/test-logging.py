@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+
+"""
+Logging Test Script for Pomodoro Lock
+Checks queued, rotated logging and benchmarks log-call latency on the tick path (no display required)
+"""
+
+import os
+import sys
+import time
+import logging
+import tempfile
+from pathlib import Path
+
+# Add src to path for telemetry imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from telemetry.logsetup import configure_logging, shutdown_logging
+
+SLOW_WRITE = 0.005   # a disk or journald pipe that takes 5 ms per record
+
+class SlowHandler(logging.Handler):
+    """Handler that blocks like a stalled disk"""
+
+    def __init__(self):
+        super().__init__()
+        self.records = 0
+
+    def emit(self, record):
+        time.sleep(SLOW_WRITE)
+        self.records += 1
+
+def percentile(samples, fraction):
+    """Value below which `fraction` of the samples fall"""
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+def measure(calls):
+    """Latency of logging.info as the timer loop calls it"""
+    samples = []
+    for i in range(calls):
+        start = time.perf_counter()
+        logging.info(f"Tick {i}: 1499 seconds remaining")
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def test_rotation(tmp_dir):
+    """The log file is rotated by size and all records reach the files"""
+    print("Testing log rotation...")
+    log_path = Path(tmp_dir) / "pomodoro-ui.log"
+    configure_logging(log_path, max_bytes=4096, backup_count=2, stream=False)
+    for i in range(500):
+        logging.info(f"Rotation record {i:04d}")
+    shutdown_logging()
+
+    files = sorted(Path(tmp_dir).glob("pomodoro-ui.log*"))
+    sizes = [f.stat().st_size for f in files]
+    last = log_path.read_text().strip().splitlines()[-1]
+    ok = len(files) == 3 and max(sizes) <= 4096 + 100 and last.endswith("Rotation record 0499")
+    print(f"{'OK' if ok else 'FAIL'} {len(files)} files, largest {max(sizes)} bytes")
+    return ok
+
+def test_tick_latency():
+    """Benchmark: log calls do not wait for a slow handler"""
+    print("Benchmarking log-call latency with a 5 ms handler...")
+    calls = 200
+
+    slow = SlowHandler()
+    root = logging.getLogger()
+    root.handlers = [slow]
+    root.setLevel(logging.INFO)
+    direct = measure(calls // 10)
+
+    slow = SlowHandler()
+    configure_logging(None, handlers=[slow])
+    queued = measure(calls)
+    shutdown_logging()
+
+    direct_p99 = percentile(direct, 0.99) * 1e6
+    queued_p50 = percentile(queued, 0.5) * 1e6
+    queued_p99 = percentile(queued, 0.99) * 1e6
+    print(f"  direct handler   p99 {direct_p99:8.1f} us")
+    print(f"  queued handler   p50 {queued_p50:8.1f} us   p99 {queued_p99:8.1f} us")
+    ok = queued_p99 < 1000 and slow.records == calls
+    print("OK Log calls are non-blocking" if ok else "FAIL Log calls wait for the handler")
+    return ok
+
+def main():
+    print("Starting Logging Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Rotation", lambda: test_rotation(tmp_dir)),
+            ("Tick Latency", test_tick_latency),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+
+"""
+Metrics Test Script for Pomodoro Lock
+Checks the metrics registry, its cost on the hot path and the metrics control command (no display required)
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add src to path for telemetry and ipc imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from telemetry.metrics import MetricsRegistry, bucket_quantile, format_metrics
+from ipc.control import ControlServer, send_command
+
+def test_registry():
+    """Counters, gauges and histograms record what they are given"""
+    print("Testing the registry...")
+    registry = MetricsRegistry()
+    registry.counter('breaks_total').inc()
+    registry.counter('breaks_total').inc(2)
+    registry.gauge('overlays').set(3)
+    lateness = registry.histogram('tick_lateness_seconds', buckets=(0.01, 0.1, 1.0))
+    for value in (0.002, 0.004, 0.05, 0.3, 3.0):
+        lateness.observe(value)
+
+    snapshot = registry.snapshot()
+    buckets = snapshot['tick_lateness_seconds']['buckets']
+    ok = (
+        snapshot['breaks_total']['value'] == 3
+        and snapshot['overlays']['value'] == 3
+        and buckets == [[0.01, 2], [0.1, 1], [1.0, 1], ['+Inf', 1]]
+        and snapshot['tick_lateness_seconds']['count'] == 5
+        and snapshot['tick_lateness_seconds']['max'] == 3.0
+        and bucket_quantile(snapshot['tick_lateness_seconds'], 0.5) == 0.1
+        and bucket_quantile(snapshot['tick_lateness_seconds'], 0.99) == 3.0
+    )
+    try:
+        registry.gauge('breaks_total')
+        ok = False
+    except ValueError:
+        pass
+    print("OK Registry records values" if ok else f"FAIL {snapshot}")
+    return ok
+
+def test_timer():
+    """Histogram.time() observes the duration of a block"""
+    print("Testing block timing...")
+    registry = MetricsRegistry()
+    overlay = registry.histogram('overlay_show_seconds')
+    with overlay.time():
+        time.sleep(0.02)
+    snapshot = registry.snapshot()['overlay_show_seconds']
+    ok = snapshot['count'] == 1 and 0.02 <= snapshot['sum'] < 0.5
+    print(f"{'OK' if ok else 'FAIL'} Timed {snapshot['sum'] * 1000:.1f} ms")
+    return ok
+
+def test_overhead():
+    """Benchmark: an observation costs a few microseconds at most"""
+    print("Benchmarking histogram observations...")
+    histogram = MetricsRegistry().histogram('gui_update_seconds')
+    calls = 100000
+    start = time.perf_counter()
+    for i in range(calls):
+        histogram.observe(i * 1e-7)
+    per_call = (time.perf_counter() - start) / calls * 1e6
+    ok = per_call < 5 and histogram.count == calls
+    print(f"{'OK' if ok else 'FAIL'} {per_call:.2f} us per observation")
+    return ok
+
+def test_control(tmp_dir):
+    """The metrics control command returns the registry and formats as text"""
+    print("Testing the metrics control command...")
+    registry = MetricsRegistry()
+    registry.histogram('timer_tick_lateness_seconds').observe(0.004)
+    path = str(Path(tmp_dir) / "control.sock")
+    server = ControlServer({'metrics': lambda request: {'metrics': registry.snapshot()}}, path=path)
+    server.start()
+    try:
+        reply = send_command('metrics', path=path)
+    finally:
+        server.stop()
+    text = format_metrics(reply['metrics'])
+    ok = reply['metrics']['timer_tick_lateness_seconds']['count'] == 1 and "timer_tick_lateness_seconds" in text and "n=1" in text
+    print(f"{'OK' if ok else 'FAIL'} {text}")
+    return ok
+
+def main():
+    print("Starting Metrics Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Registry", test_registry),
+            ("Block Timing", test_timer),
+            ("Overhead", test_overhead),
+            ("Control Command", lambda: test_control(tmp_dir)),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
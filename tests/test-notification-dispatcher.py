@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+
+"""
+Notification Dispatcher Test Script for Pomodoro Lock
+Checks that sending never blocks the caller, the drop-oldest queue, expiry and latency reporting (no display required)
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Add src to path for platform_abstraction imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from platform_abstraction.dispatcher import NotificationDispatcher
+
+class HungDaemon:
+    """Notification sender that blocks until released, like a hung daemon"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.shown = []
+
+    def send(self, request):
+        self.release.wait(10)
+        self.shown.append(request.message)
+        return True
+
+def test_non_blocking():
+    """Submitting while the daemon hangs returns immediately and keeps the newest requests"""
+    print("Testing submits against a hung daemon...")
+    daemon = HungDaemon()
+    dispatcher = NotificationDispatcher(daemon.send, capacity=4)
+    dispatcher.submit("Pomodoro Lock", "message 0")
+    time.sleep(0.05)  # the worker is now stuck sending message 0
+
+    slowest = 0.0
+    for i in range(1, 20):
+        start = time.perf_counter()
+        dispatcher.submit("Pomodoro Lock", f"message {i}")
+        slowest = max(slowest, time.perf_counter() - start)
+    daemon.release.set()
+    dispatcher.flush()
+    dispatcher.stop()
+
+    ok = (
+        slowest < 0.005
+        and daemon.shown == ["message 0", "message 16", "message 17", "message 18", "message 19"]
+        and dispatcher.dropped == 15
+    )
+    print(f"{'OK' if ok else 'FAIL'} Slowest submit {slowest * 1e6:.0f} us, dropped {dispatcher.dropped}, shown {daemon.shown}")
+    return ok
+
+def test_expiry():
+    """Requests queued longer than max_age are discarded"""
+    print("Testing expiry of stale requests...")
+    daemon = HungDaemon()
+    dispatcher = NotificationDispatcher(daemon.send, max_age=0.1)
+    dispatcher.submit("Pomodoro Lock", "Break time! Take a rest.")
+    time.sleep(0.02)
+    dispatcher.submit("Pomodoro Lock", "Break ended! Back to work.")
+    time.sleep(0.2)
+    daemon.release.set()
+    dispatcher.flush()
+    dispatcher.stop()
+    ok = daemon.shown == ["Break time! Take a rest."] and dispatcher.expired == 1
+    print(f"{'OK' if ok else 'FAIL'} Shown {daemon.shown}, expired {dispatcher.expired}")
+    return ok
+
+def test_latency():
+    """Each send reports its queue delay and send duration"""
+    print("Testing latency reporting...")
+    observed = []
+
+    def slow_send(request):
+        time.sleep(0.03)
+        return request.message != "fail"
+
+    dispatcher = NotificationDispatcher(slow_send)
+    dispatcher.observer = lambda queued, send, ok: observed.append((queued, send, ok))
+    for message in ("first", "second", "fail"):
+        dispatcher.submit("Pomodoro Lock", message)
+    dispatcher.flush()
+    dispatcher.stop()
+
+    ok = (
+        [entry[2] for entry in observed] == [True, True, False]
+        and all(send >= 0.03 for _, send, _ in observed)
+        and observed[2][0] >= 0.05
+        and dispatcher.sent == 2 and dispatcher.failed == 1
+    )
+    print(f"{'OK' if ok else 'FAIL'} " + ", ".join(f"queued {q * 1000:.0f} ms send {s * 1000:.0f} ms" for q, s, _ in observed))
+    return ok
+
+def test_sender_errors():
+    """A sender that raises does not kill the worker"""
+    print("Testing sender errors...")
+    shown = []
+
+    def flaky_send(request):
+        if request.message == "boom":
+            raise RuntimeError("org.freedesktop.DBus.Error.ServiceUnknown")
+        shown.append(request.message)
+        return True
+
+    dispatcher = NotificationDispatcher(flaky_send)
+    dispatcher.submit("Pomodoro Lock", "boom")
+    dispatcher.submit("Pomodoro Lock", "Timer resumed!")
+    dispatcher.flush()
+    dispatcher.stop()
+    ok = shown == ["Timer resumed!"] and dispatcher.failed == 1
+    print("OK Worker survived a failing send" if ok else f"FAIL {shown}")
+    return ok
+
+def test_async_sender():
+    """A sender that answers later reports its latency through completed()"""
+    print("Testing asynchronous senders...")
+    observed = []
+    replies = []
+    dispatcher = NotificationDispatcher(lambda request: replies.append(request))
+    dispatcher.observer = lambda queued, send, ok: observed.append((send, ok))
+    start = time.perf_counter()
+    dispatcher.submit("Pomodoro Lock", "Break time! Take a rest.")
+    dispatcher.flush()
+    handed_off = time.perf_counter() - start
+
+    # The reply arrives on another thread (the GLib main loop in the Gio backend)
+    time.sleep(0.05)
+    threading.Thread(target=dispatcher.completed, args=(replies[0], True)).start()
+    time.sleep(0.05)
+    dispatcher.stop()
+    ok = handed_off < 0.05 and len(observed) == 1 and observed[0][0] >= 0.05 and observed[0][1] and dispatcher.sent == 1
+    print(f"{'OK' if ok else 'FAIL'} Reply after {observed[0][0] * 1000 if observed else 0:.0f} ms")
+    return ok
+
+def main():
+    print("Starting Notification Dispatcher Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    tests = [
+        ("Non-blocking Submit", test_non_blocking),
+        ("Expiry", test_expiry),
+        ("Latency", test_latency),
+        ("Sender Errors", test_sender_errors),
+        ("Async Sender", test_async_sender),
+    ]
+    for test_name, test_func in tests:
+        print(f"\n--- {test_name} ---")
+        try:
+            results.append((test_name, test_func()))
+        except Exception as e:
+            print(f"FAIL {test_name} test crashed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+
+"""
+Notification Replacement Test Script for Pomodoro Lock
+Checks that bursts are coalesced and that each category updates one notification in place (replaces_id),
+against a stub org.freedesktop.Notifications server on a private session bus
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+
+# Add src to path for platform_abstraction imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from platform_abstraction.dispatcher import NotificationDispatcher
+
+# Stub notification daemon: logs every Notify call as a JSON line and honours replaces_id
+STUB_SERVER = r'''
+import sys, json
+import gi
+gi.require_version('Gio', '2.0')
+from gi.repository import Gio, GLib
+
+XML = """<node><interface name="org.freedesktop.Notifications">
+<method name="Notify"><arg type="s" direction="in"/><arg type="u" direction="in"/>
+<arg type="s" direction="in"/><arg type="s" direction="in"/><arg type="s" direction="in"/>
+<arg type="as" direction="in"/><arg type="a{sv}" direction="in"/><arg type="i" direction="in"/>
+<arg type="u" direction="out"/></method>
+<method name="CloseNotification"><arg type="u" direction="in"/></method>
+<method name="GetCapabilities"><arg type="as" direction="out"/></method>
+<method name="GetServerInformation"><arg type="s" direction="out"/><arg type="s" direction="out"/>
+<arg type="s" direction="out"/><arg type="s" direction="out"/></method>
+</interface></node>"""
+
+log = open(sys.argv[1], 'a', buffering=1)
+last_id = [0]
+
+def on_call(connection, sender, path, interface, method, params, invocation):
+    if method == 'Notify':
+        app, replaces_id, icon, summary, body, actions, hints, timeout = params.unpack()
+        if not replaces_id:
+            last_id[0] += 1
+        notification_id = replaces_id or last_id[0]
+        log.write(json.dumps({'replaces_id': replaces_id, 'id': notification_id,
+                              'summary': summary, 'body': body, 'timeout': timeout}) + '\n')
+        invocation.return_value(GLib.Variant('(u)', (notification_id,)))
+    elif method == 'GetCapabilities':
+        invocation.return_value(GLib.Variant('(as)', (['body'],)))
+    elif method == 'GetServerInformation':
+        invocation.return_value(GLib.Variant('(ssss)', ('stub', 'pomodoro-lock', '1', '1.2')))
+    else:
+        invocation.return_value(None)
+
+def on_bus(connection, name):
+    interface = Gio.DBusNodeInfo.new_for_xml(XML).interfaces[0]
+    connection.register_object('/org/freedesktop/Notifications', interface, on_call, None, None)
+
+def on_name(connection, name):
+    print('ready', flush=True)
+
+Gio.bus_own_name(Gio.BusType.SESSION, 'org.freedesktop.Notifications',
+                 Gio.BusNameOwnerFlags.NONE, on_bus, on_name, None)
+GLib.MainLoop().run()
+'''
+
+class Recorder:
+    """Sender that records what it was asked to show"""
+
+    def __init__(self):
+        self.shown = []
+
+    def send(self, request):
+        self.shown.append((request.category, request.message, request.coalesced))
+        return True
+
+def test_coalescing():
+    """A burst within the window becomes one notification carrying the latest text"""
+    print("Testing coalescing of bursts...")
+    recorder = Recorder()
+    dispatcher = NotificationDispatcher(recorder.send, coalesce_window=0.2)
+    for i in range(10):
+        dispatcher.submit("Pomodoro Lock", "Timer paused. Will resume in 10 minutes" if i % 2 == 0 else "Timer resumed!",
+                          category="snooze")
+    dispatcher.submit("Pomodoro Lock", "Break time! Take a rest.", "high", category="session")
+    dispatcher.flush()
+
+    # After the window a new click is sent on its own
+    dispatcher.submit("Pomodoro Lock", "Timer paused. Will resume in 10 minutes", category="snooze")
+    dispatcher.flush()
+    dispatcher.stop()
+
+    expected = [
+        ("snooze", "Timer resumed!", 9),
+        ("session", "Break time! Take a rest.", 0),
+        ("snooze", "Timer paused. Will resume in 10 minutes", 0),
+    ]
+    ok = recorder.shown == expected and dispatcher.coalesced == 9
+    print(f"{'OK' if ok else 'FAIL'} {recorder.shown}")
+    return ok
+
+def test_uncategorized():
+    """Notifications without a category are never merged"""
+    print("Testing uncategorized notifications...")
+    recorder = Recorder()
+    dispatcher = NotificationDispatcher(recorder.send)
+    for i in range(3):
+        dispatcher.submit("Pomodoro Lock", f"message {i}")
+    dispatcher.flush()
+    dispatcher.stop()
+    ok = [message for _, message, _ in recorder.shown] == ["message 0", "message 1", "message 2"]
+    print("OK Uncategorized notifications kept" if ok else f"FAIL {recorder.shown}")
+    return ok
+
+class HungNotify2:
+    """Stand-in for the notify2 module whose daemon never answers until released"""
+
+    URGENCY_LOW, URGENCY_NORMAL, URGENCY_CRITICAL = range(3)
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.shown = []
+        module = self
+
+        class Notification:
+            def __init__(self, title, message):
+                self.message = message
+
+            def update(self, title, message):
+                self.message = message
+
+            def set_urgency(self, urgency):
+                pass
+
+            def set_timeout(self, timeout):
+                pass
+
+            def show(self):
+                module.release.wait()
+                module.shown.append(self.message)
+
+        self.Notification = Notification
+
+def install_notify2(module):
+    """Make `import notify2` return module; returns a function undoing it"""
+    saved = sys.modules.get('notify2')
+    sys.modules['notify2'] = module
+
+    def restore():
+        if saved is None:
+            del sys.modules['notify2']
+        else:
+            sys.modules['notify2'] = saved
+    return restore
+
+def test_notify2_timeout():
+    """A notify2 send the daemon never answers is abandoned instead of blocking the dispatcher"""
+    print("Testing the notify2 send timeout...")
+    from platform_abstraction import linux
+    from platform_abstraction.dispatcher import NotificationRequest
+    notify2 = HungNotify2()
+    notify2.init = lambda name: None
+    backend = linux.Notify2Backend()
+    backend.CALL_TIMEOUT = 0.2
+
+    def request(message):
+        now = time.monotonic()
+        return NotificationRequest("Pomodoro Lock", message, "normal", 5, "session", now, None, now)
+
+    outcomes = []
+    restore = install_notify2(notify2)
+    try:
+        for message in ("first", "second"):
+            start = time.perf_counter()
+            try:
+                backend.show(request(message))
+                outcomes.append(("sent", round(time.perf_counter() - start, 1)))
+            except TimeoutError as e:
+                outcomes.append((type(e).__name__, round(time.perf_counter() - start, 1)))
+
+        # Once the daemon answers, sends go through again
+        notify2.release.set()
+        time.sleep(0.1)
+        backend.show(request("third"))
+    finally:
+        restore()
+    ok = outcomes == [("TimeoutError", 0.2), ("TimeoutError", 0.0)] and notify2.shown == ["first", "third"]
+    print(f"{'OK' if ok else 'FAIL'} {outcomes}, daemon showed {notify2.shown}")
+    return ok
+
+def test_notify2_init_timeout():
+    """A first notify2 send that times out in init leaves notifications enabled"""
+    print("Testing a notify2 connection that hangs on the first notification...")
+    from platform_abstraction import linux
+    from platform_abstraction.dispatcher import NotificationRequest
+    notify2 = HungNotify2()
+    inits = []
+    notify2.init = lambda name: inits.append(name) or notify2.release.wait()
+    restore = install_notify2(notify2)
+    manager = linux.NotificationManager("notify2")
+    manager.backend = linux.Notify2Backend()
+    manager.backend.CALL_TIMEOUT = 0.2
+    manager.initialized = True
+
+    def request(message):
+        now = time.monotonic()
+        return NotificationRequest("Pomodoro Lock", message, "normal", 5, "session", now, None, now)
+
+    try:
+        first = manager._show(request("first"))
+        enabled = manager.initialized
+        notify2.release.set()
+        time.sleep(0.1)
+        second = manager._show(request("second"))
+    finally:
+        manager.close()
+        restore()
+    # The send after the timeout connects again
+    ok = first is False and enabled and second is True and manager.initialized and len(inits) == 2
+    ok = ok and notify2.shown == ["first", "second"]
+    print(f"{'OK' if ok else 'FAIL'} sends {first}, {second}; {len(inits)} connections; shown {notify2.shown}")
+    return ok
+
+def start_private_bus(tmp_dir):
+    """Start a private session bus and the stub server; returns (processes, log path), or None to skip"""
+    if platform.system().lower() != "linux" or not shutil.which("dbus-daemon"):
+        print("WARN dbus-daemon not available - skipped")
+        return None
+    try:
+        import gi  # noqa: F401 (the stub server needs PyGObject)
+    except ImportError:
+        print("WARN PyGObject not available - skipped")
+        return None
+
+    bus = subprocess.Popen(
+        ["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+        stdout=subprocess.PIPE, text=True
+    )
+    address = bus.stdout.readline().strip()
+    os.environ['DBUS_SESSION_BUS_ADDRESS'] = address
+
+    log_path = Path(tmp_dir) / "notify-calls.jsonl"
+    log_path.unlink(missing_ok=True)
+    server = subprocess.Popen(
+        [sys.executable, "-c", STUB_SERVER, str(log_path)],
+        stdout=subprocess.PIPE, text=True
+    )
+    if server.stdout.readline().strip() != "ready":
+        server.kill()
+        bus.kill()
+        raise RuntimeError("stub notification server did not start")
+    return (bus, server), log_path
+
+def read_calls(log_path):
+    if not log_path.exists():
+        return []
+    return [json.loads(line) for line in log_path.read_text().splitlines()]
+
+def check_backend(manager, log_path):
+    """Drive a notification manager like the timer does and inspect the Notify calls"""
+    for i in range(10):
+        manager.send_notification("Pomodoro Lock", "Timer paused. Will resume in 10 minutes" if i % 2 == 0 else "Timer resumed!",
+                                  "normal", timeout=5, category="snooze")
+    manager.send_notification("Pomodoro Lock", "Break time! Take a rest.", "high", timeout=5, category="session")
+    manager.dispatcher.flush()
+    time.sleep(0.5)
+    manager.send_notification("Pomodoro Lock", "Timer resumed automatically!", "normal", timeout=5, category="snooze")
+    manager.dispatcher.flush()
+    time.sleep(0.5)
+
+    calls = read_calls(log_path)
+    snooze = [call for call in calls if call['body'].startswith("Timer")]
+    ok = (
+        len(calls) == 3
+        and len({call['id'] for call in calls}) == 2
+        and snooze[0]['replaces_id'] == 0 and snooze[0]['body'] == "Timer resumed!"
+        and snooze[1]['replaces_id'] == snooze[0]['id']
+    )
+    print(f"{'OK' if ok else 'FAIL'} {len(calls)} Notify calls for 12 notifications: {calls}")
+    return ok
+
+def test_stub_server(tmp_dir, backend):
+    """Against a stub daemon, one bubble per category is updated in place (None when skipped)"""
+    print(f"Testing replaces_id with the {backend} backend against a stub notification server...")
+    started = start_private_bus(tmp_dir)
+    if started is None:
+        return None
+    processes, log_path = started
+    loop = None
+    try:
+        from platform_abstraction import linux
+        if backend == "notify2" and not linux.NOTIFY2_AVAILABLE:
+            print("WARN notify2 not available - skipped")
+            return None
+        if backend == "gio":
+            if not linux.GIO_AVAILABLE:
+                print("WARN Gio not available - skipped")
+                return None
+            # Notify replies are handled by the default main loop, as under Gtk.main()
+            loop = linux.GLib.MainLoop()
+            threading.Thread(target=loop.run, daemon=True).start()
+        manager = linux.NotificationManager(backend)
+        try:
+            return manager.backend.name == backend and check_backend(manager, log_path)
+        finally:
+            manager.close()
+    finally:
+        if loop is not None:
+            loop.quit()
+        for process in processes:
+            process.terminate()
+            process.wait(timeout=5)
+
+def main():
+    print("Starting Notification Replacement Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Coalescing", test_coalescing),
+            ("Uncategorized", test_uncategorized),
+            ("notify2 Timeout", test_notify2_timeout),
+            ("notify2 Init Timeout", test_notify2_init_timeout),
+            ("Stub Server (notify2)", lambda: test_stub_server(tmp_dir, "notify2")),
+            ("Stub Server (Gio)", lambda: test_stub_server(tmp_dir, "gio")),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    # A test returning None was skipped and counts neither way
+    ran = [result for _, result in results if result is not None]
+    passed = sum(1 for result in ran if result)
+    skipped = len(results) - len(ran)
+    for test_name, result in results:
+        print(f"{test_name}: {'SKIP' if result is None else 'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(ran)} tests passed" + (f", {skipped} skipped" if skipped else ""))
+    return 0 if passed == len(ran) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
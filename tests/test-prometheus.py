@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+"""
+Prometheus Exporter Test Script for Pomodoro Lock
+Checks the text exposition format, the textfile exporter and the Unix socket listener (no display required)
+"""
+
+import os
+import sys
+import time
+import socket
+import tempfile
+from pathlib import Path
+
+# Add src to path for telemetry imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from telemetry.metrics import MetricsRegistry
+from telemetry.prometheus import (
+    render, TextfileExporter, MetricsSocketServer, process_rss_bytes, METRICS_SOCKET_AVAILABLE
+)
+
+def build_registry():
+    """Registry with the metrics the timer exports"""
+    registry = MetricsRegistry()
+    registry.counter('breaks_enforced_total', "Breaks that locked the screen").inc(4)
+    registry.counter('breaks_snoozed_total', "Breaks paused with the snooze").inc()
+    registry.counter('work_sessions_total', "Work sessions started").inc(5)
+    registry.gauge('process_resident_memory_bytes', "Resident memory").set_function(process_rss_bytes)
+    lateness = registry.histogram('timer_tick_lateness_seconds', "Tick lateness", buckets=(0.01, 0.1, 1.0))
+    for value in (0.001, 0.002, 0.05, 2.0):
+        lateness.observe(value)
+    registry.histogram('notification_send_seconds', "Notification latency").observe(0.012)
+    return registry
+
+def parse(text):
+    """Sample name (with labels) -> value, checking every line is well formed"""
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith('#'):
+            assert line.split()[1] in ('HELP', 'TYPE'), line
+            continue
+        name, value = line.rsplit(' ', 1)
+        samples[name] = float(value)
+    return samples
+
+def test_format():
+    """Counters, gauges and cumulative histogram buckets are exposed"""
+    print("Testing the exposition format...")
+    text = render(build_registry().snapshot())
+    samples = parse(text)
+    ok = (
+        text.endswith("\n")
+        and "# TYPE pomodoro_lock_breaks_enforced_total counter" in text
+        and samples['pomodoro_lock_breaks_enforced_total'] == 4
+        and samples['pomodoro_lock_breaks_snoozed_total'] == 1
+        and samples['pomodoro_lock_process_resident_memory_bytes'] > 0
+        and samples['pomodoro_lock_timer_tick_lateness_seconds_bucket{le="0.01"}'] == 2
+        and samples['pomodoro_lock_timer_tick_lateness_seconds_bucket{le="1.0"}'] == 3
+        and samples['pomodoro_lock_timer_tick_lateness_seconds_bucket{le="+Inf"}'] == 4
+        and samples['pomodoro_lock_timer_tick_lateness_seconds_count'] == 4
+        and abs(samples['pomodoro_lock_timer_tick_lateness_seconds_sum'] - 2.053) < 1e-9
+    )
+    print("OK Exposition is well formed" if ok else f"FAIL\n{text}")
+    return ok
+
+def test_textfile(tmp_dir):
+    """The textfile exporter writes a readable file atomically and removes it on stop"""
+    print("Testing the textfile exporter...")
+    path = Path(tmp_dir) / "textfile" / "pomodoro_lock.prom"
+    exporter = TextfileExporter(build_registry(), path, interval=0.05)
+    exporter.start()
+    time.sleep(0.2)
+    text = path.read_text()
+    mode = path.stat().st_mode & 0o777
+    leftovers = [p.name for p in path.parent.iterdir() if p.name != path.name]
+    exporter.stop()
+    ok = "pomodoro_lock_work_sessions_total 5" in text and mode & 0o044 and not leftovers and not path.exists()
+    print(f"{'OK' if ok else 'FAIL'} Wrote {len(text)} bytes, mode {mode:o}")
+    return ok
+
+def scrape(path):
+    """Issue an HTTP GET on a Unix socket and return (status line, body)"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(5)
+    sock.connect(str(path))
+    sock.sendall(b"GET /metrics HTTP/1.0\r\nHost: localhost\r\n\r\n")
+    data = b""
+    while True:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    sock.close()
+    head, _, body = data.partition(b"\r\n\r\n")
+    return head.split(b"\r\n")[0].decode(), head.decode(), body.decode()
+
+def test_socket(tmp_dir):
+    """Benchmark: scrapes over the Unix socket are fast and well formed"""
+    print("Testing the metrics socket...")
+    if not METRICS_SOCKET_AVAILABLE:
+        print("WARN Unix sockets not available - skipped")
+        return True
+    path = Path(tmp_dir) / "metrics.sock"
+    server = MetricsSocketServer(build_registry(), path)
+    if not server.start():
+        print("FAIL Could not start the metrics socket")
+        return False
+    try:
+        scrapes = 50
+        start = time.perf_counter()
+        for _ in range(scrapes):
+            status, head, body = scrape(path)
+        per_scrape = (time.perf_counter() - start) / scrapes * 1000
+    finally:
+        server.stop()
+    ok = (
+        status.endswith("200 OK")
+        and "version=0.0.4" in head
+        and parse(body)['pomodoro_lock_breaks_enforced_total'] == 4
+        and per_scrape < 20
+        and not path.exists()
+    )
+    print(f"{'OK' if ok else 'FAIL'} {status}, {per_scrape:.2f} ms per scrape")
+    return ok
+
+def test_render_cost():
+    """Benchmark: rendering costs well under a millisecond"""
+    print("Benchmarking rendering...")
+    registry = build_registry()
+    runs = 1000
+    start = time.perf_counter()
+    for _ in range(runs):
+        render(registry.snapshot())
+    per_render = (time.perf_counter() - start) / runs * 1e6
+    ok = per_render < 1000
+    print(f"{'OK' if ok else 'FAIL'} {per_render:.1f} us per snapshot and render")
+    return ok
+
+def main():
+    print("Starting Prometheus Exporter Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Exposition Format", test_format),
+            ("Textfile Exporter", lambda: test_textfile(tmp_dir)),
+            ("Metrics Socket", lambda: test_socket(tmp_dir)),
+            ("Render Cost", test_render_cost),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+
+"""
+Session Daemon Test Script for Pomodoro Lock
+Checks the shared session table on a virtual clock, per-user isolation over the daemon socket,
+and benchmarks 1,000 simulated sessions against one daemon process (no display required)
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import selectors
+import subprocess
+from pathlib import Path
+
+# Add src to path for engine and ipc imports
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+from engine.scheduler import DeadlineScheduler
+from engine.sessions import SessionManager, SessionError
+from ipc.control import ControlError, send_command, subscribe, encode_message, CONTROL_AVAILABLE
+from ipc.session_daemon import SessionDaemon
+
+SESSIONS = 1000
+CONFIG = {"work_time_minutes": 2, "break_time_minutes": 1, "notification_time_minutes": 1,
+          "snooze_time_minutes": 1, "max_snooze_minutes": 1}
+
+class VirtualClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def wait_for(condition, timeout=5.0):
+    """Poll until condition() is true or the timeout expires"""
+    end = time.time() + timeout
+    while time.time() < end:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def test_session_table():
+    """Sessions follow the PomodoroTimer cycle, each on its own deadlines"""
+    print("Testing the session table on a virtual clock...")
+    clock = VirtualClock()
+    scheduler = DeadlineScheduler(clock)
+    events = []
+    manager = SessionManager(scheduler, lambda key, message: events.append((key, message['event'])),
+                             expire_after=300)
+    manager.attach("1000:a", CONFIG)
+    clock.now += 30
+    manager.attach("1001:a", CONFIG)
+
+    def advance(to):
+        clock.now = 1000.0 + to
+        scheduler.run_due()
+
+    advance(60)    # warning for a
+    advance(90)    # warning for b
+    manager.pause("1001:a")
+    advance(120)   # a goes on break; b is paused with 60 s left
+    granted_again = manager.pause("1001:a")
+    advance(150)   # b auto-resumes
+    advance(180)   # a back to work
+    refused = manager.pause("1001:a") == 0 and events[-1] == ("1001:a", "snooze_denied")
+
+    expected = [
+        ("1000:a", "work_start"), ("1001:a", "work_start"),
+        ("1000:a", "warning"), ("1001:a", "warning"), ("1001:a", "pause"),
+        ("1000:a", "break_start"), ("1001:a", "resume"),
+        ("1000:a", "break_end"), ("1000:a", "work_start"), ("1001:a", "snooze_denied"),
+    ]
+    left = manager.snapshot("1001:a")['remaining']
+    ok = events == expected and granted_again == 0 and refused and left == 30
+
+    # Detached sessions expire; unknown sessions are errors
+    manager.detach("1000:a")
+    advance(180 + 301)
+    try:
+        manager.pause("1000:a")
+        unknown_refused = False
+    except SessionError:
+        unknown_refused = True
+    ok = ok and "1000:a" not in manager and "1001:a" in manager and unknown_refused
+    print(f"{'OK' if ok else 'FAIL'} {len(events)} events, {left} s left after the snooze: {events}")
+    return ok
+
+def test_isolation(tmp_dir):
+    """Each client sees and controls only its own session"""
+    print("Testing per-session event routing over the daemon socket...")
+    if not CONTROL_AVAILABLE:
+        print("WARN Unix sockets not available - skipped")
+        return True
+    path = Path(tmp_dir) / "isolation" / "daemon.sock"
+    daemon = SessionDaemon(path, expire_after=0.2, policy_path=Path(tmp_dir) / "no-policy.json")
+    if not daemon.start():
+        print("FAIL Daemon did not start")
+        return False
+    try:
+        stream_a = subscribe(path, timeout=5, session="a", config=CONFIG)
+        stream_b = subscribe(path, timeout=5, session="b", config=CONFIG)
+        first_a, first_b = next(stream_a), next(stream_b)
+        reply = send_command('pause', path=path, session="a")
+        event_a = next(stream_a)
+        status_b = send_command('status', path=path, session="b")
+        uid = os.getuid()
+        ok = (
+            first_a.get('topic') == f"{uid}:a" and first_b.get('topic') == f"{uid}:b"
+            and reply.get('snooze_seconds') == 60 and event_a.get('event') == 'pause'
+            and status_b.get('paused') is False
+        )
+        # The other stream stays quiet
+        send_command('resume', path=path, session="a")
+        ok = ok and next(stream_a).get('event') == 'resume'
+
+        # Invalid requests are refused without touching the table
+        bad = send_command('pause', path=path, session="a", seconds=-5)
+        ok = ok and bad.get('ok') is False
+
+        # A session whose last client leaves is forgotten after expire_after
+        stream_a.close()
+        expired = wait_for(lambda: f"{uid}:a" not in daemon.sessions, timeout=3)
+        ok = ok and expired and f"{uid}:b" in daemon.sessions
+        stream_b.close()
+    except (ControlError, StopIteration) as e:
+        print(f"FAIL Daemon request failed: {e}")
+        return False
+    finally:
+        daemon.stop()
+    print("OK Sessions isolated and expired" if ok else f"FAIL {first_a} {first_b} {reply} {status_b}")
+    return ok
+
+def test_policy_and_limit(tmp_dir):
+    """Client settings go through the system policy, and each user keeps a bounded number of sessions"""
+    print("Testing the policy layer and the per-user session limit...")
+    if not CONTROL_AVAILABLE:
+        print("WARN Unix sockets not available - skipped")
+        return True
+    policy = Path(tmp_dir) / "policy.json"
+    policy.write_text(json.dumps({"max_snooze_minutes": 2, "locked": ["max_snooze_minutes"]}))
+    path = Path(tmp_dir) / "limit" / "daemon.sock"
+    daemon = SessionDaemon(path, expire_after=0.2, policy_path=policy, max_sessions_per_user=2)
+    if not daemon.start():
+        print("FAIL Daemon did not start")
+        return False
+    try:
+        first = subscribe(path, timeout=5, session="a", config=dict(CONFIG, max_snooze_minutes=60))
+        second = subscribe(path, timeout=5, session="b", config=CONFIG)
+        locked, _ = next(first), next(second)
+        refused = send_command('subscribe', path=path, session="c", config=CONFIG)
+        # Attaching to a session the user already has is not a new one
+        again = send_command('status', path=path, session="a")
+
+        # Once a session expires, the user may start another
+        first.close()
+        expired = wait_for(lambda: f"{os.getuid()}:a" not in daemon.sessions, timeout=3)
+        third = subscribe(path, timeout=5, session="c", config=CONFIG)
+        accepted = next(third)
+        third.close()
+        second.close()
+    except (ControlError, StopIteration) as e:
+        print(f"FAIL Daemon request failed: {e}")
+        return False
+    finally:
+        daemon.stop()
+    ok = (
+        locked.get('snooze_left') == 120 and refused.get('ok') is False and again.get('ok')
+        and expired and accepted.get('event') == 'subscribed'
+    )
+    print(f"{'OK' if ok else 'FAIL'} snooze_left {locked.get('snooze_left')}, third session: {refused.get('error')}")
+    return ok
+
+def process_stats(pid):
+    """(rss bytes, cpu seconds) of a process from /proc"""
+    with open(f"/proc/{pid}/statm") as f:
+        rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    ticks = os.sysconf('SC_CLK_TCK')
+    return rss, (int(fields[11]) + int(fields[12])) / ticks
+
+class SimulatedClients:
+    """Many thin clients, one subscribed socket each, read through one selector"""
+
+    def __init__(self, path):
+        self.path = str(path)
+        self.selector = selectors.DefaultSelector()
+        self.sockets = []
+        self.buffers = {}
+        self.events = []
+
+    def connect(self, count):
+        for i in range(count):
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.path)
+            sock.sendall(encode_message({'cmd': 'subscribe', 'session': f"s{i}", 'config': CONFIG}))
+            sock.setblocking(False)
+            self.sockets.append(sock)
+            self.buffers[sock] = b''
+            self.selector.register(sock, selectors.EVENT_READ)
+
+    def send_all(self, request):
+        data = encode_message(request)
+        for i, sock in enumerate(self.sockets):
+            sock.setblocking(True)
+            sock.sendall(data.replace(b'"s?"', f'"s{i}"'.encode()))
+            sock.setblocking(False)
+
+    def pump(self, until, timeout=10.0):
+        """Read lines until until(events) is true"""
+        end = time.time() + timeout
+        while not until(self.events) and time.time() < end:
+            for key, _ in self.selector.select(0.1):
+                data = key.fileobj.recv(65536)
+                buf = self.buffers[key.fileobj] + data
+                *lines, self.buffers[key.fileobj] = buf.split(b'\n')
+                received = time.time()
+                self.events.extend((received, json.loads(line)) for line in lines if line.strip())
+        return until(self.events)
+
+    def count(self, name):
+        return sum(1 for _, event in self.events if event.get('event') == name)
+
+    def close(self):
+        for sock in self.sockets:
+            sock.close()
+        self.selector.close()
+
+def test_thousand_sessions(tmp_dir):
+    """One daemon process serves 1,000 sessions with flat idle CPU and a few KiB each"""
+    print(f"Benchmarking {SESSIONS} simulated sessions against one daemon process...")
+    if not os.path.exists("/proc/self/statm"):
+        print("WARN /proc not available - skipped")
+        return True
+    path = Path(tmp_dir) / "bench" / "daemon.sock"
+    daemon = subprocess.Popen([sys.executable, os.path.join(SRC_DIR, "pomodoro-daemon.py"), "--socket", str(path),
+                               "--max-sessions-per-user", str(SESSIONS)],
+                              stderr=subprocess.DEVNULL)
+    clients = SimulatedClients(path)
+    try:
+        if not wait_for(path.exists):
+            print("FAIL Daemon did not start")
+            return False
+        time.sleep(0.2)
+        rss_empty, _ = process_stats(daemon.pid)
+
+        start = time.perf_counter()
+        clients.connect(SESSIONS)
+        attached = clients.pump(lambda events: clients.count('subscribed') >= SESSIONS)
+        attach_time = time.perf_counter() - start
+        time.sleep(0.5)
+        rss_full, cpu_before = process_stats(daemon.pid)
+        per_session = (rss_full - rss_empty) / SESSIONS
+
+        # Between transitions nothing runs, however many sessions there are
+        time.sleep(2.0)
+        _, cpu_after = process_stats(daemon.pid)
+        idle_cpu = cpu_after - cpu_before
+
+        # Every session snoozes for one second: 1,000 deadlines in one burst
+        clients.events.clear()
+        paused_at = time.time()
+        clients.send_all({'cmd': 'pause', 'session': "s?", 'seconds': 1})
+        resumed = clients.pump(lambda events: clients.count('resume') >= SESSIONS, timeout=15)
+        _, cpu_burst = process_stats(daemon.pid)
+        last_resume = max(received for received, event in clients.events if event.get('event') == 'resume') \
+            if resumed else float('nan')
+        delivery = last_resume - paused_at - 1.0
+        stats = send_command('sessions', path=path)
+    finally:
+        clients.close()
+        daemon.terminate()
+        daemon.wait(timeout=5)
+
+    print(f"  attach: {attach_time:.2f} s for {SESSIONS} clients")
+    print(f"  RSS: {rss_empty / 2**20:.1f} MiB empty, {rss_full / 2**20:.1f} MiB with {SESSIONS} sessions "
+          f"({per_session / 1024:.1f} KiB per session)")
+    print(f"  idle CPU: {idle_cpu:.2f} s over 2 s; burst of {SESSIONS} snooze ends: "
+          f"{cpu_burst - cpu_after:.2f} s CPU, last event {delivery * 1000:.0f} ms after its deadline")
+    ok = (
+        attached and resumed
+        and stats.get('sessions') == SESSIONS
+        and per_session < 64 * 1024
+        and idle_cpu < 0.1
+        and delivery < 2.0
+    )
+    print(f"{'OK' if ok else 'FAIL'} {stats.get('sessions')} sessions, {stats.get('deadlines')} deadlines in one heap")
+    return ok
+
+def main():
+    print("Starting Session Daemon Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Session Table", test_session_table),
+            ("Isolation", lambda: test_isolation(tmp_dir)),
+            ("Policy and Limit", lambda: test_policy_and_limit(tmp_dir)),
+            ("1,000 Sessions", lambda: test_thousand_sessions(tmp_dir)),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+
+"""
+Session Table Test Script for Pomodoro Lock
+Checks that the compact struct-of-arrays session table behaves exactly like the object-per-session
+manager, measures its bytes per session and times vectorized due queries (no display required)
+"""
+
+import os
+import sys
+import time
+
+# Add src to path for engine imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from engine.scheduler import DeadlineScheduler
+from engine.simulation import Simulation, VirtualClock, measure_memory
+from engine.table import SessionTable, NUMPY_AVAILABLE
+
+CONFIG = {"work_time_minutes": 25, "break_time_minutes": 5, "notification_time_minutes": 2}
+
+def run_logged(table, use_numpy=True):
+    """Per-session event logs of a two-day simulation"""
+    simulation = Simulation(300, days=2, table=table)
+    if table:
+        simulation.manager.use_numpy = use_numpy and NUMPY_AVAILABLE
+    simulation.record = True
+    simulation.populate()
+    simulation.run()
+    return simulation.log, simulation.violations
+
+def test_same_events():
+    """The table produces the same events at the same times as SessionManager"""
+    print("Testing the table against SessionManager over 2 simulated days...")
+    reference, violations = run_logged(False)
+    results = []
+    for use_numpy in ((True, False) if NUMPY_AVAILABLE else (False,)):
+        log, table_violations = run_logged(True, use_numpy)
+        differing = [key for key in reference if reference[key] != log.get(key)]
+        results.append(not differing and len(log) == len(reference) and not table_violations)
+        events = sum(len(entries) for entries in log.values())
+        print(f"  {'NumPy' if use_numpy else 'plain'} queries: {events} events, {len(differing)} sessions differ")
+    if not NUMPY_AVAILABLE:
+        print("WARN NumPy not available - only the plain queries were checked")
+    ok = all(results) and not violations
+    print("OK Identical event logs" if ok else "FAIL Event logs differ")
+    return ok
+
+def test_bytes_per_session():
+    """A session in the table costs under 200 bytes, key included"""
+    print("Measuring bytes per session...")
+    table_bytes = measure_memory(10000, table=True)
+    object_bytes = measure_memory(10000, table=False)
+    columns = SessionTable(DeadlineScheduler()).column_bytes()
+    ok = table_bytes < 200
+    print(f"{'OK' if ok else 'FAIL'} {table_bytes:.0f} bytes per session in the table "
+          f"({columns} in columns), {object_bytes:.0f} as objects")
+    return ok
+
+def test_due_query():
+    """Vectorized due queries over 100,000 sessions agree with the plain loop and stay fast"""
+    print("Testing due queries over 100,000 sessions...")
+    clock = VirtualClock()
+    table = SessionTable(DeadlineScheduler(clock))
+    for i in range(100000):
+        clock.now = i * 0.05
+        table.attach(f"{1000 + i}:default", CONFIG)
+    now = 25 * 60 + 600.0
+    # Pause a few, so snooze deadlines take part
+    for i in range(0, 100000, 1000):
+        table.pause(f"{1000 + i}:default")
+
+    table.use_numpy = False
+    start = time.perf_counter()
+    plain = table.due(now)
+    plain_time = time.perf_counter() - start
+    earliest = {slot: min(table.deadline[slot], table.warning[slot], table.snooze[slot])
+                for slot in range(len(table.flags))}
+    expected = sorted((slot for slot, when in earliest.items() if when <= now), key=lambda slot: (earliest[slot], slot))
+    ok = plain == expected
+    print(f"  plain loop: {len(plain)} due in {plain_time * 1000:.1f} ms")
+    if NUMPY_AVAILABLE:
+        table.use_numpy = True
+        start = time.perf_counter()
+        vectorized = table.due(now)
+        numpy_time = time.perf_counter() - start
+        print(f"  NumPy: {len(vectorized)} due in {numpy_time * 1000:.1f} ms")
+        ok = ok and vectorized == plain and numpy_time < 0.05
+    else:
+        print("WARN NumPy not available - vectorized query skipped")
+    print("OK Due queries agree" if ok else "FAIL Due queries disagree or are too slow")
+    return ok
+
+def test_slot_reuse():
+    """Removed sessions free their slot for the next one"""
+    print("Testing slot reuse...")
+    table = SessionTable(DeadlineScheduler(VirtualClock()))
+    for i in range(10):
+        table.attach(f"1000:s{i}", CONFIG)
+    table.remove("1000:s3")
+    slot = table.attach("1001:new", CONFIG)
+    stats = table.stats()
+    ok = (
+        slot == 3 and len(table.flags) == 10 and len(table) == 10
+        and "1000:s3" not in table and table.snapshot("1001:new")['remaining'] == 25 * 60
+        and stats['profiles'] == 1
+    )
+    print(f"{'OK' if ok else 'FAIL'} New session took slot {slot}, {len(table.flags)} slots, {stats}")
+    return ok
+
+def test_profile_release():
+    """Unused config keys share a profile, and profiles are freed with their last session"""
+    print("Testing profile sharing and release...")
+    table = SessionTable(DeadlineScheduler(VirtualClock()))
+    for i in range(10):
+        table.attach(f"1000:junk{i}", dict(CONFIG, **{f"junk{i}": i}))
+    shared = table.stats()['profiles']
+    table.attach("1000:long", dict(CONFIG, work_time_minutes=50))
+    table.attach("1000:junk0", dict(CONFIG, work_time_minutes=50))
+    reconfigured = table.stats()['profiles']
+    for key in table.keys():
+        table.remove(key)
+    empty = table.stats()
+    table.attach("1000:again", CONFIG)
+    ok = shared == 1 and reconfigured == 2 and empty['profiles'] == 0 and empty['sessions'] == 0
+    ok = ok and table.stats()['profiles'] == 1 and len(table._profiles) == 2
+    print(f"{'OK' if ok else 'FAIL'} {shared} profile for 10 configs, {reconfigured} after a change, "
+          f"{empty['profiles']} once every session was removed")
+    return ok
+
+def main():
+    print("Starting Session Table Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    tests = [
+        ("Same Events", test_same_events),
+        ("Bytes per Session", test_bytes_per_session),
+        ("Due Query", test_due_query),
+        ("Slot Reuse", test_slot_reuse),
+        ("Profile Release", test_profile_release),
+    ]
+    for test_name, test_func in tests:
+        print(f"\n--- {test_name} ---")
+        try:
+            results.append((test_name, test_func()))
+        except Exception as e:
+            print(f"FAIL {test_name} test crashed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
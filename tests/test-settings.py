@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+
+"""
+Settings Test Script for Pomodoro Lock
+Checks layered settings: policy, user file, environment, locking and caching (no display required)
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# Add src to path for settings imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from settings.loader import DEFAULT_CONFIG, ConfigError
+from settings.layers import SettingsLoader, LAYER_POLICY, LAYER_USER, LAYER_ENV, LAYER_DEFAULT
+
+def write_json(path, data):
+    """Write a JSON layer"""
+    path.write_text(json.dumps(data))
+
+def test_layer_order(tmp_dir):
+    """Environment beats the user file, which beats the policy and defaults"""
+    print("Testing layer order...")
+    policy, user = Path(tmp_dir) / "order-policy.json", Path(tmp_dir) / "order-user.json"
+    write_json(policy, {"work_time_minutes": 50, "break_time_minutes": 10})
+    write_json(user, {"break_time_minutes": 15, "notification_time_minutes": 3})
+    environ = {"POMODORO_NOTIFICATION_TIME_MINUTES": "4"}
+
+    settings = SettingsLoader(user, policy, environ).get()
+    ok = (
+        settings.work_time_minutes == 50 and settings.source('work_time_minutes') == LAYER_POLICY
+        and settings.break_time_minutes == 15 and settings.source('break_time_minutes') == LAYER_USER
+        and settings.notification_time == 4 * 60 and settings.source('notification_time_minutes') == LAYER_ENV
+        and settings.inactivity_threshold_minutes == DEFAULT_CONFIG['inactivity_threshold_minutes']
+        and settings.source('inactivity_threshold_minutes') == LAYER_DEFAULT
+    )
+    print("OK Layers merged in order" if ok else f"FAIL {settings}")
+    return ok
+
+def test_locked_keys(tmp_dir):
+    """Locked policy keys ignore the user file and the environment"""
+    print("Testing locked keys...")
+    policy, user = Path(tmp_dir) / "lock-policy.json", Path(tmp_dir) / "lock-user.json"
+    write_json(policy, {"break_time_minutes": 10, "locked": ["break_time_minutes"]})
+    write_json(user, {"break_time_minutes": 1, "work_time_minutes": 40})
+    environ = {"POMODORO_BREAK_TIME_MINUTES": "2"}
+
+    settings = SettingsLoader(user, policy, environ).get()
+    ok = (
+        settings.break_time_minutes == 10
+        and settings.work_time_minutes == 40
+        and settings.locked == frozenset(["break_time_minutes"])
+    )
+    print("OK Locked keys enforced" if ok else f"FAIL {settings}")
+    return ok
+
+def test_immutable_and_cached(tmp_dir):
+    """Settings cannot be modified and are merged again only after a change"""
+    print("Testing immutability and caching...")
+    policy, user = Path(tmp_dir) / "cache-policy.json", Path(tmp_dir) / "cache-user.json"
+    write_json(user, {"work_time_minutes": 30})
+    loader = SettingsLoader(user, policy, {})
+
+    first = loader.get()
+    ok = all(loader.get() is first for _ in range(100)) and loader.merges == 1
+    try:
+        first.work_time_minutes = 1
+        ok = False
+    except AttributeError:
+        pass
+
+    write_json(user, {"work_time_minutes": 35, "break_time_minutes": 7})
+    second = loader.get()
+    ok = ok and loader.merges == 2 and second.work_time == 35 * 60 and first.work_time == 30 * 60
+    print(f"{'OK' if ok else 'FAIL'} {loader.merges} merges for 102 lookups")
+    return ok
+
+def test_invalid_layers(tmp_dir):
+    """Invalid layers raise ConfigError; the fallback keeps the policy"""
+    print("Testing invalid layers...")
+    policy, user = Path(tmp_dir) / "bad-policy.json", Path(tmp_dir) / "bad-user.json"
+    write_json(policy, {"work_time_minutes": 45})
+    user.write_text('{"work_time_minutes": ')
+
+    loader = SettingsLoader(user, policy, {})
+    ok = False
+    try:
+        loader.get()
+    except ConfigError:
+        ok = True
+    ok = ok and loader.get_or_fallback().work_time_minutes == 45
+
+    env_loader = SettingsLoader(Path(tmp_dir) / "missing.json", policy, {"POMODORO_WORK_TIME_MINUTES": "lots"})
+    try:
+        env_loader.get()
+        ok = False
+    except ConfigError:
+        pass
+    print("OK Invalid layers rejected" if ok else "FAIL Invalid layer accepted")
+    return ok
+
+def main():
+    print("Starting Settings Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Layer Order", test_layer_order),
+            ("Locked Keys", test_locked_keys),
+            ("Immutable and Cached", test_immutable_and_cached),
+            ("Invalid Layers", test_invalid_layers),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func(tmp_dir)))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
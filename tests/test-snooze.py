@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+
+"""
+Snooze Test Script for Pomodoro Lock
+Checks the configurable snooze length, the per-session snooze limit and its accounting across resumes, restarts and the history (no display required)
+"""
+
+import os
+import sys
+import json
+import tempfile
+from pathlib import Path
+
+# Add src to path for engine, settings and storage imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from engine.state import TimerState, StateCell
+from engine.scheduler import DeadlineScheduler, DEADLINE_SNOOZE_END
+from settings.loader import ConfigError, validate_config
+from settings.layers import SettingsLoader
+from storage.checkpoint import StateCheckpoint, resume_plan
+from storage.history import HistoryLog, iter_records, KIND_PAUSE, KIND_SNOOZE_DENIED, KIND_NAMES, FLAG_LIMITED
+
+def test_settings(tmp_dir):
+    """Snooze length and limit come from the config, environment and validation"""
+    print("Testing snooze settings...")
+    user = Path(tmp_dir) / "config.json"
+    user.write_text(json.dumps({"snooze_time_minutes": 5, "max_snooze_minutes": 0}))
+    settings = SettingsLoader(user, Path(tmp_dir) / "none.json", {"POMODORO_SNOOZE_TIME_MINUTES": "7"}).get()
+    defaults = validate_config({})
+    rejected = 0
+    for bad in ({"snooze_time_minutes": 0}, {"max_snooze_minutes": -1}, {"max_snooze_minutes": 1000}):
+        try:
+            validate_config(bad)
+        except ConfigError:
+            rejected += 1
+    ok = (
+        settings.snooze_time == 7 * 60 and settings.max_snooze == 0
+        and defaults["snooze_time_minutes"] == 10 and defaults["max_snooze_minutes"] == 20
+        and rejected == 3
+    )
+    print(f"{'OK' if ok else 'FAIL'} snooze {settings.snooze_time}s, limit {settings.max_snooze}s, {rejected}/3 bad values rejected")
+    return ok
+
+class Clock:
+    """Virtual monotonic clock"""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+def test_stacking():
+    """Snoozes stack up to the limit; early resumes refund, a new session resets"""
+    print("Testing snooze stacking and the per-session limit...")
+    clock = Clock()
+    scheduler = DeadlineScheduler(clock=clock)
+    cell = StateCell(TimerState(1500, deadline=clock() + 1500))
+    snooze, limit = 600, 1200
+    granted = []
+
+    def pause():
+        state = cell.transform(lambda state: state.paused(clock(), snooze, limit))
+        if state is None:
+            granted.append(0)
+            return
+        granted.append(round(state.snooze_deadline - clock()))
+        scheduler.schedule(DEADLINE_SNOOZE_END, state.snooze_deadline,
+                           lambda: cell.transform(lambda state: state.resumed(clock())))
+
+    def resume():
+        scheduler.cancel(DEADLINE_SNOOZE_END)
+        cell.transform(lambda state: state.resumed(clock()))
+
+    pause()                          # full 10 minutes
+    clock.now += 600
+    scheduler.run_due()              # auto-resume at the deadline
+    clock.now += 60
+    pause()                          # another 10 minutes, the limit is now spent
+    clock.now += 240
+    resume()                         # 6 minutes refunded
+    used_after_refund = cell.get().snooze_used
+    pause()                          # only the refunded 6 minutes are left
+    clock.now += 360
+    scheduler.run_due()
+    pause()                          # refused; the countdown keeps running
+    refused_state = cell.get()
+    left_in_session = refused_state.left(clock())
+
+    # The next session starts with the whole limit again
+    cell.update(is_work_session=False, remaining=300, deadline=clock() + 300, snooze_used=0)
+    pause()
+
+    ok = (
+        granted == [600, 600, 360, 0, 600]
+        and used_after_refund == 840
+        and refused_state.snooze_used == 1200 and not refused_state.is_paused
+        and left_in_session == 1500 - 60
+        and scheduler.fired == 2
+    )
+    print(f"{'OK' if ok else 'FAIL'} granted {granted}, {left_in_session}s of work left after snoozing")
+    return ok
+
+def test_restart(tmp_dir):
+    """The snooze already used survives a restart, so restarting does not reset the limit"""
+    print("Testing snooze accounting across restarts...")
+    checkpoint = StateCheckpoint(Path(tmp_dir) / "state")
+    checkpoint.save(True, True, 2000.0, 900, snooze_deadline=1300.0, snooze_used=1080)
+    stored = checkpoint.load()
+    stored['saved_at'] = 1000.0
+    paused = resume_plan(stored, 300, now=1100.0)
+    expired = resume_plan(stored, 300, now=1400.0)
+    owed_break = resume_plan(dict(stored, is_paused=False, deadline=1050.0), 300, now=1100.0)
+    ok = (
+        paused['is_paused'] and paused['snooze_remaining'] == 200 and paused['snooze_used'] == 1080
+        and not expired['is_paused'] and expired['snooze_used'] == 1080
+        and not owed_break['is_work_session'] and owed_break['snooze_used'] == 0
+    )
+    print(f"{'OK' if ok else 'FAIL'} {paused}, {owed_break}")
+    return ok
+
+def test_history(tmp_dir):
+    """Shortened and refused snoozes are recorded in the history"""
+    print("Testing snooze records in the history...")
+    directory = Path(tmp_dir) / "history"
+    log = HistoryLog(directory, batch_records=1)
+    log.start()
+    log.record(KIND_PAUSE, 360, FLAG_LIMITED)
+    log.record(KIND_SNOOZE_DENIED, 1200)
+    log.close()
+    records = list(iter_records(directory))
+    ok = (
+        [(r.kind, r.value, r.flags) for r in records] == [(KIND_PAUSE, 360, FLAG_LIMITED), (KIND_SNOOZE_DENIED, 1200, 0)]
+        and KIND_NAMES[KIND_SNOOZE_DENIED] == 'snooze_denied'
+    )
+    print(f"{'OK' if ok else 'FAIL'} {records}")
+    return ok
+
+def main():
+    print("Starting Snooze Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Settings", lambda: test_settings(tmp_dir)),
+            ("Stacking", test_stacking),
+            ("Restart", lambda: test_restart(tmp_dir)),
+            ("History", lambda: test_history(tmp_dir)),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+"""
+Status Page Test Script for Pomodoro Lock
+Checks the memory-mapped status page used by panels and shell prompts (no display required)
+"""
+
+import os
+import sys
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+# Add src to path for ipc imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ipc.status_page import (
+    StatusPageWriter,
+    StatusPageReader,
+    STATE_WORK,
+    STATE_BREAK,
+    STATE_STOPPED
+)
+
+def test_round_trip(tmp_dir):
+    """A published record is read back unchanged"""
+    print("Testing publish/read round trip...")
+    path = Path(tmp_dir) / "status"
+    writer = StatusPageWriter(path)
+    deadline = time.time() + 300
+    writer.publish(STATE_WORK, False, deadline, 0, 1500)
+
+    reader = StatusPageReader(path)
+    snapshot = reader.read()
+    ok = (
+        snapshot is not None
+        and snapshot.state == STATE_WORK
+        and not snapshot.paused
+        and snapshot.deadline == deadline
+        and snapshot.session_length == 1500
+        and snapshot.sequence % 2 == 0
+    )
+    remaining = reader.remaining()
+    ok = ok and 299 <= remaining <= 300
+
+    writer.publish(STATE_BREAK, True, deadline, 42, 300)
+    snapshot = reader.read()
+    ok = ok and snapshot.state == STATE_BREAK and snapshot.paused and reader.remaining() == 42
+    ok = ok and reader.format().endswith("(paused)")
+
+    writer.close()
+    ok = ok and reader.read().state == STATE_STOPPED and reader.remaining() is None
+    reader.close()
+
+    print("OK Round trip works" if ok else "FAIL Round trip mismatch")
+    return ok
+
+def test_missing_page(tmp_dir):
+    """Readers cope with no running timer"""
+    print("Testing reader without a page...")
+    reader = StatusPageReader(Path(tmp_dir) / "missing")
+    ok = reader.read() is None and reader.format() == ""
+    print("OK Missing page handled" if ok else "FAIL Missing page not handled")
+    return ok
+
+def test_concurrent_reads(tmp_dir):
+    """Readers never observe a torn record while the writer is busy"""
+    print("Testing seqlock consistency under concurrent writes...")
+    path = Path(tmp_dir) / "status-concurrent"
+    writer = StatusPageWriter(path)
+    stop = threading.Event()
+    torn = []
+
+    def write_loop():
+        i = 0
+        while not stop.is_set():
+            i += 1
+            # remaining and session length always match for a consistent record
+            writer.publish(STATE_WORK, False, float(i), float(i), float(i))
+
+    thread = threading.Thread(target=write_loop, daemon=True)
+    thread.start()
+    reader = StatusPageReader(path)
+    end = time.time() + 1.0
+    reads = 0
+    while time.time() < end:
+        snapshot = reader.read()
+        if snapshot is None:
+            continue
+        reads += 1
+        if not (snapshot.deadline == snapshot.remaining == snapshot.session_length):
+            torn.append(snapshot)
+    stop.set()
+    thread.join()
+    writer.close()
+    reader.close()
+
+    ok = not torn and reads > 0
+    print(f"OK {reads} consistent reads" if ok else f"FAIL {len(torn)} torn reads")
+    return ok
+
+def test_read_latency(tmp_dir):
+    """Reads after the first map stay well below a millisecond"""
+    print("Testing read latency...")
+    path = Path(tmp_dir) / "status-latency"
+    writer = StatusPageWriter(path)
+    writer.publish(STATE_WORK, False, time.time() + 60, 0, 60)
+    reader = StatusPageReader(path)
+    reader.remaining()
+
+    count = 10000
+    start = time.perf_counter()
+    for _ in range(count):
+        reader.remaining()
+    per_read = (time.perf_counter() - start) / count
+    writer.close()
+    reader.close()
+
+    ok = per_read < 0.001
+    print(f"{'OK' if ok else 'FAIL'} {per_read * 1e6:.2f} us per read")
+    return ok
+
+def main():
+    print("Starting Status Page Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Round Trip", test_round_trip),
+            ("Missing Page", test_missing_page),
+            ("Concurrent Reads", test_concurrent_reads),
+            ("Read Latency", test_read_latency),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func(tmp_dir)))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
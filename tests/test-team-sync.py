@@ -0,0 +1,384 @@
+#!/usr/bin/env python3
+
+"""
+Team Sync Test Script for Pomodoro Lock
+Checks team schedule arithmetic, that timers keep their schedule across coordinator restarts,
+and benchmarks 2,000 subscribed timers against one coordinator process over TCP (no display required)
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import tempfile
+import threading
+import selectors
+import subprocess
+from pathlib import Path
+
+# Add src to path for engine and ipc imports
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src')
+sys.path.insert(0, SRC_DIR)
+
+from engine.team import TeamSchedule, ScheduleError, MIN_WORK
+from ipc.control import send_command, encode_message, CONTROL_AVAILABLE
+from ipc.coordinator import TeamCoordinator, TeamSyncClient
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+CLIENTS = 2000
+TEAMS = 20
+
+def wait_for(condition, timeout=5.0):
+    """Poll until condition() is true or the timeout expires"""
+    end = time.time() + timeout
+    while time.time() < end:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+def free_port():
+    """A TCP port nobody listens on right now"""
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def test_schedule_phase():
+    """Any timer works out the team's session and time left from the schedule alone"""
+    print("Testing team schedule arithmetic...")
+    schedule = TeamSchedule("platform", 1000.0, 25 * 60, 5 * 60, version=3)
+    cycle = 30 * 60
+    cases = [
+        (1000.0, (True, 1500)),                          # the epoch starts a work session
+        (1000.0 + 600, (True, 900)),
+        (1000.0 + 1500, (False, 300)),                   # break
+        (1000.0 + 1500 - MIN_WORK + 1, (False, 359)),    # too little work left: break with the team
+        (1000.0 + 7 * cycle + 1700, (False, 100)),       # any number of cycles later
+        (1000.0 - 100, (False, 100)),                    # before the epoch
+    ]
+    results = [schedule.phase(now) for now, _ in cases]
+    ok = results == [expected for _, expected in cases]
+
+    # The wire form round-trips and bad schedules are refused
+    ok = ok and TeamSchedule.from_dict(schedule.as_dict()) == schedule
+    refused = 0
+    for bad in ({'epoch': "soon", 'work_time_minutes': 25, 'break_time_minutes': 5},
+                {'epoch': 0, 'work_time_minutes': 0, 'break_time_minutes': 5},
+                {'epoch': 0, 'work_time_minutes': 25, 'break_time_minutes': 5, 'team': ""},
+                [1, 2]):
+        try:
+            TeamSchedule.from_dict(bad)
+        except ScheduleError:
+            refused += 1
+    ok = ok and refused == 4
+    print(f"{'OK' if ok else 'FAIL'} phases {results}, {refused}/4 bad schedules refused")
+    return ok
+
+def test_coordinator_loss(tmp_dir):
+    """Timers keep following their schedule while the coordinator is gone and pick up changes after"""
+    print("Testing coordinator restarts...")
+    state = Path(tmp_dir) / "loss" / "teams.json"
+    admin = Path(tmp_dir) / "loss" / "coordinator.sock"
+    coordinator = TeamCoordinator([admin, "tcp://127.0.0.1:0"], state)
+    if not coordinator.start():
+        print("FAIL Coordinator did not start")
+        return False
+    address = coordinator.paths[1]
+    received = []
+    cache = Path(tmp_dir) / "loss" / "team-schedule.json"
+    client = TeamSyncClient(received.append, address, "platform", cache_path=cache)
+    client.start()
+    try:
+        ok = wait_for(lambda: received and client.connected)
+        first = received[0] if received else None
+
+        # Lost: the client notices but keeps the schedule
+        coordinator.stop()
+        ok = ok and wait_for(lambda: not client.connected) and client.schedule == first
+
+        # A timer started while the coordinator is down follows the cached schedule
+        offline = []
+        offline_client = TeamSyncClient(offline.append, address, "platform", cache_path=cache)
+        offline_client.start()
+        offline_client.stop()
+        ok = ok and offline == [first]
+
+        # Back (same address and state file): same epoch, no spurious change, then a real change
+        coordinator = TeamCoordinator([admin, address], state)
+        ok = ok and coordinator.start() and wait_for(lambda: client.connected, timeout=10)
+        ok = ok and len(received) == 1
+        send_command('set-schedule', path=admin, team="platform", work_time_minutes=50, break_time_minutes=10)
+        ok = ok and wait_for(lambda: len(received) == 2)
+        changed = received[-1] if len(received) == 2 else None
+        ok = ok and changed.epoch == first.epoch and changed.work_time == 50 * 60 and changed.version == 1
+
+        # Anonymous TCP peers cannot change schedules
+        refused = send_command('set-schedule', path=address, team="platform", epoch='now')
+        ok = ok and refused.get('ok') is False
+    finally:
+        client.stop()
+        coordinator.stop()
+    print(f"{'OK' if ok else 'FAIL'} Schedules {received}")
+    return ok
+
+def open_subscription(address, team):
+    """Subscribe a raw socket to a team; returns (socket, first reply)"""
+    address = str(address)
+    if address.startswith('tcp://'):
+        host, port = address[len('tcp://'):].rsplit(':', 1)
+        sock = socket.create_connection((host, int(port)), timeout=5)
+    else:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(5)
+        sock.connect(address)
+    sock.sendall(encode_message({'cmd': 'subscribe', 'team': team}))
+    line = b''
+    while not line.endswith(b'\n'):
+        data = sock.recv(4096)
+        if not data:
+            break
+        line += data
+    return sock, json.loads(line or b'{}')
+
+def test_team_limit(tmp_dir):
+    """Peers can start only a bounded number of teams, released when their last timer leaves"""
+    print("Testing the team limit...")
+    state = Path(tmp_dir) / "limit" / "teams.json"
+    admin = Path(tmp_dir) / "limit" / "coordinator.sock"
+    coordinator = TeamCoordinator([admin, "tcp://127.0.0.1:0"], state, max_teams=3, max_teams_per_peer=2)
+    if not coordinator.start():
+        print("FAIL Coordinator did not start")
+        return False
+    address = coordinator.paths[1]
+    socks = []
+    try:
+        def join(path, team):
+            sock, reply = open_subscription(path, team)
+            socks.append(sock)
+            return reply
+
+        # Two teams per peer; joining a team that is already running costs nothing
+        started = [join(address, "team-0"), join(address, "team-1"), join(address, "team-0")]
+        over_peer = join(address, "team-2")
+        local = join(admin, "team-2")
+        over_total = join(admin, "team-3")
+        ok = all(reply.get('ok', True) for reply in started + [local])
+        ok = ok and over_peer.get('ok') is False and over_total.get('ok') is False
+
+        # Asking for a schedule starts nothing
+        queried = send_command('schedule', path=address, team="team-9")
+        ok = ok and queried.get('ok') and sorted(coordinator.schedules) == ["team-0", "team-1", "team-2"]
+
+        # Once team-0's last timer leaves the team is released and the peer may start another
+        socks[0].close()
+        socks[2].close()
+        ok = ok and wait_for(lambda: "team-0" not in coordinator.schedules)
+        ok = ok and join(address, "team-3").get('ok', True) is not False
+        ok = ok and not state.exists()
+
+        # Schedules changed by the admin are saved and kept, even for a team past the limit
+        send_command('set-schedule', path=admin, team="team-1", work_time_minutes=50)
+        changed = send_command('set-schedule', path=admin, team="extra", epoch='now')
+        socks[1].close()
+        time.sleep(0.2)
+        saved = sorted(entry['team'] for entry in json.loads(state.read_text()))
+        ok = ok and changed.get('ok') and saved == ["extra", "team-1"] and "team-1" in coordinator.schedules
+    finally:
+        for sock in socks:
+            sock.close()
+        coordinator.stop()
+
+    # A restarted coordinator hands out the same schedule for teams it did not save
+    restarted = TeamCoordinator([admin], state)
+    restarted._load()
+    default = restarted.schedule("team-0").as_dict()
+    ok = ok and default == {k: started[0][k] for k in default}
+    print(f"{'OK' if ok else 'FAIL'} Refused: {over_peer.get('error')}; {over_total.get('error')}; saved {saved}")
+    return ok
+
+def test_concurrent_changes(tmp_dir):
+    """Changes made at the same time each get their own version"""
+    print("Testing concurrent schedule changes...")
+    state = Path(tmp_dir) / "concurrent" / "teams.json"
+    coordinator = TeamCoordinator([Path(tmp_dir) / "concurrent" / "coordinator.sock"], state)
+    versions = []
+
+    def change(minutes):
+        for _ in range(50):
+            versions.append(coordinator.set_schedule("platform", work_minutes=minutes).version)
+
+    threads = [threading.Thread(target=change, args=(20 + i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    saved = json.loads(state.read_text())
+    ok = (
+        sorted(versions) == list(range(1, 401))
+        and coordinator.schedule("platform").version == 400 and coordinator.changes == 400
+        and saved[0]['version'] == 400
+    )
+    print(f"{'OK' if ok else 'FAIL'} {len(set(versions))} distinct versions of {len(versions)} changes")
+    return ok
+
+def process_stats(pid):
+    """(rss bytes, cpu seconds) of a process from /proc"""
+    with open(f"/proc/{pid}/statm") as f:
+        rss = int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    with open(f"/proc/{pid}/stat") as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    ticks = os.sysconf('SC_CLK_TCK')
+    return rss, (int(fields[11]) + int(fields[12])) / ticks
+
+class SimulatedTimers:
+    """Many team-synced timers, one subscribed TCP connection each, read through one selector"""
+
+    def __init__(self, address):
+        host, port = address[len("tcp://"):].rsplit(':', 1)
+        self.address = (host, int(port))
+        self.selector = selectors.DefaultSelector()
+        self.sockets = []
+        self.buffers = {}
+        self.events = []
+        self.received_bytes = 0
+
+    def connect(self, count):
+        for i in range(count):
+            sock = socket.create_connection(self.address)
+            sock.sendall(encode_message({'cmd': 'subscribe', 'team': f"team-{i % TEAMS}"}))
+            sock.setblocking(False)
+            self.sockets.append(sock)
+            self.buffers[sock] = b''
+            self.selector.register(sock, selectors.EVENT_READ)
+
+    def pump(self, until, timeout=10.0):
+        """Read lines until until(events) is true (or, with until None, for timeout seconds)"""
+        end = time.time() + timeout
+        while (until is None or not until(self.events)) and time.time() < end:
+            for key, _ in self.selector.select(0.1):
+                data = key.fileobj.recv(65536)
+                self.received_bytes += len(data)
+                buf = self.buffers[key.fileobj] + data
+                *lines, self.buffers[key.fileobj] = buf.split(b'\n')
+                received = time.time()
+                self.events.extend((received, json.loads(line)) for line in lines if line.strip())
+        return until is None or until(self.events)
+
+    def count(self, name):
+        return sum(1 for _, event in self.events if event.get('event') == name)
+
+    def close(self):
+        for sock in self.sockets:
+            sock.close()
+        self.selector.close()
+
+def test_thousands_of_timers(tmp_dir):
+    """One coordinator holds 2,000 idle timers and pushes a schedule change to a team at once"""
+    print(f"Benchmarking {CLIENTS} timers in {TEAMS} teams against one coordinator process...")
+    if not os.path.exists("/proc/self/statm") or not CONTROL_AVAILABLE:
+        print("WARN /proc or Unix sockets not available - skipped")
+        return True
+    if resource is not None:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if hard < CLIENTS + 100:
+            print(f"WARN open file limit {hard} too low - skipped")
+            return True
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    admin = Path(tmp_dir) / "bench" / "coordinator.sock"
+    address = f"tcp://127.0.0.1:{free_port()}"
+    coordinator = subprocess.Popen(
+        [sys.executable, os.path.join(SRC_DIR, "pomodoro-coordinator.py"),
+         "--listen", str(admin), "--listen", address, "--state", str(Path(tmp_dir) / "bench" / "teams.json"),
+         "--max-teams-per-peer", str(TEAMS)],
+        stderr=subprocess.DEVNULL
+    )
+    timers = SimulatedTimers(address)
+    try:
+        if not wait_for(admin.exists):
+            print("FAIL Coordinator did not start")
+            return False
+        time.sleep(0.2)
+        rss_empty, _ = process_stats(coordinator.pid)
+
+        start = time.perf_counter()
+        timers.connect(CLIENTS)
+        subscribed = timers.pump(lambda events: timers.count('subscribed') >= CLIENTS)
+        connect_time = time.perf_counter() - start
+        time.sleep(0.5)
+        rss_full, cpu_before = process_stats(coordinator.pid)
+        per_client = (rss_full - rss_empty) / CLIENTS
+
+        # Nothing is sent between schedule changes
+        idle_bytes = timers.received_bytes
+        timers.pump(None, timeout=2.0)
+        idle_bytes = timers.received_bytes - idle_bytes
+        _, cpu_after = process_stats(coordinator.pid)
+        idle_cpu = cpu_after - cpu_before
+
+        # One change reaches exactly the members of that team
+        timers.events.clear()
+        changed_at = time.time()
+        send_command('set-schedule', path=admin, team="team-0", epoch='now')
+        members = CLIENTS // TEAMS
+        delivered = timers.pump(lambda events: timers.count('schedule') >= members, timeout=10)
+        timers.pump(None, timeout=0.3)
+        latency = max(received for received, _ in timers.events) - changed_at if timers.events else float('nan')
+        stats = send_command('teams', path=admin)
+    finally:
+        timers.close()
+        coordinator.terminate()
+        coordinator.wait(timeout=5)
+
+    print(f"  connect: {connect_time:.2f} s for {CLIENTS} timers")
+    print(f"  RSS: {rss_empty / 2**20:.1f} MiB empty, {rss_full / 2**20:.1f} MiB with {CLIENTS} timers "
+          f"({per_client / 1024:.1f} KiB per timer)")
+    print(f"  idle: {idle_bytes} bytes sent and {idle_cpu:.2f} s CPU over 2 s; "
+          f"schedule change reached {timers.count('schedule')} timers in {latency * 1000:.0f} ms")
+    ok = (
+        subscribed and delivered
+        and timers.count('schedule') == members
+        and stats.get('subscribers') == CLIENTS
+        and len(stats.get('teams', {})) == TEAMS
+        and idle_bytes == 0
+        and idle_cpu < 0.1
+        and per_client < 32 * 1024
+        and latency < 1.0
+    )
+    print(f"{'OK' if ok else 'FAIL'} {stats.get('subscribers')} subscribers in {len(stats.get('teams', {}))} teams")
+    return ok
+
+def main():
+    print("Starting Team Sync Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tests = [
+            ("Schedule Phase", test_schedule_phase),
+            ("Coordinator Loss", lambda: test_coordinator_loss(tmp_dir)),
+            ("Team Limit", lambda: test_team_limit(tmp_dir)),
+            ("Concurrent Changes", lambda: test_concurrent_changes(tmp_dir)),
+            ("2,000 Timers", lambda: test_thousands_of_timers(tmp_dir)),
+        ]
+        for test_name, test_func in tests:
+            print(f"\n--- {test_name} ---")
+            try:
+                results.append((test_name, test_func()))
+            except Exception as e:
+                print(f"FAIL {test_name} test crashed: {e}")
+                results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+
+"""
+Timer State Test Script for Pomodoro Lock
+Checks that timer state snapshots are immutable and stay consistent while many threads read and write them (no display required)
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Add src to path for engine imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from engine.state import TimerState, StateCell
+
+WORK_TIME = 1500
+BREAK_TIME = 300
+
+def test_immutable():
+    """Snapshots cannot be changed in place; replace() makes a new version"""
+    print("Testing immutability...")
+    state = TimerState(WORK_TIME)
+    try:
+        state.remaining = 10
+        print("FAIL Assignment to a snapshot succeeded")
+        return False
+    except AttributeError:
+        pass
+    paused = state.replace(is_paused=True, snooze_deadline=123.0)
+    ok = (
+        state.remaining == WORK_TIME and not state.is_paused
+        and paused.is_paused and paused.remaining == WORK_TIME
+        and paused.version == state.version + 1
+        and paused.session == 'work' and not hasattr(state, '__dict__')
+    )
+    print(f"{'OK' if ok else 'FAIL'} {paused!r}")
+    return ok
+
+def test_no_lost_updates():
+    """Concurrent read-modify-write updates are all applied"""
+    print("Testing concurrent countdown updates...")
+    threads, steps = 8, 5000
+    cell = StateCell(TimerState(threads * steps))
+    declined = []
+
+    def count_down():
+        for _ in range(steps):
+            cell.transform(lambda state: state.replace(remaining=state.remaining - 1))
+        # Nothing left to count: the update is declined and nothing is published
+        declined.append(cell.transform(lambda state: None if state.remaining <= 0 else state))
+
+    workers = [threading.Thread(target=count_down) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    state = cell.get()
+    ok = state.remaining == 0 and state.version == threads * steps and declined[-1] is None
+    print(f"{'OK' if ok else 'FAIL'} remaining {state.remaining}, version {state.version}")
+    return ok
+
+def check(state):
+    """Invariants every published state satisfies; a torn read would break them"""
+    if state.is_work_session:
+        consistent = BREAK_TIME < state.remaining <= WORK_TIME
+    else:
+        consistent = 0 <= state.remaining <= BREAK_TIME
+    if state.is_paused:
+        consistent = consistent and state.paused_time == state.remaining and state.snooze_deadline is not None
+    else:
+        consistent = consistent and state.snooze_deadline is None
+    return consistent
+
+def test_stress():
+    """Readers on many threads only ever see consistent snapshots"""
+    print("Stress testing readers against ticks, pauses and session changes...")
+    cell = StateCell(TimerState(WORK_TIME))
+    stop = threading.Event()
+    reads = [0]
+    torn = []
+
+    def tick():
+        while not stop.is_set():
+            def count_down(state):
+                if state.is_paused:
+                    return None
+                if state.is_work_session and state.remaining <= BREAK_TIME + 1:
+                    return state.replace(is_work_session=False, remaining=BREAK_TIME)
+                if not state.is_work_session and state.remaining <= 0:
+                    return state.replace(is_work_session=True, remaining=WORK_TIME)
+                return state.replace(remaining=state.remaining - 1)
+            cell.transform(count_down)
+
+    def click():
+        while not stop.is_set():
+            cell.transform(lambda state: state.replace(
+                is_paused=True, paused_time=state.remaining, snooze_deadline=time.time() + 600
+            ) if not state.is_paused else state.replace(is_paused=False, snooze_deadline=None))
+            time.sleep(0.0005)
+
+    def read():
+        count = 0
+        while not stop.is_set():
+            state = cell.get()
+            if not check(state):
+                torn.append(state)
+            count += 1
+        reads[0] += count
+
+    threads = [threading.Thread(target=tick) for _ in range(4)]
+    threads += [threading.Thread(target=click) for _ in range(2)]
+    threads += [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    time.sleep(2.0)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    writes = cell.get().version
+    ok = not torn and writes > 1000 and reads[0] > 1000
+    print(f"{'OK' if ok else 'FAIL'} {reads[0]} reads and {writes} writes, {len(torn)} inconsistent snapshots")
+    if torn:
+        print(f"  first: {torn[0]!r}")
+    return ok
+
+def test_read_cost():
+    """Benchmark: taking a snapshot costs about as much as reading an attribute"""
+    print("Benchmarking snapshot reads...")
+    cell = StateCell(TimerState(WORK_TIME))
+    reads = 200000
+    start = time.perf_counter()
+    for _ in range(reads):
+        cell.get().remaining
+    per_read = (time.perf_counter() - start) / reads * 1e6
+    ok = per_read < 5
+    print(f"{'OK' if ok else 'FAIL'} {per_read:.2f} us per snapshot read")
+    return ok
+
+def main():
+    print("Starting Timer State Tests for Pomodoro Lock")
+    print("=" * 50)
+
+    results = []
+    tests = [
+        ("Immutability", test_immutable),
+        ("No Lost Updates", test_no_lost_updates),
+        ("Stress", test_stress),
+        ("Read Cost", test_read_cost),
+    ]
+    for test_name, test_func in tests:
+        print(f"\n--- {test_name} ---")
+        try:
+            results.append((test_name, test_func()))
+        except Exception as e:
+            print(f"FAIL {test_name} test crashed: {e}")
+            results.append((test_name, False))
+
+    print("\n" + "=" * 50)
+    passed = sum(1 for _, result in results if result)
+    for test_name, result in results:
+        print(f"{test_name}: {'PASS' if result else 'FAIL'}")
+    print(f"\nSummary: {passed}/{len(results)} tests passed")
+    return 0 if passed == len(results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())